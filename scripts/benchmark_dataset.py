@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк завантаження датасету: CSV проти колонкової копії (src/data/dataset_store.py).
+
+Збільшує health_dataset.csv у --scale разів, записує CSV і колонкову копію
+у тимчасовий каталог та вимірює медіанний час і пікову пам'ять
+(tracemalloc) завантаження всіх колонок і лише колонок навчання.
+
+Приклад:
+    python scripts/benchmark_dataset.py --scale 100
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Додаємо корінь проекту до шляху
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd  # noqa: E402
+
+from src.data.dataset_store import DATASET_PATH, columnar_path, read_dataset, write_columnar  # noqa: E402
+from src.models.train_many import BASE_FEATURES, TARGETS  # noqa: E402
+
+
+def scaled_dataset(scale: int) -> pd.DataFrame:
+    """Датасет, повторений scale разів (з унікальним SEQN)."""
+    df = pd.read_csv(DATASET_PATH, encoding="utf-8")
+    copies = []
+    for index in range(scale):
+        copy = df.copy()
+        copy["SEQN"] = copy["SEQN"] + index * (int(df["SEQN"].max()) + 1)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def measure(load, repeats: int) -> dict:
+    """Медіанний час, пікова пам'ять під час завантаження та розмір результату."""
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        load()
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    frame = load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": statistics.median(times),
+        "peak_mb": peak / 2**20,
+        "frame_mb": frame.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100, help="У скільки разів збільшити датасет")
+    parser.add_argument("--repeats", type=int, default=5, help="Повторів кожного вимірювання")
+    args = parser.parse_args()
+
+    training_columns = BASE_FEATURES + ["LBXGLU"] + TARGETS
+    df = scaled_dataset(args.scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "health_dataset.csv"
+        df.to_csv(csv_path, index=False, encoding="utf-8")
+        missing_copy = Path(tmp) / "no_copy.csv"
+        missing_copy.symlink_to(csv_path)
+        write_columnar(df, csv_path)
+        csv_mb = csv_path.stat().st_size / 2**20
+        columns_mb = sum(path.stat().st_size for path in columnar_path(csv_path).iterdir()) / 2**20
+
+        cases = {
+            "pd.read_csv (усі колонки)": lambda: pd.read_csv(csv_path, encoding="utf-8"),
+            "CSV, колонки навчання": lambda: read_dataset(missing_copy, training_columns),
+            "Колонкова копія (усі)": lambda: read_dataset(csv_path),
+            "Колонкова копія, навчання": lambda: read_dataset(csv_path, training_columns),
+        }
+        results = {name: measure(load, args.repeats) for name, load in cases.items()}
+
+    print("\n" + "=" * 72)
+    print(f"Рядків: {len(df)} (×{args.scale}), CSV: {csv_mb:.1f} МБ, колонкова копія: {columns_mb:.1f} МБ")
+    print(f"{'Спосіб':<30}{'Час, с':>10}{'Пік, МБ':>12}{'DataFrame, МБ':>16}")
+    baseline = results["pd.read_csv (усі колонки)"]["seconds"]
+    for name, result in results.items():
+        print(
+            f"{name:<30}{result['seconds']:>10.3f}{result['peak_mb']:>12.1f}{result['frame_mb']:>16.1f}"
+            f"   ×{baseline / result['seconds']:.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк об'єднання таблиць ETL за SEQN: послідовний merge проти одного
+проходу (src/data/table_join.py).
+
+Генерує --tables синтетичних таблиць по --rows рядків (ключі — SEQN з
+пропусками учасників; в останній таблиці --duplicates частка рядків має
+повторний ключ, як у таблиці ліків) та вимірює медіанний час і пікову
+пам'ять (tracemalloc) обох способів. Результати перевіряються на рівність.
+
+Приклад:
+    python scripts/benchmark_join.py --rows 1000000 --tables 6
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Додаємо корінь проекту до шляху
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.data.table_join import merge_fold, outer_join_on_key  # noqa: E402
+
+FIRST_SEQN = 73557
+
+
+def synthetic_tables(rows: int, tables: int, columns: int, duplicates: float, seed: int = 42) -> list:
+    """Таблиці з ключем SEQN: ~90% учасників у кожній; в останній частина ключів повторюється."""
+    rng = np.random.default_rng(seed)
+    participants = np.arange(FIRST_SEQN, FIRST_SEQN + int(rows * 1.1))
+    frames = []
+    for index in range(tables):
+        unique_rows = rows - int(rows * duplicates) if index == tables - 1 else rows
+        keys = rng.choice(participants, unique_rows, replace=False)
+        keys = np.concatenate([keys, rng.choice(keys, rows - unique_rows)])
+        data = {"SEQN": keys}
+        for column in range(columns):
+            data[f"T{index}C{column}"] = rng.normal(size=rows)
+        frames.append(pd.DataFrame(data))
+    return frames
+
+
+def measure(join, repeats: int) -> dict:
+    """Медіанний час і пікова пам'ять об'єднання."""
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        join()
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    join()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": statistics.median(times), "peak_mb": peak / 2**20}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Рядків у кожній таблиці")
+    parser.add_argument("--tables", type=int, default=6, help="Кількість таблиць")
+    parser.add_argument("--columns", type=int, default=5, help="Колонок (крім SEQN) у кожній таблиці")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="Частка рядків з повторним SEQN в останній таблиці")
+    parser.add_argument("--repeats", type=int, default=3, help="Повторів кожного вимірювання")
+    args = parser.parse_args()
+
+    frames = synthetic_tables(args.rows, args.tables, args.columns, args.duplicates)
+    cases = {
+        "Послідовний merge": lambda: merge_fold(frames, "SEQN"),
+        "Один прохід": lambda: outer_join_on_key(frames, "SEQN"),
+    }
+    expected = merge_fold(frames, "SEQN").reset_index(drop=True)
+    pd.testing.assert_frame_equal(outer_join_on_key(frames, "SEQN"), expected)
+    shape = expected.shape
+    del expected
+    results = {name: measure(join, args.repeats) for name, join in cases.items()}
+
+    print("\n" + "=" * 60)
+    print(f"Таблиць: {args.tables} × {args.rows} рядків, результат: {shape[0]} × {shape[1]}")
+    print(f"{'Спосіб':<24}{'Час, с':>10}{'Пік, МБ':>12}")
+    baseline = results["Послідовний merge"]["seconds"]
+    for name, result in results.items():
+        print(f"{name:<24}{result['seconds']:>10.3f}{result['peak_mb']:>12.1f}   ×{baseline / result['seconds']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк повнотекстового пошуку повідомлень: FTS5 (BM25) проти LIKE '%...%'.
+
+Створює тимчасову БД, заповнює її випадковими повідомленнями чатів і асистента
+(через тригери, тобто з реальною вартістю індексації) та вимірює p50/p95 часу
+запитів: FTS5 по всіх джерелах (scope=all, окремий рейтинг кожного джерела з
+чергуванням) і лише по чатах, LIKE — по чатах.
+
+Приклад:
+    python scripts/benchmark_search.py --messages 1000000
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Додаємо корінь проекту до шляху
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from src.service import models  # noqa: E402,F401 — реєструє таблиці в metadata
+from src.service.services.message_search import ensure_search_index, search_messages  # noqa: E402
+
+SEED_WORDS = [
+    "глюкоза", "інсулін", "тиск", "пульс", "холестерин", "дієта", "сон", "вага", "аналіз",
+    "лікар", "рецепт", "тренування", "біг", "вода", "сніданок", "обід", "вечеря", "прогулянка",
+    "ризик", "діабет", "ожиріння", "норма", "результат", "завтра", "сьогодні", "привіт",
+]
+SYLLABLES = ["ка", "ро", "ні", "ле", "ма", "ту", "ві", "са", "до", "ли", "пе", "зо", "ри", "ну", "бе"]
+VOCABULARY_SIZE = 20_000
+
+BATCH_SIZE = 10_000
+
+
+def build_vocabulary(rng: random.Random):
+    """Словник з частотами за законом Ципфа (як у природному тексті)."""
+    words = list(SEED_WORDS)
+    seen = set(words)
+    while len(words) < VOCABULARY_SIZE:
+        word = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    cum_weights = list(itertools.accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+    return words, cum_weights
+
+
+def _sentence(rng: random.Random, words, cum_weights) -> str:
+    return " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(4, 16)))
+
+
+def _percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def populate(engine, messages: int, users: int, vocabulary, seed: int, assistant_share: float = 0.0) -> float:
+    """Заповнює БД користувачами, чатами та повідомленнями (частка assistant_share — розмови з асистентом).
+
+    Повертає час вставки, с.
+    """
+    rng = random.Random(seed)
+    words, cum_weights = vocabulary
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO user (id, email, hashed_password, display_name, avatar_type, is_active, created_at, updated_at) "
+                "VALUES (:id, :email, 'x', :name, 'generated', 1, :now, :now)"
+            ),
+            [{"id": i, "email": f"user{i}@bench.local", "name": f"User {i}", "now": now} for i in range(1, users + 1)],
+        )
+        chats = [(i, i + 1) for i in range(1, users)]
+        conn.execute(
+            text(
+                'INSERT INTO chat (id, uuid, user1_id, user2_id, created_at, updated_at, is_pinned, "order") '
+                "VALUES (:id, :uuid, :u1, :u2, :now, :now, 0, 0)"
+            ),
+            [{"id": n, "uuid": f"bench-{n}", "u1": a, "u2": b, "now": now} for n, (a, b) in enumerate(chats, 1)],
+        )
+
+    insert = text(
+        "INSERT INTO chatmessage (chat_id, sender_id, content, created_at) "
+        "VALUES (:chat_id, :sender_id, :content, :now)"
+    )
+    insert_assistant = text(
+        "INSERT INTO assistantmessage (user_id, role, content, created_at) "
+        "VALUES (:user_id, :role, :content, :now)"
+    )
+    assistant_messages = int(messages * assistant_share)
+    started = time.perf_counter()
+    done = 0
+    while done < messages:
+        batch, assistant_batch = [], []
+        for _ in range(min(BATCH_SIZE, messages - done)):
+            if done + len(batch) + len(assistant_batch) < assistant_messages:
+                assistant_batch.append({
+                    "user_id": rng.randint(1, users),
+                    "role": rng.choice(("user", "assistant")),
+                    "content": _sentence(rng, words, cum_weights),
+                    "now": now,
+                })
+                continue
+            chat_id = rng.randint(1, len(chats))
+            batch.append({
+                "chat_id": chat_id,
+                "sender_id": rng.choice(chats[chat_id - 1]),
+                "content": _sentence(rng, words, cum_weights),
+                "now": now,
+            })
+        with engine.begin() as conn:
+            if batch:
+                conn.execute(insert, batch)
+            if assistant_batch:
+                conn.execute(insert_assistant, assistant_batch)
+        done += len(batch) + len(assistant_batch)
+    return time.perf_counter() - started
+
+
+def run_queries(engine, queries: int, users: int, vocabulary, seed: int):
+    """Вимірює час FTS-пошуку та LIKE-базової лінії на однакових запитах.
+
+    Терміни беруться рівномірно з усього словника, тож запити покривають
+    і часті, і рідкісні слова.
+    """
+    rng = random.Random(seed + 1)
+    words, _ = vocabulary
+    like_sql = text(
+        "SELECT m.id FROM chatmessage m JOIN chat c ON c.id = m.chat_id "
+        "WHERE (c.user1_id = :user_id OR c.user2_id = :user_id) AND m.content LIKE :pattern "
+        "ORDER BY m.id DESC LIMIT 20"
+    )
+    all_times, fts_times, like_times = [], [], []
+    with Session(engine) as session:
+        for _ in range(queries):
+            user_id = rng.randint(1, users)
+            term = rng.choice(words)
+
+            started = time.perf_counter()
+            search_messages(session, user_id, term, scope="all", limit=20)
+            all_times.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            search_messages(session, user_id, term, scope="chats", limit=20)
+            fts_times.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            session.execute(like_sql, {"user_id": user_id, "pattern": f"%{term}%"}).all()
+            like_times.append((time.perf_counter() - started) * 1000)
+    return all_times, fts_times, like_times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк FTS5-пошуку повідомлень")
+    parser.add_argument("--messages", type=int, default=1_000_000, help="Кількість повідомлень")
+    parser.add_argument("--users", type=int, default=200, help="Кількість користувачів")
+    parser.add_argument("--queries", type=int, default=200, help="Кількість пошукових запитів")
+    parser.add_argument("--assistant-share", type=float, default=0.2, help="Частка повідомлень асистента")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        with engine.connect() as conn:
+            if not ensure_search_index(conn):
+                print("❌ SQLite зібрано без FTS5")
+                sys.exit(1)
+
+        vocabulary = build_vocabulary(random.Random(args.seed))
+        print(f"📥 Вставка {args.messages:,} повідомлень (з індексацією тригерами)...")
+        elapsed = populate(engine, args.messages, max(2, args.users), vocabulary, args.seed, args.assistant_share)
+        print(f"   {elapsed:.1f} с, {args.messages / elapsed:,.0f} повідомлень/с")
+
+        print(f"🔎 {args.queries} запитів...")
+        all_times, fts_times, like_times = run_queries(engine, args.queries, max(2, args.users), vocabulary, args.seed)
+        engine.dispose()
+
+    print(f"\n{'':12}{'p50, мс':>10}{'p95, мс':>10}{'mean, мс':>10}")
+    for name, samples in (("FTS5 all", all_times), ("FTS5 chats", fts_times), ("LIKE chats", like_times)):
+        print(
+            f"{name:12}{_percentile(samples, 0.5):10.2f}{_percentile(samples, 0.95):10.2f}"
+            f"{statistics.mean(samples):10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк навчання моделей: послідовно (n_jobs=1) проти пулу процесів.
+
+Навчає ті самі моделі для всіх цільових змінних двічі у тимчасові каталоги,
+порівнює час і перевіряє, що лідерборди та чемпіони збігаються.
+
+Приклад:
+    python scripts/benchmark_training.py --jobs 8
+    python scripts/benchmark_training.py --sample 2000 --models LogisticRegression,RandomForest,KNN
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Додаємо корінь проекту до шляху
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd  # noqa: E402
+
+from src.models import train_many  # noqa: E402
+
+
+def timed_run(datasets, models, n_jobs, models_dir: Path, plots: str) -> float:
+    started = time.perf_counter()
+    train_many.run_training(datasets, models, n_jobs=n_jobs, models_dir=models_dir, plots=plots)
+    return time.perf_counter() - started
+
+
+def compare(serial_dir: Path, parallel_dir: Path, targets) -> list:
+    """Розбіжності лідербордів і чемпіонів (порожній список — результати однакові)."""
+    problems = []
+    for target in targets:
+        leaderboards = [pd.read_csv(root / target / "leaderboard.csv") for root in (serial_dir, parallel_dir)]
+        if not leaderboards[0].equals(leaderboards[1]):
+            problems.append(f"{target}: лідерборди відрізняються")
+        champions = [
+            json.loads((root / target / "champion.json").read_text(encoding="utf-8"))
+            for root in (serial_dir, parallel_dir)
+        ]
+        if (champions[0]["model_name"], champions[0]["metrics"]) != (champions[1]["model_name"], champions[1]["metrics"]):
+            problems.append(f"{target}: чемпіони відрізняються")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Бюджет ядер для паралельного запуску")
+    parser.add_argument("--models", default="", help="Моделі через кому (за замовчуванням — усі доступні)")
+    parser.add_argument("--plots", choices=["none", *train_many.PLOT_MODES], default="full", help="Режим графіків")
+    parser.add_argument("--sample", type=int, default=0, help="Взяти лише перші N рядків датасету")
+    args = parser.parse_args()
+
+    models = train_many.get_models()
+    if args.models:
+        names = [name.strip() for name in args.models.split(",") if name.strip()]
+        models = {name: models[name] for name in names}
+
+    datasets = {}
+    for target in train_many.TARGETS:
+        X, y, features = train_many.load_and_prepare_data(train_many.DATA_PATH, target, train_many.BASE_FEATURES)
+        if args.sample:
+            X, y = X.iloc[: args.sample], y.iloc[: args.sample]
+        datasets[target] = (X, y, features)
+
+    workers, threads = train_many.plan_cpu_budget(len(datasets) * len(models), args.jobs)
+    with tempfile.TemporaryDirectory() as tmp:
+        serial_dir, parallel_dir = Path(tmp) / "serial", Path(tmp) / "parallel"
+        serial = timed_run(datasets, models, 1, serial_dir, args.plots)
+        parallel = timed_run(datasets, models, args.jobs, parallel_dir, args.plots)
+        problems = compare(serial_dir, parallel_dir, datasets)
+
+    print("\n" + "=" * 60)
+    print(f"Моделей: {len(models)}, цільових змінних: {len(datasets)}, ядер: {os.cpu_count()}")
+    print(f"{'Послідовно:':<28}{serial:8.1f} с")
+    print(f"{f'Пул ({workers} × {threads} потоків):':<28}{parallel:8.1f} с")
+    print(f"{'Прискорення:':<28}{serial / parallel:8.2f}×")
+    print("Результати однакові" if not problems else "\n".join(problems))
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
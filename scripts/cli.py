@@ -11,6 +11,7 @@ import typer
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.data.etl_manifest import format_report
 from src.data.nhanes_etl import run_etl
 
 app = typer.Typer(help="CLI для обробки даних NHANES та оцінки ризиків здоров'я")
@@ -24,17 +25,145 @@ def main() -> None:
 
 
 @app.command("data")
-def data_command() -> None:
-    """Запускає обробку даних NHANES та зберігає результат."""
+def data_command(
+    full: bool = typer.Option(False, "--full", help="Перебудувати всі цикли незалежно від маніфесту"),
+) -> None:
+    """Запускає обробку даних NHANES (лише нові або змінені цикли) та зберігає результат."""
     # Повідомлення про запуск обробки
     print("🔄 Запуск обробки даних NHANES...")
 
     # Виконання ETL пайплайну
-    run_etl()
+    report = run_etl(full=full)
 
-    # Повідомлення про успішне завершення
+    # Що перебудовано, а що пропущено
+    for line in format_report(report):
+        print(line)
     print("✅ Обробку завершено. Файл збережено у datasets/processed/health_dataset.csv")
 
 
+@app.command("startup")
+def startup_command(
+    warmup: bool = typer.Option(False, "--warmup", help="Також завантажити чемпіонські моделі"),
+) -> None:
+    """Вимірює холодний старт API за фазами в окремому процесі."""
+    from src.service.startup_profile import measure_cold_start
+
+    print("⏱️  Вимірювання холодного старту API...")
+    report = measure_cold_start(warmup=warmup)
+
+    for phase, duration in report["phases_ms"].items():
+        value = f"{duration:10.1f} мс" if duration is not None else f"{'—':>13}"
+        print(f"   {phase:14}{value}")
+    print(f"   {'разом':14}{report['total_ms']:10.1f} мс")
+    heavy = ", ".join(report["heavy_modules_loaded"]) or "немає"
+    print(f"📦 Важкі залежності після старту: {heavy}")
+
+
+@app.command("archive")
+def archive_command(
+    older_than_days: int = typer.Option(None, "--older-than-days", help="Вік записів для архівації (за замовчуванням ARCHIVE_AFTER_DAYS)"),
+    batch_size: int = typer.Option(None, "--batch-size", help="Записів в одній транзакції (за замовчуванням ARCHIVE_BATCH_SIZE)"),
+    pause: float = typer.Option(0.05, "--pause", help="Пауза між порціями, с"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Лише показати, скільки записів буде перенесено"),
+) -> None:
+    """Переносить давні прогнози та повідомлення в помісячні архіви БД."""
+    from datetime import datetime, timedelta
+
+    from src.service.archive import ArchiveConflictError, archive_dir, archive_old_rows, plan_archive
+    from src.service.db import engine, init_db
+    from src.service.settings import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+
+    init_db()
+    days = older_than_days if older_than_days is not None else ARCHIVE_AFTER_DAYS
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    print(f"🗄️  Архівація записів, створених до {cutoff:%Y-%m-%d %H:%M} UTC → {archive_dir(engine)}")
+
+    if dry_run:
+        for table, months in plan_archive(engine, cutoff).items():
+            total = sum(months.values())
+            detail = ", ".join(f"{month}: {count}" for month, count in months.items())
+            print(f"   {table:18}{total:8}" + (f"  ({detail})" if detail else ""))
+        return
+
+    try:
+        moved = archive_old_rows(engine, cutoff, batch_size=batch_size or ARCHIVE_BATCH_SIZE, pause=pause)
+    except ArchiveConflictError as e:
+        print(f"❌ Архівацію зупинено, записи лишились в основній БД: {e}")
+        raise typer.Exit(code=1)
+    for table, count in moved.items():
+        print(f"   {table:18}{count:8}")
+    print("✅ Архівацію завершено")
+
+
+@app.command("backup")
+def backup_command(
+    destination: Path = typer.Option(None, "--to", help="Файл копії (за замовчуванням data/backups/app-<час>.db)"),
+    pages_per_step: int = typer.Option(256, "--pages-per-step", help="Сторінок за один крок копіювання"),
+    pause: float = typer.Option(0.005, "--pause", help="Пауза між кроками, с"),
+    keep: int = typer.Option(0, "--keep", help="Скільки останніх копій лишати в data/backups (0 — усі)"),
+) -> None:
+    """Робить онлайн-копію data/app.db, не зупиняючи сервіс."""
+    from src.service.db import DATABASE_PATH
+    from src.service.maintenance import backup_database, default_backup_path, prune_backups
+
+    destination = destination or default_backup_path(DATABASE_PATH)
+    print(f"💾 Резервне копіювання {DATABASE_PATH} → {destination}")
+    report = backup_database(DATABASE_PATH, destination, pages_per_step=pages_per_step, pause=pause)
+
+    print(f"   тривалість          {report['duration_ms']:10.1f} мс")
+    print(f"   сторінок скопійовано {report['pages_copied']:9} з {report['total_pages']} ({report['steps']} кроків)")
+    print(f"   перезапусків        {report['restarts']:10}")
+    print(f"   очікування блокувань{report['lock_wait_ms']:10.1f} мс (найдовший крок {report['max_step_ms']:.1f} мс)")
+    integrity = report["integrity"]
+    print(("✅ Копія цілісна" if integrity["ok"] else "❌ Копія пошкоджена: " + "; ".join(integrity["errors"])))
+    if keep:
+        for path in prune_backups(destination.parent, DATABASE_PATH.stem, keep):
+            print(f"🗑️  Видалено стару копію {path.name}")
+    if not integrity["ok"]:
+        raise typer.Exit(code=1)
+
+
+@app.command("compact")
+def compact_command(
+    max_pages: int = typer.Option(None, "--max-pages", help="Максимум сторінок, що звільняються за запуск"),
+    pages_per_step: int = typer.Option(512, "--pages-per-step", help="Сторінок в одній транзакції"),
+    enable_incremental: bool = typer.Option(
+        False, "--enable-incremental", help="Перемкнути auto_vacuum=incremental (одноразовий повний VACUUM)"
+    ),
+) -> None:
+    """Звільняє вільні сторінки data/app.db (incremental_vacuum) та виконує PRAGMA optimize."""
+    from src.service.db import DATABASE_PATH
+    from src.service.maintenance import compact_database
+
+    report = compact_database(
+        DATABASE_PATH, max_pages=max_pages, pages_per_step=pages_per_step, enable_incremental=enable_incremental
+    )
+    before, after = report["before"], report["after"]
+    print(f"🧹 Ущільнення {DATABASE_PATH} (auto_vacuum: {before['auto_vacuum']} → {after['auto_vacuum']})")
+    print(f"   сторінок            {before['page_count']:10} → {after['page_count']}")
+    print(f"   вільних сторінок    {before['freelist_count']:10} → {after['freelist_count']}")
+    print(f"   тривалість          {report['duration_ms']:10.1f} мс (очікування блокувань {report['lock_wait_ms']:.1f} мс)")
+    if before["auto_vacuum"] != "incremental" and not report["full_vacuum"]:
+        print("ℹ️  incremental_vacuum недоступний у цьому режимі, запустіть з --enable-incremental")
+
+
+@app.command("check-db")
+def check_db_command(
+    quick: bool = typer.Option(False, "--quick", help="PRAGMA quick_check замість повного integrity_check"),
+) -> None:
+    """Перевіряє цілісність data/app.db."""
+    from src.service.db import DATABASE_PATH
+    from src.service.maintenance import check_integrity
+
+    report = check_integrity(DATABASE_PATH, quick=quick)
+    if report["ok"]:
+        print(f"✅ {report['check']}: ok ({report['duration_ms']:.1f} мс)")
+        return
+    print(f"❌ {report['check']}: знайдено помилки")
+    for error in report["errors"]:
+        print(f"   {error}")
+    raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     app()
@@ -11,6 +11,8 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from src.data.dataset_store import read_dataset
+
 # Налаштування шляхів
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_PATH = PROJECT_ROOT / "datasets/processed/health_dataset.csv"
@@ -26,7 +28,7 @@ plt.rcParams["font.size"] = 10
 def load_data(data_path: Path = DATA_PATH) -> pd.DataFrame:
     """Завантажує оброблений датасет NHANES."""
     print(f"📊 Завантаження даних з {data_path}...")
-    df = pd.read_csv(data_path, encoding="utf-8")
+    df = read_dataset(data_path)
     return df
 
 
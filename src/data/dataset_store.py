@@ -0,0 +1,186 @@
+"""
+Колонкова копія обробленого датасету та спільний завантажувач.
+
+ETL поряд із health_dataset.csv зберігає типізовану копію — каталог
+health_dataset.columns/ з окремим .npy-файлом на кожну колонку та schema.json.
+Типи зменшуються без втрати значень: цілі — до найменшого int, дробові — до
+float32, якщо всі значення точно в ньому представлені, рядки — до кодів
+категорій. Читаються лише потрібні колонки й без розбору тексту.
+
+read_dataset читає колонкову копію, а якщо її немає або вона не відповідає
+поточному CSV (розмір чи час зміни) — сам CSV (теж лише потрібні колонки).
+Обидва шляхи повертають однакові типи.
+
+Приклад (створити копію для наявного CSV):
+    python -m src.data.dataset_store
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DATASET_PATH = PROJECT_ROOT / "datasets/processed/health_dataset.csv"
+
+SCHEMA_FILE = "schema.json"
+SCHEMA_VERSION = 1
+# Найбільше ціле, яке float64 зберігає точно
+MAX_EXACT_INT = 2 ** 53
+
+
+def columnar_path(csv_path: Path) -> Path:
+    """Каталог колонкової копії: health_dataset.csv -> health_dataset.columns/."""
+    return csv_path.with_suffix(".columns")
+
+
+def _source_stamp(csv_path: Path) -> Dict[str, int]:
+    stat = csv_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def downcast_column(series: pd.Series) -> pd.Series:
+    """
+    Зменшує тип колонки без втрати значень.
+
+    Args:
+        series: Колонка датасету
+
+    Returns:
+        Колонка з найменшим типом: int8..int64, float32/float64 або category
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype(np.int8)
+    if not pd.api.types.is_numeric_dtype(series):
+        return series.astype("category")
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    values = series.to_numpy(dtype=np.float64)
+    # Цілі значення лише скінченні й у межах, де float64 точно представляє цілі (|v| <= 2**53):
+    # nan/inf та більші числа лишаються float
+    if (
+        np.isfinite(values).all()
+        and np.array_equal(values, np.round(values))
+        and (len(values) == 0 or np.abs(values).max() <= MAX_EXACT_INT)
+    ):
+        return pd.to_numeric(series.astype(np.int64), downcast="integer")
+    if np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+        return series.astype(np.float32)
+    return series.astype(np.float64)
+
+
+def downcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Застосовує downcast_column до всіх колонок."""
+    return pd.DataFrame({column: downcast_column(df[column]) for column in df.columns}, index=df.index)
+
+
+def write_columnar(df: pd.DataFrame, csv_path: Path = DATASET_PATH) -> Path:
+    """
+    Зберігає колонкову копію датасету, записаного у csv_path.
+
+    Викликається після запису CSV: schema.json фіксує його розмір і час зміни,
+    щоб read_dataset не читав копію застарілого файлу. Копія пишеться у
+    тимчасовий каталог і підміняє попередню лише повністю записаною.
+
+    Args:
+        df: Датасет (той самий, що записано у CSV)
+        csv_path: Шлях до CSV файлу
+
+    Returns:
+        Шлях до каталогу колонкової копії
+    """
+    target = columnar_path(csv_path)
+    staging = target.with_name(target.name + ".tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    # Як після read_csv: індекс не зберігається
+    frame = downcast_frame(df.reset_index(drop=True))
+    columns = {}
+    for index, column in enumerate(frame.columns):
+        series = frame[column]
+        file_name = f"{index:03d}.npy"
+        entry = {"file": file_name, "dtype": str(series.dtype)}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry["categories"] = [str(category) for category in series.cat.categories]
+            np.save(staging / file_name, series.cat.codes.to_numpy())
+        else:
+            np.save(staging / file_name, series.to_numpy())
+        columns[str(column)] = entry
+
+    schema = {
+        "version": SCHEMA_VERSION,
+        "rows": len(frame),
+        "source": _source_stamp(csv_path),
+        "columns": columns,
+    }
+    with open(staging / SCHEMA_FILE, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2, ensure_ascii=False)
+
+    if target.exists():
+        shutil.rmtree(target)
+    staging.rename(target)
+    return target
+
+
+def _load_schema(csv_path: Path) -> Optional[Dict]:
+    """Схема актуальної колонкової копії або None (немає, інша версія чи застаріла)."""
+    schema_path = columnar_path(csv_path) / SCHEMA_FILE
+    try:
+        with open(schema_path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if schema.get("version") != SCHEMA_VERSION:
+        return None
+    if csv_path.exists() and schema.get("source") != _source_stamp(csv_path):
+        return None
+    return schema
+
+
+def read_dataset(
+    csv_path: Path = DATASET_PATH, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Завантажує датасет: колонкову копію, якщо вона актуальна, інакше CSV.
+
+    Args:
+        csv_path: Шлях до CSV файлу
+        columns: Потрібні колонки (None — усі); відсутні в датасеті пропускаються
+
+    Returns:
+        DataFrame з колонками у порядку датасету та зменшеними типами
+    """
+    schema = _load_schema(csv_path)
+    if schema is None:
+        wanted = None if columns is None else set(columns)
+        usecols = None if wanted is None else (lambda column: column in wanted)
+        return downcast_frame(pd.read_csv(csv_path, encoding="utf-8", usecols=usecols))
+
+    directory = columnar_path(csv_path)
+    data = {}
+    for column, entry in schema["columns"].items():
+        if columns is not None and column not in columns:
+            continue
+        # memmap: DataFrame копіює значення один раз, без проміжного масиву в пам'яті
+        values = np.load(directory / entry["file"], mmap_mode="r")
+        if "categories" in entry:
+            data[column] = pd.Categorical.from_codes(values, categories=entry["categories"])
+        else:
+            data[column] = values
+    return pd.DataFrame(data, index=pd.RangeIndex(schema["rows"]))
+
+
+def main() -> None:
+    """Створює колонкову копію для наявного CSV (без повторного запуску ETL)."""
+    df = pd.read_csv(DATASET_PATH, encoding="utf-8")
+    target = write_columnar(df, DATASET_PATH)
+    print(f"✅ Колонкову копію {len(df)} рядків і {len(df.columns)} колонок збережено у {target}")
+
+
+if __name__ == "__main__":
+    main()
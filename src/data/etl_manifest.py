@@ -0,0 +1,241 @@
+"""
+Інкрементальний ETL за циклами NHANES: маніфест сирих джерел і оброблених розділів.
+
+Кожен цикл NHANES (набір сирих таблиць) обробляється в окремий розділ —
+pickle з результатом ETL цього циклу в каталозі health_dataset.partitions/.
+manifest.json у тому ж каталозі зберігає SHA-256 кожного сирого файлу,
+джерела кожного розділу та відбиток налаштувань обробки. Повторний запуск
+обробляє лише нові цикли або цикли зі зміненим вмістом джерел, решта
+розділів береться з диску, а розділи циклів, яких більше немає, видаляються.
+Якщо жоден розділ не змінився і фінальний CSV відповідає маніфесту, ETL
+нічого не записує.
+
+SHA-256 файлу перераховується лише тоді, коли змінився його розмір чи час
+зміни, інакше він береться з маніфесту. Файл, у якого змінився лише час
+зміни, а вміст той самий, не спричиняє обробки.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Union
+
+import pandas as pd
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+HASH_BLOCK_BYTES = 1 << 20
+
+SourcePaths = Mapping[str, Union[Path, List[Path]]]
+
+
+def partitions_path(output_path: Path) -> Path:
+    """Каталог розділів: health_dataset.csv -> health_dataset.partitions/."""
+    return output_path.with_suffix(".partitions")
+
+
+def _file_stamp(path: Path) -> Dict[str, int]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _as_list(paths: Union[Path, List[Path]]) -> List[Path]:
+    return list(paths) if isinstance(paths, (list, tuple)) else [paths]
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 вмісту файлу (читається блоками по HASH_BLOCK_BYTES)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for block in iter(lambda: stream.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def settings_digest(settings: Any) -> str:
+    """Відбиток налаштувань обробки: їх зміна робить застарілими всі розділи."""
+    payload = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(output_path: Path) -> Dict[str, Any]:
+    """Маніфест розділів або порожній словник (немає, пошкоджений чи інша версія)."""
+    try:
+        with open(partitions_path(output_path) / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def hash_sources(cycles: Mapping[str, SourcePaths], known: Mapping[str, Dict]) -> Dict[str, Dict]:
+    """
+    SHA-256 та розмір/час зміни кожного сирого файлу всіх циклів.
+
+    Args:
+        cycles: Цикл -> таблиця -> шлях або список шляхів
+        known: Секція sources попереднього маніфесту
+
+    Returns:
+        Шлях (рядок) -> {"sha256", "size", "mtime_ns"}
+    """
+    sources: Dict[str, Dict] = {}
+    for tables in cycles.values():
+        for paths in tables.values():
+            for path in _as_list(paths):
+                key = str(path)
+                if key in sources:
+                    continue
+                if not path.exists():
+                    raise FileNotFoundError(f"Не знайдено сирий файл {path}")
+                stamp = _file_stamp(path)
+                previous = known.get(key, {})
+                unchanged = all(previous.get(field) == value for field, value in stamp.items())
+                sha256 = previous["sha256"] if unchanged and "sha256" in previous else file_sha256(path)
+                sources[key] = {"sha256": sha256, **stamp}
+    return sources
+
+
+def _cycle_sources(tables: SourcePaths, sources: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """Таблиця -> SHA-256 її файлів: саме за ним порівнюється розділ."""
+    return {
+        table: [sources[str(path)]["sha256"] for path in _as_list(paths)]
+        for table, paths in tables.items()
+    }
+
+
+def _partition_file(cycle: str) -> str:
+    return re.sub(r"[^\w.-]", "_", cycle) + ".pkl"
+
+
+def plan_cycles(
+    cycles: Mapping[str, SourcePaths],
+    manifest: Dict[str, Any],
+    sources: Dict[str, Dict],
+    settings_hash: str,
+    directory: Path,
+) -> Dict[str, str]:
+    """
+    Причина перебудови кожного циклу; порожній рядок — розділ актуальний.
+
+    Розділ перебудовується, якщо цикл новий, змінено налаштування обробки,
+    файл розділу відсутній або змінився вміст (чи склад) його джерел.
+    """
+    known = manifest.get("partitions", {})
+    plan: Dict[str, str] = {}
+    for cycle, tables in cycles.items():
+        entry = known.get(cycle)
+        if entry is None:
+            plan[cycle] = "новий цикл"
+        elif manifest.get("settings") != settings_hash:
+            plan[cycle] = "змінено налаштування ETL"
+        elif not (directory / entry["file"]).exists():
+            plan[cycle] = "немає файлу розділу"
+        else:
+            current = _cycle_sources(tables, sources)
+            changed = [table for table in current if entry["sources"].get(table) != current[table]]
+            changed += [table for table in entry["sources"] if table not in current]
+            plan[cycle] = f"змінено: {', '.join(changed)}" if changed else ""
+    return plan
+
+
+def _write_manifest(directory: Path, manifest: Dict[str, Any]) -> None:
+    staging = directory / (MANIFEST_FILE + ".tmp")
+    with open(staging, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    staging.replace(directory / MANIFEST_FILE)
+
+
+def run_incremental(
+    cycles: Mapping[str, SourcePaths],
+    process_cycle: Callable[[SourcePaths], pd.DataFrame],
+    save: Callable[[pd.DataFrame, Path], None],
+    output_path: Path,
+    settings: Any,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """
+    Обробляє лише нові або змінені цикли та збирає фінальний датасет з розділів.
+
+    Args:
+        cycles: Цикл -> таблиця -> шлях або список шляхів (порядок циклів — порядок рядків)
+        process_cycle: Обробка сирих таблиць одного циклу в готовий DataFrame
+        save: Збереження фінального датасету (CSV та колонкова копія)
+        output_path: Шлях до фінального CSV
+        settings: Налаштування обробки, що впливають на результат
+        full: Перебудувати всі розділи незалежно від маніфесту
+
+    Returns:
+        Звіт: rebuilt (цикл -> причина), skipped, removed, assembled, rows
+    """
+    if not cycles:
+        raise ValueError("Не задано жодного циклу сирих даних")
+    directory = partitions_path(output_path)
+    manifest = load_manifest(output_path)
+    settings_hash = settings_digest(settings)
+    sources = hash_sources(cycles, {} if full else manifest.get("sources", {}))
+    directory.mkdir(parents=True, exist_ok=True)
+    plan = plan_cycles(cycles, manifest, sources, settings_hash, directory)
+    if full:
+        plan = {cycle: "повне перебудування" for cycle in cycles}
+
+    partitions: Dict[str, Dict] = {}
+    rebuilt: Dict[str, str] = {}
+    for cycle, tables in cycles.items():
+        entry = manifest.get("partitions", {}).get(cycle)
+        if plan[cycle]:
+            print(f"🔁 Цикл {cycle}: {plan[cycle]}, обробка...")
+            processed_df = process_cycle(tables)
+            entry = {"file": _partition_file(cycle), "rows": len(processed_df)}
+            processed_df.to_pickle(directory / entry["file"])
+            rebuilt[cycle] = plan[cycle]
+        else:
+            print(f"⏭️ Цикл {cycle}: джерела не змінилися, розділ з диску")
+        partitions[cycle] = {**entry, "sources": _cycle_sources(tables, sources)}
+
+    removed = [cycle for cycle in manifest.get("partitions", {}) if cycle not in cycles]
+    for cycle in removed:
+        print(f"🗑️ Цикл {cycle} більше не задано, розділ видалено")
+        (directory / manifest["partitions"][cycle]["file"]).unlink(missing_ok=True)
+
+    output_current = (
+        output_path.exists() and manifest.get("output") == _file_stamp(output_path)
+    )
+    assembled = bool(rebuilt or removed or not output_current)
+    if assembled:
+        frames = [pd.read_pickle(directory / partitions[cycle]["file"]) for cycle in cycles]
+        dataset = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        save(dataset, output_path)
+    else:
+        print(f"⏭️ {output_path.name} актуальний, запис пропущено")
+
+    _write_manifest(directory, {
+        "version": MANIFEST_VERSION,
+        "settings": settings_hash,
+        "sources": sources,
+        "partitions": partitions,
+        "output": _file_stamp(output_path),
+    })
+    return {
+        "rebuilt": rebuilt,
+        "skipped": [cycle for cycle in cycles if cycle not in rebuilt],
+        "removed": removed,
+        "assembled": assembled,
+        "rows": sum(entry["rows"] for entry in partitions.values()),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """Рядки підсумку інкрементального ETL для виводу в CLI."""
+    lines = [f"🔁 Перебудовано циклів: {len(report['rebuilt'])}"]
+    lines += [f"   {cycle}: {reason}" for cycle, reason in report["rebuilt"].items()]
+    lines.append(f"⏭️ Пропущено (без змін): {len(report['skipped'])}")
+    lines += [f"   {cycle}" for cycle in report["skipped"]]
+    if report["removed"]:
+        lines.append(f"🗑️ Видалено розділів: {', '.join(report['removed'])}")
+    action = "зібрано з розділів" if report["assembled"] else "без змін"
+    lines.append(f"📄 Датасет ({report['rows']} рядків): {action}")
+    return lines
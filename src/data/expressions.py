@@ -0,0 +1,374 @@
+"""
+Безпечні вирази для похідних ознак і цільових змінних ETL.
+
+Вираз у configs/nhanes.yaml (наприклад, "BMXBMI >= 30 and not isna(LBXGLU)")
+розбирається модулем ast і один раз компілюється у функцію над масивами
+NumPy. Дозволено лише:
+
+- назви колонок, числа, True/False, nan;
+- порівняння, зокрема діапазони (18 <= RIDAGEYR < 65) та належність
+  (DIQ010 in (1, 3));
+- логіку: and, or, not (а також &, |, ~) та "a if умова else b";
+- арифметику: + - * / // % **; ділення на нуль дає nan (для співвідношень);
+- функції з FUNCTIONS: isna, notna, fillna, where, between, abs, log, sqrt,
+  minimum, maximum, clip.
+
+Виклики методів, атрибути, індексація та будь-які інші конструкції
+відхиляються ще під час компіляції, тож вираз не може виконати довільний код.
+
+Пропуски: порівняння з nan дає False, арифметика з nan — nan. Логічний
+результат записується як 0/1 (int64), числовий — як float64.
+"""
+
+import ast
+from dataclasses import dataclass
+from functools import lru_cache, reduce
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BOOL = "bool"
+NUMBER = "number"
+
+Evaluator = Callable[[Mapping[str, np.ndarray]], Any]
+
+
+class ExpressionError(ValueError):
+    """Вираз має синтаксичну помилку або недозволену конструкцію."""
+
+
+def _divide(left, right):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.asarray(right) != 0, np.true_divide(left, right), np.nan)
+
+
+def _floor_divide(left, right):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.asarray(right) != 0, np.floor_divide(left, right), np.nan)
+
+
+def _mod(left, right):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.asarray(right) != 0, np.mod(left, right), np.nan)
+
+
+def _power(left, right):
+    with np.errstate(invalid="ignore", over="ignore"):
+        return np.power(np.asarray(left, dtype=np.float64), right)
+
+
+def _log(value):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.asarray(value) > 0, np.log(value), np.nan)
+
+
+def _sqrt(value):
+    with np.errstate(invalid="ignore"):
+        return np.sqrt(value)
+
+
+def _fillna(value, replacement):
+    return np.where(np.isnan(value), replacement, value)
+
+
+def _between(value, low, high):
+    return (value >= low) & (value <= high)
+
+
+# Назва -> (функція, типи аргументів, тип результату або None — як у аргументів-значень)
+FUNCTIONS: Dict[str, Tuple[Callable, Tuple[str, ...], Optional[str]]] = {
+    "isna": (np.isnan, (NUMBER,), BOOL),
+    "notna": (lambda value: ~np.isnan(value), (NUMBER,), BOOL),
+    "fillna": (_fillna, (NUMBER, NUMBER), NUMBER),
+    "where": (np.where, (BOOL, None, None), None),
+    "between": (_between, (NUMBER, NUMBER, NUMBER), BOOL),
+    "abs": (np.abs, (NUMBER,), NUMBER),
+    "log": (_log, (NUMBER,), NUMBER),
+    "sqrt": (_sqrt, (NUMBER,), NUMBER),
+    "minimum": (np.minimum, (NUMBER, NUMBER), NUMBER),
+    "maximum": (np.maximum, (NUMBER, NUMBER), NUMBER),
+    "clip": (np.clip, (NUMBER, NUMBER, NUMBER), NUMBER),
+}
+CONSTANTS = {"nan": np.nan}
+
+_COMPARISONS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+_ARITHMETIC = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: _divide,
+    ast.FloorDiv: _floor_divide,
+    ast.Mod: _mod,
+    ast.Pow: _power,
+}
+_LOGICAL = {ast.BitAnd: np.logical_and, ast.BitOr: np.logical_or, ast.BitXor: np.logical_xor}
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """Скомпільований вираз: колонки, від яких він залежить, і функція над масивами."""
+
+    source: str
+    columns: Tuple[str, ...]
+    kind: str
+    evaluate_arrays: Evaluator
+
+    def evaluate(self, frame: pd.DataFrame, extra: Optional[Mapping[str, np.ndarray]] = None) -> np.ndarray:
+        """
+        Обчислює вираз для всіх рядків frame.
+
+        Args:
+            frame: Дані з колонками self.columns
+            extra: Уже обчислені колонки, що ще не додані до frame (мають пріоритет)
+
+        Returns:
+            Масив довжини len(frame): int64 (0/1) для логічного виразу, інакше float64
+        """
+        extra = extra or {}
+        arrays = {
+            column: extra[column] if column in extra else numeric_values(frame[column])
+            for column in self.columns
+        }
+        result = np.broadcast_to(self.evaluate_arrays(arrays), (len(frame),))
+        return result.astype(np.int64 if self.kind == BOOL else np.float64)
+
+
+def numeric_values(series: pd.Series) -> np.ndarray:
+    """Значення колонки як float64 (нечислові — nan); для float64 без копії."""
+    if series.dtype == np.float64:
+        return series.to_numpy()
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class _Compiler:
+    def __init__(self, source: str):
+        self.source = source
+        self.columns: List[str] = []
+
+    def fail(self, message: str) -> ExpressionError:
+        return ExpressionError(f"{message} у виразі '{self.source}'")
+
+    def compile(self, node: ast.AST) -> Tuple[Evaluator, str]:
+        handler = getattr(self, f"_{type(node).__name__}", None)
+        if handler is None:
+            return self._reject(node)
+        return handler(node)
+
+    def _reject(self, node: ast.AST):
+        raise self.fail(f"Недозволена конструкція '{type(node).__name__}'")
+
+    def expect(self, node: ast.AST, kind: Optional[str]) -> Tuple[Evaluator, str]:
+        evaluate, actual = self.compile(node)
+        if kind is not None and actual != kind:
+            wanted = "логічне значення" if kind == BOOL else "число"
+            raise self.fail(f"Очікується {wanted}: '{ast.unparse(node)}'")
+        return evaluate, actual
+
+    def _Expression(self, node: ast.Expression):
+        return self.compile(node.body)
+
+    def _Constant(self, node: ast.Constant):
+        value = node.value
+        if isinstance(value, bool):
+            return (lambda arrays: value), BOOL
+        if isinstance(value, (int, float)):
+            number = float(value)
+            return (lambda arrays: number), NUMBER
+        raise self.fail(f"Недозволена константа {value!r}")
+
+    def _Name(self, node: ast.Name):
+        if node.id in CONSTANTS:
+            value = CONSTANTS[node.id]
+            return (lambda arrays: value), NUMBER
+        if node.id in FUNCTIONS:
+            raise self.fail(f"Функцію '{node.id}' потрібно викликати")
+        name = node.id
+        if name not in self.columns:
+            self.columns.append(name)
+        return (lambda arrays: arrays[name]), NUMBER
+
+    def _UnaryOp(self, node: ast.UnaryOp):
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            operand, _ = self.expect(node.operand, BOOL)
+            return (lambda arrays: np.logical_not(operand(arrays))), BOOL
+        operand, _ = self.expect(node.operand, NUMBER)
+        if isinstance(node.op, ast.USub):
+            return (lambda arrays: np.negative(operand(arrays))), NUMBER
+        return operand, NUMBER
+
+    def _BoolOp(self, node: ast.BoolOp):
+        operands = [self.expect(value, BOOL)[0] for value in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return (lambda arrays: reduce(combine, (operand(arrays) for operand in operands))), BOOL
+
+    def _BinOp(self, node: ast.BinOp):
+        if type(node.op) in _LOGICAL:
+            combine = _LOGICAL[type(node.op)]
+            left, _ = self.expect(node.left, BOOL)
+            right, _ = self.expect(node.right, BOOL)
+            return (lambda arrays: combine(left(arrays), right(arrays))), BOOL
+        if type(node.op) not in _ARITHMETIC:
+            return self._reject(node.op)
+        operation = _ARITHMETIC[type(node.op)]
+        left, _ = self.expect(node.left, NUMBER)
+        right, _ = self.expect(node.right, NUMBER)
+        return (lambda arrays: operation(left(arrays), right(arrays))), NUMBER
+
+    def _Compare(self, node: ast.Compare):
+        # a < b <= c — як у Python: (a < b) and (b <= c)
+        if len(node.ops) > 1 and any(isinstance(op, (ast.In, ast.NotIn)) for op in node.ops):
+            raise self.fail("'in' не можна поєднувати в ланцюжок з іншими порівняннями")
+        operands = [self.expect(node.left, NUMBER)[0]]
+        checks = []
+        for index, (operator, comparator) in enumerate(zip(node.ops, node.comparators)):
+            if isinstance(operator, (ast.In, ast.NotIn)):
+                checks.append((index, self._membership(operator, comparator)))
+                operands.append(None)
+                continue
+            if type(operator) not in _COMPARISONS:
+                return self._reject(operator)
+            operands.append(self.expect(comparator, NUMBER)[0])
+            checks.append((index, _COMPARISONS[type(operator)]))
+
+        def evaluate(arrays):
+            values = [operand(arrays) if operand is not None else None for operand in operands]
+            results = [check(values[index], values[index + 1]) for index, check in checks]
+            return reduce(np.logical_and, results)
+
+        return evaluate, BOOL
+
+    def _membership(self, operator: ast.cmpop, node: ast.AST) -> Callable:
+        if not isinstance(node, (ast.Tuple, ast.List, ast.Set)) or not all(
+            isinstance(item, ast.Constant) and isinstance(item.value, (int, float)) and not isinstance(item.value, bool)
+            for item in node.elts
+        ):
+            raise self.fail("Після 'in' очікується перелік чисел")
+        values = np.array([item.value for item in node.elts], dtype=np.float64)
+        invert = isinstance(operator, ast.NotIn)
+        return lambda left, _: np.isin(left, values, invert=invert)
+
+    def _IfExp(self, node: ast.IfExp):
+        condition, _ = self.expect(node.test, BOOL)
+        body, body_kind = self.compile(node.body)
+        orelse, orelse_kind = self.compile(node.orelse)
+        kind = BOOL if body_kind == orelse_kind == BOOL else NUMBER
+        return (lambda arrays: np.where(condition(arrays), body(arrays), orelse(arrays))), kind
+
+    def _Call(self, node: ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise self.fail(f"Невідома функція '{ast.unparse(node.func)}'")
+        if node.keywords:
+            raise self.fail(f"Функція '{node.func.id}' приймає лише позиційні аргументи")
+        function, argument_kinds, result_kind = FUNCTIONS[node.func.id]
+        if len(node.args) != len(argument_kinds):
+            raise self.fail(f"Функція '{node.func.id}' очікує {len(argument_kinds)} аргумент(и)")
+        compiled = [self.expect(argument, kind) for argument, kind in zip(node.args, argument_kinds)]
+        arguments = [evaluate for evaluate, _ in compiled]
+        if result_kind is None:
+            # where(умова, a, b): логічний результат, лише якщо обидві гілки логічні
+            value_kinds = [kind for (_, kind), wanted in zip(compiled, argument_kinds) if wanted is None]
+            result_kind = BOOL if all(kind == BOOL for kind in value_kinds) else NUMBER
+        return (lambda arrays: function(*(argument(arrays) for argument in arguments))), result_kind
+
+
+@lru_cache(maxsize=None)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Компілює вираз у функцію над масивами NumPy (результат кешується за текстом).
+
+    Args:
+        source: Текст виразу, наприклад "BMXBMI >= 30"
+
+    Returns:
+        CompiledExpression з переліком колонок, від яких залежить вираз
+
+    Raises:
+        ExpressionError: синтаксична помилка або недозволена конструкція
+    """
+    try:
+        tree = ast.parse(str(source).strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ExpressionError(f"Синтаксична помилка у виразі '{source}': {exc.msg}") from exc
+    compiler = _Compiler(source)
+    evaluate, kind = compiler.compile(tree)
+    return CompiledExpression(source, tuple(compiler.columns), kind, evaluate)
+
+
+# pandas 2 без copy-on-write копіює дані в concat без copy=False; у pandas 3 ключ застарів
+_CONCAT_NO_COPY: Dict[str, Any] = {"copy": False} if int(pd.__version__.split(".")[0]) < 3 else {}
+
+
+def evaluate_definitions(
+    df: pd.DataFrame,
+    definitions: Mapping[str, str],
+    derived: Optional[Dict[str, Any]] = None,
+    computed: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, Any]:
+    """
+    Обчислює вирази по черзі, не змінюючи df.
+
+    Наступний вираз може посилатися на колонку, визначену попереднім. Якщо
+    вираз посилається на колонку, якої немає, результат — пропуски (pd.NA).
+
+    Args:
+        df: Вхідні дані
+        definitions: Назва нової колонки -> вираз
+        derived: Результати попередніх кроків (доповнюються на місці)
+        computed: Числові масиви попередніх кроків для наступних виразів (доповнюються на місці)
+
+    Returns:
+        derived: назва -> масив значень або pd.NA
+    """
+    derived = {} if derived is None else derived
+    computed = {} if computed is None else computed
+    for name, source in definitions.items():
+        expression = compile_expression(source)
+        available = [
+            column in computed or (column not in derived and column in df.columns)
+            for column in expression.columns
+        ]
+        if all(available):
+            derived[name] = computed[name] = expression.evaluate(df, computed)
+        else:
+            derived[name] = pd.NA
+            computed.pop(name, None)
+    return derived
+
+
+def attach_columns(df: pd.DataFrame, columns: Mapping[str, Any]) -> pd.DataFrame:
+    """
+    Додає колонки одним кроком без копіювання наявних даних (і в pandas 2).
+
+    Колонки з назвами, що вже є в df, замінюються через assign — лише в цьому
+    випадку pandas 2 копіює DataFrame.
+    """
+    if not columns:
+        return df
+    if any(name in df.columns for name in columns):
+        return df.assign(**columns)
+    return pd.concat([df, pd.DataFrame(dict(columns), index=df.index)], axis=1, **_CONCAT_NO_COPY)
+
+
+def derive_columns(df: pd.DataFrame, definitions: Mapping[str, str]) -> pd.DataFrame:
+    """
+    Додає колонки, задані виразами, без копіювання наявних даних.
+
+    Вирази обчислюються по черзі (evaluate_definitions), а результати
+    додаються одним кроком (attach_columns).
+
+    Args:
+        df: Вхідні дані
+        definitions: Назва нової колонки -> вираз
+
+    Returns:
+        DataFrame з доданими колонками (решта колонок спільна з df)
+    """
+    return attach_columns(df, evaluate_definitions(df, definitions))
@@ -1,14 +1,24 @@
 """
 ETL-пайплайн для підготовки фінального датасету NHANES.
+
+Кожен цикл NHANES з RAW_DATA_CYCLES обробляється в окремий розділ;
+повторний запуск обробляє лише нові цикли або цикли зі зміненими сирими
+файлами (src/data/etl_manifest.py).
 """
 
+import argparse
 import math
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List
 
 import pandas as pd
 
+from src.data.dataset_store import write_columnar
+from src.data.etl_manifest import format_report, run_incremental
+from src.data.expressions import derive_columns
+from src.data.table_join import outer_join_on_key
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 RAW_DATA_PATHS: Dict[str, Path] = {
     "demographics": PROJECT_ROOT / "datasets/raw/demographic.csv",
@@ -18,6 +28,10 @@ RAW_DATA_PATHS: Dict[str, Path] = {
     "medications": PROJECT_ROOT / "datasets/raw/medications.csv",
     "questionnaire": PROJECT_ROOT / "datasets/raw/questionnaire.csv",
 }
+# Цикли NHANES: назва циклу -> сирі таблиці (новий цикл додається окремим записом)
+RAW_DATA_CYCLES: Dict[str, Dict[str, Path]] = {
+    "2013-2014": RAW_DATA_PATHS,
+}
 JOIN_KEY = "SEQN"
 FEATURE_COLUMNS: List[str] = [
     "SEQN",
@@ -42,14 +56,19 @@ NUMERIC_COLUMNS: List[str] = [
     "DIQ010",
 ]
 TARGET_COLUMNS = ["obesity_present", "diabetes_present"]
+# Цільові змінні: назва -> вираз (src/data/expressions.py)
+TARGET_FORMULAS: Dict[str, str] = {
+    "obesity_present": "BMXBMI >= 30",
+    "diabetes_present": "DIQ010 == 1",
+}
 OUTPUT_PATH = PROJECT_ROOT / "datasets/processed/health_dataset.csv"
 
 
-def read_raw_tables() -> Dict[str, pd.DataFrame]:
-    """Зчитує сирі таблиці NHANES з усіх джерел."""
+def read_raw_tables(paths: Dict[str, Path] = RAW_DATA_PATHS) -> Dict[str, pd.DataFrame]:
+    """Зчитує сирі таблиці NHANES з усіх джерел (одного циклу)."""
     # Зчитування усіх CSV-файлів з резервним кодуванням
     tables: Dict[str, pd.DataFrame] = {}
-    for name, path in RAW_DATA_PATHS.items():
+    for name, path in paths.items():
         if not path.exists():
             raise FileNotFoundError(f"Не знайдено файл {path} для таблиці '{name}'")
         try:
@@ -61,15 +80,8 @@ def read_raw_tables() -> Dict[str, pd.DataFrame]:
 
 def merge_tables(tables: Dict[str, pd.DataFrame], join_key: str = JOIN_KEY) -> pd.DataFrame:
     """Об'єднує таблиці за спільним ключем SEQN."""
-    # Поетапне об'єднання даних зовнішніми злиттями
-    dataframes = list(tables.values())
-    if not dataframes:
-        return pd.DataFrame()
-
-    merged = dataframes[0]
-    for df in dataframes[1:]:
-        merged = merged.merge(df, on=join_key, how="outer")
-    return merged
+    # Зовнішнє об'єднання всіх таблиць за один прохід (як послідовні merge(how="outer"))
+    return outer_join_on_key(list(tables.values()), join_key)
 
 
 def select_features(df: pd.DataFrame, features: List[str]) -> pd.DataFrame:
@@ -99,28 +111,17 @@ def clean_data(df: pd.DataFrame, join_key: str, numeric_columns: List[str]) -> p
 
 
 def derive_targets(df: pd.DataFrame) -> pd.DataFrame:
-    """Генерує цільові змінні на основі бізнес-правил."""
-    enriched = df.copy()
-
-    # Формування ознаки ожиріння
-    if "BMXBMI" in enriched.columns:
-        enriched["obesity_present"] = enriched["BMXBMI"].ge(30).fillna(False).astype(int)
-    else:
-        enriched["obesity_present"] = pd.NA
-
-    # Формування ознаки діабету
-    if "DIQ010" in enriched.columns:
-        enriched["diabetes_present"] = (enriched["DIQ010"] == 1).fillna(False).astype(int)
-    else:
-        enriched["diabetes_present"] = pd.NA
-
-    return enriched
+    """Генерує цільові змінні на основі бізнес-правил (TARGET_FORMULAS)."""
+    # Відсутня колонка-джерело дає pd.NA; пропуск у джерелі — 0
+    return derive_columns(df, TARGET_FORMULAS)
 
 
 def save_dataset(df: pd.DataFrame, output_path: Path = OUTPUT_PATH) -> None:
     """Зберігає фінальний датасет на диск."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(output_path, index=False, encoding="utf-8")
+    # Типізована колонкова копія для швидкого завантаження (read_dataset)
+    write_columnar(df, output_path)
 
     absolute_path = output_path.resolve()
     rows, cols = df.shape
@@ -129,10 +130,10 @@ def save_dataset(df: pd.DataFrame, output_path: Path = OUTPUT_PATH) -> None:
     )
 
 
-def run_etl() -> None:
-    """Запускає повний процес ETL для NHANES."""
+def process_cycle(paths: Dict[str, Path]) -> pd.DataFrame:
+    """Обробляє сирі таблиці одного циклу NHANES у готовий датасет."""
     # Зчитування даних
-    raw_tables = read_raw_tables()
+    raw_tables = read_raw_tables(paths)
     # Об'єднання таблиць
     merged = merge_tables(raw_tables, JOIN_KEY)
     # Вибір ключових ознак
@@ -140,10 +141,35 @@ def run_etl() -> None:
     # Очищення даних
     cleaned = clean_data(selected, JOIN_KEY, NUMERIC_COLUMNS)
     # Створення цільових ознак
-    enriched = derive_targets(cleaned)
-    # Збереження результату
-    save_dataset(enriched, OUTPUT_PATH)
+    return derive_targets(cleaned)
+
+
+def run_etl(full: bool = False) -> Dict[str, Any]:
+    """
+    Запускає процес ETL для NHANES.
+
+    Обробляються лише нові цикли та цикли, сирі файли яких змінилися
+    (за SHA-256); решта береться з розділів попереднього запуску.
+
+    Args:
+        full: Перебудувати всі цикли незалежно від маніфесту
+
+    Returns:
+        Звіт: перебудовані та пропущені цикли (run_incremental)
+    """
+    settings = {
+        "etl": "src.data.nhanes_etl",
+        "join_key": JOIN_KEY,
+        "features": FEATURE_COLUMNS,
+        "numeric_columns": NUMERIC_COLUMNS,
+        "targets": TARGET_FORMULAS,
+    }
+    return run_incremental(RAW_DATA_CYCLES, process_cycle, save_dataset, OUTPUT_PATH, settings, full=full)
 
 
 if __name__ == "__main__":
-    run_etl()
+    parser = argparse.ArgumentParser(description="ETL набору NHANES")
+    parser.add_argument("--full", action="store_true", help="Перебудувати всі цикли")
+    args = parser.parse_args()
+    for line in format_report(run_etl(full=args.full)):
+        print(line)
@@ -0,0 +1,134 @@
+"""
+Зовнішнє об'єднання кількох таблиць за ключем за один прохід.
+
+Послідовні DataFrame.merge(how="outer") щоразу будують новий, дедалі більший
+проміжний DataFrame. outer_join_on_key натомість один раз обчислює для кожного
+рядка результату номер рядка в кожній таблиці (щільні цілі ключі на кшталт SEQN
+адресуються напряму, без сортування) і збирає кожну колонку результату одним
+take, без проміжних DataFrame.
+
+Результат збігається з послідовним merge: ключі відсортовані, рядки з
+однаковим ключем дають декартів добуток (перша таблиця — старший розряд),
+відсутні значення — NaN з тим самим підвищенням типів. Якщо таблиці мають
+спільні колонки, крім ключа (merge додав би суфікси _x/_y), ключі різних
+типів або пропуски в ключі, виконується звичайний послідовний merge.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Цілі ключі з діапазоном не більше DENSE_KEY_FACTOR × рядків адресуються напряму
+DENSE_KEY_FACTOR = 4
+
+
+def merge_fold(frames: List[pd.DataFrame], join_key: str) -> pd.DataFrame:
+    """Послідовний зовнішній merge (еталонна поведінка)."""
+    merged = frames[0]
+    for frame in frames[1:]:
+        merged = merged.merge(frame, on=join_key, how="outer")
+    return merged
+
+
+def _can_join_by_index(frames: List[pd.DataFrame], join_key: str) -> bool:
+    seen = set()
+    for frame in frames:
+        columns = [column for column in frame.columns if column != join_key]
+        if seen.intersection(columns) or len(set(columns)) != len(columns):
+            return False
+        seen.update(columns)
+    key_dtypes = {frame[join_key].dtype for frame in frames}
+    if len(key_dtypes) != 1 or not pd.api.types.is_numeric_dtype(key_dtypes.pop()):
+        return False
+    return not any(frame[join_key].isna().any() for frame in frames)
+
+
+def _key_codes(keys: List[np.ndarray]) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Відсортоване об'єднання ключів та номер ключа в ньому для кожного рядка."""
+    total = sum(len(table_keys) for table_keys in keys)
+    non_empty = [table_keys for table_keys in keys if len(table_keys)]
+    if non_empty and all(np.issubdtype(table_keys.dtype, np.integer) for table_keys in keys):
+        low = min(int(table_keys.min()) for table_keys in non_empty)
+        span = max(int(table_keys.max()) for table_keys in non_empty) - low + 1
+        # Щільні цілі ключі (SEQN): пряма адресація замість сортування
+        if span <= DENSE_KEY_FACTOR * total:
+            seen = np.zeros(span, dtype=bool)
+            for table_keys in non_empty:
+                seen[table_keys - low] = True
+            lookup = np.cumsum(seen) - 1
+            union = (np.flatnonzero(seen) + low).astype(keys[0].dtype)
+            return union, [lookup[table_keys - low] for table_keys in keys]
+    union = np.unique(np.concatenate(keys))
+    return union, [np.searchsorted(union, table_keys) for table_keys in keys]
+
+
+def outer_join_on_key(frames: List[pd.DataFrame], join_key: str) -> pd.DataFrame:
+    """
+    Зовнішнє об'єднання таблиць за ключем (еквівалент послідовного merge).
+
+    Args:
+        frames: Таблиці, кожна з колонкою join_key
+        join_key: Назва ключа (наприклад, SEQN)
+
+    Returns:
+        Об'єднаний DataFrame з RangeIndex
+    """
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    if not _can_join_by_index(frames, join_key):
+        return merge_fold(frames, join_key)
+
+    keys = [frame[join_key].to_numpy() for frame in frames]
+    union, codes = _key_codes(keys)
+    n_keys = len(union)
+
+    # Рядків на ключ: добуток кількостей рядків з цим ключем у таблицях з дублікатами
+    # (ключ без рядків у таблиці дає один рядок з пропусками)
+    counts = []
+    rows_per_key = np.ones(n_keys, dtype=np.int64)
+    for table_codes in codes:
+        count = np.bincount(table_codes, minlength=n_keys)
+        if len(table_codes) and count.max() > 1:
+            rows_per_key *= np.maximum(count, 1)
+            counts.append(count)
+        else:
+            counts.append(None)
+    if all(count is None for count in counts):
+        key_of_row, offset = None, None
+    else:
+        key_of_row = np.repeat(np.arange(n_keys), rows_per_key)
+        offset = np.arange(len(key_of_row)) - np.repeat(np.cumsum(rows_per_key) - rows_per_key, rows_per_key)
+
+    # Номер рядка результату всередині ключа — число зі змішаною основою, перша таблиця — старший розряд
+    positions = [None] * len(frames)
+    stride = np.ones(n_keys, dtype=np.int64)
+    for index in reversed(range(len(frames))):
+        table_codes, count = codes[index], counts[index]
+        if count is None:
+            # Унікальні ключі: номер рядка за ключем, без сортування
+            row_of_key = np.full(n_keys, -1, dtype=np.int64)
+            row_of_key[table_codes] = np.arange(len(table_codes))
+            positions[index] = row_of_key if key_of_row is None else row_of_key[key_of_row]
+            continue
+        order = np.argsort(table_codes, kind="stable")
+        start = np.cumsum(count) - count
+        factor = np.maximum(count, 1)
+        slot = start[key_of_row] + (offset // stride[key_of_row]) % factor[key_of_row]
+        present = count[key_of_row] > 0
+        positions[index] = np.where(present, order[np.minimum(slot, len(order) - 1)], -1)
+        stride = stride * factor
+
+    # Кожна колонка збирається одним take; позиція -1 дає пропуск, як у merge.
+    # copy=False: колонки стають блоками результату без ще однієї копії.
+    data = {}
+    for index, frame in enumerate(frames):
+        for column in frame.columns:
+            if column == join_key:
+                if index == 0:
+                    data[column] = union if key_of_row is None else union[key_of_row]
+                continue
+            data[column] = pd.api.extensions.take(frame[column].array, positions[index], allow_fill=True)
+    return pd.DataFrame(data, copy=False)
@@ -2,14 +2,32 @@
 Модуль ETL для підготовки набору даних NHANES.
 """
 
+import argparse
+import codecs
+import io
 import math
 import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+import numpy as np
 import pandas as pd
 import yaml
 
+from src.data.dataset_store import columnar_path, write_columnar
+from src.data.etl_manifest import format_report, run_incremental
+from src.data.expressions import (
+    ExpressionError,
+    attach_columns,
+    compile_expression,
+    derive_columns,
+    evaluate_definitions,
+    numeric_values,
+)
+from src.data.table_join import outer_join_on_key
+
 
 def get_project_root() -> Path:
     """Визначає корінь проєкту (директорію з configs/ та datasets/)."""
@@ -27,6 +45,13 @@ PROJECT_ROOT = get_project_root()
 CONFIG_PATH = PROJECT_ROOT / "configs/nhanes.yaml"
 OUTPUT_PATH = PROJECT_ROOT / "datasets/processed/health_dataset.csv"
 
+# Налаштування читання (перевизначаються секцією reading у конфігурації)
+CHUNK_ROWS = 100_000
+ENCODING_SAMPLE_BYTES = 1 << 20
+PARTITION_MB = 64
+DEFAULT_DTYPE = "float64"
+JOIN_KEY_DTYPE = "int64"
+
 
 def load_config(config_path: Path = CONFIG_PATH) -> Dict[str, Any]:
     """Завантажує конфігурацію NHANES з YAML файлу."""
@@ -36,35 +61,215 @@ def load_config(config_path: Path = CONFIG_PATH) -> Dict[str, Any]:
     return config
 
 
-def read_nhanes_tables(config: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
-    """Зчитує сирі таблиці NHANES згідно конфігурації."""
-    # Зчитування CSV-файлів
+def detect_encoding(path: Path, sample_bytes: int = ENCODING_SAMPLE_BYTES) -> str:
+    """Визначає кодування файлу за першими sample_bytes байтами (utf-8, utf-8-sig або latin-1)."""
+    with open(path, "rb") as stream:
+        sample = stream.read(sample_bytes)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # final=False: багатобайтовий символ, обрізаний межею вибірки, не є помилкою
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def _reading_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    reading = config.get("reading") or {}
+    return {
+        "chunk_rows": reading.get("chunk_rows", CHUNK_ROWS),
+        "sample_bytes": reading.get("sample_bytes", ENCODING_SAMPLE_BYTES),
+        "partition_mb": reading.get("partition_mb", PARTITION_MB),
+        "streaming": reading.get("streaming", False),
+    }
+
+
+def required_columns(config: Dict[str, Any]) -> List[str]:
+    """Колонки, які потрібно читати з сирих таблиць: ключ, ознаки та джерела похідних ознак і цілей."""
+    join_key = config.get("join_key", "SEQN")
+    features_config = config.get("features", {})
+    columns = [join_key, *features_config.get("keep", [])]
+    # Похідні ознаки та цілі обчислюються, а не читаються
+    computed = set(features_config.get("derived") or {}) | set(config.get("targets", {}))
+    formulas = list((features_config.get("derived") or {}).values())
+    for target_config in config.get("targets", {}).values():
+        if target_config.get("type") == "from_column" and target_config.get("column"):
+            columns.append(target_config["column"])
+        elif target_config.get("type") == "derived" and target_config.get("formula"):
+            formulas.append(target_config["formula"])
+    for formula in formulas:
+        columns.extend(column for column in compile_expression(formula).columns if column not in computed)
+    return list(dict.fromkeys(columns))
+
+
+def column_dtypes(columns: List[str], config: Dict[str, Any]) -> Dict[str, str]:
+    """Явні типи колонок: ключ — int64, решта — float64, якщо не задано у секції dtypes."""
+    overrides = config.get("dtypes") or {}
+    join_key = config.get("join_key", "SEQN")
+    return {
+        column: overrides.get(column, JOIN_KEY_DTYPE if column == join_key else DEFAULT_DTYPE)
+        for column in columns
+    }
+
+
+def _resolve_paths(local_paths: Dict[str, Any]) -> Dict[str, List[Path]]:
+    paths: Dict[str, List[Path]] = {}
+    for table_name, relative_paths in local_paths.items():
+        if isinstance(relative_paths, str):
+            relative_paths = [relative_paths]
+        paths[table_name] = []
+        for relative_path in relative_paths:
+            table_path = PROJECT_ROOT / Path(relative_path)
+            if not table_path.exists():
+                raise FileNotFoundError(
+                    f"Не вдалося знайти файл для таблиці '{table_name}': {table_path}"
+                )
+            paths[table_name].append(table_path)
+    return paths
+
+
+def cycle_paths(config: Dict[str, Any]) -> Dict[str, Dict[str, List[Path]]]:
+    """
+    Шляхи до файлів таблиць кожного циклу NHANES.
+
+    Секція cycles задає цикл -> таблиця -> шлях(и); без неї local_paths
+    вважається одним циклом з назвою dataset_name.
+    """
+    cycles = config.get("cycles") or {config.get("dataset_name", "nhanes"): config.get("local_paths", {})}
+    return {str(cycle): _resolve_paths(local_paths) for cycle, local_paths in cycles.items()}
+
+
+def table_paths(config: Dict[str, Any]) -> Dict[str, List[Path]]:
+    """
+    Шляхи до файлів кожної таблиці.
+
+    Значення local_paths — шлях або список шляхів (кілька циклів NHANES,
+    які читаються як одна таблиця). Файли таблиці з усіх циклів секції
+    cycles також читаються як одна таблиця.
+    """
+    paths: Dict[str, List[Path]] = {}
+    for tables in cycle_paths(config).values():
+        for table_name, table_files in tables.items():
+            paths.setdefault(table_name, []).extend(table_files)
+    return paths
+
+
+class _FallbackTextStream(io.TextIOBase):
+    """
+    Текстовий потік файлу, що декодує UTF-8, а з першого некоректного байта — latin-1.
+
+    Перемикання відбувається всередині одного проходу за позицією в байтах,
+    тож парсер CSV не перезапускається і не залежить від того, скільки
+    фізичних рядків (порожніх чи всередині лапок) припадає на рядок таблиці.
+    """
+
+    def __init__(self, path: Path, encoding: str) -> None:
+        self.path = path
+        self._encoding = encoding
+        self._raw = open(path, "rb")
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._consumed = 0
+
+    @property
+    def encoding(self) -> str:
+        return self._encoding
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        final = size is None or size < 0
+        data = self._raw.read(-1 if final else size)
+        # Байти, що лишились у декодері (обрізаний символ), стоять у файлі перед data
+        buffered = len(self._decoder.getstate()[0])
+        start = self._consumed - buffered
+        self._consumed += len(data)
+        try:
+            return self._decoder.decode(data, final or not data)
+        except UnicodeDecodeError as e:
+            # e.object — залишок декодера разом з data, e.start — перший некоректний байт у ньому
+            print(f"⚠️ {self.path.name}: не UTF-8 з байта {start + e.start}, решта файлу читається в latin-1")
+            prefix = e.object[:e.start].decode(self._encoding)
+            self._encoding = "latin-1"
+            self._decoder = codecs.getincrementaldecoder("latin-1")()
+            return prefix + e.object[e.start:].decode("latin-1")
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+
+def iter_table_chunks(
+    paths: List[Path],
+    columns: List[str],
+    dtypes: Dict[str, str],
+    chunk_rows: int = CHUNK_ROWS,
+    sample_bytes: int = ENCODING_SAMPLE_BYTES,
+) -> Iterator[pd.DataFrame]:
+    """
+    Читає файли таблиці порціями лише з потрібними колонками.
+
+    Кодування визначається один раз за вибіркою з початку файлу. Якщо
+    некоректні для UTF-8 байти трапляються далі, решта файлу з першого такого
+    байта декодується як latin-1 у тому ж проході (_FallbackTextStream):
+    файл не перечитується, а вже прочитані порції лишаються без змін.
+
+    Yields:
+        Порції з колонками columns, наявними у файлі (у порядку файлу)
+    """
+    for path in paths:
+        encoding = detect_encoding(path, sample_bytes)
+        header = pd.read_csv(path, nrows=0, encoding=encoding).columns
+        usecols = [column for column in header if column in columns]
+        with _FallbackTextStream(path, encoding) as stream:
+            reader = pd.read_csv(
+                stream,
+                usecols=usecols,
+                dtype={column: dtypes[column] for column in usecols},
+                chunksize=chunk_rows,
+            )
+            with reader:
+                yield from reader
+
+
+def read_nhanes_tables(
+    config: Dict[str, Any], paths: Optional[Dict[str, List[Path]]] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Зчитує сирі таблиці NHANES згідно конфігурації.
+
+    paths обмежує читання файлами одного циклу (cycle_paths); None — усі таблиці.
+
+    Читаються лише ключ, ознаки та джерела цільових змінних (required_columns)
+    з явними типами, порціями по reading.chunk_rows рядків. Повні дублікати
+    рядків відкидаються вже в порціях: clean_data однаково їх прибирає, а
+    таблиці на кшталт medications мають багато однакових після проєкції рядків.
+    """
+    settings = _reading_settings(config)
+    columns = required_columns(config)
+    dtypes = column_dtypes(columns, config)
+
     tables: Dict[str, pd.DataFrame] = {}
-    local_paths: Dict[str, str] = config.get("local_paths", {})
-    for table_name, relative_path in local_paths.items():
-        table_path = PROJECT_ROOT / Path(relative_path)
-        if not table_path.exists():
-            raise FileNotFoundError(
-                f"Не вдалося знайти файл для таблиці '{table_name}': {table_path}"
+    for table_name, table_files in (table_paths(config) if paths is None else paths).items():
+        chunks = [
+            chunk.drop_duplicates()
+            for chunk in iter_table_chunks(
+                table_files, columns, dtypes, settings["chunk_rows"], settings["sample_bytes"]
             )
-        try:
-            tables[table_name] = pd.read_csv(table_path, encoding="utf-8")
-        except UnicodeDecodeError:
-            tables[table_name] = pd.read_csv(table_path, encoding="latin-1")
+        ]
+        if not chunks:
+            print(f"⚠️ Таблиця '{table_name}' порожня, її пропущено")
+            continue
+        tables[table_name] = pd.concat(chunks, ignore_index=True).drop_duplicates(ignore_index=True)
     return tables
 
 
 def merge_tables(tables: Dict[str, pd.DataFrame], join_key: str) -> pd.DataFrame:
     """Об'єднує таблиці за спільним ключем."""
-    # Об'єднання за ключем SEQN
+    # Зовнішнє об'єднання за ключем SEQN за один прохід (як послідовні merge(how="outer"))
     dataframes: List[pd.DataFrame] = list(tables.values())
-    if not dataframes:
-        return pd.DataFrame()
-
-    merged_df = dataframes[0]
-    for additional_df in dataframes[1:]:
-        merged_df = merged_df.merge(additional_df, on=join_key, how="outer")
-    return merged_df
+    return outer_join_on_key(dataframes, join_key)
 
 
 def select_features(
@@ -87,77 +292,72 @@ def select_features(
     return df.loc[:, columns_to_keep]
 
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Виконує базове очищення даних."""
+def clean_data(df: pd.DataFrame, subset: Optional[List[str]] = None) -> pd.DataFrame:
+    """Виконує базове очищення даних.
+
+    subset — колонки, за якими шукаються дублікати та рахуються пропуски
+    (за замовчуванням усі колонки).
+    """
     # Прибирання дублікатів
-    clean_df = df.drop_duplicates()
+    clean_df = df.drop_duplicates(subset=subset)
     # Видалення рядків з надмірною кількістю пропусків
     if clean_df.empty:
         return clean_df
 
-    column_count = len(clean_df.columns)
+    column_count = len(subset) if subset is not None else len(clean_df.columns)
     min_non_null = max(1, column_count - math.floor(column_count / 2))
-    clean_df = clean_df.dropna(thresh=min_non_null)
+    clean_df = clean_df.dropna(thresh=min_non_null, subset=subset)
     return clean_df
 
 
-def derive_targets(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
-    """Формує цільові змінні на основі конфігурації."""
-    # Обчислення похідних цілей (наприклад, ожиріння)
-    targets_config = config.get("targets", {})
-    processed_df = df.copy()
+def derive_features(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+    """Додає похідні ознаки з секції features.derived (назва -> вираз, src/data/expressions.py)."""
+    return derive_columns(df, config.get("features", {}).get("derived") or {})
 
-    for target_name, target_config in targets_config.items():
+
+def _evaluate_targets(
+    df: pd.DataFrame, config: Dict[str, Any], derived: Dict[str, Any], computed: Dict[str, np.ndarray]
+) -> Dict[str, Any]:
+    """Обчислює цілі в derived (спільно з похідними ознаками), не змінюючи df."""
+    for target_name, target_config in config.get("targets", {}).items():
         target_type = target_config.get("type")
 
         if target_type == "derived":
             formula = target_config.get("formula", "")
-            tokens = formula.split()
-            if len(tokens) != 3:
-                raise ValueError(
-                    f"Непідтримувана формула для цілі '{target_name}': {formula}"
-                )
-            column_name, operator, value_token = tokens
-
-            if column_name not in processed_df.columns:
-                processed_df[target_name] = pd.NA
-                continue
-
             try:
-                comparison_value = float(value_token)
-                numeric_series = pd.to_numeric(processed_df[column_name], errors="coerce")
-            except ValueError as exc:
-                raise ValueError(
-                    f"Не вдалося обробити значення '{value_token}' у формулі '{formula}'"
-                ) from exc
-
-            if operator == ">=":
-                mask = numeric_series >= comparison_value
-            elif operator == ">":
-                mask = numeric_series > comparison_value
-            elif operator == "<=":
-                mask = numeric_series <= comparison_value
-            elif operator == "<":
-                mask = numeric_series < comparison_value
-            elif operator == "==":
-                mask = numeric_series == comparison_value
-            else:
-                raise ValueError(
-                    f"Непідтримуваний оператор '{operator}' у формулі '{formula}'"
-                )
-
-            processed_df[target_name] = mask.fillna(False).astype(int)
+                evaluate_definitions(df, {target_name: formula}, derived, computed)
+            except ExpressionError as exc:
+                raise ExpressionError(f"Ціль '{target_name}': {exc}") from exc
         elif target_type == "from_column":
             source_column = target_config.get("column")
-            if source_column and source_column in processed_df.columns:
-                processed_df[target_name] = processed_df[source_column]
+            if source_column in derived:
+                values = derived[source_column]
+            elif source_column and source_column in df.columns:
+                values = df[source_column]
+            else:
+                values = pd.NA
+            derived[target_name] = values
+            if source_column in computed:
+                computed[target_name] = computed[source_column]
+            elif values is pd.NA:
+                computed.pop(target_name, None)
             else:
-                processed_df[target_name] = pd.NA
+                computed[target_name] = numeric_values(values)
         else:
             raise ValueError(f"Непідтримуваний тип цільової змінної: {target_type}")
+    return derived
 
-    # Заповнення цілей з наявних колонок
-    return processed_df
+
+def derive_targets(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Формує цільові змінні на основі конфігурації.
+
+    Ціль типу derived задається виразом (formula), який компілюється один раз
+    і обчислюється над колонками; from_column бере значення наявної колонки.
+    Якщо потрібної колонки немає, ціль — pd.NA. Усі цілі додаються одним
+    кроком без копіювання DataFrame.
+    """
+    return attach_columns(df, _evaluate_targets(df, config, {}, {}))
 
 
 def save_processed_dataset(df: pd.DataFrame, output_path: Path = OUTPUT_PATH) -> None:
@@ -168,32 +368,157 @@ def save_processed_dataset(df: pd.DataFrame, output_path: Path = OUTPUT_PATH) ->
     
     # Збереження обробленого набору даних
     df.to_csv(output_path, index=False)
+    # Типізована колонкова копія для швидкого завантаження (read_dataset)
+    write_columnar(df, output_path)
     
     # Повідомлення про успішне збереження
     print(f"Оброблений датасет успішно збережено за шляхом: {output_path}")
 
 
-def run_etl(config_path: Path = CONFIG_PATH) -> None:
-    """Запускає повний цикл ETL для набору NHANES."""
-    # Завантаження конфігурації
-    config = load_config(config_path)
-    # Зчитування сирих таблиць
-    nhanes_tables = read_nhanes_tables(config)
+def transform_tables(tables: Dict[str, pd.DataFrame], config: Dict[str, Any]) -> pd.DataFrame:
+    """Об'єднує таблиці, вибирає ознаки, очищує дані та формує цільові змінні.
+
+    Похідні ознаки та цілі можуть спиратися на колонки поза features.keep:
+    такі колонки лишаються до обчислення виразів і прибираються після нього.
+    Очищення (дублікати, пропуски) враховує лише ключ і ознаки з features.keep.
+    """
+    join_key = config.get("join_key", "SEQN")
     # Об'єднання таблиць
-    merged_df = merge_tables(nhanes_tables, config.get("join_key", "SEQN"))
-    # Вибір ознак
-    selected_df = select_features(
-        merged_df, config.get("features", {}).get("keep", []), config.get("join_key")
-    )
+    merged_df = merge_tables(tables, join_key)
+    # Вибір ознак разом з джерелами виразів
+    kept = list(select_features(merged_df, config.get("features", {}).get("keep", []), join_key).columns)
+    selected_df = select_features(merged_df, required_columns(config), join_key)
     # Очищення даних
-    cleaned_df = clean_data(selected_df)
-    # Формування цільових змінних
-    enriched_df = derive_targets(cleaned_df, config)
-    # Збереження результату
-    save_processed_dataset(enriched_df, OUTPUT_PATH)
+    cleaned_df = clean_data(selected_df, subset=kept)
+    # Похідні ознаки та цільові змінні: обчислюються над усіма джерелами, а додаються
+    # одним кроком до колонок з features.keep (єдина копія — вибір цих колонок)
+    derived: Dict[str, Any] = {}
+    computed: Dict[str, np.ndarray] = {}
+    evaluate_definitions(cleaned_df, config.get("features", {}).get("derived") or {}, derived, computed)
+    _evaluate_targets(cleaned_df, config, derived, computed)
+    output_columns = [column for column in cleaned_df.columns if column in kept]
+    base_df = cleaned_df if len(output_columns) == len(cleaned_df.columns) else cleaned_df[output_columns]
+    return attach_columns(base_df, derived)
+
+
+def run_etl_streaming(config: Dict[str, Any], output_path: Path = OUTPUT_PATH) -> int:
+    """
+    Потоковий ETL з обмеженою пам'яттю незалежно від розміру вхідних даних.
+
+    Порції таблиць розкладаються на диску за хешем ключа на розділи (приблизно
+    reading.partition_mb сирих даних на розділ); далі розділи обробляються по
+    одному — усі рядки одного ключа потрапляють в один розділ, тож об'єднання,
+    прибирання дублікатів і цілі такі самі, як у run_etl. У пам'яті одночасно
+    лише одна порція або один розділ. Рядки впорядковані за розділами.
+
+    Колонкова копія не створюється (для неї потрібен увесь датасет у пам'яті):
+    read_dataset читатиме CSV, а копію можна створити окремо.
+
+    Returns:
+        Кількість записаних рядків
+    """
+    settings = _reading_settings(config)
+    join_key = config.get("join_key", "SEQN")
+    columns = required_columns(config)
+    dtypes = column_dtypes(columns, config)
+    paths = table_paths(config)
+    total_bytes = sum(path.stat().st_size for table in paths.values() for path in table)
+    partitions = max(1, math.ceil(total_bytes / (settings["partition_mb"] * 2**20)))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = output_path.with_name(output_path.name + ".tmp")
+    rows = 0
+    with tempfile.TemporaryDirectory(prefix="nhanes_etl_") as spill:
+        spill_dir = Path(spill)
+        schemas: Dict[str, pd.DataFrame] = {}
+        for table_name, table_files in paths.items():
+            chunks = iter_table_chunks(
+                table_files, columns, dtypes, settings["chunk_rows"], settings["sample_bytes"]
+            )
+            for index, chunk in enumerate(chunks):
+                chunk = chunk.drop_duplicates()
+                schemas.setdefault(table_name, chunk.iloc[:0])
+                buckets = pd.util.hash_pandas_object(chunk[join_key], index=False) % partitions
+                for partition, part in chunk.groupby(buckets.to_numpy()):
+                    part.to_pickle(spill_dir / f"{table_name}.{partition}.{index}.pkl")
+
+        for partition in range(partitions):
+            tables = {}
+            for table_name, schema in schemas.items():
+                parts = [pd.read_pickle(path) for path in sorted(spill_dir.glob(f"{table_name}.{partition}.*.pkl"))]
+                tables[table_name] = pd.concat(parts, ignore_index=True) if parts else schema
+            if all(table.empty for table in tables.values()):
+                continue
+            processed_df = transform_tables(tables, config)
+            processed_df.to_csv(partial_path, mode="a" if rows else "w", header=not rows, index=False)
+            rows += len(processed_df)
+
+    if not rows:
+        raise ValueError("Потоковий ETL не отримав жодного рядка")
+    partial_path.replace(output_path)
+    # Попередня колонкова копія описує вже інший CSV
+    shutil.rmtree(columnar_path(output_path), ignore_errors=True)
+    print(f"Оброблений датасет ({rows} рядків, розділів: {partitions}) збережено за шляхом: {output_path}")
+    return rows
+
+
+def run_etl(
+    config_path: Path = CONFIG_PATH, streaming: Optional[bool] = None, full: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Запускає цикл ETL для набору NHANES.
+
+    Звичайний режим інкрементальний: кожен цикл обробляється в окремий розділ,
+    і повторно обробляються лише нові цикли або цикли зі зміненими сирими
+    файлами (src/data/etl_manifest.py). Потоковий режим завжди перебудовує
+    весь датасет.
+
+    Args:
+        config_path: Шлях до конфігурації
+        streaming: Потоковий режим (None — reading.streaming з конфігурації)
+        full: Перебудувати всі цикли незалежно від маніфесту
+
+    Returns:
+        Звіт про перебудовані та пропущені цикли (None у потоковому режимі)
+    """
+    # Завантаження конфігурації
+    config = load_config(config_path)
+    if streaming is None:
+        streaming = _reading_settings(config)["streaming"]
+    report = None
+    if streaming:
+        run_etl_streaming(config, OUTPUT_PATH)
+    else:
+        # Налаштування, від яких залежить результат обробки циклу
+        settings = {
+            "etl": "src.health_risk_ai.data.nhanes_etl",
+            **{key: config.get(key) for key in ("join_key", "features", "targets", "dtypes")},
+        }
+        report = run_incremental(
+            cycle_paths(config),
+            # Зчитування сирих таблиць циклу (лише потрібні колонки), об'єднання, очищення та цілі
+            lambda paths: transform_tables(read_nhanes_tables(config, paths), config),
+            save_processed_dataset,
+            OUTPUT_PATH,
+            settings,
+            full=full,
+        )
+        for line in format_report(report):
+            print(line)
     absolute_path = OUTPUT_PATH.resolve()
     print(f"✅ Обробку даних завершено. Файл збережено у {absolute_path}")
+    return report
 
 
 if __name__ == "__main__":
-    run_etl()
+    parser = argparse.ArgumentParser(description="ETL набору NHANES")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH, help="Файл конфігурації")
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        default=None,
+        help="Потоковий режим з обмеженою пам'яттю (розділи за ключем на диску)",
+    )
+    parser.add_argument("--full", action="store_true", help="Перебудувати всі цикли")
+    args = parser.parse_args()
+    run_etl(args.config, streaming=args.streaming, full=args.full)
@@ -16,7 +16,21 @@ from sklearn.metrics import (
     brier_score_loss,
     roc_auc_score,
 )
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from src.data.dataset_store import read_dataset
+from src.models.evaluation import (
+    CALIBRATION_METHODS,
+    OOF_FILE,
+    calibration_scores,
+    evaluate_fold,
+    fold_memory,
+    make_folds,
+    out_of_fold_proba,
+    prepare_folds,
+)
 
 # Налаштування шляхів
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -78,7 +92,7 @@ def load_and_prepare_data(target: str) -> Tuple[pd.DataFrame, pd.Series, List[st
         Кортеж (X_train, X_test, y_train, y_test, available_features)
     """
     print(f"📊 Завантаження даних для {target}...")
-    df = pd.read_csv(DATA_PATH, encoding="utf-8")
+    df = read_dataset(DATA_PATH, BASE_FEATURES + ["LBXGLU", target])
     
     # Перевірка наявності ознак
     available_features = [f for f in BASE_FEATURES if f in df.columns]
@@ -96,7 +110,8 @@ def load_and_prepare_data(target: str) -> Tuple[pd.DataFrame, pd.Series, List[st
     
     print(f"✅ Завантажено {len(df_clean)} рядків з {len(available_features)} ознаками")
     
-    X = df_clean[available_features]
+    # Ті самі типи, що й у train_many.load_and_prepare_data
+    X = df_clean[available_features].astype(np.float64)
     y = df_clean[target]
     
     # Розділення на тренувальну та тестову вибірки
@@ -180,72 +195,84 @@ def plot_calibration_curve(
     plt.close()
 
 
+def champion_oof_proba(
+    pipeline: object, model_dir: Path, X_train: pd.DataFrame, y_train: pd.Series
+) -> np.ndarray:
+    """
+    Out-of-fold ймовірності чемпіона на тренувальній вибірці.
+    
+    Беруться з крос-валідації train_many.py (cv_predictions.npz); якщо їх немає,
+    обчислюються на тих самих фолдах із кешу трансформованих даних.
+    
+    Args:
+        pipeline: Навчена модель (pipeline)
+        model_dir: Каталог артефактів чемпіона
+        X_train: Тренувальні дані
+        y_train: Тренувальні цільові значення
+    
+    Returns:
+        Масив ймовірностей для кожного рядка тренувальної вибірки
+    """
+    oof_path = model_dir / OOF_FILE
+    if oof_path.exists():
+        with np.load(oof_path) as data:
+            oof = data["proba"]
+        if len(oof) == len(y_train) and not np.isnan(oof).any():
+            return oof
+    
+    print("⚠️ Немає out-of-fold передбачень крос-валідації, обчислення на кешованих фолдах...")
+    preprocessor = clone(pipeline.named_steps["preprocessor"])
+    folds = prepare_folds(X_train, y_train, preprocessor, memory=fold_memory(MODELS_DIR.parent / "cache"))
+    results = [evaluate_fold(pipeline.named_steps["model"], fold) for fold in folds]
+    return out_of_fold_proba(results, folds, len(y_train))
+
+
 def calibrate_model(
-    pipeline: object, X_train: pd.DataFrame, y_train: pd.Series, X_val: pd.DataFrame, y_val: pd.Series, methods: list = ["isotonic", "sigmoid"]
-) -> Tuple[object, str]:
+    pipeline: object,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    oof_proba: np.ndarray,
+    methods: List[str] = CALIBRATION_METHODS,
+) -> Tuple[object, str, Dict[str, float]]:
     """
     Калібрує модель за допомогою CalibratedClassifierCV.
     
+    Метод обирається за середнім Brier на фолдах крос-валідації без
+    перенавчання моделі (за out-of-fold ймовірностями); фінальна модель
+    калібрується на тих самих фолдах.
+    
     Args:
         pipeline: Навчена модель (pipeline)
         X_train: Тренувальні дані
         y_train: Тренувальні цільові значення
-        X_val: Валідаційні дані для вибору методу
-        y_val: Валідаційні цільові значення
+        oof_proba: Out-of-fold ймовірності моделі на X_train
         methods: Список методів калібрування для тестування
     
     Returns:
-        Кортеж (калібрована модель, найкращий метод)
+        Кортеж (калібрована модель, найкращий метод, Brier кожного методу)
     """
     # Отримання фінального естиматора з pipeline
     base_estimator = pipeline.named_steps["model"]
     preprocessor = pipeline.named_steps["preprocessor"]
     
-    # Трансформація даних
-    X_train_transformed = preprocessor.transform(X_train)
-    X_val_transformed = preprocessor.transform(X_val)
-    
-    # Тестування методів калібрування
-    best_method = None
-    best_brier = float("inf")
-    best_calibrated = None
+    # Ті самі стратифіковані фолди, що й у крос-валідації train_many.py
+    folds = make_folds(y_train)
+    scores = calibration_scores(oof_proba, y_train, folds, methods)
+    for method, brier in scores.items():
+        print(f"   {method}: Brier на фолдах = {brier:.4f}")
+    best_method = min(scores, key=scores.get)
     
-    for method in methods:
-        try:
-            # Створення каліброваної моделі
-            calibrated = CalibratedClassifierCV(base_estimator, method=method, cv=5, n_jobs=-1)
-            
-            # Навчання каліброваної моделі на тренувальних даних
-            calibrated.fit(X_train_transformed, y_train)
-            
-            # Оцінка на валідаційній вибірці
-            y_proba_cal = calibrated.predict_proba(X_val_transformed)[:, 1]
-            brier = brier_score_loss(y_val, y_proba_cal)
-            
-            if brier < best_brier:
-                best_brier = brier
-                best_method = method
-                best_calibrated = calibrated
-        except Exception as e:
-            print(f"⚠️ Помилка при калібруванні методом {method}: {str(e)}")
-            continue
-    
-    if best_calibrated is None:
-        raise ValueError("Не вдалося створити калібровану модель")
-    
-    # Переобучення найкращої каліброваної моделі на всіх тренувальних даних
-    # Використовуємо cv=3 для переобучення на всіх даних
-    final_calibrated = CalibratedClassifierCV(base_estimator, method=best_method, cv=5, n_jobs=-1)
+    # Калібрування на всіх тренувальних даних з тими самими фолдами
+    X_train_transformed = preprocessor.transform(X_train)
+    final_calibrated = CalibratedClassifierCV(base_estimator, method=best_method, cv=folds, n_jobs=-1)
     final_calibrated.fit(X_train_transformed, y_train)
     
     # Створення нового pipeline з каліброваною моделлю
-    from sklearn.pipeline import Pipeline
-    
     calibrated_pipeline = Pipeline(
         steps=[("preprocessor", preprocessor), ("model", final_calibrated)]
     )
     
-    return calibrated_pipeline, best_method
+    return calibrated_pipeline, best_method, scores
 
 
 def calibrate_champion_for_target(target: str) -> None:
@@ -265,11 +292,6 @@ def calibrate_champion_for_target(target: str) -> None:
     # Завантаження та підготовка даних
     X_train, X_test, y_train, y_test, available_features = load_and_prepare_data(target)
     
-    # Розділення тренувальних даних на train та validation для вибору методу калібрування
-    X_train_cal, X_val_cal, y_train_cal, y_val_cal = train_test_split(
-        X_train, y_train, test_size=0.2, random_state=RANDOM_STATE, stratify=y_train
-    )
-    
     # Оцінка некаліброваної моделі
     print("\n📊 Оцінка некаліброваної моделі:")
     metrics_before, y_proba_before = evaluate_model(
@@ -288,8 +310,9 @@ def calibrate_champion_for_target(target: str) -> None:
     
     # Калібрування моделі
     print("\n🔧 Калібрування моделі...")
-    calibrated_pipeline, best_method = calibrate_model(
-        pipeline, X_train_cal, y_train_cal, X_val_cal, y_val_cal
+    oof_proba = champion_oof_proba(pipeline, target_dir / metadata["model_name"], X_train, y_train)
+    calibrated_pipeline, best_method, method_scores = calibrate_model(
+        pipeline, X_train, y_train, oof_proba
     )
     print(f"➡️ Обраний метод калібрування: {best_method}")
     
@@ -318,6 +341,7 @@ def calibrate_champion_for_target(target: str) -> None:
             "avg_precision": metrics_after["avg_precision"] - metrics_before["avg_precision"],
         },
         "calibration_method": best_method,
+        "calibration_cv_brier": method_scores,
     }
     
     with open(target_dir / "metrics_before_after.json", "w", encoding="utf-8") as f:
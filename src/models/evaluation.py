@@ -0,0 +1,303 @@
+"""
+Спільний рушій оцінювання моделей: стратифікована K-fold крос-валідація
+з кешованими результатами попередньої обробки.
+
+Використовується train_many.py (вибір чемпіона за метриками крос-валідації)
+та calibrate_champions.py (вибір методу калібрування на тих самих фолдах).
+Фолди будуються на тренувальній вибірці, тому тестова вибірка лишається
+відкладеною для фінальної оцінки.
+
+Препроцесор навчається на тренувальній частині кожного фолду один раз:
+трансформовані масиви кешуються на диску через joblib.Memory
+(artifacts/cache/folds) і спільні для всіх моделей та обох скриптів.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Memory
+from scipy import stats
+from sklearn.base import clone
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import (
+    accuracy_score,
+    average_precision_score,
+    brier_score_loss,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+from sklearn.model_selection import StratifiedKFold
+from threadpoolctl import threadpool_limits
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = PROJECT_ROOT / "artifacts/cache"
+
+# Налаштування крос-валідації
+CV_FOLDS = 5
+RANDOM_STATE = 42
+
+# Рівень довірчих інтервалів для середніх метрик по фолдах
+CONFIDENCE_LEVEL = 0.95
+
+# Метрики, для яких у лідерборд пишуться середнє, стандартне відхилення та інтервал
+CV_SUMMARY_METRICS = ["roc_auc", "avg_precision", "brier"]
+
+CALIBRATION_METHODS = ["isotonic", "sigmoid"]
+
+# Артефакти крос-валідації в каталозі моделі artifacts/models/<target>/<model>/
+CV_METRICS_FILE = "cv_metrics.json"
+OOF_FILE = "cv_predictions.npz"
+
+
+def get_predict_proba(model, X: np.ndarray) -> np.ndarray:
+    """
+    Отримує ймовірності передбачень від моделі.
+
+    Args:
+        model: Навчена модель
+        X: Вхідні дані
+
+    Returns:
+        Масив ймовірностей передбачень
+    """
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(X)[:, 1]
+    elif hasattr(model, "decision_function"):
+        # Перетворення decision_function на ймовірності через сигмоїду
+        decision = model.decision_function(X)
+        # Нормалізація до діапазону [0, 1]
+        proba = 1 / (1 + np.exp(-decision))
+        return proba
+    else:
+        raise ValueError("Модель не підтримує predict_proba або decision_function")
+
+
+def compute_metrics(y_true: np.ndarray, y_pred: np.ndarray, y_proba: np.ndarray) -> Dict[str, float]:
+    """
+    Обчислює метрики якості моделі.
+
+    Args:
+        y_true: Справжні значення
+        y_pred: Передбачені значення (бінарні)
+        y_proba: Передбачені ймовірності
+
+    Returns:
+        Словник з метриками
+    """
+    metrics = {
+        "roc_auc": roc_auc_score(y_true, y_proba),
+        "avg_precision": average_precision_score(y_true, y_proba),
+        "accuracy": accuracy_score(y_true, y_pred),
+        "precision": precision_score(y_true, y_pred, zero_division=0),
+        "recall": recall_score(y_true, y_pred, zero_division=0),
+        "f1": f1_score(y_true, y_pred, zero_division=0),
+        "brier": brier_score_loss(y_true, y_proba),
+    }
+
+    return metrics
+
+
+def make_folds(
+    y: pd.Series, n_splits: int = CV_FOLDS, random_state: int = RANDOM_STATE
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Будує стратифіковані фолди (позиційні індекси рядків y).
+
+    Args:
+        y: Цільова змінна тренувальної вибірки
+        n_splits: Кількість фолдів
+        random_state: Зерно перемішування
+
+    Returns:
+        Список пар (індекси навчання, індекси валідації)
+    """
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+
+def fold_memory(cache_dir: Optional[Path] = CACHE_DIR) -> Memory:
+    """
+    Кеш трансформованих фолдів на диску (None — без кешу).
+
+    Args:
+        cache_dir: Каталог кешу; фолди зберігаються у його підкаталозі folds
+
+    Returns:
+        joblib.Memory
+    """
+    return Memory(None if cache_dir is None else str(Path(cache_dir) / "folds"), verbose=0)
+
+
+def _transform_fold(
+    preprocessor, X: pd.DataFrame, train_idx: np.ndarray, valid_idx: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Навчає копію препроцесора на тренувальній частині фолду і трансформує обидві частини."""
+    fitted = clone(preprocessor).fit(X.iloc[train_idx])
+    return fitted.transform(X.iloc[train_idx]), fitted.transform(X.iloc[valid_idx])
+
+
+def prepare_folds(
+    X: pd.DataFrame,
+    y: pd.Series,
+    preprocessor,
+    n_splits: int = CV_FOLDS,
+    memory: Optional[Memory] = None,
+) -> List[Dict]:
+    """
+    Готує трансформовані фолди для оцінювання будь-якої кількості моделей.
+
+    Args:
+        X: Ознаки тренувальної вибірки
+        y: Цільова змінна тренувальної вибірки
+        preprocessor: Ненавчений препроцесор
+        n_splits: Кількість фолдів
+        memory: Кеш (fold_memory); None — кеш у каталозі за замовчуванням
+
+    Returns:
+        Список фолдів: словники з index, train_idx, valid_idx, X_train, y_train, X_valid, y_valid
+    """
+    memory = memory if memory is not None else fold_memory()
+    transform = memory.cache(_transform_fold)
+    y_values = np.asarray(y)
+    folds = []
+    for index, (train_idx, valid_idx) in enumerate(make_folds(y, n_splits)):
+        X_train, X_valid = transform(preprocessor, X, train_idx, valid_idx)
+        folds.append({
+            "index": index,
+            "train_idx": train_idx,
+            "valid_idx": valid_idx,
+            "X_train": X_train,
+            "y_train": y_values[train_idx],
+            "X_valid": X_valid,
+            "y_valid": y_values[valid_idx],
+        })
+    return folds
+
+
+def evaluate_fold(model, fold: Dict, threads: int = 1) -> Dict:
+    """
+    Навчає копію моделі на тренувальній частині фолду та оцінює на валідаційній.
+
+    Args:
+        model: Ненавчена модель (без препроцесора — дані фолду вже трансформовані)
+        fold: Фолд з prepare_folds
+        threads: Ліміт потоків (n_jobs моделі та BLAS/OpenMP)
+
+    Returns:
+        Словник з index, metrics та proba (ймовірності для валідаційної частини)
+    """
+    model = clone(model)
+    # n_jobs=None — модель і так однопотокова (у LogisticRegression параметр застарів)
+    if model.get_params(deep=False).get("n_jobs") is not None:
+        model.set_params(n_jobs=threads)
+    with threadpool_limits(limits=threads):
+        model.fit(fold["X_train"], fold["y_train"])
+        y_pred = model.predict(fold["X_valid"])
+        y_proba = get_predict_proba(model, fold["X_valid"])
+    return {
+        "index": fold["index"],
+        "metrics": compute_metrics(fold["y_valid"], y_pred, y_proba),
+        "proba": y_proba,
+    }
+
+
+def summarize_folds(fold_metrics: List[Dict[str, float]], level: float = CONFIDENCE_LEVEL) -> Dict[str, float]:
+    """
+    Середнє, стандартне відхилення та t-інтервал довіри метрик по фолдах.
+
+    Args:
+        fold_metrics: Метрики кожного фолду
+        level: Рівень довіри
+
+    Returns:
+        Словник cv_<метрика>_mean/_std/_ci_low/_ci_high для CV_SUMMARY_METRICS
+    """
+    summary = {}
+    k = len(fold_metrics)
+    quantile = stats.t.ppf((1 + level) / 2, k - 1) if k > 1 else 0.0
+    for metric in CV_SUMMARY_METRICS:
+        values = np.array([fold[metric] for fold in fold_metrics], dtype=float)
+        mean = float(values.mean())
+        std = float(values.std(ddof=1)) if k > 1 else 0.0
+        margin = float(quantile * std / np.sqrt(k))
+        summary[f"cv_{metric}_mean"] = mean
+        summary[f"cv_{metric}_std"] = std
+        summary[f"cv_{metric}_ci_low"] = mean - margin
+        summary[f"cv_{metric}_ci_high"] = mean + margin
+    return summary
+
+
+def out_of_fold_proba(fold_results: List[Dict], folds: List[Dict], n_samples: int) -> np.ndarray:
+    """
+    Збирає ймовірності валідаційних частин фолдів в один масив (out-of-fold).
+
+    Args:
+        fold_results: Результати evaluate_fold
+        folds: Фолди (prepare_folds або make_folds у вигляді словників з valid_idx)
+        n_samples: Розмір тренувальної вибірки
+
+    Returns:
+        Масив ймовірностей для кожного рядка тренувальної вибірки
+    """
+    oof = np.full(n_samples, np.nan)
+    valid = {fold["index"]: fold["valid_idx"] for fold in folds}
+    for result in fold_results:
+        oof[valid[result["index"]]] = result["proba"]
+    return oof
+
+
+def _fit_calibrator(method: str, proba: np.ndarray, y: np.ndarray):
+    if method == "isotonic":
+        return IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip").fit(proba, y)
+    # Platt scaling на логітах ймовірностей
+    return LogisticRegression(C=1e6).fit(_logit(proba), y)
+
+
+def _apply_calibrator(method: str, calibrator, proba: np.ndarray) -> np.ndarray:
+    if method == "isotonic":
+        return calibrator.predict(proba)
+    return calibrator.predict_proba(_logit(proba))[:, 1]
+
+
+def _logit(proba: np.ndarray) -> np.ndarray:
+    clipped = np.clip(proba, 1e-6, 1 - 1e-6)
+    return np.log(clipped / (1 - clipped)).reshape(-1, 1)
+
+
+def calibration_scores(
+    oof_proba: np.ndarray,
+    y: pd.Series,
+    folds: List[Tuple[np.ndarray, np.ndarray]],
+    methods: List[str] = CALIBRATION_METHODS,
+) -> Dict[str, float]:
+    """
+    Оцінює методи калібрування за out-of-fold ймовірностями без перенавчання моделі.
+
+    Для кожного фолду калібратор навчається на out-of-fold ймовірностях решти
+    фолдів і оцінюється (Brier) на валідаційній частині.
+
+    Args:
+        oof_proba: Out-of-fold ймовірності моделі на тренувальній вибірці
+        y: Цільова змінна тренувальної вибірки
+        folds: Ті самі фолди (make_folds), на яких отримано oof_proba
+        methods: Методи калібрування
+
+    Returns:
+        Словник {метод: середній Brier по фолдах}
+    """
+    oof_proba = np.asarray(oof_proba, dtype=float)
+    y_values = np.asarray(y)
+    scores = {}
+    for method in methods:
+        briers = []
+        for train_idx, valid_idx in folds:
+            calibrator = _fit_calibrator(method, oof_proba[train_idx], y_values[train_idx])
+            calibrated = _apply_calibrator(method, calibrator, oof_proba[valid_idx])
+            briers.append(brier_score_loss(y_values[valid_idx], calibrated))
+        scores[method] = float(np.mean(briers))
+    return scores
@@ -2,26 +2,33 @@
 Модуль навчання множини моделей машинного навчання для прогнозування ризиків здоров'я.
 """
 
+import argparse
+import hashlib
+import importlib.metadata
 import json
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import joblib
-import matplotlib.pyplot as plt
+import matplotlib
+
+# Навчання працює без дисплея (сервер, CI, процеси пулу)
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
 import numpy as np
 import pandas as pd
+from sklearn.base import clone
 from sklearn.calibration import calibration_curve
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.inspection import permutation_importance
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import (
-    accuracy_score,
     average_precision_score,
-    brier_score_loss,
-    f1_score,
-    precision_score,
-    recall_score,
     roc_auc_score,
     roc_curve,
     precision_recall_curve,
@@ -34,6 +41,21 @@ from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.impute import SimpleImputer
 from sklearn.svm import SVC
+from threadpoolctl import threadpool_limits
+
+from src.data.dataset_store import read_dataset
+from src.models.evaluation import (
+    CV_FOLDS,
+    CV_METRICS_FILE,
+    OOF_FILE,
+    compute_metrics,
+    evaluate_fold,
+    fold_memory,
+    get_predict_proba,
+    out_of_fold_proba,
+    prepare_folds,
+    summarize_folds,
+)
 
 # Опціональні імпорти для XGBoost та LightGBM
 try:
@@ -66,6 +88,36 @@ BASE_FEATURES = ["RIDAGEYR", "RIAGENDR", "BMXBMI", "BPXSY1", "BPXDI1", "LBXTC"]
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
 
+# Відносна тривалість навчання моделей: у пулі довші навчання запускаються першими
+TRAINING_COST_HINTS = {
+    "SVC": 10,
+    "RandomForest": 4,
+    "XGBoost": 4,
+    "MLP": 3,
+    "LightGBM": 3,
+    "KNN": 1,
+    "LogisticRegression": 1,
+}
+
+# Файл з відбитком даних, ознак, параметрів і версій бібліотек у каталозі кожної моделі
+FINGERPRINT_FILE = "fingerprint.json"
+
+# Найкраща конфігурація пошуку гіперпараметрів (src/models/tuning.py) у каталозі моделі
+TUNED_PARAMS_FILE = "tuned_params.json"
+
+# Бібліотеки, від версій яких залежать навчені моделі та їх серіалізація
+FINGERPRINT_LIBRARIES = ["numpy", "pandas", "scikit-learn", "joblib", "xgboost", "lightgbm"]
+
+# Дані кривих моделі (малюються окремим проходом render_plots)
+CURVES_FILE = "curves.npz"
+
+# Параметри savefig для режимів графіків (--plots); "none" — графіки не малюються.
+# fast: менша роздільність і без bbox_inches="tight", який вимагає додаткового рендерингу
+PLOT_MODES = {
+    "fast": {"dpi": 100},
+    "full": {"dpi": 300, "bbox_inches": "tight"},
+}
+
 # Налаштування графіків
 plt.rcParams["figure.figsize"] = (10, 8)
 plt.rcParams["font.size"] = 10
@@ -86,7 +138,8 @@ def load_and_prepare_data(
         Кортеж (X, y, available_features)
     """
     print(f"📊 Завантаження даних з {data_path}...")
-    df = pd.read_csv(data_path, encoding="utf-8")
+    # Лише потрібні колонки; колонкова копія, якщо ETL її створив (див. dataset_store)
+    df = read_dataset(data_path, features + ["LBXGLU", target])
     
     # Перевірка наявності ознак
     available_features = [f for f in features if f in df.columns]
@@ -109,7 +162,8 @@ def load_and_prepare_data(
     
     print(f"✅ Завантажено {len(df_clean)} рядків з {len(available_features)} ознаками")
     
-    X = df_clean[available_features]
+    # Моделі навчаються у float64 незалежно від зменшених типів сховища
+    X = df_clean[available_features].astype(np.float64)
     y = df_clean[target]
     
     return X, y, available_features
@@ -207,68 +261,102 @@ def get_models() -> Dict[str, object]:
     return models
 
 
-def get_predict_proba(model, X: np.ndarray) -> np.ndarray:
+def with_params(model, params: Dict):
+    """
+    Повертає копію моделі з заданими параметрами.
+    
+    JSON та YAML не мають кортежів, тому списки (наприклад, hidden_layer_sizes)
+    перетворюються на кортежі.
+    
+    Args:
+        model: Ненавчена модель
+        params: Параметри моделі
+    
+    Returns:
+        Ненавчена копія моделі
+    """
+    values = {name: tuple(value) if isinstance(value, list) else value for name, value in params.items()}
+    return clone(model).set_params(**values)
+
+
+def apply_tuned_params(model, model_dir: Path, incomplete_tuning: bool = False):
     """
-    Отримує ймовірності передбачень від моделі.
+    Застосовує до моделі налаштовані гіперпараметри з TUNED_PARAMS_FILE, якщо він є.
+    
+    Результат незавершеного пошуку (complete: false — бюджет вичерпано до
+    останнього раунду) пропускається з попередженням, якщо його не дозволено явно.
     
     Args:
-        model: Навчена модель
-        X: Вхідні дані
+        model: Модель з get_models()
+        model_dir: Каталог артефактів моделі
+        incomplete_tuning: Застосовувати й результат незавершеного пошуку
     
     Returns:
-        Масив ймовірностей передбачень
+        Модель з налаштованими параметрами або та сама модель
     """
-    if hasattr(model, "predict_proba"):
-        return model.predict_proba(X)[:, 1]
-    elif hasattr(model, "decision_function"):
-        # Перетворення decision_function на ймовірності через сигмоїду
-        decision = model.decision_function(X)
-        # Нормалізація до діапазону [0, 1]
-        proba = 1 / (1 + np.exp(-decision))
-        return proba
-    else:
-        raise ValueError("Модель не підтримує predict_proba або decision_function")
+    tuned_path = model_dir / TUNED_PARAMS_FILE
+    if not tuned_path.exists():
+        return model
+    with open(tuned_path, "r", encoding="utf-8") as f:
+        tuned = json.load(f)
+    if not tuned.get("complete", True):
+        if not incomplete_tuning:
+            print(
+                f"⚠️ {tuned_path}: пошук не завершено (раунд {tuned.get('rung')}), параметри не застосовано; "
+                "дозвольте їх через --incomplete-tuning"
+            )
+            return model
+        print(f"⚠️ {tuned_path}: застосовано параметри незавершеного пошуку (раунд {tuned.get('rung')})")
+    return with_params(model, tuned["params"])
 
 
-def compute_metrics(y_true: np.ndarray, y_pred: np.ndarray, y_proba: np.ndarray) -> Dict[str, float]:
+def compute_curves(y_true: np.ndarray, y_proba: np.ndarray) -> Dict[str, np.ndarray]:
     """
-    Обчислює метрики якості моделі.
+    Обчислює дані ROC-, PR- та калібрувальної кривих для збереження у CURVES_FILE.
     
     Args:
         y_true: Справжні значення
-        y_pred: Передбачені значення (бінарні)
         y_proba: Передбачені ймовірності
     
     Returns:
-        Словник з метриками
-    """
-    metrics = {
-        "roc_auc": roc_auc_score(y_true, y_proba),
-        "avg_precision": average_precision_score(y_true, y_proba),
-        "accuracy": accuracy_score(y_true, y_pred),
-        "precision": precision_score(y_true, y_pred, zero_division=0),
-        "recall": recall_score(y_true, y_pred, zero_division=0),
-        "f1": f1_score(y_true, y_pred, zero_division=0),
-        "brier": brier_score_loss(y_true, y_proba),
-    }
+        Словник масивів (float32) та підсумкових значень AUC і AP
+    """
+    fpr, tpr, _ = roc_curve(y_true, y_proba)
+    precision, recall, _ = precision_recall_curve(y_true, y_proba)
+    fraction_of_positives, mean_predicted_value = calibration_curve(y_true, y_proba, n_bins=10)
     
-    return metrics
+    curves = {
+        "fpr": fpr,
+        "tpr": tpr,
+        "precision": precision,
+        "recall": recall,
+        "fraction_of_positives": fraction_of_positives,
+        "mean_predicted_value": mean_predicted_value,
+    }
+    curves = {name: np.asarray(values, dtype=np.float32) for name, values in curves.items()}
+    curves["roc_auc"] = np.float64(roc_auc_score(y_true, y_proba))
+    curves["avg_precision"] = np.float64(average_precision_score(y_true, y_proba))
+    return curves
+
+
+def _save_figure(save_path: Path, mode: str) -> None:
+    """Зберігає поточний графік з роздільністю режиму mode і закриває його."""
+    plt.tight_layout()
+    plt.savefig(save_path, **PLOT_MODES[mode])
+    plt.close()
 
 
-def plot_roc_curve(y_true: np.ndarray, y_proba: np.ndarray, save_path: Path) -> None:
+def plot_roc_curve(curves: Dict[str, np.ndarray], save_path: Path, mode: str = "full") -> None:
     """
     Побудова та збереження ROC-кривої.
     
     Args:
-        y_true: Справжні значення
-        y_proba: Передбачені ймовірності
+        curves: Дані кривих (compute_curves)
         save_path: Шлях для збереження графіка
+        mode: Режим графіків ("fast" або "full")
     """
-    fpr, tpr, _ = roc_curve(y_true, y_proba)
-    roc_auc = roc_auc_score(y_true, y_proba)
-    
     plt.figure(figsize=(8, 6))
-    plt.plot(fpr, tpr, color="darkorange", lw=2, label=f"ROC крива (AUC = {roc_auc:.3f})")
+    plt.plot(curves["fpr"], curves["tpr"], color="darkorange", lw=2, label=f"ROC крива (AUC = {float(curves['roc_auc']):.3f})")
     plt.plot([0, 1], [0, 1], color="navy", lw=2, linestyle="--", label="Випадкова модель")
     plt.xlim([0.0, 1.0])
     plt.ylim([0.0, 1.05])
@@ -277,66 +365,56 @@ def plot_roc_curve(y_true: np.ndarray, y_proba: np.ndarray, save_path: Path) ->
     plt.title("ROC-крива")
     plt.legend(loc="lower right")
     plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches="tight")
-    plt.close()
+    _save_figure(save_path, mode)
 
 
-def plot_pr_curve(y_true: np.ndarray, y_proba: np.ndarray, save_path: Path) -> None:
+def plot_pr_curve(curves: Dict[str, np.ndarray], save_path: Path, mode: str = "full") -> None:
     """
     Побудова та збереження Precision-Recall кривої.
     
     Args:
-        y_true: Справжні значення
-        y_proba: Передбачені ймовірності
+        curves: Дані кривих (compute_curves)
         save_path: Шлях для збереження графіка
+        mode: Режим графіків ("fast" або "full")
     """
-    precision, recall, _ = precision_recall_curve(y_true, y_proba)
-    avg_precision = average_precision_score(y_true, y_proba)
-    
     plt.figure(figsize=(8, 6))
-    plt.plot(recall, precision, color="blue", lw=2, label=f"PR крива (AP = {avg_precision:.3f})")
+    plt.plot(curves["recall"], curves["precision"], color="blue", lw=2, label=f"PR крива (AP = {float(curves['avg_precision']):.3f})")
     plt.xlabel("Повнота (Recall)")
     plt.ylabel("Точність (Precision)")
     plt.title("Precision-Recall крива")
     plt.legend(loc="lower left")
     plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches="tight")
-    plt.close()
+    _save_figure(save_path, mode)
 
 
-def plot_calibration_curve(y_true: np.ndarray, y_proba: np.ndarray, save_path: Path) -> None:
+def plot_calibration_curve(curves: Dict[str, np.ndarray], save_path: Path, mode: str = "full") -> None:
     """
     Побудова та збереження кривої калібрування.
     
     Args:
-        y_true: Справжні значення
-        y_proba: Передбачені ймовірності
+        curves: Дані кривих (compute_curves)
         save_path: Шлях для збереження графіка
+        mode: Режим графіків ("fast" або "full")
     """
-    fraction_of_positives, mean_predicted_value = calibration_curve(y_true, y_proba, n_bins=10)
-    
     plt.figure(figsize=(8, 6))
-    plt.plot(mean_predicted_value, fraction_of_positives, "s-", label="Модель")
+    plt.plot(curves["mean_predicted_value"], curves["fraction_of_positives"], "s-", label="Модель")
     plt.plot([0, 1], [0, 1], "k--", label="Ідеальна калібровка")
     plt.xlabel("Середня передбачена ймовірність")
     plt.ylabel("Частка позитивних")
     plt.title("Крива калібрування")
     plt.legend(loc="upper left")
     plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches="tight")
-    plt.close()
+    _save_figure(save_path, mode)
 
 
-def plot_feature_importance(importances: Dict[str, float], save_path: Path) -> None:
+def plot_feature_importance(importances: Dict[str, float], save_path: Path, mode: str = "full") -> None:
     """
     Побудова та збереження графіка важливості ознак.
     
     Args:
         importances: Словник з назвами ознак та їх важливістю
         save_path: Шлях для збереження графіка
+        mode: Режим графіків ("fast" або "full")
     """
     features = list(importances.keys())
     values = list(importances.values())
@@ -353,9 +431,582 @@ def plot_feature_importance(importances: Dict[str, float], save_path: Path) -> N
     plt.title("Важливість ознак (Permutation Importance)")
     plt.gca().invert_yaxis()
     plt.grid(True, alpha=0.3, axis="x")
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches="tight")
-    plt.close()
+    _save_figure(save_path, mode)
+
+
+# Графіки моделі, що малюються з CURVES_FILE
+CURVE_PLOTS = {
+    "roc.png": plot_roc_curve,
+    "pr.png": plot_pr_curve,
+    "calibration.png": plot_calibration_curve,
+}
+
+
+def _render_job(job: Tuple[str, Path, str]) -> int:
+    """
+    Малює графіки одного джерела даних (виконується і в процесах пулу).
+    
+    Args:
+        job: (вид, файл даних, режим): "curves" — CURVES_FILE моделі,
+            "importance" — champion_importance.json цільової змінної
+    
+    Returns:
+        Кількість збережених зображень
+    """
+    kind, source, mode = job
+    if kind == "importance":
+        with open(source, "r", encoding="utf-8") as f:
+            plot_feature_importance(json.load(f), source.with_suffix(".png"), mode)
+        return 1
+    with np.load(source) as data:
+        curves = {name: data[name] for name in data.files}
+    for name, plot in CURVE_PLOTS.items():
+        plot(curves, source.parent / name, mode)
+    return len(CURVE_PLOTS)
+
+
+def _render_outputs(kind: str, source: Path) -> List[Path]:
+    if kind == "importance":
+        return [source.with_suffix(".png")]
+    return [source.parent / name for name in CURVE_PLOTS]
+
+
+def render_plots(
+    models_dir: Path = MODELS_DIR,
+    mode: str = "full",
+    n_jobs: Optional[int] = None,
+    force: bool = False,
+) -> int:
+    """
+    Малює графіки зі збережених даних кривих окремим паралельним проходом.
+    
+    Перемальовуються лише графіки, яких немає або які старші за свої дані
+    (force=True — усі). Можна запускати окремо від навчання: --plots-only.
+    
+    Args:
+        models_dir: Директорія з артефактами моделей
+        mode: "none" (нічого не малювати), "fast" або "full"
+        n_jobs: Бюджет ядер (див. plan_cpu_budget)
+        force: Перемалювати всі графіки
+    
+    Returns:
+        Кількість збережених зображень
+    """
+    if mode == "none":
+        return 0
+    if mode not in PLOT_MODES:
+        raise ValueError(f"Невідомий режим графіків '{mode}'")
+    
+    sources = [("curves", path) for path in sorted(models_dir.glob(f"*/*/{CURVES_FILE}"))]
+    sources += [("importance", path) for path in sorted(models_dir.glob("*/champion_importance.json"))]
+    jobs = []
+    for kind, source in sources:
+        outputs = _render_outputs(kind, source)
+        stale = force or any(
+            not output.exists() or output.stat().st_mtime < source.stat().st_mtime for output in outputs
+        )
+        if stale:
+            jobs.append((kind, source, mode))
+    
+    workers, _ = plan_cpu_budget(len(jobs), n_jobs)
+    if workers == 1:
+        return sum(_render_job(job) for job in jobs)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return sum(pool.map(_render_job, jobs))
+
+
+def data_fingerprint(X: pd.DataFrame, y: pd.Series) -> str:
+    """
+    Обчислює SHA-256 вмісту ознак і цільової змінної.
+    
+    Args:
+        X: Ознаки
+        y: Цільова змінна
+    
+    Returns:
+        Шістнадцятковий хеш (враховує назви колонок, індекс і значення)
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(column) for column in X.columns], str(y.name)]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+    digest.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def library_versions() -> Dict[str, Optional[str]]:
+    """Версії бібліотек з FINGERPRINT_LIBRARIES (None — не встановлена)."""
+    versions = {}
+    for name in FINGERPRINT_LIBRARIES:
+        try:
+            versions[name] = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def model_fingerprint(
+    model,
+    preprocessor: ColumnTransformer,
+    data_hash: str,
+    features: List[str],
+    versions: Dict[str, Optional[str]],
+) -> Dict:
+    """
+    Будує відбиток навчання однієї моделі.
+    
+    Args:
+        model: Ненавчена модель
+        preprocessor: Ненавчений пайплайн попередньої обробки
+        data_hash: Результат data_fingerprint
+        features: Список ознак
+        versions: Результат library_versions
+    
+    Returns:
+        Словник {"fingerprint": хеш, "components": складові відбитка}
+    """
+    # Параметри, що не є JSON-значеннями (вкладені трансформери тощо), порівнюються за repr
+    params = {
+        "estimator": f"{type(model).__module__}.{type(model).__qualname__}",
+        "model": json.loads(json.dumps(model.get_params(deep=True), sort_keys=True, default=repr)),
+        "preprocessor": json.loads(json.dumps(preprocessor.get_params(deep=True), sort_keys=True, default=repr)),
+    }
+    components = {
+        "data": data_hash,
+        "features": list(features),
+        "split": {"test_size": TEST_SIZE, "random_state": RANDOM_STATE, "cv_folds": CV_FOLDS},
+        "params": params,
+        "versions": versions,
+    }
+    canonical = json.dumps(components, sort_keys=True, ensure_ascii=False)
+    return {"fingerprint": hashlib.sha256(canonical.encode("utf-8")).hexdigest(), "components": components}
+
+
+def stale_reasons(model_dir: Path, fingerprint: Dict) -> List[str]:
+    """
+    Визначає, чому артефакти моделі потребують перенавчання.
+    
+    Args:
+        model_dir: Каталог артефактів моделі
+        fingerprint: Поточний відбиток (model_fingerprint)
+    
+    Returns:
+        Змінені складові відбитка ("data", "params", ...), "missing" без артефактів;
+        порожній список — артефакти актуальні
+    """
+    artifacts = ("model.joblib", "metrics.json", CURVES_FILE, CV_METRICS_FILE, OOF_FILE, FINGERPRINT_FILE)
+    required = [model_dir / name for name in artifacts]
+    if not all(path.exists() for path in required):
+        return ["missing"]
+    try:
+        with open(model_dir / FINGERPRINT_FILE, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return ["fingerprint"]
+    if stored.get("fingerprint") == fingerprint["fingerprint"]:
+        return []
+    components = stored.get("components", {})
+    changed = [name for name, value in fingerprint["components"].items() if components.get(name) != value]
+    return changed or ["fingerprint"]
+
+
+def plan_cpu_budget(n_tasks: int, n_jobs: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Розподіляє ядра між паралельними навчаннями.
+    
+    Args:
+        n_tasks: Кількість навчань (цільова змінна × модель)
+        n_jobs: Бюджет ядер (None або -1 — усі ядра машини)
+    
+    Returns:
+        Кортеж (кількість процесів, потоків на одне навчання)
+    """
+    cpus = n_jobs if n_jobs and n_jobs > 0 else (os.cpu_count() or 1)
+    workers = max(1, min(cpus, n_tasks))
+    return workers, max(1, cpus // workers)
+
+
+def fit_and_evaluate(task: Dict) -> Dict:
+    """
+    Навчає одну модель для однієї цільової змінної та зберігає її артефакти.
+    
+    Виконується і в головному процесі, і в процесах пулу, тому приймає та
+    повертає лише об'єкти, що серіалізуються pickle.
+    
+    Args:
+        task: Словник з model_name, model, preprocessor, split (X_train, X_test,
+            y_train, y_test), model_dir та threads (ліміт потоків на навчання)
+    
+    Returns:
+        Словник з навченим пайплайном, метриками, трансформованою тестовою
+        вибіркою та часом навчання у секундах
+    """
+    started = time.perf_counter()
+    X_train, X_test, y_train, y_test = task["split"]
+    threads = task["threads"]
+    
+    model = clone(task["model"])
+    params = model.get_params(deep=False)
+    # Моделі з власним n_jobs=-1 інакше займали б усі ядра в кожному процесі пулу
+    limit_n_jobs = params.get("n_jobs") is not None
+    if limit_n_jobs:
+        model.set_params(n_jobs=threads)
+    pipeline = Pipeline(steps=[("preprocessor", clone(task["preprocessor"])), ("model", model)])
+    
+    # threadpool_limits обмежує також BLAS/OpenMP (MLP, LogisticRegression)
+    with threadpool_limits(limits=threads):
+        pipeline.fit(X_train, y_train)
+        y_pred = pipeline.predict(X_test)
+        
+        # Збереження трансформованих даних для permutation importance
+        X_test_transformed = pipeline.named_steps["preprocessor"].transform(X_test)
+        
+        # Отримання ймовірностей через pipeline
+        try:
+            y_proba = pipeline.predict_proba(X_test)[:, 1]
+        except Exception:
+            # Fallback для моделей без predict_proba
+            y_proba = get_predict_proba(pipeline.named_steps["model"], X_test_transformed)
+    
+    # Збережена модель має ті самі параметри, що й при послідовному навчанні
+    if limit_n_jobs:
+        model.set_params(n_jobs=params["n_jobs"])
+    
+    metrics = compute_metrics(y_test, y_pred, y_proba)
+    
+    # Збереження метрик
+    model_dir = Path(task["model_dir"])
+    model_dir.mkdir(parents=True, exist_ok=True)
+    
+    with open(model_dir / "metrics.json", "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2, ensure_ascii=False)
+    
+    # Дані кривих — графіки малює render_plots окремим проходом
+    np.savez_compressed(model_dir / CURVES_FILE, **compute_curves(y_test, y_proba))
+    
+    # Збереження моделі (відбиток записує run_training після артефактів крос-валідації)
+    joblib.dump(pipeline, model_dir / "model.joblib")
+    
+    return {
+        "pipeline": pipeline,
+        "metrics": metrics,
+        "X_test_transformed": X_test_transformed,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def load_trained(task: Dict) -> Dict:
+    """
+    Завантажує актуальні артефакти моделі замість повторного навчання.
+    
+    Args:
+        task: Завдання навчання (див. fit_and_evaluate)
+    
+    Returns:
+        Словник того ж формату, що й fit_and_evaluate
+    """
+    model_dir = Path(task["model_dir"])
+    pipeline = joblib.load(model_dir / "model.joblib")
+    with open(model_dir / "metrics.json", "r", encoding="utf-8") as f:
+        metrics = json.load(f)
+    with open(model_dir / CV_METRICS_FILE, "r", encoding="utf-8") as f:
+        cv = json.load(f)
+    X_test = task["split"][1]
+    return {
+        "pipeline": pipeline,
+        "metrics": metrics,
+        "cv": cv,
+        "X_test_transformed": pipeline.named_steps["preprocessor"].transform(X_test),
+        "seconds": 0.0,
+    }
+
+
+def _execute(job: Dict) -> Dict:
+    """Виконує одиницю роботи: фінальне навчання моделі ("fit") або один фолд крос-валідації ("fold")."""
+    if job["kind"] == "fold":
+        return evaluate_fold(job["model"], job["fold"], job["threads"])
+    return fit_and_evaluate(job)
+
+
+def _run_tasks(
+    tasks: List[Dict], workers: int, worker=_execute
+) -> Iterator[Tuple[Dict, Optional[Dict], Optional[Exception]]]:
+    """
+    Виконує навчання послідовно (workers=1) або в пулі процесів.
+    
+    Args:
+        tasks: Завдання (з model_name — для порядку в пулі)
+        workers: Кількість процесів
+        worker: Функція рівня модуля, що виконує одне завдання
+    
+    Returns:
+        Ітератор (task, результат або None, помилка або None) у порядку завершення
+    """
+    if workers == 1:
+        for task in tasks:
+            try:
+                yield task, worker(task), None
+            except Exception as e:
+                yield task, None, e
+        return
+    
+    # Найдовші навчання першими, щоб наприкінці пул не чекав на одне SVC
+    ordered = sorted(tasks, key=lambda task: TRAINING_COST_HINTS.get(task["model_name"], 1), reverse=True)
+    # spawn: fork після ініціалізації OpenMP (XGBoost, LightGBM) може зависати
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(worker, task): task for task in ordered}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def _build_tasks(
+    datasets: Dict[str, Tuple[pd.DataFrame, pd.Series, List[str]]],
+    models: Dict[str, object],
+    models_dir: Path,
+    force: bool,
+    incomplete_tuning: bool = False,
+) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    Готує завдання навчання (цільова змінна × модель) та контексти цільових змінних.
+    
+    Кожне завдання містить відбиток навчання та reasons — причини перенавчання
+    (порожній список — артефакти актуальні).
+    
+    Returns:
+        Кортеж (завдання у порядку datasets × models, {цільова змінна: контекст})
+    """
+    tasks = []
+    contexts = {}
+    versions = library_versions()
+    
+    for target, (X, y, available_features) in datasets.items():
+        # Розділення на тренувальну та тестову вибірки
+        split = train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y)
+        print(f"\n📂 {target}: тренувальна вибірка {len(split[0])}, тестова {len(split[1])}")
+        
+        # Визначення типів ознак
+        numeric_features = [f for f in available_features if f != "RIAGENDR"]
+        categorical_features = [f for f in available_features if f == "RIAGENDR"]
+        
+        target_dir = models_dir / target
+        preprocessor = create_preprocessing_pipeline(numeric_features, categorical_features)
+        contexts[target] = {
+            "target_dir": target_dir,
+            "X_train": split[0],
+            "y_train": split[2],
+            "preprocessor": preprocessor,
+            "X_test": split[1],
+            "y_test": split[3],
+            "available_features": available_features,
+            "numeric_features": numeric_features,
+            "categorical_features": categorical_features,
+        }
+        data_hash = data_fingerprint(X, y)
+        for model_name, model in models.items():
+            model_dir = target_dir / model_name
+            # Налаштовані параметри змінюють відбиток, тож модель буде перенавчено
+            model = apply_tuned_params(model, model_dir, incomplete_tuning)
+            fingerprint = model_fingerprint(model, preprocessor, data_hash, available_features, versions)
+            tasks.append({
+                "target": target,
+                "model_name": model_name,
+                "model": model,
+                "preprocessor": preprocessor,
+                "split": split,
+                "model_dir": model_dir,
+                "fingerprint": fingerprint,
+                "reasons": ["force"] if force else stale_reasons(model_dir, fingerprint),
+            })
+    
+    return tasks, contexts
+
+
+def plan_retraining(
+    datasets: Dict[str, Tuple[pd.DataFrame, pd.Series, List[str]]],
+    models: Dict[str, object],
+    force: bool = False,
+    models_dir: Path = MODELS_DIR,
+    incomplete_tuning: bool = False,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Визначає, які моделі буде перенавчено, нічого не навчаючи і не записуючи.
+    
+    incomplete_tuning — як у run_training.
+    
+    Returns:
+        Словник {цільова змінна: {модель: причини перенавчання}}; порожній
+        список причин — модель актуальна і буде пропущена
+    """
+    tasks, _ = _build_tasks(datasets, models, models_dir, force, incomplete_tuning)
+    plan: Dict[str, Dict[str, List[str]]] = {target: {} for target in datasets}
+    for task in tasks:
+        plan[task["target"]][task["model_name"]] = task["reasons"]
+    return plan
+
+
+def run_training(
+    datasets: Dict[str, Tuple[pd.DataFrame, pd.Series, List[str]]],
+    models: Dict[str, object],
+    n_jobs: Optional[int] = None,
+    models_dir: Path = MODELS_DIR,
+    force: bool = False,
+    plots: str = "full",
+    incomplete_tuning: bool = False,
+) -> Dict[str, Dict[str, Dict]]:
+    """
+    Навчає всі моделі для всіх цільових змінних, розподіляючи навчання між процесами.
+    
+    Кожна пара (цільова змінна, модель) — окреме завдання пулу; ядра діляться
+    між процесами через plan_cpu_budget. Лідерборди, чемпіони та артефакти
+    збігаються з послідовним запуском (n_jobs=1): моделі детерміновані
+    (random_state), а результати збираються у порядку models.
+    
+    Моделі, чий відбиток (дані, ознаки, параметри, версії бібліотек) збігається
+    зі збереженим у fingerprint.json, не перенавчаються: їх артефакти
+    завантажуються з диска.
+    
+    Args:
+        datasets: Словник {цільова змінна: (X, y, available_features)}
+        models: Словник з моделями
+        n_jobs: Бюджет ядер (None або -1 — усі ядра, 1 — послідовно в поточному процесі)
+        models_dir: Директорія для артефактів
+        force: Перенавчити всі моделі незалежно від відбитків
+        plots: Режим графіків після навчання ("none", "fast", "full"; див. render_plots)
+        incomplete_tuning: Застосовувати tuned_params.json незавершеного пошуку (див. apply_tuned_params)
+    
+    Returns:
+        Словник {цільова змінна: результати train_model_for_target}
+    """
+    tasks, contexts = _build_tasks(datasets, models, models_dir, force, incomplete_tuning)
+    for context in contexts.values():
+        context["target_dir"].mkdir(parents=True, exist_ok=True)
+    
+    fitted: Dict[Tuple[str, str], Dict] = {}
+    for task in tasks:
+        if task["reasons"]:
+            continue
+        label = f"{task['target']} / {task['model_name']}"
+        try:
+            fitted[(task["target"], task["model_name"])] = load_trained(task)
+            print(f"⏭️ {label}: актуальна, навчання пропущено")
+        except Exception as e:
+            print(f"  ⚠️ Не вдалося завантажити {label} ({str(e)}), модель буде перенавчено")
+            task["reasons"] = ["load"]
+    
+    stale = [task for task in tasks if task["reasons"]]
+    # Старий відбиток прибирається до навчання: перерване чи невдале навчання
+    # не лишає його поруч із частково оновленими артефактами
+    for task in stale:
+        (task["model_dir"] / FINGERPRINT_FILE).unlink(missing_ok=True)
+    
+    # Фолди будуються лише для цільових змінних із застарілими моделями;
+    # трансформовані фолди кешуються на диску й спільні з calibrate_champions.py
+    memory = fold_memory(models_dir.parent / "cache")
+    folds = {
+        target: prepare_folds(
+            contexts[target]["X_train"], contexts[target]["y_train"], contexts[target]["preprocessor"], CV_FOLDS, memory
+        )
+        for target in dict.fromkeys(task["target"] for task in stale)
+    }
+    jobs = []
+    for task in stale:
+        jobs.append({**task, "kind": "fit"})
+        for fold in folds[task["target"]]:
+            jobs.append({
+                "kind": "fold",
+                "target": task["target"],
+                "model_name": task["model_name"],
+                "model": task["model"],
+                "fold": fold,
+            })
+    
+    workers, threads = plan_cpu_budget(len(jobs), n_jobs)
+    for job in jobs:
+        job["threads"] = threads
+    print(
+        f"\n⚙️ Навчань: {len(stale)} × (1 + {CV_FOLDS} фолдів) (актуальних пропущено: {len(tasks) - len(stale)}); "
+        f"процесів: {workers}, потоків на навчання: {threads}"
+    )
+    
+    fold_results: Dict[Tuple[str, str], List[Dict]] = {}
+    failed = set()
+    for job, outcome, error in _run_tasks(jobs, workers):
+        key = (job["target"], job["model_name"])
+        label = f"{job['target']} / {job['model_name']}"
+        if error is not None:
+            if key not in failed:
+                print(f"  ❌ Помилка при навчанні {label}: {str(error)}")
+            failed.add(key)
+            continue
+        if job["kind"] == "fold":
+            fold_results.setdefault(key, []).append(outcome)
+            continue
+        metrics = outcome["metrics"]
+        print(
+            f"🔹 {label}: ROC-AUC {metrics['roc_auc']:.4f}, AP {metrics['avg_precision']:.4f}, "
+            f"F1 {metrics['f1']:.4f} ({outcome['seconds']:.1f} с)"
+        )
+        fitted[key] = outcome
+    
+    # Метрики крос-валідації та out-of-fold ймовірності (для вибору методу калібрування)
+    for task in stale:
+        key = (task["target"], task["model_name"])
+        if key in failed:
+            fitted.pop(key, None)
+            continue
+        if key not in fitted:
+            continue
+        results = sorted(fold_results[key], key=lambda result: result["index"])
+        fold_metrics = [result["metrics"] for result in results]
+        cv = {"folds": fold_metrics, "summary": summarize_folds(fold_metrics)}
+        with open(task["model_dir"] / CV_METRICS_FILE, "w", encoding="utf-8") as f:
+            json.dump(cv, f, indent=2, ensure_ascii=False)
+        oof = out_of_fold_proba(results, folds[task["target"]], len(contexts[task["target"]]["y_train"]))
+        np.savez_compressed(task["model_dir"] / OOF_FILE, proba=oof)
+        fitted[key]["cv"] = cv
+        # Відбиток — останнім: без нього модель лишається застарілою
+        with open(task["model_dir"] / FINGERPRINT_FILE, "w", encoding="utf-8") as f:
+            json.dump(task["fingerprint"], f, indent=2, ensure_ascii=False)
+    
+    retrained_targets = {task["target"] for task in stale}
+    all_results = {}
+    for target, context in contexts.items():
+        print(f"\n{'='*80}")
+        print(f"Результати для цільової змінної: {target}")
+        print(f"{'='*80}")
+        
+        # Порядок моделей як у послідовному запуску — від нього залежить вибір чемпіона при рівних метриках
+        results = {}
+        for model_name in models:
+            outcome = fitted.get((target, model_name))
+            if outcome is None:
+                continue
+            results[model_name] = {
+                "pipeline": outcome["pipeline"],
+                "metrics": outcome["metrics"],
+                "cv": outcome["cv"],
+                "X_test": context["X_test"],
+                "y_test": context["y_test"],
+                "X_test_transformed": outcome["X_test_transformed"],
+            }
+        # Важливість ознак чемпіона детермінована: без перенавчання її не перераховуємо
+        refresh_importance = (
+            target in retrained_targets
+            or not (context["target_dir"] / "champion_importance.json").exists()
+        )
+        all_results[target] = select_champion(target, results, context, refresh_importance)
+    
+    # Графіки — окремим проходом, коли процеси навчання вже звільнили пам'ять
+    started = time.perf_counter()
+    rendered = render_plots(models_dir, plots, n_jobs=n_jobs)
+    if rendered:
+        print(f"\n🖼️ Збережено графіків: {rendered} ({time.perf_counter() - started:.1f} с)")
+    
+    return all_results
 
 
 def train_model_for_target(
@@ -364,6 +1015,10 @@ def train_model_for_target(
     target: str,
     models: Dict[str, object],
     available_features: List[str],
+    n_jobs: Optional[int] = None,
+    models_dir: Path = MODELS_DIR,
+    force: bool = False,
+    plots: str = "full",
 ) -> Dict[str, Dict]:
     """
     Навчає всі моделі для однієї цільової змінної.
@@ -374,122 +1029,69 @@ def train_model_for_target(
         target: Назва цільової змінної
         models: Словник з моделями
         available_features: Список доступних ознак
+        n_jobs: Бюджет ядер (див. run_training)
+        models_dir: Директорія для артефактів
+        force: Перенавчити всі моделі незалежно від відбитків
+        plots: Режим графіків (див. render_plots)
     
     Returns:
         Словник з результатами навчання
     """
-    print(f"\n{'='*80}")
-    print(f"Навчання моделей для цільової змінної: {target}")
-    print(f"{'='*80}")
-    
-    # Розділення на тренувальну та тестову вибірки
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
-    )
-    
-    print(f"Розмір тренувальної вибірки: {len(X_train)}")
-    print(f"Розмір тестової вибірки: {len(X_test)}")
-    
-    # Визначення типів ознак
-    numeric_features = [f for f in available_features if f != "RIAGENDR"]
-    categorical_features = [f for f in available_features if f == "RIAGENDR"]
-    
-    # Створення пайплайну попередньої обробки
-    preprocessor = create_preprocessing_pipeline(numeric_features, categorical_features)
-    
-    # Створення директорії для результатів
-    target_dir = MODELS_DIR / target
-    target_dir.mkdir(parents=True, exist_ok=True)
+    datasets = {target: (X, y, available_features)}
+    return run_training(datasets, models, n_jobs=n_jobs, models_dir=models_dir, force=force, plots=plots)[target]
+
+
+def select_champion(
+    target: str,
+    results: Dict[str, Dict],
+    context: Dict,
+    refresh_importance: bool = True,
+) -> Dict[str, Dict]:
+    """
+    Зберігає лідерборд, метадані чемпіона та важливість його ознак.
     
-    # Результати навчання
-    results = {}
-    leaderboard_data = []
+    Args:
+        target: Назва цільової змінної
+        results: Результати навчання моделей у порядку get_models()
+        context: target_dir, available_features, numeric_features, categorical_features
+        refresh_importance: Перерахувати permutation importance чемпіона
     
-    # Навчання кожної моделі
-    for model_name, model in models.items():
-        print(f"\n🔹 Навчання моделі: {model_name}")
-        
-        try:
-            # Створення повного пайплайну
-            pipeline = Pipeline(steps=[("preprocessor", preprocessor), ("model", model)])
-            
-            # Навчання моделі
-            pipeline.fit(X_train, y_train)
-            
-            # Передбачення на тестовій вибірці
-            y_pred = pipeline.predict(X_test)
-            
-            # Отримання ймовірностей через pipeline
-            try:
-                y_proba = pipeline.predict_proba(X_test)[:, 1]
-            except Exception:
-                # Fallback для моделей без predict_proba
-                X_test_transformed = pipeline.named_steps["preprocessor"].transform(X_test)
-                y_proba = get_predict_proba(pipeline.named_steps["model"], X_test_transformed)
-            
-            # Збереження трансформованих даних для permutation importance
-            X_test_transformed = pipeline.named_steps["preprocessor"].transform(X_test)
-            
-            # Обчислення метрик
-            metrics = compute_metrics(y_test, y_pred, y_proba)
-            
-            print(f"  ROC-AUC: {metrics['roc_auc']:.4f}")
-            print(f"  Average Precision: {metrics['avg_precision']:.4f}")
-            print(f"  F1: {metrics['f1']:.4f}")
-            
-            # Збереження метрик
-            model_dir = target_dir / model_name
-            model_dir.mkdir(parents=True, exist_ok=True)
-            
-            with open(model_dir / "metrics.json", "w", encoding="utf-8") as f:
-                json.dump(metrics, f, indent=2, ensure_ascii=False)
-            
-            # Побудова та збереження графіків
-            plot_roc_curve(y_test, y_proba, model_dir / "roc.png")
-            plot_pr_curve(y_test, y_proba, model_dir / "pr.png")
-            plot_calibration_curve(y_test, y_proba, model_dir / "calibration.png")
-            
-            # Збереження моделі
-            joblib.dump(pipeline, model_dir / "model.joblib")
-            
-            # Додавання до лідерборду
-            leaderboard_data.append(
-                {
-                    "model": model_name,
-                    "roc_auc": metrics["roc_auc"],
-                    "avg_precision": metrics["avg_precision"],
-                    "accuracy": metrics["accuracy"],
-                    "precision": metrics["precision"],
-                    "recall": metrics["recall"],
-                    "f1": metrics["f1"],
-                    "brier": metrics["brier"],
-                }
-            )
-            
-            results[model_name] = {
-                "pipeline": pipeline,
-                "metrics": metrics,
-                "X_test": X_test,
-                "y_test": y_test,
-                "X_test_transformed": X_test_transformed,
-            }
-            
-            print(f"  ✅ Модель збережено у {model_dir}")
-            
-        except Exception as e:
-            print(f"  ❌ Помилка при навчанні {model_name}: {str(e)}")
-            continue
+    Returns:
+        Ті самі results
+    """
+    target_dir = context["target_dir"]
+    available_features = context["available_features"]
+    numeric_features = context["numeric_features"]
+    categorical_features = context["categorical_features"]
+    # Метрики тестової вибірки та підсумок крос-валідації (середнє, std, довірчий інтервал)
+    leaderboard_data = [
+        {"model": model_name, **result["metrics"], **result["cv"]["summary"]}
+        for model_name, result in results.items()
+    ]
     
     # Створення лідерборду
     if leaderboard_data:
         leaderboard = pd.DataFrame(leaderboard_data)
+        # Чемпіон обирається за крос-валідацією на тренувальній вибірці, а не за одним розбиттям
         leaderboard = leaderboard.sort_values(
-            by=["roc_auc", "avg_precision"], ascending=[False, False]
+            by=["cv_roc_auc_mean", "cv_avg_precision_mean"], ascending=[False, False]
         )
         leaderboard.to_csv(target_dir / "leaderboard.csv", index=False)
         
+        # Метрики кожного фолду
+        fold_rows = [
+            {"model": model_name, "fold": index, **fold}
+            for model_name, result in results.items()
+            for index, fold in enumerate(result["cv"]["folds"])
+        ]
+        pd.DataFrame(fold_rows).to_csv(target_dir / "leaderboard_folds.csv", index=False)
+        
         print(f"\n📊 Лідерборд для {target}:")
-        print(leaderboard[["model", "roc_auc", "avg_precision", "f1"]].head(3).to_string(index=False))
+        print(
+            leaderboard[["model", "cv_roc_auc_mean", "cv_roc_auc_ci_low", "cv_roc_auc_ci_high", "roc_auc"]]
+            .head(3)
+            .to_string(index=False)
+        )
         
         # Визначення чемпіона
         champion_row = leaderboard.iloc[0]
@@ -520,7 +1122,7 @@ def train_model_for_target(
         print(f"   Average Precision: {champion_metrics['avg_precision']:.4f}")
         
         # Обчислення важливості ознак для чемпіона
-        if champion_name in results:
+        if champion_name in results and refresh_importance:
             print(f"\n🔍 Обчислення важливості ознак для чемпіона...")
             try:
                 champion_pipeline = results[champion_name]["pipeline"]
@@ -574,9 +1176,6 @@ def train_model_for_target(
                 with open(target_dir / "champion_importance.json", "w", encoding="utf-8") as f:
                     json.dump(importances_dict, f, indent=2, ensure_ascii=False)
                 
-                # Побудова графіка важливості ознак
-                plot_feature_importance(importances_dict, target_dir / "champion_importance.png")
-                
                 print(f"  ✅ Важливість ознак збережено")
                 
             except Exception as e:
@@ -586,31 +1185,92 @@ def train_model_for_target(
     
     return results
 
-
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Головна функція для запуску навчання всіх моделей."""
+    parser = argparse.ArgumentParser(description="Навчання множини моделей для всіх цільових змінних")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Бюджет ядер для навчання (за замовчуванням — усі; 1 — послідовно)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Перенавчити всі моделі, навіть якщо їх артефакти актуальні",
+    )
+    parser.add_argument(
+        "--plots",
+        choices=["none", *PLOT_MODES],
+        default="full",
+        help="Графіки: none — лише дані кривих (curves.npz), fast — швидкі, full — dpi 300",
+    )
+    parser.add_argument(
+        "--plots-only",
+        action="store_true",
+        help="Лише намалювати графіки зі збережених даних, без навчання (з --force — усі)",
+    )
+    parser.add_argument(
+        "--incomplete-tuning",
+        action="store_true",
+        help="Застосовувати tuned_params.json і тоді, коли пошук гіперпараметрів не завершено",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Лише показати, які моделі буде перенавчено",
+    )
+    args = parser.parse_args(argv)
+    
+    if args.plots_only:
+        rendered = render_plots(MODELS_DIR, args.plots, n_jobs=args.jobs, force=args.force)
+        print(f"🖼️ Збережено графіків: {rendered}")
+        return
+    
     print("=" * 80)
     print("ЗАПУСК НАВЧАННЯ МОДЕЛЕЙ МАШИННОГО НАВЧАННЯ")
     print("=" * 80)
     
+    # Завантаження та підготовка даних для кожної цільової змінної
+    datasets = {
+        target: load_and_prepare_data(DATA_PATH, target, BASE_FEATURES)
+        for target in TARGETS
+    }
+    models = get_models()
+    
+    if args.dry_run:
+        plan = plan_retraining(datasets, models, force=args.force, incomplete_tuning=args.incomplete_tuning)
+        stale = 0
+        for target, model_reasons in plan.items():
+            print(f"\n📋 {target}:")
+            for model_name, reasons in model_reasons.items():
+                if reasons:
+                    stale += 1
+                    print(f"   🔁 {model_name}: буде перенавчено ({', '.join(reasons)})")
+                else:
+                    print(f"   ✅ {model_name}: актуальна")
+        total = sum(len(model_reasons) for model_reasons in plan.values())
+        print(f"\nБуде перенавчено {stale} з {total} моделей")
+        return
+    
     # Створення директорії для моделей
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Навчання для кожної цільової змінної
-    all_results = {}
-    models = get_models()
-    
-    for target in TARGETS:
-        # Завантаження та підготовка даних
-        X, y, available_features = load_and_prepare_data(DATA_PATH, target, BASE_FEATURES)
-        
-        # Навчання моделей
-        results = train_model_for_target(X, y, target, models, available_features)
-        all_results[target] = results
+    # Навчання моделей (усі пари цільова змінна × модель разом)
+    started = time.perf_counter()
+    run_training(
+        datasets,
+        models,
+        n_jobs=args.jobs,
+        force=args.force,
+        plots=args.plots,
+        incomplete_tuning=args.incomplete_tuning,
+    )
+    elapsed = time.perf_counter() - started
     
     # Фінальне повідомлення
     print("\n" + "=" * 80)
-    print("✅ Навчання завершено. Лідерборди та чемпіони збережено у artifacts/models/")
+    print(f"✅ Навчання завершено за {elapsed:.1f} с. Лідерборди та чемпіони збережено у artifacts/models/")
     print("=" * 80)
     
     # Виведення шляхів до лідербордів та чемпіонів
@@ -628,4 +1288,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,517 @@
+"""
+Пошук гіперпараметрів методом successive halving.
+
+Простори пошуку задаються у configs/search_spaces.yaml. Кожен раунд оцінює
+кандидатів стратифікованою крос-валідацією на тренувальній вибірці (ті самі
+кешовані фолди, що й у train_many.py) з обмеженим ресурсом — кількістю
+дерев/ітерацій або часткою рядків. До наступного раунду переходить 1/eta
+найкращих за середнім ROC-AUC, а ресурс зростає в eta разів. Бустингові
+моделі навчаються з ранньою зупинкою.
+
+Кожне навчання фолду дописується в журнал trials.jsonl у каталозі моделі,
+тому перерваний пошук продовжується з місця зупинки. Найкраща конфігурація
+експортується у tuned_params.json поряд з артефактами моделі, і train_many.py
+застосовує її під час наступного навчання.
+
+Приклад:
+    python -m src.models.tuning --models RandomForest,XGBoost --jobs 8 --time-budget 3600
+"""
+
+import argparse
+import hashlib
+import json
+import time
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import yaml
+from sklearn.base import clone
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from threadpoolctl import threadpool_limits
+
+from src.models import train_many
+from src.models.evaluation import fold_memory, get_predict_proba, prepare_folds
+from src.models.train_many import (
+    BASE_FEATURES,
+    DATA_PATH,
+    MODELS_DIR,
+    PROJECT_ROOT,
+    RANDOM_STATE,
+    TARGETS,
+    TUNED_PARAMS_FILE,
+    _build_tasks,
+    _run_tasks,
+    data_fingerprint,
+    get_models,
+    library_versions,
+    load_and_prepare_data,
+    model_fingerprint,
+    plan_cpu_budget,
+    with_params,
+)
+
+SEARCH_CONFIG_PATH = PROJECT_ROOT / "configs/search_spaces.yaml"
+
+# Журнал навчань фолдів у каталозі моделі artifacts/models/<target>/<model>/
+TRIALS_FILE = "trials.jsonl"
+
+# Частка тренувальної частини фолду, відкладена для ранньої зупинки
+EARLY_STOPPING_FRACTION = 0.1
+
+
+def load_search_config(config_path: Path = SEARCH_CONFIG_PATH) -> Dict:
+    """Завантажує налаштування пошуку та простори гіперпараметрів з YAML файлу."""
+    with open(config_path, "r", encoding="utf-8") as config_stream:
+        config: Dict = yaml.safe_load(config_stream)
+    return config
+
+
+def resource_levels(resource: Dict, eta: int) -> List[float]:
+    """
+    Обчислює ресурс кожного раунду: min, min·eta, min·eta², ..., max.
+
+    Args:
+        resource: Опис ресурсу з конфігурації (name, min, max)
+        eta: Коефіцієнт відсіювання
+
+    Returns:
+        Список ресурсів раундів (цілі числа для параметрів моделі, частки для samples)
+    """
+    low, high = resource["min"], resource["max"]
+    rounds = int(np.floor(np.log(high / low) / np.log(eta) + 1e-9)) + 1
+    levels = [low * eta ** index for index in range(rounds)]
+    levels[-1] = high
+    if resource["name"] == "samples":
+        return [float(level) for level in levels]
+    return [int(round(level)) for level in levels]
+
+
+def _sample_value(spec: Dict, rng: np.random.Generator):
+    if "choice" in spec:
+        return spec["choice"][int(rng.integers(len(spec["choice"])))]
+    low, high = spec["low"], spec["high"]
+    if spec.get("log"):
+        value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+    else:
+        value = float(rng.uniform(low, high))
+    if spec["type"] == "int":
+        return int(round(value))
+    return float(f"{value:.6g}")
+
+
+def sample_candidates(
+    space: Dict[str, Dict],
+    n_candidates: int,
+    baseline: Optional[Dict] = None,
+    random_state: int = RANDOM_STATE,
+) -> List[Dict]:
+    """
+    Вибирає різні конфігурації з простору пошуку (детерміновано за random_state).
+
+    Args:
+        space: Параметри з конфігурації моделі
+        n_candidates: Кількість кандидатів
+        baseline: Поточна конфігурація — завжди перший кандидат
+        random_state: Зерно генератора
+
+    Returns:
+        Список словників параметрів (значення — JSON-сумісні)
+    """
+    rng = np.random.default_rng(random_state)
+    candidates = [baseline] if baseline is not None else []
+    seen = {json.dumps(candidate, sort_keys=True) for candidate in candidates}
+    # Малий дискретний простір може мати менше конфігурацій, ніж n_candidates
+    for _ in range(n_candidates * 20):
+        if len(candidates) >= n_candidates:
+            break
+        candidate = {name: _sample_value(spec, rng) for name, spec in space.items()}
+        key = json.dumps(candidate, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(candidate)
+    return candidates
+
+
+def _baseline_params(model, space: Dict[str, Dict]) -> Dict:
+    params = model.get_params(deep=False)
+    return {name: list(params[name]) if isinstance(params[name], tuple) else params[name] for name in space}
+
+
+def _configure(model, params: Dict, resource: Dict, level):
+    """Копія моделі з параметрами кандидата та ресурсом раунду (якщо ресурс — параметр моделі)."""
+    if resource["name"] != "samples":
+        params = {**params, resource["name"]: level}
+    return with_params(model, params)
+
+
+def trial_key(model, context: Dict, data_hash: str, level, settings: Dict, versions: Dict) -> str:
+    """
+    Ідентифікатор навчання кандидата в журналі.
+
+    Змінюється разом з параметрами, ресурсом, даними, ознаками, фолдами та
+    версіями бібліотек — застарілі записи журналу не використовуються.
+    """
+    fingerprint = model_fingerprint(
+        model, context["preprocessor"], data_hash, context["available_features"], versions
+    )
+    extra = {
+        "level": level,
+        "cv_folds": settings["cv_folds"],
+        "early_stopping_rounds": settings["early_stopping_rounds"],
+    }
+    canonical = fingerprint["fingerprint"] + json.dumps(extra, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _early_stopping_fit_params(model, X_stop: np.ndarray, y_stop: np.ndarray, rounds: int) -> Dict:
+    if train_many.XGBOOST_AVAILABLE and isinstance(model, train_many.XGBClassifier):
+        model.set_params(early_stopping_rounds=rounds)
+        return {"eval_set": [(X_stop, y_stop)], "verbose": False}
+    if train_many.LIGHTGBM_AVAILABLE and isinstance(model, train_many.LGBMClassifier):
+        import lightgbm
+        return {"eval_set": [(X_stop, y_stop)], "callbacks": [lightgbm.early_stopping(rounds, verbose=False)]}
+    raise ValueError(f"Рання зупинка не підтримується для {type(model).__name__}")
+
+
+def _best_n_estimators(model) -> Optional[int]:
+    # LightGBM рахує ітерації з 1, XGBoost — з 0
+    best = getattr(model, "best_iteration_", None)
+    if best:
+        return int(best)
+    best = getattr(model, "best_iteration", None)
+    if best is not None:
+        return int(best) + 1
+    return None
+
+
+def evaluate_trial(job: Dict) -> Dict:
+    """
+    Навчає кандидата на одному фолді з ресурсом раунду та оцінює ROC-AUC.
+
+    Виконується і в головному процесі, і в процесах пулу.
+
+    Args:
+        job: Словник з model (налаштована копія), fold (prepare_folds), samples
+            (частка рядків), early_stopping (раундів або None) та threads
+
+    Returns:
+        Словник з roc_auc, best_n_estimators (для ранньої зупинки) та seconds
+    """
+    started = time.perf_counter()
+    fold = job["fold"]
+    model = clone(job["model"])
+    X_train, y_train = fold["X_train"], fold["y_train"]
+    if job["samples"] < 1.0:
+        rows, _ = train_test_split(
+            np.arange(len(y_train)), train_size=job["samples"], random_state=RANDOM_STATE, stratify=y_train
+        )
+        X_train, y_train = X_train[rows], y_train[rows]
+
+    if model.get_params(deep=False).get("n_jobs") is not None:
+        model.set_params(n_jobs=job["threads"])
+    fit_params = {}
+    if job["early_stopping"]:
+        X_train, X_stop, y_train, y_stop = train_test_split(
+            X_train, y_train, test_size=EARLY_STOPPING_FRACTION, random_state=RANDOM_STATE, stratify=y_train
+        )
+        fit_params = _early_stopping_fit_params(model, X_stop, y_stop, job["early_stopping"])
+
+    with threadpool_limits(limits=job["threads"]), warnings.catch_warnings():
+        # Ранні раунди з малим max_iter навмисно не доходять до збіжності
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        model.fit(X_train, y_train, **fit_params)
+        y_proba = get_predict_proba(model, fold["X_valid"])
+
+    return {
+        "roc_auc": float(roc_auc_score(fold["y_valid"], y_proba)),
+        "best_n_estimators": _best_n_estimators(model) if job["early_stopping"] else None,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def load_trials(log_path: Path) -> Dict[str, Dict[int, Dict]]:
+    """
+    Читає журнал навчань фолдів.
+
+    Returns:
+        Словник {ідентифікатор кандидата: {номер фолду: запис}}; обірваний
+        останній рядок (перерваний запис) пропускається
+    """
+    trials: Dict[str, Dict[int, Dict]] = {}
+    if not log_path.exists():
+        return trials
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            trials.setdefault(record["trial"], {})[record["fold"]] = record
+    return trials
+
+
+def _round_results(search: Dict, n_folds: int) -> List[Dict]:
+    """Кандидати раунду з усіма фолдами, від найкращого (при рівності — у порядку кандидатів)."""
+    results = []
+    for params, key in search["round"]:
+        records = search["trials"].get(key, {})
+        if key in search["failed"] or len(records) < n_folds:
+            continue
+        ordered = [records[index] for index in sorted(records)]
+        best_n = [record["best_n_estimators"] for record in ordered if record.get("best_n_estimators")]
+        results.append({
+            "params": params,
+            "score": float(np.mean([record["roc_auc"] for record in ordered])),
+            "best_n_estimators": int(round(np.mean(best_n))) if best_n else None,
+        })
+    return sorted(results, key=lambda result: -result["score"])
+
+
+def export_best(search: Dict) -> Optional[Dict]:
+    """
+    Записує найкращу конфігурацію останнього завершеного раунду у TUNED_PARAMS_FILE.
+
+    Ресурс-параметр (кількість дерев/ітерацій) експортується лише після
+    останнього раунду, де він дорівнює max; для ранньої зупинки — середня
+    найкраща кількість ітерацій по фолдах.
+
+    Returns:
+        Записаний словник або None, якщо жоден раунд не завершено
+    """
+    if not search["completed"]:
+        return None
+    last = search["completed"][-1]
+    best = last["results"][0]
+    resource = search["resource"]
+    complete = last["rung"] == len(search["levels"]) - 1
+    params = dict(best["params"])
+    if best["best_n_estimators"]:
+        params[resource["name"]] = best["best_n_estimators"]
+    elif resource["name"] != "samples" and complete:
+        params[resource["name"]] = last["level"]
+
+    tuned = {
+        "model": search["model_name"],
+        "params": params,
+        "cv_roc_auc": best["score"],
+        "rung": last["rung"],
+        "level": last["level"],
+        "complete": complete,
+        "trials": len(search["trials"]),
+    }
+    search["model_dir"].mkdir(parents=True, exist_ok=True)
+    with open(search["model_dir"] / TUNED_PARAMS_FILE, "w", encoding="utf-8") as f:
+        json.dump(tuned, f, indent=2, ensure_ascii=False)
+    return tuned
+
+
+def run_search(
+    datasets: Dict[str, tuple],
+    models: Dict[str, object],
+    config: Dict,
+    n_jobs: Optional[int] = None,
+    models_dir: Path = MODELS_DIR,
+    time_budget: Optional[float] = None,
+    max_fits: Optional[int] = None,
+    fresh: bool = False,
+) -> Dict[str, Dict[str, Dict]]:
+    """
+    Шукає гіперпараметри всіх моделей для всіх цільових змінних.
+
+    Раунди всіх пар (цільова змінна × модель) виконуються разом: навчання
+    фолдів кожного раунду розподіляються між процесами (plan_cpu_budget).
+    Бюджети перевіряються перед кожним раундом; після вичерпання
+    експортується найкращий кандидат останнього завершеного раунду.
+
+    Args:
+        datasets: Словник {цільова змінна: (X, y, available_features)}
+        models: Базові моделі (get_models); моделі без простору пошуку пропускаються
+        config: Конфігурація (load_search_config)
+        n_jobs: Бюджет ядер (None або -1 — усі, 1 — послідовно)
+        models_dir: Директорія артефактів моделей
+        time_budget: Секунд на весь пошук (None — з конфігурації)
+        max_fits: Нових навчань фолдів на весь пошук (None — з конфігурації)
+        fresh: Почати з нуля, видаливши журнали навчань
+
+    Returns:
+        Словник {цільова змінна: {модель: результат export_best}}
+    """
+    settings = config["search"]
+    eta = settings["eta"]
+    n_folds = settings["cv_folds"]
+    time_budget = time_budget if time_budget is not None else settings.get("time_budget")
+    max_fits = max_fits if max_fits is not None else settings.get("max_fits")
+
+    # Ті самі розбиття та препроцесори, що й у train_many.py
+    _, contexts = _build_tasks(datasets, {}, models_dir, force=False)
+    memory = fold_memory(models_dir.parent / "cache")
+    versions = library_versions()
+
+    searches = []
+    for target, context in contexts.items():
+        folds = prepare_folds(context["X_train"], context["y_train"], context["preprocessor"], n_folds, memory)
+        data_hash = data_fingerprint(*datasets[target][:2])
+        for model_name, model in models.items():
+            spec = config["models"].get(model_name)
+            if spec is None:
+                print(f"⏭️ {target} / {model_name}: простір пошуку не задано")
+                continue
+            model_dir = context["target_dir"] / model_name
+            log_path = model_dir / TRIALS_FILE
+            if fresh and log_path.exists():
+                log_path.unlink()
+            searches.append({
+                "index": len(searches),
+                "target": target,
+                "model_name": model_name,
+                "model": model,
+                "context": context,
+                "data_hash": data_hash,
+                "folds": folds,
+                "resource": spec["resource"],
+                "levels": resource_levels(spec["resource"], eta),
+                "early_stopping": settings["early_stopping_rounds"] if spec.get("early_stopping") else None,
+                "model_dir": model_dir,
+                "log_path": log_path,
+                "trials": load_trials(log_path),
+                "failed": set(),
+                "candidates": sample_candidates(
+                    spec["params"], settings["n_candidates"], _baseline_params(model, spec["params"])
+                ),
+                "rung": 0,
+                "completed": [],
+            })
+
+    started = time.monotonic()
+    fits = 0
+    active = list(searches)
+    while active:
+        if time_budget is not None and time.monotonic() - started >= time_budget:
+            print(f"⏱️ Вичерпано бюджет часу ({time_budget} с)")
+            break
+
+        jobs = []
+        for search in active:
+            level = search["levels"][search["rung"]]
+            search["round"] = []
+            for params in search["candidates"]:
+                model = _configure(search["model"], params, search["resource"], level)
+                key = trial_key(model, search["context"], search["data_hash"], level, settings, versions)
+                search["round"].append((params, key))
+                done = search["trials"].get(key, {})
+                for fold in search["folds"]:
+                    if fold["index"] in done:
+                        continue
+                    jobs.append({
+                        "search": search["index"],
+                        "target": search["target"],
+                        "model_name": search["model_name"],
+                        "model": model,
+                        "key": key,
+                        "params": params,
+                        "level": level,
+                        "fold": fold,
+                        "samples": level if search["resource"]["name"] == "samples" else 1.0,
+                        "early_stopping": search["early_stopping"],
+                    })
+
+        if max_fits is not None and fits + len(jobs) > max_fits:
+            print(f"🧮 Вичерпано бюджет навчань ({max_fits}): наступний раунд потребує {len(jobs)}")
+            break
+
+        workers, threads = plan_cpu_budget(len(jobs), n_jobs)
+        for job in jobs:
+            job["threads"] = threads
+        print(
+            f"\n🔎 Раунд: {len(active)} пошуків, навчань фолдів: {len(jobs)} "
+            f"(з журналу: {sum(len(s['round']) for s in active) * n_folds - len(jobs)}); процесів: {workers}"
+        )
+        for job, outcome, error in _run_tasks(jobs, workers, evaluate_trial):
+            search = searches[job["search"]]
+            if error is not None:
+                if job["key"] not in search["failed"]:
+                    print(f"  ❌ {job['target']} / {job['model_name']} {job['params']}: {str(error)}")
+                search["failed"].add(job["key"])
+                continue
+            record = {
+                "trial": job["key"],
+                "params": job["params"],
+                "level": job["level"],
+                "fold": job["fold"]["index"],
+                **outcome,
+            }
+            search["trials"].setdefault(job["key"], {})[record["fold"]] = record
+            search["model_dir"].mkdir(parents=True, exist_ok=True)
+            with open(search["log_path"], "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        fits += len(jobs)
+
+        for search in active:
+            results = _round_results(search, n_folds)
+            if results:
+                level = search["levels"][search["rung"]]
+                search["completed"].append({"rung": search["rung"], "level": level, "results": results})
+                print(
+                    f"  {search['target']} / {search['model_name']}: ресурс {level}, "
+                    f"кандидатів {len(results)}, найкращий ROC-AUC {results[0]['score']:.4f}"
+                )
+            if not results or search["rung"] == len(search["levels"]) - 1:
+                search["done"] = True
+                continue
+            search["candidates"] = [result["params"] for result in results[: max(1, len(results) // eta)]]
+            search["rung"] += 1
+        active = [search for search in active if not search.get("done")]
+
+    exported: Dict[str, Dict[str, Dict]] = {target: {} for target in datasets}
+    for search in searches:
+        tuned = export_best(search)
+        label = f"{search['target']} / {search['model_name']}"
+        if tuned is None:
+            print(f"⚠️ {label}: жоден раунд не завершено, конфігурацію не експортовано")
+            continue
+        exported[search["target"]][search["model_name"]] = tuned
+        status = "" if tuned["complete"] else " (пошук не завершено)"
+        print(f"🏁 {label}: CV ROC-AUC {tuned['cv_roc_auc']:.4f}, {tuned['params']}{status}")
+    return exported
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Головна функція для запуску пошуку гіперпараметрів."""
+    parser = argparse.ArgumentParser(description="Пошук гіперпараметрів моделей методом successive halving")
+    parser.add_argument("--models", default="", help="Моделі через кому (за замовчуванням — усі з простором пошуку)")
+    parser.add_argument("--targets", default="", help="Цільові змінні через кому (за замовчуванням — усі)")
+    parser.add_argument("--jobs", type=int, default=None, help="Бюджет ядер (за замовчуванням — усі; 1 — послідовно)")
+    parser.add_argument("--time-budget", type=float, default=None, help="Секунд на весь пошук")
+    parser.add_argument("--max-fits", type=int, default=None, help="Нових навчань фолдів на весь пошук")
+    parser.add_argument("--config", type=Path, default=SEARCH_CONFIG_PATH, help="Файл просторів пошуку")
+    parser.add_argument("--fresh", action="store_true", help="Ігнорувати журнали попередніх запусків")
+    args = parser.parse_args(argv)
+
+    config = load_search_config(args.config)
+    models = get_models()
+    if args.models:
+        names = [name.strip() for name in args.models.split(",") if name.strip()]
+        models = {name: models[name] for name in names}
+    targets = [name.strip() for name in args.targets.split(",") if name.strip()] or TARGETS
+    datasets = {target: load_and_prepare_data(DATA_PATH, target, BASE_FEATURES) for target in targets}
+
+    started = time.perf_counter()
+    run_search(
+        datasets,
+        models,
+        config,
+        n_jobs=args.jobs,
+        time_budget=args.time_budget,
+        max_fits=args.max_fits,
+        fresh=args.fresh,
+    )
+    print(f"\n✅ Пошук завершено за {time.perf_counter() - started:.1f} с.")
+    print("   Запустіть python -m src.models.train_many, щоб перенавчити моделі з налаштованими параметрами.")
+
+
+if __name__ == "__main__":
+    main()
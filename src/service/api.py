@@ -1,30 +1,43 @@
 """
 FastAPI сервіс для обслуговування каліброваних чемпіонських моделей.
+
+pandas та sklearn імпортуються в ендпоінтах при першому використанні,
+щоб старт воркера не залежав від ML-стеку (див. startup_profile).
 """
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator, Optional
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
 
-import pandas as pd  # type: ignore
 from fastapi import Depends, FastAPI, HTTPException, Query, Request  # type: ignore
 from fastapi.middleware.cors import CORSMiddleware  # type: ignore
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse  # type: ignore
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse  # type: ignore
 from starlette.middleware.base import BaseHTTPMiddleware  # type: ignore
 from starlette.types import ASGIApp  # type: ignore
 from starlette.requests import Request as StarletteRequest  # type: ignore
 from fastapi.staticfiles import StaticFiles  # type: ignore
-from sklearn.inspection import permutation_importance  # type: ignore
-from sklearn.model_selection import train_test_split  # type: ignore
 from sqlmodel import Session  # type: ignore
 
 from src.service.auth_utils import get_current_user
-from src.service.db import get_session, init_db
+from src.service.db import DATABASE_PATH, MAINTENANCE_LOCK_PATH, get_session, init_db
+from src.service.maintenance import maintenance_loop
 from src.service.models import User
 from src.service.routes_auth import router as auth_router
 from src.service.routes_auth import save_history_entry, users_router
+from src.service.routers.analytics import router as analytics_router
 from src.service.routers.assistant import router as assistant_router
 from src.service.routers.chats import router as chats_router
+from src.service.routers.search import router as search_router
+from src.service.services.assistant_llm import close_llm_client
+from src.service import settings
+from src.service.settings import WEB_SHELL_AUTO_RELOAD
+from src.service.startup_profile import startup_profile
+from src.service.web_shell import ShellResponse, SpaShell
 
 from src.service.model_registry import (
     get_feature_schema,
@@ -40,15 +53,51 @@ from src.service.schemas import (
     PredictResponse,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+
+
+def warm_up_models() -> list[str]:
+    """Завантажує чемпіонські моделі в кеш. Повертає цілі, для яких модель знайдено."""
+    loaded = []
+    for target in AVAILABLE_TARGETS:
+        try:
+            load_champion(target, prefer_calibrated=True)
+        except FileNotFoundError:
+            continue
+        loaded.append(target)
+    return loaded
+
+
+def run_startup(warmup: Optional[bool] = None) -> None:
+    """Ініціалізація процесу: БД, міграції та (опційно) прогрів моделей.
+
+    Тривалість кожної фази записується в startup_profile.
+    """
+    init_db()
+    if warmup is None:
+        warmup = settings.MODEL_WARMUP_ON_STARTUP
+    if warmup:
+        with startup_profile.phase("model_warmup"):
+            warm_up_models()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Обробка подій життєвого циклу додатку."""
-    # Startup: ініціалізація БД
-    init_db()
+    # Startup: ініціалізація БД та прогрів моделей
+    run_startup()
+    maintenance = None
+    if settings.DB_MAINTENANCE_INTERVAL > 0:
+        # Задача є в кожному воркері, але обслуговує БД лише власник MAINTENANCE_LOCK_PATH
+        maintenance = asyncio.create_task(
+            maintenance_loop(DATABASE_PATH, settings.DB_MAINTENANCE_INTERVAL, MAINTENANCE_LOCK_PATH)
+        )
     yield
-    # Shutdown: очищення ресурсів (якщо потрібно)
-    # Поки що нічого не робимо при завершенні
+    if maintenance is not None:
+        maintenance.cancel()
+    # Shutdown: закриваємо пул зʼєднань до Ollama
+    await close_llm_client()
 
 
 # Створення FastAPI додатку
@@ -98,9 +147,11 @@ async def serve_reports_page():
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(assistant_router)
+app.include_router(analytics_router)
 # Mount chats API router under /api prefix
 # This ensures clean separation: /chats = HTML, /api/chats = JSON API
 app.include_router(chats_router, prefix="/api")
+app.include_router(search_router, prefix="/api")
 
 # Allowlist of valid routes that should NOT be redirected to /login
 # This list is built from actual routes defined in this project
@@ -128,6 +179,7 @@ ALLOWLISTED_PREFIXES = (
     "/users/",
     "/chats/",  # API endpoints
     "/assistant/",  # API endpoints
+    "/analytics/",  # API endpoints
     "/static/",
     "/app/static/",
 )
@@ -192,11 +244,16 @@ AVATARS_DIR.mkdir(parents=True, exist_ok=True)
 app.mount("/static/avatars", StaticFiles(directory=AVATARS_DIR, html=False), name="avatars_static")
 
 
-def serve_frontend() -> FileResponse:
-    """Повертає єдину HTML-сторінку інтерфейсу."""
-    if not WEB_DIR.exists():
+# Оболонка SPA кешується в памʼяті (identity/gzip/brotli + ETag)
+SPA_SHELL = SpaShell(WEB_DIR, auto_reload=WEB_SHELL_AUTO_RELOAD)
+
+
+def serve_frontend() -> ShellResponse:
+    """Повертає єдину HTML-сторінку інтерфейсу з кешу в памʼяті."""
+    try:
+        return SPA_SHELL.response()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Веб-інтерфейс недоступний")
-    return FileResponse(WEB_DIR / "index.html")
 
 
 @app.get("/app", response_class=HTMLResponse)
@@ -343,7 +400,7 @@ def get_risk_bucket(probability: float) -> str:
 
 
 def calculate_top_factors_simple(
-    pipeline, X: pd.DataFrame, y_proba: float, feature_names: list
+    pipeline, X: "pd.DataFrame", y_proba: float, feature_names: list
 ) -> list[FeatureImpact]:
     """
     Обчислює топ факторів на основі нормалізованих значень ознак.
@@ -360,6 +417,8 @@ def calculate_top_factors_simple(
     Returns:
         Список топ факторів з їх впливом
     """
+    import pandas as pd  # type: ignore
+
     try:
         impacts = []
         
@@ -430,6 +489,18 @@ async def health_check():
     }
 
 
+@app.get("/system/startup")
+async def get_startup_report():
+    """
+    Звіт про запуск поточного процесу.
+    
+    Returns:
+        Тривалість фаз запуску (import, db_init, migrations, model_warmup), мс,
+        та список уже завантажених важких залежностей
+    """
+    return startup_profile.report()
+
+
 @app.get("/system/database/stats")
 async def get_database_stats(session: Session = Depends(get_session)):
     """
@@ -605,6 +676,8 @@ async def predict(
                 data[feat_name] = [None]
                 input_values[feat_name] = None
         
+        import pandas as pd  # type: ignore
+
         X = pd.DataFrame(data)
         
         # Передбачення ймовірності
@@ -713,14 +786,15 @@ async def explain_model(target: str = Query(..., description="Цільова з
         # Завантаження моделі
         pipeline, metadata = load_champion(target, prefer_calibrated=True)
         
-        # Завантаження тестових даних
-        PROJECT_ROOT = Path(__file__).resolve().parents[2]
-        DATA_PATH = PROJECT_ROOT / "datasets/processed/health_dataset.csv"
-        
-        df = pd.read_csv(DATA_PATH, encoding="utf-8")
+        from sklearn.inspection import permutation_importance  # type: ignore
+
+        from src.data.dataset_store import read_dataset
+
+        # Завантаження лише потрібних колонок (колонкова копія, якщо є)
+        feature_schema = get_feature_schema()
+        df = read_dataset(columns=[feat["name"] for feat in feature_schema] + [target])
         
         # Підготовка даних
-        feature_schema = get_feature_schema()
         feature_names = [feat["name"] for feat in feature_schema if feat["name"] in df.columns]
         feature_names = [f for f in feature_names if f != target]
         
@@ -732,7 +806,8 @@ async def explain_model(target: str = Query(..., description="Цільова з
         sample_size = min(256, len(df_clean))
         df_sample = df_clean.sample(n=sample_size, random_state=42)
         
-        X_sample = df_sample[feature_names]
+        # Ті самі типи, що й під час навчання
+        X_sample = df_sample[feature_names].astype("float64")
         y_sample = df_sample[target]
         
         # Трансформація даних
@@ -913,6 +988,9 @@ async def catch_all_route(
     raise HTTPException(status_code=404, detail="Маршрут не знайдено")
 
 
+startup_profile.record("import", _IMPORT_STARTED)
+
+
 if __name__ == "__main__":
     import uvicorn  # type: ignore
     
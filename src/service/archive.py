@@ -0,0 +1,306 @@
+"""
+Архівація давніх записів у помісячні файли SQLite.
+
+- archive_old_rows: переносить записи, старші за межу, з основної БД в архіви
+  невеликими порціями (кожна — окрема коротка транзакція запису)
+- plan_archive: скільки записів кожної таблиці буде перенесено, по місяцях
+- archive_engines: архіви, відкриті лише на читання (для власних запитів)
+- select_with_archives: виконує запит в основній БД, а потім в архівах
+  від новіших місяців до старіших, доки не набереться потрібна кількість рядків
+
+- delete_archived_rows: видаляє з архівів записи, що видаляються через API
+  (прогноз, історія асистента, чат, обліковий запис)
+- archived_rollup_rows: внесок архівних прогнозів в агрегати (для rebuild_rollups)
+- max_archived_ids: найбільші id в архівах (лічильник AUTOINCREMENT, міграція №8)
+
+Архіви лежать поруч з БД у каталозі <назва БД>_archive/ (для data/app.db —
+data/app_archive/2024-01.db) і містять ті самі таблиці без FTS-індексів і тригерів.
+Для читання вони відкриваються лише на читання при першому зверненні.
+
+Архівні таблиці мають AUTOINCREMENT (міграція №8), тому id, перенесені в архів,
+не видаються повторно навіть після спорожнення основної таблиці. Запис
+видаляється з основної БД лише тоді, коли в архіві лежить ідентичний рядок;
+інакше порція відкочується з ArchiveConflictError.
+
+Записи в архівах не змінюються і не потрапляють у повнотекстовий пошук
+(пошук охоплює лише основну БД); популяційні агрегати predictionrollup
+при архівації зберігаються.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, create_engine
+
+from .models import AssistantMessage, ChatMessage, PredictionHistory
+from .services.prediction_rollups import ROLLUP_SELECT, add_to_rollups
+
+# Таблиці, що архівуються (усі мають монотонний id та created_at)
+ARCHIVED_TABLES: Dict[str, Table] = {
+    model.__tablename__: model.__table__
+    for model in (PredictionHistory, AssistantMessage, ChatMessage)
+}
+
+_MONTH_FILE = re.compile(r"^(\d{4})-(\d{2})\.db$")
+
+_readers: Dict[Path, Engine] = {}
+_readers_lock = threading.Lock()
+
+
+class ArchiveConflictError(RuntimeError):
+    """У файлі архіву вже є інший запис з тим самим id — порцію не перенесено."""
+
+
+def archive_dir(engine: Engine) -> Path:
+    """Каталог архівів для БД engine."""
+    database = Path(engine.url.database)
+    return database.with_name(f"{database.stem}_archive")
+
+
+def archive_files(engine: Engine) -> List[Path]:
+    """Файли архівів від старіших місяців до новіших."""
+    directory = archive_dir(engine)
+    if not directory.is_dir():
+        return []
+    return sorted(path for path in directory.iterdir() if _MONTH_FILE.match(path.name))
+
+
+def archive_engines(engine: Engine) -> List[Engine]:
+    """Рушії архівів лише для читання, від старіших місяців до новіших."""
+    return [_reader(path) for path in archive_files(engine)]
+
+
+def _reader(path: Path) -> Engine:
+    with _readers_lock:
+        engine = _readers.get(path)
+        if engine is None:
+            engine = create_engine(
+                f"sqlite:///file:{path.as_posix()}?mode=ro&uri=true",
+                connect_args={"check_same_thread": False},
+            )
+            _readers[path] = engine
+        return engine
+
+
+def select_with_archives(session: Session, statement, limit: Optional[int] = None) -> list:
+    """Виконує select у поточній БД і доповнює результат з архівів.
+
+    Архівні записи старші за будь-який запис основної БД, тому для запитів,
+    упорядкованих від новіших до старіших, результат лишається впорядкованим.
+    Архіви читаються, лише якщо основна БД не дала limit рядків.
+    """
+    rows = list(session.exec(statement if limit is None else statement.limit(limit)))
+    for reader in reversed(archive_engines(session.get_bind())):
+        if limit is not None and len(rows) >= limit:
+            break
+        remaining = statement if limit is None else statement.limit(limit - len(rows))
+        with Session(reader) as archived:
+            rows.extend(archived.exec(remaining))
+    return rows
+
+
+def _ensure_archive(path: Path) -> None:
+    """Створює файл архіву зі схемою архівних таблиць, якщо його ще немає."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{path.as_posix()}")
+    try:
+        with engine.begin() as conn:
+            for table in ARCHIVED_TABLES.values():
+                table.create(bind=conn, checkfirst=True)
+    finally:
+        engine.dispose()
+
+
+def _batch_months(conn: Connection, table: str, cutoff: datetime, batch_size: int) -> Dict[str, List[int]]:
+    """id наступної порції записів, старших за cutoff, згруповані за місяцем created_at."""
+    rows = conn.execute(
+        text(
+            f"SELECT id, strftime('%Y-%m', created_at) FROM {table} "
+            "WHERE created_at < :cutoff ORDER BY id LIMIT :limit"
+        ),
+        {"cutoff": cutoff, "limit": batch_size},
+    ).all()
+    months: Dict[str, List[int]] = defaultdict(list)
+    for row_id, month in rows:
+        months[month].append(row_id)
+    return months
+
+
+def _attach(conn: Connection, path: Path, alias: str) -> None:
+    # ATTACH неможливий всередині транзакції
+    conn.exec_driver_sql(f"ATTACH DATABASE ? AS {alias}", (str(path),))
+
+
+def _move_batch(conn: Connection, table: str, months: Dict[str, List[int]], directory: Path) -> int:
+    """Переносить одну порцію в одній транзакції (архіви та основна БД разом).
+
+    З основної БД видаляються лише записи, ідентична копія яких є в архіві:
+    повторний запуск після збою нічого не дублює, а інший рядок з тим самим id
+    в архіві зупиняє архівацію з ArchiveConflictError замість втрати даних.
+    """
+    names = [column.name for column in ARCHIVED_TABLES[table].columns]
+    columns = ", ".join(f'"{name}"' for name in names)
+    identical = " AND ".join(f'a."{name}" IS m."{name}"' for name in names)
+    aliases = {}
+    for month in months:
+        path = directory / f"{month}.db"
+        _ensure_archive(path)
+        alias = f"archive_{month.replace('-', '_')}"
+        _attach(conn, path, alias)
+        aliases[month] = alias
+    try:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            moved = 0
+            for month, ids in months.items():
+                id_list = ", ".join(str(row_id) for row_id in ids)
+                conn.exec_driver_sql(
+                    f"INSERT OR IGNORE INTO {aliases[month]}.{table} ({columns}) "
+                    f"SELECT {columns} FROM main.{table} WHERE id IN ({id_list})"
+                )
+                archived = {
+                    row_id for (row_id,) in conn.exec_driver_sql(
+                        f"SELECT m.id FROM main.{table} AS m JOIN {aliases[month]}.{table} AS a "
+                        f"ON a.id = m.id WHERE m.id IN ({id_list}) AND {identical}"
+                    )
+                }
+                conflicts = sorted(set(ids) - archived)
+                if conflicts:
+                    raise ArchiveConflictError(
+                        f"{table}: архів {month}.db уже містить інші записи з id {conflicts[:10]}"
+                    )
+                if table == "predictionhistory":
+                    # Тригер видалення зменшує агрегати — повертаємо внесок цих записів
+                    add_to_rollups(conn, f"id IN ({id_list})")
+                conn.exec_driver_sql(f"DELETE FROM main.{table} WHERE id IN ({id_list})")
+                moved += len(ids)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    finally:
+        for alias in aliases.values():
+            conn.exec_driver_sql(f"DETACH DATABASE {alias}")
+    return moved
+
+
+def iter_archive_batches(
+    engine: Engine,
+    cutoff: datetime,
+    *,
+    tables: Sequence[str] = tuple(ARCHIVED_TABLES),
+    batch_size: int = 500,
+) -> Iterator[tuple]:
+    """Переносить записи, старші за cutoff, порціями; після кожної повертає (таблиця, кількість)."""
+    directory = archive_dir(engine)
+    for table in tables:
+        while True:
+            with engine.connect() as conn:
+                months = _batch_months(conn, table, cutoff, batch_size)
+                moved = _move_batch(conn, table, months, directory) if months else 0
+            if not moved:
+                break
+            yield table, moved
+
+
+def archive_old_rows(
+    engine: Engine,
+    cutoff: datetime,
+    *,
+    tables: Sequence[str] = tuple(ARCHIVED_TABLES),
+    batch_size: int = 500,
+    pause: float = 0.0,
+) -> Dict[str, int]:
+    """Переносить в архіви всі записи, старші за cutoff. Повертає {таблиця: кількість}.
+
+    Між порціями блокування запису знімається (pause — додаткова пауза, с),
+    тому запити API не чекають на завершення всієї архівації. Перерваний запуск
+    можна безпечно повторити: вже перенесені записи пропускаються.
+
+    Raises:
+        ArchiveConflictError: архів містить інший запис з тим самим id
+    """
+    moved: Dict[str, int] = {table: 0 for table in tables}
+    for table, count in iter_archive_batches(engine, cutoff, tables=tables, batch_size=batch_size):
+        moved[table] += count
+        if pause:
+            time.sleep(pause)
+    return moved
+
+
+def plan_archive(
+    engine: Engine,
+    cutoff: datetime,
+    *,
+    tables: Sequence[str] = tuple(ARCHIVED_TABLES),
+) -> Dict[str, Dict[str, int]]:
+    """Кількість записів до архівації: {таблиця: {місяць: кількість}} (без змін у БД)."""
+    plan: Dict[str, Dict[str, int]] = {}
+    with engine.connect() as conn:
+        for table in tables:
+            rows = conn.execute(
+                text(
+                    f"SELECT strftime('%Y-%m', created_at) AS month, COUNT(*) FROM {table} "
+                    "WHERE created_at < :cutoff GROUP BY month ORDER BY month"
+                ),
+                {"cutoff": cutoff},
+            ).all()
+            plan[table] = {month: count for month, count in rows}
+    return plan
+
+
+def delete_archived_rows(engine: Engine, table: str, where: str, params: Sequence = ()) -> int:
+    """Видаляє з усіх архівів записи table, що відповідають умові where. Повертає кількість.
+
+    Архіви під'єднуються до основної БД на запис по одному; для predictionhistory
+    внесок видалених записів віднімається з агрегатів у тій самій транзакції.
+    """
+    deleted = 0
+    with engine.connect() as conn:
+        for path in archive_files(engine):
+            _attach(conn, path, "archive_rw")
+            try:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                try:
+                    if table == "predictionhistory":
+                        add_to_rollups(conn, where, params, source="archive_rw.predictionhistory", sign=-1)
+                    deleted += conn.exec_driver_sql(
+                        f"DELETE FROM archive_rw.{table} WHERE {where}", tuple(params)
+                    ).rowcount
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            finally:
+                conn.exec_driver_sql("DETACH DATABASE archive_rw")
+    return deleted
+
+
+def archived_rollup_rows(engine: Engine) -> List[tuple]:
+    """Агрегати predictionrollup, складені з прогнозів усіх архівів (у форматі ROLLUP_SELECT)."""
+    rows: List[tuple] = []
+    for reader in archive_engines(engine):
+        with reader.connect() as conn:
+            for granularity in ROLLUP_SELECT:
+                rows.extend(tuple(row) for row in conn.exec_driver_sql(
+                    ROLLUP_SELECT[granularity].format(source="predictionhistory", where="1")
+                ))
+    return rows
+
+
+def max_archived_ids(engine: Engine) -> Dict[str, int]:
+    """Найбільший id кожної архівної таблиці серед усіх архівів (0 — записів немає)."""
+    high: Dict[str, int] = {table: 0 for table in ARCHIVED_TABLES}
+    for reader in archive_engines(engine):
+        with reader.connect() as conn:
+            for table in ARCHIVED_TABLES:
+                high[table] = max(high[table], conn.exec_driver_sql(f"SELECT MAX(id) FROM {table}").scalar() or 0)
+    return high
@@ -8,7 +8,6 @@ from typing import Optional
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from pydantic import BaseModel, EmailStr
 from sqlmodel import Session, select
 
@@ -60,6 +59,8 @@ def get_password_hash(password: str) -> str:
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     """Створює JWT токен."""
+    from jose import jwt
+
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode = {"sub": subject, "exp": expire}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -67,6 +68,8 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
 
 def decode_token(token: str) -> TokenData:
     """Розкодовує токен та повертає вміст."""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return TokenData(**payload)
@@ -78,6 +81,18 @@ def decode_token(token: str) -> TokenData:
         ) from exc
 
 
+def get_user_from_token(session: Session, token: Optional[str]) -> Optional[User]:
+    """Повертає активного користувача за токеном або None (для WebSocket, де немає HTTPException)."""
+    if not token:
+        return None
+    try:
+        token_data = decode_token(token)
+    except HTTPException:
+        return None
+    statement = select(User).where(User.email == token_data.sub, User.is_active.is_(True))
+    return session.exec(statement).first()
+
+
 async def get_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
     session: Session = Depends(get_session),
@@ -8,8 +8,6 @@ import time
 from pathlib import Path
 from typing import Optional
 
-from PIL import Image
-
 
 # Шлях до директорії для зберігання аватарів
 DATA_DIR = Path(__file__).resolve().parents[2] / "data"
@@ -76,6 +74,8 @@ def save_avatar(user_id: int, file_content: bytes, extension: str) -> tuple[str,
     with open(avatar_path, "wb") as f:
         f.write(file_content)
     
+    from PIL import Image
+
     # Перевіряємо та обробляємо зображення (оптимізація)
     try:
         with Image.open(avatar_path) as img:
@@ -154,6 +154,8 @@ def validate_image_file(content_type: str, content: bytes) -> tuple[str, bytes]:
     if len(content) > MAX_FILE_SIZE:
         raise ValueError("Файл занадто великий. Максимальний розмір: 5MB.")
     
+    from PIL import Image
+
     # Перевірка, що це дійсно зображення
     try:
         Image.open(io.BytesIO(content)).verify()
@@ -0,0 +1,309 @@
+"""
+Обслуговування файлу БД SQLite без зупинки сервісу.
+
+- backup_database: онлайн-копія через backup API SQLite невеликими кроками
+  з паузами між ними, щоб не затримувати запити API
+- check_integrity: PRAGMA quick_check / integrity_check
+- compact_database: incremental_vacuum порціями сторінок та PRAGMA optimize
+- run_maintenance / maintenance_loop: періодичне обслуговування у фоні;
+  з lock_path його виконує лише воркер, що тримає файлове блокування
+
+Усі функції приймають шлях до файлу та працюють з окремим з'єднанням sqlite3,
+а звіти повертають словниками з тривалістю та часом очікування блокувань (мс).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Коди стану кроку backup, коли сторінки не скопійовано через блокування
+_BUSY_CODES = {sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED}
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+class _TooManyRestarts(Exception):
+    """Копіювання кроками перезапускалось надто часто через паралельні записи."""
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def _connect(path: Path, busy_timeout: float = 5.0) -> sqlite3.Connection:
+    # isolation_level=None: транзакціями керуємо явно
+    return sqlite3.connect(str(path), timeout=busy_timeout, isolation_level=None)
+
+
+def default_backup_path(database: Path, directory: Optional[Path] = None) -> Path:
+    """data/backups/app-20250101-120000.db для data/app.db."""
+    directory = directory or database.parent / "backups"
+    return directory / f"{database.stem}-{datetime.utcnow():%Y%m%d-%H%M%S}{database.suffix}"
+
+
+def backup_database(
+    source: Path,
+    destination: Path,
+    *,
+    pages_per_step: int = 256,
+    pause: float = 0.005,
+    max_restarts: int = 3,
+    retry_interval: float = 0.01,
+    verify: bool = True,
+) -> Dict[str, Any]:
+    """Копіює БД через backup API, не блокуючи записи на весь час копіювання.
+
+    Кожен крок копіює pages_per_step сторінок під коротким блокуванням читання,
+    між кроками — пауза pause секунд. Якщо інше з'єднання змінює БД під час
+    копіювання, SQLite починає копіювання заново (restarts у звіті); після
+    max_restarts перезапусків решта копіюється одним кроком (single_step=True),
+    інакше за постійних записів копіювання ніколи б не завершилось.
+    Копія пишеться у тимчасовий файл і перейменовується лише після успіху.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(destination.name + ".partial")
+    partial.unlink(missing_ok=True)
+
+    stats = {"steps": 0, "pages_copied": 0, "restarts": 0, "lock_wait": 0.0, "max_step": 0.0}
+    state = {"remaining": None, "step_started": 0.0, "busy": False}
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        step = time.perf_counter() - state["step_started"]
+        stats["steps"] += 1
+        stats["max_step"] = max(stats["max_step"], step)
+        previous = state["remaining"] if state["remaining"] is not None else total
+        busy = status in _BUSY_CODES
+        # Після BUSY SQLite чекає retry_interval перед повтором — це теж очікування блокування
+        if busy or state["busy"]:
+            stats["lock_wait"] += step
+        state["busy"] = busy
+        if not busy and remaining > previous:
+            stats["restarts"] += 1
+            stats["pages_copied"] += total - remaining
+            if stats["restarts"] > max_restarts:
+                raise _TooManyRestarts
+        elif not busy:
+            stats["pages_copied"] += previous - remaining
+        state["remaining"] = remaining
+        stats["total_pages"] = total
+        if pause and remaining:
+            time.sleep(pause)
+        state["step_started"] = time.perf_counter()
+
+    started = time.perf_counter()
+    single_step = False
+    # Без busy timeout: зайняте джерело повертає BUSY у progress, і очікування видно у звіті
+    src = _connect(source, busy_timeout=0)
+    dst = sqlite3.connect(str(partial))
+    try:
+        state["step_started"] = time.perf_counter()
+        try:
+            src.backup(dst, pages=pages_per_step, progress=progress, sleep=retry_interval)
+        except _TooManyRestarts:
+            single_step = True
+            step_started = time.perf_counter()
+            src.backup(dst, pages=-1, sleep=retry_interval)
+            step = time.perf_counter() - step_started
+            stats["max_step"] = max(stats["max_step"], step)
+            stats["pages_copied"] += stats["total_pages"]
+            stats["steps"] += 1
+    finally:
+        dst.close()
+        src.close()
+    os.replace(partial, destination)
+
+    report: Dict[str, Any] = {
+        "source": str(source),
+        "destination": str(destination),
+        "duration_ms": _ms(time.perf_counter() - started),
+        "total_pages": stats.get("total_pages", 0),
+        "pages_copied": stats["pages_copied"],
+        "steps": stats["steps"],
+        "restarts": stats["restarts"],
+        "single_step": single_step,
+        "lock_wait_ms": _ms(stats["lock_wait"]),
+        "max_step_ms": _ms(stats["max_step"]),
+        "size_bytes": destination.stat().st_size,
+    }
+    if verify:
+        report["integrity"] = check_integrity(destination, quick=True)
+    return report
+
+
+def prune_backups(directory: Path, stem: str, keep: int) -> List[Path]:
+    """Видаляє найстаріші копії stem-*.db, лишаючи keep найновіших. Повертає видалені."""
+    backups = sorted(directory.glob(f"{stem}-*.db"))
+    removed = backups[:-keep] if keep > 0 else []
+    for path in removed:
+        path.unlink()
+    return removed
+
+
+def check_integrity(path: Path, *, quick: bool = False, max_errors: int = 100) -> Dict[str, Any]:
+    """Перевіряє цілісність файлу БД. ok=True, якщо помилок немає."""
+    pragma = "quick_check" if quick else "integrity_check"
+    started = time.perf_counter()
+    conn = _connect(path)
+    try:
+        rows = [row[0] for row in conn.execute(f"PRAGMA {pragma}({max_errors})")]
+    except sqlite3.DatabaseError as e:
+        # Пошкоджений заголовок або схема: перевірка не може навіть почати роботу
+        rows = [str(e)]
+    finally:
+        conn.close()
+    return {
+        "check": pragma,
+        "ok": rows == ["ok"],
+        "errors": [] if rows == ["ok"] else rows,
+        "duration_ms": _ms(time.perf_counter() - started),
+    }
+
+
+def database_stats(path: Path) -> Dict[str, Any]:
+    """Розмір сторінки, кількість сторінок, вільні сторінки та режим auto_vacuum."""
+    conn = _connect(path)
+    try:
+        page_size, page_count, freelist, auto_vacuum = (
+            conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("page_size", "page_count", "freelist_count", "auto_vacuum")
+        )
+    finally:
+        conn.close()
+    return {
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist,
+        "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+    }
+
+
+def compact_database(
+    path: Path,
+    *,
+    pages_per_step: int = 512,
+    pause: float = 0.01,
+    max_pages: Optional[int] = None,
+    enable_incremental: bool = False,
+) -> Dict[str, Any]:
+    """Звільняє вільні сторінки файлу БД і оновлює статистику планувальника.
+
+    В режимі auto_vacuum=incremental вільні сторінки повертаються порціями
+    (кожна — коротка транзакція запису з паузою між ними). В інших режимах
+    incremental_vacuum нічого не робить; enable_incremental=True один раз
+    перемикає режим через повний VACUUM, який блокує запис на весь час виконання.
+    Наприкінці виконується PRAGMA optimize.
+    """
+    started = time.perf_counter()
+    before = database_stats(path)
+    report: Dict[str, Any] = {"before": before, "full_vacuum": False, "pages_freed": 0, "steps": 0}
+    lock_wait = 0.0
+
+    conn = _connect(path)
+    try:
+        if before["auto_vacuum"] != "incremental" and enable_incremental:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            report["full_vacuum"] = True
+        elif before["auto_vacuum"] == "incremental":
+            while max_pages is None or report["pages_freed"] < max_pages:
+                free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if not free:
+                    break
+                step = min(pages_per_step, free)
+                if max_pages is not None:
+                    step = min(step, max_pages - report["pages_freed"])
+                wait_started = time.perf_counter()
+                conn.execute("BEGIN IMMEDIATE")
+                lock_wait += time.perf_counter() - wait_started
+                try:
+                    # sqlite3 робить лише один крок PRAGMA без результатів,
+                    # а кожен крок incremental_vacuum звільняє одну сторінку
+                    for _ in range(step):
+                        conn.execute("PRAGMA incremental_vacuum")
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                report["pages_freed"] += step
+                report["steps"] += 1
+                if pause:
+                    time.sleep(pause)
+        optimize_started = time.perf_counter()
+        conn.execute("PRAGMA optimize")
+        report["optimize_ms"] = _ms(time.perf_counter() - optimize_started)
+    finally:
+        conn.close()
+
+    report["after"] = database_stats(path)
+    report["lock_wait_ms"] = _ms(lock_wait)
+    report["duration_ms"] = _ms(time.perf_counter() - started)
+    return report
+
+
+def run_maintenance(path: Path, *, max_pages: int = 2048) -> Dict[str, Any]:
+    """Один прохід планового обслуговування: обмежений incremental_vacuum та PRAGMA optimize."""
+    return compact_database(path, max_pages=max_pages)
+
+
+def _try_lock(path: Path) -> Optional[int]:
+    """Неблокувальна спроба ексклюзивного файлового блокування; дескриптор або None, якщо воно зайняте."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    os.close(fd)
+
+
+async def maintenance_loop(path: Path, interval: float, lock_path: Optional[Path] = None) -> None:
+    """Фонова задача: run_maintenance кожні interval секунд (перший прохід — через interval).
+
+    З lock_path задача стартує в кожному воркері, але обслуговування виконує
+    лише той, хто тримає блокування файлу (до завершення задачі). Решта
+    пробують його взяти кожен інтервал, тож після зупинки власника роботу
+    підхоплює інший воркер.
+    """
+    lock_fd: Optional[int] = None
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            if lock_path is not None and lock_fd is None:
+                lock_fd = _try_lock(lock_path)
+                if lock_fd is None:
+                    continue
+            try:
+                report = await asyncio.to_thread(run_maintenance, path)
+                print(
+                    f"Обслуговування БД: звільнено {report['pages_freed']} сторінок за {report['duration_ms']} мс "
+                    f"(очікування блокувань {report['lock_wait_ms']} мс)"
+                )
+            except sqlite3.Error as e:
+                print(f"Warning: DB maintenance failed: {e}")
+    finally:
+        if lock_fd is not None:
+            _unlock(lock_fd)
@@ -0,0 +1,240 @@
+"""
+Версійовані міграції схеми БД.
+
+- MIGRATIONS: впорядкований список ідемпотентних міграцій (номер, назва, функція)
+- get_schema_version: поточна версія схеми — один запит до schema_version
+- migrate: застосовує відсутні міграції в одній транзакції під файловим блокуванням,
+  щоб паралельні воркери не виконували їх одночасно
+
+Зміна схеми — нова функція з наступним номером у кінці MIGRATIONS; застосовані
+міграції не редагуються. Кожна міграція має бути ідемпотентною: БД, створені
+до появи schema_version, проходять увесь список з першого номера.
+"""
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Одна міграція схеми."""
+
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _columns(conn: Connection, table: str) -> Set[str]:
+    return {row[1] for row in conn.execute(text(f'PRAGMA table_info("{table}")'))}
+
+
+def _add_columns(conn: Connection, table: str, columns: Dict[str, str]) -> None:
+    """Додає до таблиці колонки, яких у ній ще немає."""
+    existing = _columns(conn, table)
+    for name, ddl in columns.items():
+        if name not in existing:
+            conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {ddl}'))
+
+
+def _baseline(conn: Connection) -> None:
+    """Створює таблиці моделей, яких ще немає (зокрема userblock)."""
+    from . import models  # noqa: F401 — реєструє таблиці в metadata
+
+    SQLModel.metadata.create_all(bind=conn)
+
+
+def _user_profile_columns(conn: Connection) -> None:
+    _add_columns(conn, "user", {
+        "avatar_type": "VARCHAR",
+        "first_name": "VARCHAR",
+        "last_name": "VARCHAR",
+        "date_of_birth": "DATETIME",
+        "gender": "VARCHAR",
+    })
+    conn.execute(text("UPDATE user SET avatar_type = 'generated' WHERE avatar_type IS NULL"))
+
+
+def _chat_pin_order_columns(conn: Connection) -> None:
+    _add_columns(conn, "chat", {"is_pinned": "BOOLEAN DEFAULT 0", "order": "INTEGER DEFAULT 0"})
+
+
+def _chatmessage_cursor_index(conn: Connection) -> None:
+    # Складений індекс для курсорної пагінації замінює одноколонковий ix_chatmessage_chat_id
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_chatmessage_chat_id_id ON chatmessage(chat_id, id)"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_chatmessage_chat_id"))
+
+
+def _message_search_index(conn: Connection) -> None:
+    from .services.message_search import create_search_index
+
+    create_search_index(conn)
+
+
+def _prediction_feature_columns(conn: Connection) -> None:
+    from .models import PREDICTION_FEATURE_COLUMNS
+
+    types = {name: "FLOAT" for name in PREDICTION_FEATURE_COLUMNS}
+    types["RIAGENDR"] = "INTEGER"
+    _add_columns(conn, "predictionhistory", types)
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_predictionhistory_target_risk_bucket "
+        "ON predictionhistory(target, risk_bucket)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_predictionhistory_target_created_at "
+        "ON predictionhistory(target, created_at)"
+    ))
+    # Заповнення з JSON одним UPDATE; нечислові значення лишаються NULL
+    assignments = ", ".join(
+        f"\"{name}\" = CASE WHEN json_type(inputs, '$.{name}') IN ('integer', 'real') "
+        f"THEN CAST(json_extract(inputs, '$.{name}') AS {types[name]}) END"
+        for name in PREDICTION_FEATURE_COLUMNS
+    )
+    conn.execute(text(f"UPDATE predictionhistory SET {assignments} WHERE json_valid(inputs)"))
+
+
+def _prediction_rollups(conn: Connection) -> None:
+    from .models import PredictionRollup
+    from .services.prediction_rollups import create_rollup_triggers, rebuild_rollups
+
+    PredictionRollup.__table__.create(bind=conn, checkfirst=True)
+    create_rollup_triggers(conn)
+    rebuild_rollups(conn)
+
+
+def _archived_tables_autoincrement(conn: Connection) -> None:
+    """Перебудовує архівні таблиці з AUTOINCREMENT, щоб id не використовувались повторно.
+
+    Без AUTOINCREMENT SQLite видає max(id) + 1, тож після архівації всіх записів
+    новий запис отримав би id, що вже є в архіві. Лічильник sqlite_sequence
+    починається з найбільшого id основної БД та архівів. Індекси й тригери
+    (FTS, агрегати) таблиці відтворюються з sqlite_master.
+    """
+    from sqlalchemy.schema import CreateTable
+
+    from .archive import ARCHIVED_TABLES, max_archived_ids
+
+    archived_high = max_archived_ids(conn.engine)
+    for name, table in ARCHIVED_TABLES.items():
+        ddl = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": name}
+        ).scalar()
+        if ddl is not None and "AUTOINCREMENT" not in ddl.upper():
+            dependents = [
+                row[0] for row in conn.execute(text(
+                    "SELECT sql FROM sqlite_master WHERE tbl_name = :name "
+                    "AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+                ), {"name": name})
+            ]
+            staging = f"{name}__rebuild"
+            create = str(CreateTable(table).compile(dialect=conn.dialect))
+            conn.exec_driver_sql(create.replace(f"CREATE TABLE {name} ", f"CREATE TABLE {staging} ", 1))
+            columns = ", ".join(f'"{column.name}"' for column in table.columns if column.name in _columns(conn, name))
+            conn.exec_driver_sql(f"INSERT INTO {staging} ({columns}) SELECT {columns} FROM {name}")
+            conn.exec_driver_sql(f"DROP TABLE {name}")
+            conn.exec_driver_sql(f"ALTER TABLE {staging} RENAME TO {name}")
+            for statement in dependents:
+                conn.exec_driver_sql(statement)
+        high = max(conn.exec_driver_sql(f"SELECT MAX(id) FROM {name}").scalar() or 0, archived_high[name])
+        conn.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = ?", (name,))
+        conn.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, high))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "user_profile_columns", _user_profile_columns),
+    Migration(3, "chat_pin_order_columns", _chat_pin_order_columns),
+    Migration(4, "chatmessage_cursor_index", _chatmessage_cursor_index),
+    Migration(5, "message_search_index", _message_search_index),
+    Migration(6, "prediction_feature_columns", _prediction_feature_columns),
+    Migration(7, "prediction_rollups", _prediction_rollups),
+    Migration(8, "archived_tables_autoincrement", _archived_tables_autoincrement),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(engine: Engine) -> int:
+    """Повертає поточну версію схеми (0 — міграції ще не застосовувались)."""
+    with engine.connect() as conn:
+        return _current_version(conn)
+
+
+def _current_version(conn: Connection) -> int:
+    try:
+        return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+    except OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        return 0
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Ексклюзивне міжпроцесне блокування на час міграції."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+def migrate(engine: Engine, lock_path: Path) -> List[int]:
+    """Застосовує відсутні міграції. Повертає номери застосованих.
+
+    Усі міграції виконуються в одній транзакції (DDL в SQLite транзакційний):
+    у разі помилки схема лишається в попередньому стані. Версія перевіряється
+    повторно під блокуванням — воркер, що чекав, не повторює вже виконану роботу.
+    """
+    with _file_lock(lock_path), engine.connect() as conn:
+        # BEGIN IMMEDIATE явно: драйвер sqlite3 сам не відкриває транзакцію перед DDL
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS schema_version ("
+                "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at DATETIME NOT NULL)"
+            ))
+            current = _current_version(conn)
+            applied = []
+            for migration in MIGRATIONS:
+                if migration.version <= current:
+                    continue
+                migration.apply(conn)
+                conn.execute(
+                    text("INSERT INTO schema_version (version, name, applied_at) VALUES (:v, :n, :t)"),
+                    {"v": migration.version, "n": migration.name, "t": datetime.utcnow()},
+                )
+                applied.append(migration.version)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return applied
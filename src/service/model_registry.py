@@ -1,13 +1,16 @@
 """
 Реєстр моделей для завантаження та кешування чемпіонських моделей.
+
+joblib (а з ним sklearn) імпортується лише під час першого завантаження моделі.
 """
+from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
-import joblib
-from sklearn.pipeline import Pipeline
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
 
 # Налаштування шляхів
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -40,6 +43,13 @@ MODEL_LABELS: Dict[str, str] = {
 }
 
 
+def _load_pipeline(path: Path) -> Pipeline:
+    """Десеріалізує модель з диска (joblib імпортується при першому виклику)."""
+    import joblib
+
+    return joblib.load(path)
+
+
 def load_champion(target: str, prefer_calibrated: bool = True) -> Tuple[Pipeline, Dict]:
     """
     Завантажує чемпіонську модель для цільової змінної.
@@ -79,7 +89,7 @@ def load_champion(target: str, prefer_calibrated: bool = True) -> Tuple[Pipeline
     if prefer_calibrated:
         calibrated_path = MODELS_DIR / target / "champion_calibrated.joblib"
         if calibrated_path.exists():
-            pipeline = joblib.load(calibrated_path)
+            pipeline = _load_pipeline(calibrated_path)
             metadata["is_calibrated"] = True
             metadata["model_path"] = str(calibrated_path)
             _MODEL_CACHE[cache_key] = (pipeline, metadata)
@@ -90,7 +100,7 @@ def load_champion(target: str, prefer_calibrated: bool = True) -> Tuple[Pipeline
     if not model_path.exists():
         raise FileNotFoundError(f"Модель чемпіона не знайдено: {model_path}")
     
-    pipeline = joblib.load(model_path)
+    pipeline = _load_pipeline(model_path)
     metadata["is_calibrated"] = False
     metadata["model_path"] = str(model_path)
     _MODEL_CACHE[cache_key] = (pipeline, metadata)
@@ -133,7 +143,7 @@ def load_model(target: str, model_key: str) -> Tuple[Pipeline, Dict]:
     if not model_path.exists():
         raise FileNotFoundError(f"Модель {model_folder} не знайдено за шляхом: {model_path}")
 
-    pipeline = joblib.load(model_path)
+    pipeline = _load_pipeline(model_path)
 
     metadata = {
         "model_name": MODEL_LABELS.get(model_folder, model_folder),
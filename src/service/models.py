@@ -9,6 +9,7 @@ from typing import Optional
 from sqlalchemy.dialects.sqlite import JSON as SQLITE_JSON
 from sqlalchemy import Column as SAColumn
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Text
 from sqlmodel import Column, Field, Relationship, SQLModel
 
@@ -32,6 +33,11 @@ class TimestampedBase(SQLModel):
         self.updated_at = datetime.utcnow()
 
 
+# Ознаки моделей, що дублюються з inputs у типізовані колонки PredictionHistory
+# для агрегатних запитів у SQL (JSON inputs лишається джерелом для API)
+PREDICTION_FEATURE_COLUMNS = ("RIDAGEYR", "RIAGENDR", "BMXBMI", "BPXSY1", "BPXDI1", "LBXGLU", "LBXTC")
+
+
 class PredictionHistory(SQLModel, table=True):
     """Збережена історія прогнозів користувача."""
 
@@ -46,8 +52,50 @@ class PredictionHistory(SQLModel, table=True):
         description="Вхідні параметри прогнозу",
     )
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+    # Типізовані копії ознак з inputs (заповнюються при записі, див. PREDICTION_FEATURE_COLUMNS)
+    RIDAGEYR: Optional[float] = Field(default=None, description="Вік особи (роки)")
+    RIAGENDR: Optional[int] = Field(default=None, description="Стать")
+    BMXBMI: Optional[float] = Field(default=None, description="Індекс маси тіла (ІМТ)")
+    BPXSY1: Optional[float] = Field(default=None, description="Систолічний тиск (мм рт.ст.)")
+    BPXDI1: Optional[float] = Field(default=None, description="Діастолічний тиск (мм рт.ст.)")
+    LBXGLU: Optional[float] = Field(default=None, description="Глюкоза (мг/дл)")
+    LBXTC: Optional[float] = Field(default=None, description="Загальний холестерин (мг/дл)")
+
     user: Optional["User"] = Relationship(back_populates="history")
 
+    # Популяційні запити фільтрують за ціллю та категорією ризику або за ціллю та часом
+    __table_args__ = (
+        Index("ix_predictionhistory_target_risk_bucket", "target", "risk_bucket"),
+        Index("ix_predictionhistory_target_created_at", "target", "created_at"),
+        # id не використовуються повторно: старі записи переносяться в архіви (див. archive.py)
+        {"sqlite_autoincrement": True},
+    )
+
+
+class PredictionRollup(SQLModel, table=True):
+    """Погодинні та денні агрегати прогнозів за ціллю, категорією ризику та моделлю.
+
+    Підтримуються тригерами на predictionhistory (див. services/prediction_rollups.py),
+    тож аналітика читає кілька сотень агрегатів замість сканування історії.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    granularity: str = Field(nullable=False, description="Розмір інтервалу: hour або day")
+    bucket_start: datetime = Field(nullable=False, description="Початок інтервалу (UTC)")
+    target: str = Field(nullable=False)
+    risk_bucket: str = Field(nullable=False)
+    model_name: str = Field(default="", nullable=False, description="Модель ('' — не вказано)")
+    count: int = Field(default=0, nullable=False)
+    probability_sum: float = Field(default=0.0, nullable=False, description="Сума ймовірностей для середнього")
+
+    __table_args__ = (
+        Index(
+            "ix_predictionrollup_key",
+            "granularity", "bucket_start", "target", "risk_bucket", "model_name",
+            unique=True,
+        ),
+    )
+
 
 class User(TimestampedBase, table=True):
     """Модель користувача системи."""
@@ -101,9 +149,28 @@ class AssistantMessage(SQLModel, table=True):
         description="Опційний звʼязок з конкретним прогнозом"
     )
 
+    # id не використовуються повторно: старі записи переносяться в архіви (див. archive.py)
+    __table_args__ = (
+        {"sqlite_autoincrement": True},
+    )
+
 AssistantMessage.model_rebuild()
 
 
+class AssistantSummary(SQLModel, table=True):
+    """Стислий підсумок давніх повідомлень чату асистента для користувача.
+    
+    Покриває всі повідомлення з id <= upto_message_id; новіші повідомлення
+    додаються до контексту дослівно, доки вміщуються в бюджет токенів.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", unique=True, index=True, nullable=False)
+    upto_message_id: int = Field(nullable=False, description="Останнє повідомлення, включене в підсумок")
+    content: str = Field(sa_column=SAColumn(Text, nullable=False), description="Текст підсумку")
+    token_count: int = Field(default=0, nullable=False, description="Оцінка кількості токенів підсумку")
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
 class Chat(SQLModel, table=True):
     """Чат між двома користувачами."""
     
@@ -136,7 +203,8 @@ class ChatMessage(SQLModel, table=True):
     """Повідомлення в чаті між користувачами."""
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    chat_id: int = Field(foreign_key="chat.id", index=True, nullable=False)
+    # Індекс по chat_id — складений (chat_id, id), див. __table_args__
+    chat_id: int = Field(foreign_key="chat.id", nullable=False)
     sender_id: int = Field(foreign_key="user.id", index=True, nullable=False, description="ID відправника")
     content: str = Field(sa_column=SAColumn(Text, nullable=False), description="Текст повідомлення")
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
@@ -145,6 +213,14 @@ class ChatMessage(SQLModel, table=True):
     chat: Optional[Chat] = Relationship(back_populates="messages")
     sender: Optional["User"] = Relationship()
 
+    # Курсорна пагінація: діапазон id в межах чату читається одним проходом по індексу.
+    # Індекс також обслуговує всі вибірки за chat_id, тому окремий ix_chatmessage_chat_id не потрібен
+    __table_args__ = (
+        Index("ix_chatmessage_chat_id_id", "chat_id", "id"),
+        # id не використовуються повторно: старі записи переносяться в архіви (див. archive.py)
+        {"sqlite_autoincrement": True},
+    )
+
 
 Chat.model_rebuild()
 ChatMessage.model_rebuild()
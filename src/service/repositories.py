@@ -3,12 +3,23 @@ CRUD допоміжні функції для роботи з базою дан
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import func
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
-from .models import AssistantMessage, Chat, ChatMessage, PredictionHistory, User, UserBlock
+from .archive import delete_archived_rows, select_with_archives
+from .models import (
+    PREDICTION_FEATURE_COLUMNS,
+    AssistantMessage,
+    AssistantSummary,
+    Chat,
+    ChatMessage,
+    PredictionHistory,
+    User,
+    UserBlock,
+)
 from collections import defaultdict
 
 
@@ -38,6 +49,22 @@ def update_user_profile(session: Session, user: User, **kwargs) -> User:
     return user
 
 
+def prediction_feature_values(inputs: dict) -> dict:
+    """Витягує з inputs числові значення ознак для типізованих колонок.
+
+    Відсутні та нечислові значення стають None.
+    """
+    values = {}
+    for name in PREDICTION_FEATURE_COLUMNS:
+        value = inputs.get(name) if isinstance(inputs, dict) else None
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            value = None
+        values[name] = value
+    if values["RIAGENDR"] is not None:
+        values["RIAGENDR"] = int(values["RIAGENDR"])
+    return values
+
+
 def add_prediction_history(
     session: Session,
     user_id: int,
@@ -55,6 +82,7 @@ def add_prediction_history(
         probability=probability,
         risk_bucket=risk_bucket,
         inputs=inputs,
+        **prediction_feature_values(inputs),
     )
     session.add(history)
     session.commit()
@@ -63,14 +91,13 @@ def add_prediction_history(
 
 
 def list_prediction_history(session: Session, user_id: int, limit: int = 50) -> List[PredictionHistory]:
-    """Повертає історію прогнозів користувача."""
+    """Повертає історію прогнозів користувача (разом з архівами, якщо записів мало)."""
     statement = (
         select(PredictionHistory)
         .where(PredictionHistory.user_id == user_id)
         .order_by(PredictionHistory.created_at.desc())
-        .limit(limit)
     )
-    return list(session.exec(statement))
+    return select_with_archives(session, statement, limit)
 
 
 def get_user_messages(session: Session, user_id: int, limit: int = 50) -> List[AssistantMessage]:
@@ -106,15 +133,58 @@ def add_message(
     return msg
 
 
+def get_messages_after(session: Session, user_id: int, after_id: int = 0, limit: int = 200) -> List[AssistantMessage]:
+    """Повертає до N найновіших повідомлень з id > after_id, у порядку від старих до нових."""
+    stmt = (
+        select(AssistantMessage)
+        .where(AssistantMessage.user_id == user_id, AssistantMessage.id > after_id)
+        .order_by(AssistantMessage.id.desc())
+        .limit(limit)
+    )
+    return list(reversed(session.exec(stmt).all()))
+
+
+def get_assistant_summary(session: Session, user_id: int) -> Optional[AssistantSummary]:
+    """Повертає збережений підсумок давньої переписки з асистентом."""
+    stmt = select(AssistantSummary).where(AssistantSummary.user_id == user_id)
+    return session.exec(stmt).first()
+
+
+def save_assistant_summary(
+    session: Session,
+    *,
+    user_id: int,
+    content: str,
+    upto_message_id: int,
+    token_count: int,
+) -> AssistantSummary:
+    """Створює або оновлює підсумок переписки користувача з асистентом."""
+    summary = get_assistant_summary(session, user_id)
+    if summary is None:
+        summary = AssistantSummary(user_id=user_id, content=content, upto_message_id=upto_message_id)
+    summary.content = content
+    summary.upto_message_id = upto_message_id
+    summary.token_count = token_count
+    summary.updated_at = datetime.utcnow()
+    session.add(summary)
+    session.commit()
+    session.refresh(summary)
+    return summary
+
+
 def delete_user_messages(session: Session, user_id: int) -> int:
-    """Видаляє всю історію повідомлень асистента для користувача. Повертає кількість видалених."""
+    """Видаляє всю історію повідомлень асистента (разом з підсумком). Повертає кількість видалених."""
     statement = select(AssistantMessage).where(AssistantMessage.user_id == user_id)
     messages = list(session.exec(statement))
     count = 0
     for m in messages:
         session.delete(m)
         count += 1
+    summary = get_assistant_summary(session, user_id)
+    if summary is not None:
+        session.delete(summary)
     session.commit()
+    count += delete_archived_rows(session.get_bind(), "assistantmessage", "user_id = ?", (user_id,))
     return count
 
 
@@ -126,20 +196,59 @@ def delete_prediction(session: Session, user_id: int, prediction_id: int) -> boo
     )
     history = session.exec(statement).first()
     if not history:
-        return False
+        # Запис міг бути перенесений в архів — у списках історії він видимий
+        return delete_archived_rows(
+            session.get_bind(), "predictionhistory", "id = ? AND user_id = ?", (prediction_id, user_id)
+        ) > 0
     session.delete(history)
     session.commit()
     return True
 
 
 def get_all_prediction_history(session: Session, user_id: int) -> List[PredictionHistory]:
-    """Повертає всю історію прогнозів користувача (без ліміту)."""
+    """Повертає всю історію прогнозів користувача (без ліміту, разом з архівами)."""
     statement = (
         select(PredictionHistory)
         .where(PredictionHistory.user_id == user_id)
         .order_by(PredictionHistory.created_at.desc())
     )
-    return list(session.exec(statement))
+    return select_with_archives(session, statement)
+
+
+def get_prediction_feature_stats(
+    session: Session,
+    *,
+    target: Optional[str] = None,
+    risk_bucket: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> dict:
+    """Агрегує ознаки прогнозів одним SQL-запитом по типізованих колонках.
+
+    Returns:
+        {"count": n, "features": {ознака: {"count", "mean", "min", "max"}}}
+    """
+    columns = [getattr(PredictionHistory, name) for name in PREDICTION_FEATURE_COLUMNS]
+    aggregates = [func.count(PredictionHistory.id)]
+    for column in columns:
+        aggregates += [func.count(column), func.avg(column), func.min(column), func.max(column)]
+
+    statement = select(*aggregates)
+    if target is not None:
+        statement = statement.where(PredictionHistory.target == target)
+    if risk_bucket is not None:
+        statement = statement.where(PredictionHistory.risk_bucket == risk_bucket)
+    if since is not None:
+        statement = statement.where(PredictionHistory.created_at >= since)
+    if until is not None:
+        statement = statement.where(PredictionHistory.created_at < until)
+
+    row = session.exec(statement).one()
+    features = {}
+    for i, name in enumerate(PREDICTION_FEATURE_COLUMNS):
+        count, mean, minimum, maximum = row[1 + i * 4: 5 + i * 4]
+        features[name] = {"count": count, "mean": mean, "min": minimum, "max": maximum}
+    return {"count": row[0], "features": features}
 
 
 # ========== Chat functions ==========
@@ -298,16 +407,50 @@ def get_user_chats(session: Session, user_id: int) -> List[Chat]:
     return list(session.exec(statement))
 
 
+def get_chat_messages_page(
+    session: Session,
+    chat_id: int,
+    *,
+    limit: int = 50,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> Tuple[List[ChatMessage], bool]:
+    """Повертає сторінку повідомлень чату за курсором по id (від старих до нових).
+    
+    - без курсорів: останні limit повідомлень
+    - before_id: limit повідомлень, старіших за before_id (підвантаження при прокрутці)
+    - after_id: до limit повідомлень, новіших за after_id (інкрементне оновлення)
+    
+    Returns:
+        Кортеж (messages, has_more): has_more — чи є ще повідомлення
+        у напрямку пагінації (старші для before_id/без курсора, новіші для after_id)
+    """
+    limit = max(1, min(limit, 200))
+    statement = select(ChatMessage).where(ChatMessage.chat_id == chat_id)
+    if after_id is not None:
+        statement = statement.where(ChatMessage.id > after_id).order_by(ChatMessage.id.asc())
+    else:
+        if before_id is not None:
+            statement = statement.where(ChatMessage.id < before_id)
+        statement = statement.order_by(ChatMessage.id.desc())
+
+    # Беремо на один рядок більше, щоб дізнатися про наявність наступної сторінки.
+    # Старіші повідомлення можуть бути в архівах; нові (after_id) — лише в основній БД
+    if after_id is not None:
+        rows = list(session.exec(statement.limit(limit + 1)))
+    else:
+        rows = select_with_archives(session, statement, limit + 1)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if after_id is None:
+        rows.reverse()
+    return rows, has_more
+
+
 def get_chat_messages(session: Session, chat_id: int, limit: int = 100) -> List[ChatMessage]:
-    """Повертає повідомлення чату, відсортовані за часом створення."""
-    statement = (
-        select(ChatMessage)
-        .options(selectinload(ChatMessage.sender))
-        .where(ChatMessage.chat_id == chat_id)
-        .order_by(ChatMessage.created_at.asc())
-        .limit(limit)
-    )
-    return list(session.exec(statement))
+    """Повертає останні limit повідомлень чату, відсортовані від старих до нових."""
+    messages, _ = get_chat_messages_page(session, chat_id, limit=limit)
+    return messages
 
 
 def get_last_chat_message(session: Session, chat_id: int) -> Optional[ChatMessage]:
@@ -403,6 +546,7 @@ def delete_chat(session: Session, chat_uuid: str, user_id: int) -> bool:
     # Видаляємо сам чат
     session.delete(chat)
     session.commit()
+    delete_archived_rows(session.get_bind(), "chatmessage", "chat_id = ?", (chat.id,))
     return True
 
 
@@ -0,0 +1,105 @@
+"""
+Маршрути популяційної аналітики прогнозів.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+
+from ..auth_utils import require_current_user
+from ..db import get_session
+from ..models import User
+from ..repositories import get_prediction_feature_stats
+from ..schemas import AnalyticsSummaryResponse, PredictionFeatureStatsResponse
+from ..services.prediction_rollups import GRANULARITIES, summarize_predictions
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+DEFAULT_RANGE_DAYS = 30
+# Обмеження довжини погодинного ряду (~ рік)
+MAX_HOURLY_POINTS = 24 * 366
+RISK_BUCKETS = ("low", "medium", "high")
+
+
+def _to_naive_utc(moment: datetime) -> datetime:
+    """Часові мітки історії зберігаються в UTC без часового поясу."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _resolve_interval(since: Optional[datetime], until: Optional[datetime]) -> tuple:
+    """Інтервал [since, until) у UTC без часового поясу; за замовчуванням — останні DEFAULT_RANGE_DAYS днів."""
+    until = _to_naive_utc(until) if until is not None else datetime.utcnow()
+    since = _to_naive_utc(since) if since is not None else until - timedelta(days=DEFAULT_RANGE_DAYS)
+    if since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Початок інтервалу має бути раніше за кінець",
+        )
+    return since, until
+
+
+@router.get("/summary", response_model=AnalyticsSummaryResponse)
+def analytics_summary(
+    since: Optional[datetime] = Query(None, description="Початок інтервалу (UTC), за замовчуванням — 30 днів тому"),
+    until: Optional[datetime] = Query(None, description="Кінець інтервалу (UTC, не включно), за замовчуванням — зараз"),
+    target: Optional[str] = Query(None, description="Фільтр за ціллю"),
+    model: Optional[str] = Query(None, description="Фільтр за назвою моделі"),
+    granularity: Optional[str] = Query(None, description="Часовий ряд: hour або day"),
+    current_user: User = Depends(require_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Зведення прогнозів усіх користувачів за інтервал.
+
+    Дані читаються з погодинних і денних агрегатів, які підтримуються
+    тригерами під час запису історії, тому час відповіді не залежить від
+    кількості прогнозів. Межі інтервалу вирівнюються до години.
+    """
+    if granularity is not None and granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Невідома гранулярність: {granularity}. Допустимі: {', '.join(GRANULARITIES)}",
+        )
+
+    since, until = _resolve_interval(since, until)
+    if granularity == "hour" and until - since > timedelta(hours=MAX_HOURLY_POINTS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Інтервал завеликий для погодинного ряду, використайте granularity=day",
+        )
+
+    return summarize_predictions(
+        session, since, until, target=target, model_name=model, granularity=granularity
+    )
+
+
+@router.get("/features", response_model=PredictionFeatureStatsResponse)
+def analytics_features(
+    since: Optional[datetime] = Query(None, description="Початок інтервалу (UTC), за замовчуванням — 30 днів тому"),
+    until: Optional[datetime] = Query(None, description="Кінець інтервалу (UTC, не включно), за замовчуванням — зараз"),
+    target: Optional[str] = Query(None, description="Фільтр за ціллю"),
+    risk_bucket: Optional[str] = Query(None, description="Фільтр за категорією ризику: low, medium або high"),
+    current_user: User = Depends(require_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Кількість, середнє, мінімум і максимум кожної ознаки прогнозів усіх користувачів за інтервал.
+
+    Рахується одним SQL-запитом по типізованих колонках ознак predictionhistory
+    (з індексами за ціллю, ризиком і часом), без розбору JSON inputs.
+    """
+    if risk_bucket is not None and risk_bucket not in RISK_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Невідома категорія ризику: {risk_bucket}. Допустимі: {', '.join(RISK_BUCKETS)}",
+        )
+    since, until = _resolve_interval(since, until)
+
+    stats = get_prediction_feature_stats(
+        session, target=target, risk_bucket=risk_bucket, since=since, until=until
+    )
+    return {"since": since, "until": until, **stats}
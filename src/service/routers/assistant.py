@@ -3,21 +3,32 @@
 """
 from __future__ import annotations
 
+import json
+from contextlib import aclosing
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 
 from src.service.auth_utils import require_current_user
-from src.service.db import get_session
+from src.service.db import get_session, session_scope
 from src.service.models import PredictionHistory, User
 from src.service.repositories import add_message, get_user_messages, delete_user_messages
+from src.service import settings
+from src.service.services.assistant_context import build_conversation_history, estimate_tokens
 from src.service.services.assistant_llm import (
+    LLM_EMPTY_MESSAGE,
+    LLM_ERROR_MESSAGE,
     build_assistant_prompt,
     build_health_context,
-    call_ollama,
+    get_llm_client,
+    get_response_cache,
+    stream_ollama,
 )
+from src.service.services.llm_client import LLMEmptyResponseError, LLMError, LLMQueueFullError, QueueTicket
 
 router = APIRouter(prefix="/assistant", tags=["assistant"])
 
@@ -40,13 +51,21 @@ def get_history(
     ]
 
 
-@router.post("/chat")
-def chat(
+def _build_assistant_turn(
     payload: Dict[str, Any],
-    session: Session = Depends(get_session),
-    current_user: User = Depends(require_current_user),
-) -> Dict[str, Any]:
-    """Приймає повідомлення користувача, викликає LLM та повертає відповідь."""
+    session: Session,
+    current_user: User,
+) -> Tuple[str, str, str, Optional[int], Dict[str, int]]:
+    """Валідує запит та будує підказ для LLM (без збереження в історії).
+    
+    Попередні повідомлення розмови додаються в межах бюджету токенів
+    (settings.ASSISTANT_PROMPT_BUDGET_TOKENS), давніші — у вигляді підсумку.
+    
+    Returns:
+        Кортеж (prompt, base_prompt, user_message, prediction_id, context), де
+        base_prompt — підказ без історії розмови (ключ кешу, див. _cache_key),
+        context — оцінка розміру промпту та використаної історії
+    """
     user_message = (payload.get("message") or "").strip()
     if not user_message:
         raise HTTPException(
@@ -79,8 +98,112 @@ def chat(
                 detail="Обраний прогноз недоступний.",
         )
 
+    # Отримуємо мову з payload (за замовчуванням українська)
+    language = payload.get("language", "uk")
+    if language not in ["uk", "en"]:
+        language = "uk"
+
+    # Будуємо контекст за вибраним (або останнім) прогнозом
+    context = build_health_context(session, current_user.id, prediction_id=prediction_id, language=language)
+
+    # Історія розмови отримує весь бюджет, що лишився після базового підказу
+    base_prompt = build_assistant_prompt(context, user_message, language=language)
+    base_tokens = estimate_tokens(base_prompt)
+    history = build_conversation_history(
+        session,
+        current_user.id,
+        budget_tokens=settings.ASSISTANT_PROMPT_BUDGET_TOKENS - base_tokens,
+        max_messages=settings.ASSISTANT_HISTORY_MAX_MESSAGES,
+        summary_max_tokens=settings.ASSISTANT_SUMMARY_MAX_TOKENS,
+        language=language,
+    )
+
+    # Формуємо підказ для моделі
+    prompt = build_assistant_prompt(
+        context,
+        user_message,
+        language=language,
+        history_summary=history.summary,
+        history_turns=history.turns,
+    )
+    context_info = {"prompt_tokens": estimate_tokens(prompt), **history.as_dict()}
+    return prompt, base_prompt, user_message, prediction_id, context_info
+
+
+def _use_cache(payload: Dict[str, Any]) -> bool:
+    """Чи можна відповідати з кешу (клієнт може вимкнути кеш полем use_cache=false)."""
+    return settings.ASSISTANT_CACHE_ENABLED and payload.get("use_cache", True) is not False
+
+
+def _cache_key(payload: Dict[str, Any], base_prompt: str, model: str) -> Optional[str]:
+    """Ключ кешу: питання та контекст прогнозу без історії розмови (None — кеш вимкнено).
+    
+    Історія робить кожен промпт унікальним, тож ключ за повним промптом майже
+    ніколи не збігався б. Тому ключ будується з підказу без історії, а в кеш
+    потрапляють лише відповіді, згенеровані без історії (_cacheable): відповідь
+    на те саме питання з тим самим контекстом прогнозу може бути віддана й
+    користувачу з історією, але відповідь, що залежить від чиєїсь розмови,
+    не віддається нікому іншому.
+    """
+    return get_response_cache().make_key(base_prompt, model) if _use_cache(payload) else None
+
+
+def _cacheable(prompt: str, base_prompt: str) -> bool:
+    """Чи можна зберегти відповідь у кеші: промпт не містить історії розмови."""
+    return prompt == base_prompt
+
+
+def _ensure_capacity(cache_key: Optional[str]) -> None:
+    """Повертає 503 ще до збереження повідомлення, якщо черга переповнена.
+    
+    Запити, на які можна відповісти з кешу, не потребують слоту генерації.
+    """
+    if cache_key is not None and get_response_cache().peek(cache_key):
+        return
+    if get_llm_client().limiter.is_full():
+        _reserve_llm_slot()
+
+
+def _reserve_llm_slot() -> QueueTicket:
+    """Резервує місце в черзі до мовної моделі або повертає 503."""
+    try:
+        return get_llm_client().limiter.reserve()
+    except LLMQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"},
+        ) from e
+
+
+@router.post("/chat")
+async def chat(
+    payload: Dict[str, Any],
+    session: Session = Depends(get_session),
+    current_user: User = Depends(require_current_user),
+) -> Dict[str, Any]:
+    """Приймає повідомлення користувача, викликає LLM та повертає відповідь.
+    
+    Поле queue у відповіді містить позицію в черзі на момент запиту
+    та фактичний час очікування слоту генерації (мс).
+    Поле cache: "hit", "miss", "coalesced" (спільна генерація з однаковим запитом)
+    або "bypass" (кеш вимкнено полем use_cache=false).
+    Поле context: оцінка кількості токенів промпту та використаної історії розмови.
+    
+    Запити до БД (контекст, історія, збереження повідомлень) виконуються в пулі
+    потоків, щоб не блокувати event loop; асинхронним лишається лише виклик LLM.
+    """
+    llm = get_llm_client()
+    cache = get_response_cache()
+    prompt, base_prompt, user_message, prediction_id, context = await run_in_threadpool(
+        _build_assistant_turn, payload, session, current_user
+    )
+    cache_key = _cache_key(payload, base_prompt, llm.model)
+    _ensure_capacity(cache_key)
+
     # 1) Зберігаємо повідомлення користувача
-    add_message(
+    await run_in_threadpool(
+        add_message,
         session,
         user_id=current_user.id,
         role="user",
@@ -88,22 +211,37 @@ def chat(
         prediction_id=prediction_id,
     )
 
-    # Отримуємо мову з payload (за замовчуванням українська)
-    language = payload.get("language", "uk")
-    if language not in ["uk", "en"]:
-        language = "uk"
-
-    # 2) Будуємо контекст за вибраним (або останнім) прогнозом
-    context = build_health_context(session, current_user.id, prediction_id=prediction_id, language=language)
+    # 2) Очікування слоту та виклик Ollama (або відповідь з кешу)
+    queue = {"position": 0, "wait_ms": 0}
 
-    # 3) Формуємо підказ для моделі
-    prompt = build_assistant_prompt(context, user_message, language=language)
+    async def generate() -> str:
+        ticket = _reserve_llm_slot()
+        try:
+            await ticket.wait()
+            text = await llm.generate(prompt)
+        finally:
+            ticket.release()
+            queue.update(ticket.as_dict())
+        if not text:
+            raise LLMEmptyResponseError(LLM_EMPTY_MESSAGE)
+        return text
 
-    # 4) Виклик Ollama
-    answer = call_ollama(prompt)
+    try:
+        if cache_key is None:
+            cache.record_bypass()
+            answer, cache_status = await generate(), "bypass"
+        else:
+            answer, cache_status = await cache.get_or_create(
+                cache_key, generate, store=_cacheable(prompt, base_prompt)
+            )
+    except LLMEmptyResponseError:
+        answer, cache_status = LLM_EMPTY_MESSAGE, "bypass" if cache_key is None else "miss"
+    except LLMError:
+        answer, cache_status = LLM_ERROR_MESSAGE, "bypass" if cache_key is None else "miss"
 
-    # 5) Зберігаємо відповідь асистента
-    msg = add_message(
+    # 3) Зберігаємо відповідь асистента
+    msg = await run_in_threadpool(
+        add_message,
         session,
         user_id=current_user.id,
         role="assistant",
@@ -111,14 +249,143 @@ def chat(
         prediction_id=prediction_id,
     )
 
-    # 6) Повертаємо відповідь
+    # 4) Повертаємо відповідь
     return {
         "answer": msg.content,
         "created_at": msg.created_at.isoformat(),
         "role": "assistant",
+        "queue": queue,
+        "cache": cache_status,
+        "context": context,
     }
 
 
+def _save_streamed_answer(bind: Any, user_id: int, content: str, prediction_id: Optional[int]) -> str:
+    """Зберігає відповідь потокового чату в окремій сесії. Повертає created_at (ISO).
+
+    Сесія запиту після початку потоку вже може бути закрита, тому для запису
+    після генерації відкривається нова (викликається в пулі потоків).
+    """
+    with session_scope(bind) as session:
+        msg = add_message(
+            session,
+            user_id=user_id,
+            role="assistant",
+            content=content,
+            prediction_id=prediction_id,
+        )
+        return msg.created_at.isoformat()
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Форматує одну подію Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    payload: Dict[str, Any],
+    request: Request,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(require_current_user),
+) -> StreamingResponse:
+    """Потоковий варіант /assistant/chat (Server-Sent Events).
+    
+    Події:
+    - queue: {"position": N} — запит чекає у черзі (лише якщо слоти зайняті)
+    - token: {"delta": "..."} — черговий фрагмент відповіді
+    - done: {"answer", "created_at", "role", "queue", "cache", "context"} — відповідь збережено в історії
+    - error: {"detail": "..."} — мовна модель недоступна, відповідь не збережено
+    
+    Якщо клієнт відʼєднується, запит до Ollama скасовується,
+    а часткова відповідь не зберігається.
+    Відповідь з кешу надсилається одним токеном; повна згенерована відповідь
+    потрапляє в кеш (обʼєднання одночасних запитів діє лише для /assistant/chat).
+    
+    Запити до БД виконуються в пулі потоків; відповідь після генерації
+    зберігається в окремій сесії (див. _save_streamed_answer).
+    """
+    llm = get_llm_client()
+    cache = get_response_cache()
+    prompt, base_prompt, user_message, prediction_id, context = await run_in_threadpool(
+        _build_assistant_turn, payload, session, current_user
+    )
+    cache_key = _cache_key(payload, base_prompt, llm.model)
+    _ensure_capacity(cache_key)
+    user_id, bind = current_user.id, session.get_bind()
+    await run_in_threadpool(
+        add_message,
+        session,
+        user_id=current_user.id,
+        role="user",
+        content=user_message,
+        prediction_id=prediction_id,
+    )
+
+    async def event_stream() -> AsyncIterator[str]:
+        if cache_key is None:
+            cache.record_bypass()
+            cache_status = "bypass"
+        else:
+            cached = cache.lookup(cache_key)
+            cache_status = "miss" if cached is None else "hit"
+
+        queue = {"position": 0, "wait_ms": 0}
+        parts: List[str] = []
+        if cache_status == "hit":
+            parts.append(cached)
+            yield _sse_event("token", {"delta": cached})
+        else:
+            # Слот резервується всередині генератора, щоб гарантовано звільнитися в finally
+            try:
+                ticket = llm.limiter.reserve()
+            except LLMQueueFullError as e:
+                yield _sse_event("error", {"detail": str(e)})
+                return
+
+            try:
+                if ticket.position:
+                    yield _sse_event("queue", {"position": ticket.position})
+                await ticket.wait()
+                # aclosing гарантує закриття зʼєднання з Ollama при скасуванні
+                async with aclosing(stream_ollama(prompt)) as tokens:
+                    async for part in tokens:
+                        if await request.is_disconnected():
+                            return
+                        parts.append(part)
+                        yield _sse_event("token", {"delta": part})
+            except LLMError as e:
+                yield _sse_event("error", {"detail": str(e)})
+                return
+            finally:
+                ticket.release()
+                queue = ticket.as_dict()
+
+        answer = "".join(parts).strip()
+        if not answer:
+            answer = LLM_EMPTY_MESSAGE
+        elif cache_key is not None and cache_status == "miss" and _cacheable(prompt, base_prompt):
+            cache.set(cache_key, answer)
+        created_at = await run_in_threadpool(_save_streamed_answer, bind, user_id, answer, prediction_id)
+        yield _sse_event(
+            "done",
+            {
+                "answer": answer,
+                "created_at": created_at,
+                "role": "assistant",
+                "queue": queue,
+                "cache": cache_status,
+                "context": context,
+            },
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/history")
 def clear_history(
     session: Session = Depends(get_session),
@@ -130,45 +397,50 @@ def clear_history(
 
 
 @router.get("/health")
-def check_ollama_health() -> Dict[str, Any]:
+async def check_ollama_health() -> Dict[str, Any]:
     """Перевірка статусу Ollama.
     
-    Робить простий тестовий запит до Ollama для перевірки доступності.
-    Не вимагає автентифікації, оскільки це системний endpoint.
+    Запитує перелік моделей (GET /api/tags) — це не генерація, тому перевірка
+    не займає слот черги і не навантажує модель. Не вимагає автентифікації,
+    оскільки це системний endpoint. Відповідь містить стан черги (concurrency),
+    метрики кешу відповідей (cache) та ознаку model_available — чи завантажена
+    в Ollama модель, яку використовує асистент.
     """
-    from datetime import datetime
-    import requests
-    from src.service.services.assistant_llm import OLLAMA_MODEL, OLLAMA_URL
+    import httpx
     
+    llm = get_llm_client()
     start_time = datetime.utcnow()
     
     try:
-        # Використовуємо ту саму модель та URL, що й в assistant_llm.py
-        # Простий тестовий запит до Ollama (дуже короткий prompt для швидкої перевірки)
-        payload = {"model": OLLAMA_MODEL, "prompt": "ok", "stream": False}
-        resp = requests.post(OLLAMA_URL, json=payload, timeout=10)
+        resp = await llm.http().get(llm.tags_url, timeout=10)
         end_time = datetime.utcnow()
         
         latency_ms = int((end_time - start_time).total_seconds() * 1000)
         
-        if resp.ok:
-            # Перевіряємо, чи є в відповіді поле response (означає, що Ollama працює)
+        if resp.is_success:
+            # Поле models означає, що Ollama працює; модель шукаємо з тегом і без
             try:
                 data = resp.json()
-                if data.get("response") is not None:
+                if isinstance(data.get("models"), list):
+                    names = {str(m.get("name", "")) for m in data["models"] if isinstance(m, dict)}
                     return {
                         "status": "online",
                         "is_available": True,
+                        "model_available": llm.model in names or llm.model in {n.split(":")[0] for n in names},
                         "latency_ms": latency_ms,
                         "timestamp": end_time.isoformat(),
+                        "concurrency": llm.stats(),
+                        "cache": get_response_cache().stats(),
                     }
                 else:
                     return {
                         "status": "error",
                         "is_available": False,
-                        "error": "Ollama повернув порожню відповідь",
+                        "error": "Ollama повернув неочікувану відповідь",
                         "latency_ms": latency_ms,
                         "timestamp": end_time.isoformat(),
+                        "concurrency": llm.stats(),
+                        "cache": get_response_cache().stats(),
                     }
             except Exception:
                 # Якщо не вдалося розпарсити JSON, але статус OK - вважаємо, що працює
@@ -177,6 +449,8 @@ def check_ollama_health() -> Dict[str, Any]:
                     "is_available": True,
                     "latency_ms": latency_ms,
                     "timestamp": end_time.isoformat(),
+                    "concurrency": llm.stats(),
+                    "cache": get_response_cache().stats(),
                 }
         else:
             return {
@@ -185,22 +459,28 @@ def check_ollama_health() -> Dict[str, Any]:
                 "error": f"HTTP {resp.status_code}",
                 "latency_ms": latency_ms,
                 "timestamp": end_time.isoformat(),
+                "concurrency": llm.stats(),
+                "cache": get_response_cache().stats(),
             }
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         end_time = datetime.utcnow()
         return {
             "status": "timeout",
             "is_available": False,
             "error": "Timeout при зверненні до Ollama (перевірте, чи запущений Ollama)",
             "timestamp": end_time.isoformat(),
+            "concurrency": llm.stats(),
+            "cache": get_response_cache().stats(),
         }
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         end_time = datetime.utcnow()
         return {
             "status": "offline",
             "is_available": False,
             "error": "Ollama недоступна (помилка підключення). Перевірте, чи запущений Ollama: ollama serve",
             "timestamp": end_time.isoformat(),
+            "concurrency": llm.stats(),
+            "cache": get_response_cache().stats(),
         }
     except Exception as e:
         end_time = datetime.utcnow()
@@ -209,6 +489,6 @@ def check_ollama_health() -> Dict[str, Any]:
             "is_available": False,
             "error": f"Помилка: {str(e)}",
             "timestamp": end_time.isoformat(),
+            "concurrency": llm.stats(),
+            "cache": get_response_cache().stats(),
         }
-
-
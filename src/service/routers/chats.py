@@ -2,13 +2,17 @@
 Маршрути для чатів між користувачами.
 """
 
+import asyncio
+import json
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Iterable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
 from sqlmodel import Session
 
-from ..auth_utils import require_current_user
+from .. import settings
+from ..auth_utils import get_user_from_token, require_current_user
 from ..db import get_session
 from ..models import Chat, ChatMessage, User
 from ..repositories import (
@@ -17,7 +21,7 @@ from ..repositories import (
     get_blocked_user_ids,
     get_blocked_users_with_timestamps,
     get_chat_by_uuid,
-    get_chat_messages,
+    get_chat_messages_page,
     get_last_chat_message,
     get_or_create_chat,
     get_unread_count,
@@ -33,16 +37,40 @@ from ..schemas import (
     ChatDetailResponse,
     ChatListItem,
     ChatMessageItem,
+    ChatMessagesPage,
     CreateChatRequest,
     ReorderChatsRequest,
     SendMessageRequest,
     UserListItem,
 )
+from ..services.chat_hub import OVERFLOW, Subscriber, hub
 
 # Chat API router - will be mounted at /api/chats in main app
 # Routes defined here will be accessible at /api/chats/* (e.g., /api/chats, /api/chats/unread-count)
 router = APIRouter(prefix="/chats", tags=["chats"])
 
+# Розмір сторінки повідомлень: останні CHAT_PAGE_SIZE при відкритті чату, старші — при прокрутці
+CHAT_PAGE_SIZE = 50
+CHAT_PAGE_MAX = 200
+
+# Коди закриття WebSocket: 4401 — немає/недійсний токен, 1013 — клієнт не встигає читати події
+WS_CLOSE_UNAUTHORIZED = 4401
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+
+
+def _publish(user_ids: Iterable[int], event_type: str, **data: Any) -> None:
+    """Надсилає подію підключеним через WebSocket учасникам (після коміту в БД)."""
+    hub.publish(user_ids, {"type": event_type, **jsonable_encoder(data)})
+
+
+def _publish_read(chat: Chat, reader_id: int, count: int) -> None:
+    """Сповіщає про прочитані повідомлення: відправника — квитанцією, читача — зміною лічильника."""
+    if count <= 0:
+        return
+    sender_id = chat.user2_id if chat.user1_id == reader_id else chat.user1_id
+    _publish([sender_id], "messages.read", chat_uuid=chat.uuid, reader_id=reader_id, count=count)
+    _publish([reader_id], "unread.delta", chat_uuid=chat.uuid, delta=-count)
+
 
 def _build_user_list_item(user: User, is_blocked: bool = False, blocked_at: Optional[datetime] = None) -> UserListItem:
     """Створює UserListItem з User."""
@@ -201,8 +229,8 @@ async def create_chat(
     # Створюємо або отримуємо чат
     chat = get_or_create_chat(session, current_user.id, payload.user_id)
     
-    # Отримуємо повідомлення
-    messages = get_chat_messages(session, chat.id)
+    # Отримуємо останню сторінку повідомлень
+    messages, has_more = get_chat_messages_page(session, chat.id, limit=CHAT_PAGE_SIZE)
     unread = get_unread_count_for_chat(session, chat.id, current_user.id)
     
     return ChatDetailResponse(
@@ -214,16 +242,22 @@ async def create_chat(
         ),
         messages=[_build_chat_message_item(msg) for msg in messages],
         unread_count=unread,
+        has_more=has_more,
     )
 
 
 @router.get("/{chat_uuid}", response_model=ChatDetailResponse)
 async def get_chat(
     chat_uuid: str,
+    limit: int = Query(CHAT_PAGE_SIZE, ge=1, le=CHAT_PAGE_MAX),
     current_user: User = Depends(require_current_user),
     session: Session = Depends(get_session),
 ) -> ChatDetailResponse:
-    """Отримує детальну інформацію про чат за UUID."""
+    """Отримує детальну інформацію про чат за UUID.
+    
+    Повертає лише останні limit повідомлень; старіші підвантажуються
+    через GET /{chat_uuid}/messages?before_id=... (has_more=True).
+    """
     # Перевіряємо, чи поточний користувач не заблокований
     if not current_user.is_active:
         raise HTTPException(
@@ -247,13 +281,14 @@ async def get_chat(
             detail="Користувач не знайдено.",
         )
     
-    # Отримуємо повідомлення
-    messages = get_chat_messages(session, chat.id)
+    # Отримуємо останню сторінку повідомлень
+    messages, has_more = get_chat_messages_page(session, chat.id, limit=limit)
     unread = get_unread_count_for_chat(session, chat.id, current_user.id)
     
     # Позначаємо повідомлення як прочитані
     if unread > 0:
-        mark_messages_as_read(session, chat.id, current_user.id)
+        marked = mark_messages_as_read(session, chat.id, current_user.id)
+        _publish_read(chat, current_user.id, marked)
         unread = 0
     
     return ChatDetailResponse(
@@ -265,6 +300,43 @@ async def get_chat(
         ),
         messages=[_build_chat_message_item(msg) for msg in messages],
         unread_count=unread,
+        has_more=has_more,
+    )
+
+
+@router.get("/{chat_uuid}/messages", response_model=ChatMessagesPage)
+async def list_chat_messages(
+    chat_uuid: str,
+    before_id: Optional[int] = Query(None, ge=1),
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(CHAT_PAGE_SIZE, ge=1, le=CHAT_PAGE_MAX),
+    current_user: User = Depends(require_current_user),
+    session: Session = Depends(get_session),
+) -> ChatMessagesPage:
+    """Сторінка повідомлень чату за курсором.
+    
+    - before_id: старіші повідомлення (прокрутка вгору), has_more — чи є ще старіші
+    - after_id: новіші за останнє побачене повідомлення (дешеве оновлення), has_more — чи є ще новіші
+    
+    На відміну від GET /{chat_uuid}, не позначає повідомлення прочитаними.
+    """
+    if before_id is not None and after_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Можна вказати лише один з параметрів before_id або after_id.",
+        )
+    chat = get_chat_by_uuid(session, chat_uuid, current_user.id)
+    if not chat:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Чат не знайдено.",
+        )
+    messages, has_more = get_chat_messages_page(
+        session, chat.id, limit=limit, before_id=before_id, after_id=after_id
+    )
+    return ChatMessagesPage(
+        messages=[_build_chat_message_item(msg) for msg in messages],
+        has_more=has_more,
     )
 
 
@@ -321,7 +393,10 @@ async def send_message(
         )
     
     message = add_chat_message(session, chat.id, current_user.id, payload.content)
-    return _build_chat_message_item(message)
+    item = _build_chat_message_item(message)
+    _publish([chat.user1_id, chat.user2_id], "message.created", chat_uuid=chat.uuid, message=item)
+    _publish([other_user_id], "unread.delta", chat_uuid=chat.uuid, delta=1)
+    return item
 
 
 @router.post("/{chat_uuid}/read", response_model=dict)
@@ -339,6 +414,7 @@ async def mark_chat_as_read(
         )
     
     count = mark_messages_as_read(session, chat.id, current_user.id)
+    _publish_read(chat, current_user.id, count)
     return {"marked_read": count}
 
 
@@ -370,6 +446,13 @@ async def toggle_pin_chat(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Чат не знайдено.",
         )
+    _publish(
+        [chat.user1_id, chat.user2_id],
+        "chat.pinned",
+        chat_uuid=chat.uuid,
+        is_pinned=chat.is_pinned,
+        order=chat.order,
+    )
     return {"is_pinned": chat.is_pinned, "order": chat.order}
 
 
@@ -388,5 +471,98 @@ async def reorder_chats_endpoint(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Не вдалося оновити порядок чатів.",
         )
+    _publish([current_user.id], "chats.reordered", chats=chat_orders)
     return {"success": True}
 
+
+async def _ws_reader(websocket: WebSocket) -> None:
+    """Читає повідомлення клієнта: відповідає на ping, закриває неактивне зʼєднання."""
+    while True:
+        try:
+            raw = await asyncio.wait_for(websocket.receive_text(), timeout=settings.CHAT_WS_IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            await websocket.close(code=status.WS_1001_GOING_AWAY)
+            return
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(message, dict) and message.get("type") == "ping":
+            await websocket.send_json({"type": "pong"})
+
+
+async def _ws_writer(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Передає події з черги клієнту та надсилає heartbeat, якщо подій немає."""
+    while True:
+        try:
+            event = await asyncio.wait_for(
+                subscriber.queue.get(), timeout=settings.CHAT_WS_HEARTBEAT_INTERVAL
+            )
+        except asyncio.TimeoutError:
+            event = {"type": "ping", "ts": datetime.utcnow().isoformat()}
+        if event is OVERFLOW:
+            # Клієнт не встигає: відключаємо, після перепідключення він синхронізується через REST
+            await websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER, reason="slow consumer")
+            return
+        await websocket.send_json(event)
+
+
+@router.websocket("/ws")
+async def chats_ws(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    session: Session = Depends(get_session),
+) -> None:
+    """Доставка подій чатів у реальному часі замість опитування REST-ендпоінтів.
+    
+    Автентифікація: JWT у параметрі ?token=... (браузери не дозволяють заголовки для WebSocket)
+    або в заголовку Authorization: Bearer.
+    
+    Події сервера:
+    - hello: {"user_id", "unread_count", "heartbeat"} — одразу після підключення
+    - message.created: {"chat_uuid", "message"} — нове повідомлення в чаті
+    - messages.read: {"chat_uuid", "reader_id", "count"} — співрозмовник прочитав повідомлення
+    - unread.delta: {"chat_uuid", "delta"} — зміна загальної кількості непрочитаних
+    - chat.pinned: {"chat_uuid", "is_pinned", "order"}; chats.reordered: {"chats"}
+    - ping: heartbeat; клієнт може надсилати {"type": "ping"} і отримає {"type": "pong"}
+    """
+    if not token:
+        auth_header = websocket.headers.get("authorization", "")
+        if auth_header.lower().startswith("bearer "):
+            token = auth_header[len("bearer "):]
+    user = get_user_from_token(session, token)
+    if user is None:
+        await websocket.close(code=WS_CLOSE_UNAUTHORIZED)
+        return
+
+    await websocket.accept()
+    subscriber = hub.subscribe(user.id)
+    try:
+        await websocket.send_json(
+            {
+                "type": "hello",
+                "user_id": user.id,
+                "unread_count": get_unread_count(session, user.id),
+                "heartbeat": settings.CHAT_WS_HEARTBEAT_INTERVAL,
+            }
+        )
+        # Сесія БД не потрібна на час життя зʼєднання
+        session.close()
+
+        tasks = {
+            asyncio.create_task(_ws_reader(websocket)),
+            asyncio.create_task(_ws_writer(websocket, subscriber)),
+        }
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, (WebSocketDisconnect, RuntimeError)):
+                raise exc
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(subscriber)
+
@@ -0,0 +1,64 @@
+"""
+Маршрути повнотекстового пошуку по повідомленнях.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+
+from ..auth_utils import require_current_user
+from ..db import get_session
+from ..models import User
+from ..schemas import SearchResponse, SearchResultItem
+from ..services.message_search import (
+    SEARCH_SCOPES,
+    SearchUnavailableError,
+    build_match_query,
+    search_messages,
+)
+
+# Монтується з префіксом /api: GET /api/search
+router = APIRouter(prefix="/search", tags=["search"])
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_PAGE_MAX = 50
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Пошуковий запит"),
+    scope: str = Query("all", description="Де шукати: all, chats або assistant"),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=SEARCH_PAGE_MAX),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(require_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Шукає в чатах користувача та його розмові з асистентом.
+
+    Результати впорядковані за релевантністю (BM25), фрагменти містять
+    збіги в <mark>. Чати із заблокованими користувачами не враховуються.
+    """
+    if scope not in SEARCH_SCOPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Невідома область пошуку. Допустимі: {', '.join(SEARCH_SCOPES)}",
+        )
+    if not build_match_query(q):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Запит не містить слів для пошуку",
+        )
+
+    try:
+        results, has_more = search_messages(
+            session, current_user.id, q, scope=scope, limit=limit, offset=offset
+        )
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return SearchResponse(
+        query=q,
+        results=[SearchResultItem(**item) for item in results],
+        has_more=has_more,
+        offset=offset,
+    )
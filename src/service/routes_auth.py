@@ -7,7 +7,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import select, Session
@@ -20,6 +21,7 @@ from .auth_utils import (
     verify_password,
 )
 from .i18n import get_accept_language, t
+from .archive import delete_archived_rows
 from .avatar_utils import AVATARS_DIR, delete_avatar, save_avatar, validate_image_file
 from .db import get_session
 from .models import PasswordResetToken, PredictionHistory, User
@@ -47,6 +49,14 @@ from .schemas import (
     UserRegisterRequest,
     UserUpdateRequest,
 )
+from .services.history_export import (
+    EXPORT_FORMATS,
+    MEDIA_TYPES,
+    PARQUET_AVAILABLE,
+    normalize_range,
+    parse_columns,
+    stream_history_export,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 users_router = APIRouter(prefix="/users", tags=["users"])
@@ -1023,6 +1033,65 @@ async def users_history_stats(
     )
 
 
+@users_router.get("/me/history/export")
+async def users_history_export(
+    request: Request,
+    format: str = Query("csv", description="Формат файлу: csv або parquet"),
+    columns: Optional[str] = Query(None, description="Колонки через кому (за замовчуванням — усі, крім inputs)"),
+    since: Optional[datetime] = Query(None, description="Записи, створені не раніше (UTC)"),
+    until: Optional[datetime] = Query(None, description="Записи, створені раніше (UTC)"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(require_current_user),
+) -> StreamingResponse:
+    """
+    Експортує всю історію прогнозів користувача файлом CSV або Parquet.
+
+    Файл формується потоково порціями записів, тому пам'ять не залежить
+    від розміру історії (на відміну від /me/history з лімітом).
+    """
+    lang = get_accept_language(request.headers)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=t("auth.api.history.exportUnknownFormat", lang=lang, formats=", ".join(EXPORT_FORMATS)),
+        )
+    if format == "parquet" and not PARQUET_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=t("auth.api.history.exportParquetUnavailable", lang=lang),
+        )
+    try:
+        selected = parse_columns(columns)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=t("auth.api.history.exportUnknownColumns", lang=lang, columns=str(e)),
+        )
+    try:
+        since, until = normalize_range(since, until)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=t("auth.api.history.exportInvalidRange", lang=lang),
+        )
+
+    # Генератор читає БД власними з'єднаннями: сесія запиту закривається раніше, ніж закінчиться відповідь
+    body = stream_history_export(
+        session.get_bind(),
+        current_user.id,
+        fmt=format,
+        columns=selected,
+        since=since,
+        until=until,
+    )
+    filename = f"prediction_history_{datetime.utcnow():%Y%m%d_%H%M%S}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @users_router.delete("/me/history/{prediction_id}", status_code=status.HTTP_200_OK)
 async def users_delete_history_entry(
     prediction_id: int,
@@ -1050,7 +1119,7 @@ async def delete_account(
     Видаляє обліковий запис поточного користувача.
     
     Видаляє:
-    - Всю історію прогнозів користувача
+    - Всю історію прогнозів користувача (разом з архівами)
     - Токени відновлення пароля
     - Завантажений аватар (якщо є)
     - Самого користувача з бази даних
@@ -1085,6 +1154,9 @@ async def delete_account(
         # Видаляємо користувача
         session.delete(current_user)
         session.commit()
+
+        # Прогнози, вже перенесені в архіви
+        delete_archived_rows(session.get_bind(), "predictionhistory", "user_id = ?", (user_id,))
         
         return {"detail": t("auth.api.account.deleted", lang=lang)}
         
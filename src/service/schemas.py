@@ -220,6 +220,28 @@ class PredictionHistoryStats(BaseModel):
     time_series: List[dict] = Field(..., description="Часова серія прогнозів з датами та ймовірностями")
 
 
+class AnalyticsSummaryResponse(BaseModel):
+    """Популяційне зведення прогнозів за інтервал (з агрегатів)."""
+
+    since: datetime
+    until: datetime
+    count: int
+    mean_probability: Optional[float] = None
+    by_risk_bucket: dict = Field(..., description="Кількість і частка прогнозів по категоріях ризику")
+    by_target: dict = Field(..., description="Кількість, середня ймовірність і розподіл ризику по цілях")
+    by_model: dict = Field(..., description="Кількість і середня ймовірність по моделях")
+    series: List[dict] = Field(default_factory=list, description="Часовий ряд з кроком hour або day")
+
+
+class PredictionFeatureStatsResponse(BaseModel):
+    """Агрегати ознак прогнозів за інтервал (з типізованих колонок)."""
+
+    since: datetime
+    until: datetime
+    count: int
+    features: dict = Field(..., description="Ознака -> count, mean, min, max (без пропусків)")
+
+
 # ========== Chat schemas ==========
 
 class UserListItem(BaseModel):
@@ -269,6 +291,36 @@ class ChatDetailResponse(BaseModel):
     other_user: UserListItem
     messages: List[ChatMessageItem]
     unread_count: int = 0
+    has_more: bool = False  # чи є старіші повідомлення (підвантажуються через before_id)
+
+
+class ChatMessagesPage(BaseModel):
+    """Сторінка повідомлень чату для курсорної пагінації."""
+    
+    messages: List[ChatMessageItem]
+    has_more: bool = False
+
+
+class SearchResultItem(BaseModel):
+    """Знайдене повідомлення з підсвіченим фрагментом."""
+    
+    source: str = Field(..., description="Джерело: chat або assistant")
+    message_id: int
+    chat_uuid: Optional[str] = None
+    sender_id: Optional[int] = None
+    role: Optional[str] = None
+    snippet: str = Field(..., description="HTML-екранований фрагмент зі збігами в <mark>")
+    created_at: datetime
+    rank: float = Field(..., description="BM25-ранг у межах свого джерела (менше — релевантніше)")
+
+
+class SearchResponse(BaseModel):
+    """Сторінка результатів повнотекстового пошуку."""
+    
+    query: str
+    results: List[SearchResultItem]
+    has_more: bool = False
+    offset: int = 0
 
 
 class SendMessageRequest(BaseModel):
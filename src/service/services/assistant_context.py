@@ -0,0 +1,157 @@
+"""
+Памʼять розмови асистента з обмеженням розміру промпту.
+
+- estimate_tokens: оцінка кількості токенів тексту без токенізатора моделі
+- build_conversation_history: добирає останні повідомлення у бюджет токенів,
+  а давніші згортає у підсумок, що зберігається в БД і не перераховується повторно
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlmodel import Session
+
+from src.service.models import AssistantMessage
+from src.service.repositories import get_assistant_summary, get_messages_after, save_assistant_summary
+
+# Для змішаного українсько-англійського тексту BPE-токенізатори дають ~3 символи на токен;
+# беремо консервативну оцінку, щоб не перевищувати контекстне вікно
+CHARS_PER_TOKEN = 3.0
+# Скільки символів з кожного давнього повідомлення потрапляє в підсумок
+SUMMARY_LINE_CHARS = 160
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…])\s")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+ROLE_LABELS = {
+    "uk": {"user": "Користувач", "assistant": "Асистент"},
+    "en": {"user": "User", "assistant": "Assistant"},
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Оцінює кількість токенів тексту (з запасом, без токенізатора моделі)."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class ConversationHistory:
+    """Результат добору історії для промпту."""
+
+    summary: str = ""
+    turns: str = ""
+    tokens: int = 0
+    messages: int = 0
+    summarized_upto: Optional[int] = None
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "history_tokens": self.tokens,
+            "history_messages": self.messages,
+            "summarized_upto": self.summarized_upto or 0,
+        }
+
+
+def format_turn(message: AssistantMessage, language: str = "uk") -> str:
+    """Форматує одне повідомлення для блоку історії в промпті."""
+    labels = ROLE_LABELS.get(language, ROLE_LABELS["uk"])
+    content = _WHITESPACE_RE.sub(" ", message.content).strip()
+    return f"{labels.get(message.role, message.role)}: {content}"
+
+
+def summarize_turn(message: AssistantMessage, language: str = "uk") -> str:
+    """Стискає повідомлення до першого речення (не довше SUMMARY_LINE_CHARS)."""
+    labels = ROLE_LABELS.get(language, ROLE_LABELS["uk"])
+    content = _WHITESPACE_RE.sub(" ", message.content).strip()
+    first = _SENTENCE_END_RE.split(content, maxsplit=1)[0]
+    if len(first) > SUMMARY_LINE_CHARS:
+        first = first[: SUMMARY_LINE_CHARS - 1].rstrip() + "…"
+    return f"- {labels.get(message.role, message.role)}: {first}"
+
+
+def _fit_summary(lines: List[str], max_tokens: int) -> List[str]:
+    """Залишає найновіші рядки підсумку, що вміщуються в max_tokens."""
+    kept: List[str] = []
+    used = 0
+    for line in reversed(lines):
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return list(reversed(kept))
+
+
+def build_conversation_history(
+    session: Session,
+    user_id: int,
+    budget_tokens: int,
+    max_messages: int = 12,
+    summary_max_tokens: int = 256,
+    language: str = "uk",
+) -> ConversationHistory:
+    """Добирає історію розмови, що вміщується в budget_tokens.
+
+    Найновіші повідомлення додаються дослівно (не більше max_messages).
+    Повідомлення, що не вмістилися, згортаються у підсумок: кожне рівно один раз,
+    бо підсумок зберігається в БД разом з id останнього покритого повідомлення.
+    Підсумок теж обмежений (summary_max_tokens), тож розмір промпту не росте
+    разом з довжиною розмови.
+    """
+    if budget_tokens <= 0:
+        return ConversationHistory()
+
+    stored = get_assistant_summary(session, user_id)
+    after_id = stored.upto_message_id if stored else 0
+    pending = get_messages_after(session, user_id, after_id=after_id)
+
+    summary_lines = stored.content.splitlines() if stored and stored.content else []
+    summary_reserve = min(summary_max_tokens, budget_tokens // 3)
+    pending_tokens = sum(estimate_tokens(format_turn(m, language)) + 1 for m in pending)
+    if summary_lines or pending_tokens > budget_tokens or len(pending) > max_messages:
+        recent_budget = budget_tokens - summary_reserve
+    else:
+        recent_budget = budget_tokens
+
+    # Добираємо найновіші повідомлення у бюджет
+    recent: List[str] = []
+    used = 0
+    for message in reversed(pending):
+        if len(recent) >= max_messages:
+            break
+        line = format_turn(message, language)
+        cost = estimate_tokens(line) + 1
+        if used + cost > recent_budget:
+            break
+        recent.append(line)
+        used += cost
+    recent.reverse()
+
+    # Решту згортаємо у підсумок і зберігаємо, щоб не стискати їх повторно
+    overflow = pending[: len(pending) - len(recent)]
+    if overflow:
+        summary_lines = _fit_summary(
+            summary_lines + [summarize_turn(m, language) for m in overflow],
+            summary_reserve,
+        )
+        stored = save_assistant_summary(
+            session,
+            user_id=user_id,
+            content="\n".join(summary_lines),
+            upto_message_id=overflow[-1].id,
+            token_count=sum(estimate_tokens(line) + 1 for line in summary_lines),
+        )
+
+    summary = "\n".join(summary_lines)
+    return ConversationHistory(
+        summary=summary,
+        turns="\n".join(recent),
+        tokens=used + (stored.token_count if stored and summary else 0),
+        messages=len(recent),
+        summarized_upto=stored.upto_message_id if stored else None,
+    )
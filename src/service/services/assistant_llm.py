@@ -5,20 +5,73 @@
 - build_health_context: формує короткий контекст про останній ризик користувача
 - build_assistant_prompt: конструює повний підказ (prompt) для моделі
 - call_ollama: викликає локальний Ollama та повертає текст відповіді
+- stream_ollama: асинхронно передає токени відповіді Ollama по мірі генерації
+- get_llm_client: спільний пуловий клієнт Ollama з обмеженням конкурентності
+- get_response_cache: спільний кеш відповідей асистента (TTL + LRU)
 """
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 
-import json
-import requests
 from sqlmodel import Session, select
 
+from src.service import settings
 from src.service.models import PredictionHistory, User
+from src.service.services.llm_client import LLMError, OllamaClient
+from src.service.services.response_cache import ResponseCache
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
-OLLAMA_MODEL = "llama3"
+LLM_ERROR_MESSAGE = "Сталася помилка під час звернення до мовної моделі. Спробуйте ще раз пізніше."
+LLM_EMPTY_MESSAGE = "На жаль, не вдалося отримати відповідь від мовної моделі."
+
+_llm_client: Optional[OllamaClient] = None
+_response_cache: Optional[ResponseCache] = None
+
+
+def configure_llm_client(**overrides: Any) -> OllamaClient:
+    """Створює спільний клієнт Ollama з налаштувань (settings) та перевизначень.
+    
+    Попередній клієнт не закривається тут: його пул привʼязаний до свого event loop
+    і закривається при завершенні роботи сервісу (close_llm_client).
+    """
+    global _llm_client
+    options = {
+        "url": settings.OLLAMA_URL,
+        "model": settings.OLLAMA_MODEL,
+        "timeout": settings.OLLAMA_TIMEOUT,
+        "connect_timeout": settings.OLLAMA_CONNECT_TIMEOUT,
+        "max_concurrency": settings.OLLAMA_MAX_CONCURRENCY,
+        "max_queue": settings.OLLAMA_MAX_QUEUE,
+        "max_keepalive": settings.OLLAMA_MAX_KEEPALIVE,
+        "keepalive_expiry": settings.OLLAMA_KEEPALIVE_EXPIRY,
+    }
+    options.update(overrides)
+    _llm_client = OllamaClient(**options)
+    return _llm_client
+
+
+def get_llm_client() -> OllamaClient:
+    """Повертає спільний клієнт Ollama, створюючи його за потреби."""
+    if _llm_client is None:
+        return configure_llm_client()
+    return _llm_client
+
+
+async def close_llm_client() -> None:
+    """Закриває пул зʼєднань спільного клієнта."""
+    if _llm_client is not None:
+        await _llm_client.aclose()
+
+
+def get_response_cache() -> ResponseCache:
+    """Повертає спільний кеш відповідей асистента, створюючи його за потреби."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            ttl=settings.ASSISTANT_CACHE_TTL,
+            max_entries=settings.ASSISTANT_CACHE_MAX_ENTRIES,
+        )
+    return _response_cache
 
 
 def format_percentage(prob: float) -> str:
@@ -125,7 +178,13 @@ def build_health_context(session: Session, user_id: int, prediction_id: Optional
         )
 
 
-def build_assistant_prompt(context: str, user_message: str, language: str = "uk") -> str:
+def build_assistant_prompt(
+    context: str,
+    user_message: str,
+    language: str = "uk",
+    history_summary: str = "",
+    history_turns: str = "",
+) -> str:
     """Формує повний підказ для LLM з інструкціями та контекстом.
     
     Інструкції гарантують, що відповідь не міститиме діагнозів чи призначень.
@@ -134,6 +193,8 @@ def build_assistant_prompt(context: str, user_message: str, language: str = "uk"
         context: Контекст про стан користувача
         user_message: Повідомлення користувача
         language: Мова відповіді ("uk" або "en")
+        history_summary: Підсумок давніх повідомлень розмови (див. assistant_context)
+        history_turns: Останні повідомлення розмови дослівно
     """
     # Формуємо системний промпт залежно від мови
     if language == "en":
@@ -151,10 +212,17 @@ def build_assistant_prompt(context: str, user_message: str, language: str = "uk"
             )
         else:
             context_block = f"User context: {context}"
+
+        history_block = ""
+        if history_summary:
+            history_block += f"Summary of the earlier conversation:\n{history_summary}\n\n"
+        if history_turns:
+            history_block += f"Recent conversation:\n{history_turns}\n\n"
         
         return (
             f"{system_block}\n\n"
             f"{context_block}\n\n"
+            f"{history_block}"
             f"User query: {user_message}\n\n"
             "Respond clearly and concisely, in 3–6 paragraphs. Avoid medical prescriptions."
         )
@@ -175,51 +243,45 @@ def build_assistant_prompt(context: str, user_message: str, language: str = "uk"
         else:
             context_block = f"Контекст користувача: {context}"
 
+        history_block = ""
+        if history_summary:
+            history_block += f"Підсумок попередньої розмови:\n{history_summary}\n\n"
+        if history_turns:
+            history_block += f"Останні повідомлення розмови:\n{history_turns}\n\n"
+
         return (
             f"{system_block}\n\n"
             f"{context_block}\n\n"
+            f"{history_block}"
             f"Запит користувача: {user_message}\n\n"
             "Відповідай чітко й коротко, у 3–6 абзацах. Уникай медичних призначень."
         )
 
 
-def call_ollama(prompt: str) -> str:
+async def call_ollama(prompt: str) -> str:
     """Викликає локальний Ollama та повертає текст відповіді.
     
+    Слот конкурентності має бути зарезервований викликачем (див. get_llm_client().limiter).
     У разі помилки повертає дружнє українське повідомлення.
     """
     try:
-        # Явно вимикаємо стрімінг, щоб отримати один JSON-об'єкт
-        payload = {"model": OLLAMA_MODEL, "prompt": prompt, "stream": False}
-        resp = requests.post(OLLAMA_URL, json=payload, timeout=60)
-        resp.raise_for_status()
-        content_type = resp.headers.get("content-type", "")
-        if "application/json" in content_type:
-            data = resp.json()
-            text = (data or {}).get("response") or ""
-            if not text:
-                return "На жаль, не вдалося отримати відповідь від мовної моделі."
-            return text.strip()
-        else:
-            # Деякі версії можуть повертати NDJSON рядками — спробуємо зібрати фрагменти
-            aggregated: list[str] = []
-            for line in resp.text.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                    part = obj.get("response")
-                    if part:
-                        aggregated.append(part)
-                except Exception:
-                    # Ігноруємо невалідні рядки
-                    continue
-            joined = "".join(aggregated).strip()
-            if joined:
-                return joined
-            return "Сталася помилка під час обробки відповіді мовної моделі."
-    except requests.RequestException as e:
-        return "Сталася помилка під час звернення до мовної моделі. Спробуйте ще раз пізніше."
+        text = await get_llm_client().generate(prompt)
+    except LLMError:
+        return LLM_ERROR_MESSAGE
+    if not text:
+        return LLM_EMPTY_MESSAGE
+    return text
 
 
+def stream_ollama(prompt: str) -> AsyncIterator[str]:
+    """Передає фрагменти відповіді Ollama по мірі їх генерації.
+    
+    Ollama у режимі stream повертає NDJSON: по одному JSON-обʼєкту на рядок
+    з полем response і прапорцем done в останньому рядку.
+    Якщо споживач припиняє ітерацію (наприклад, клієнт відʼєднався),
+    HTTP-зʼєднання з Ollama закривається, і генерація на боці моделі зупиняється.
+    
+    Raises:
+        LLMError: якщо Ollama недоступна або повернула помилку
+    """
+    return get_llm_client().stream(prompt)
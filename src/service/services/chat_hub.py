@@ -0,0 +1,110 @@
+"""
+In-process pub/sub для доставки подій чатів через WebSocket.
+
+- ChatHub.subscribe: реєструє зʼєднання користувача з власною обмеженою чергою
+- ChatHub.publish: розсилає подію всім зʼєднанням вказаних користувачів без очікування
+- Повільний споживач, черга якого переповнилась, отримує маркер OVERFLOW
+  і відключається: клієнт перепідключається та синхронізується через REST
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Dict, Iterable, Set
+
+from src.service import settings
+
+# Маркер переповнення черги — після нього зʼєднання закривається
+OVERFLOW: Dict[str, Any] = {"type": "overflow"}
+
+
+class Subscriber:
+    """Одне WebSocket-зʼєднання користувача з обмеженою чергою подій.
+
+    Черга належить event loop, у якому зʼєднання було відкрито; публікація
+    з іншого потоку передається в цей цикл через call_soon_threadsafe.
+    """
+
+    def __init__(self, user_id: int, max_queue: int) -> None:
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        # +1 місце для маркера OVERFLOW
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue + 1)
+        self.max_queue = max_queue
+        self.overflowed = False
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        """Ставить подію в чергу, не блокуючи видавця."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._offer(event)
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._offer, event)
+
+    def _offer(self, event: Dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.max_queue:
+            self.overflowed = True
+            self.queue.put_nowait(OVERFLOW)
+            return
+        self.queue.put_nowait(event)
+
+
+class ChatHub:
+    """Реєстр WebSocket-зʼєднань чатів, згрупованих за користувачем."""
+
+    def __init__(self, max_queue: int = 100) -> None:
+        self.max_queue = max(1, max_queue)
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.overflows = 0
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        subscriber = Subscriber(user_id, self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.user_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.user_id]
+        if subscriber.overflowed:
+            self.overflows += 1
+
+    def publish(self, user_ids: Iterable[int], event: Dict[str, Any]) -> int:
+        """Розсилає подію всім зʼєднанням користувачів. Повертає кількість адресатів."""
+        with self._lock:
+            targets = [s for uid in set(user_ids) for s in self._subscribers.get(uid, ())]
+        for subscriber in targets:
+            subscriber.offer(event)
+        self.published += 1
+        return len(targets)
+
+    def is_online(self, user_id: int) -> bool:
+        with self._lock:
+            return bool(self._subscribers.get(user_id))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            connections = sum(len(s) for s in self._subscribers.values())
+            users = len(self._subscribers)
+        return {
+            "users": users,
+            "connections": connections,
+            "published": self.published,
+            "overflows": self.overflows,
+        }
+
+
+# Спільний хаб процесу (один воркер uvicorn — один хаб)
+hub = ChatHub(max_queue=settings.CHAT_WS_QUEUE_SIZE)
@@ -0,0 +1,226 @@
+"""
+Потоковий експорт історії прогнозів у CSV та Parquet.
+
+- EXPORT_COLUMNS: доступні колонки (за замовчуванням — усі, крім сирого inputs)
+- iter_history_chunks: читає predictionhistory порціями фіксованого розміру
+- stream_history_export: генератор байтів файлу для StreamingResponse
+
+Пам'ять обмежена розміром порції незалежно від кількості записів: рядки
+читаються порціями по chunk_size (з продовженням після останнього id), кожна
+порція одразу серіалізується, а записане віддається клієнту до читання
+наступної. pyarrow потрібен лише для Parquet і імпортується при першому
+такому експорті.
+"""
+from __future__ import annotations
+
+import csv
+import importlib.util
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from src.service.archive import archive_engines
+from src.service.models import PREDICTION_FEATURE_COLUMNS, PredictionHistory
+
+EXPORT_FORMATS = ("csv", "parquet")
+EXPORT_CHUNK_SIZE = 1000
+
+# Колонка -> тип для схеми Parquet
+EXPORT_COLUMNS: Dict[str, str] = {
+    "id": "int",
+    "created_at": "datetime",
+    "target": "str",
+    "model_name": "str",
+    "probability": "float",
+    "risk_bucket": "str",
+    **{name: "float" for name in PREDICTION_FEATURE_COLUMNS},
+    "RIAGENDR": "int",
+    "inputs": "json",
+}
+DEFAULT_EXPORT_COLUMNS = tuple(name for name in EXPORT_COLUMNS if name != "inputs")
+
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+
+def parse_columns(raw: Optional[str]) -> List[str]:
+    """Розбирає список колонок через кому. ValueError — якщо є невідомі."""
+    if not raw:
+        return list(DEFAULT_EXPORT_COLUMNS)
+    columns = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+    if unknown or not columns:
+        raise ValueError(", ".join(unknown))
+    return columns
+
+
+def _naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    # created_at зберігається в UTC без часового поясу
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def normalize_range(
+    since: Optional[datetime], until: Optional[datetime]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Зводить межі до UTC без часового поясу. ValueError — якщо since не раніше until."""
+    since, until = _naive_utc(since), _naive_utc(until)
+    if since is not None and until is not None and since >= until:
+        raise ValueError("since >= until")
+    return since, until
+
+
+def iter_history_chunks(
+    engine: Engine,
+    user_id: int,
+    columns: Sequence[str],
+    *,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[List[tuple]]:
+    """Повертає записи користувача порціями (кортежі в порядку columns), за зростанням id.
+
+    Записи з архівів (див. archive.py) повертаються першими.
+
+    Кожна порція — окремий короткий запит з продовженням після останнього id:
+    повільний клієнт не тримає відкриту транзакцію читання на весь експорт.
+    Порядок за id з умовою user_id обслуговується індексом без сортування.
+    """
+    table = PredictionHistory.__table__
+    since, until = normalize_range(since, until)
+    selected = [table.c[name] for name in columns]
+    conditions = [table.c.user_id == user_id]
+    if since is not None:
+        conditions.append(table.c.created_at >= since)
+    if until is not None:
+        conditions.append(table.c.created_at < until)
+
+    # Архівні записи старші та мають менші id, тому спершу читаються архіви
+    for source in [*archive_engines(engine), engine]:
+        last_id = 0
+        while True:
+            statement = (
+                select(table.c.id, *selected)
+                .where(*conditions, table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(chunk_size)
+            )
+            with source.connect() as conn:
+                rows = conn.execute(statement).all()
+            if rows:
+                last_id = rows[-1][0]
+                yield [tuple(row[1:]) for row in rows]
+            if len(rows) < chunk_size:
+                break
+
+
+def _csv_value(value: Any, kind: str) -> Any:
+    if value is None:
+        return ""
+    if kind == "datetime":
+        return value.isoformat()
+    if kind == "json":
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _csv_chunks(chunks: Iterator[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    kinds = [EXPORT_COLUMNS[name] for name in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM, щоб Excel коректно відкривав кирилицю
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+    for chunk in chunks:
+        writer.writerows([_csv_value(v, k) for v, k in zip(row, kinds)] for row in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Файлоподібний приймач для ParquetWriter, записане забирається порціями."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _parquet_chunks(chunks: Iterator[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "str": pa.string(),
+        "datetime": pa.timestamp("us"),
+        "json": pa.string(),
+    }
+    schema = pa.schema([(name, types[EXPORT_COLUMNS[name]]) for name in columns])
+    json_columns = {i for i, name in enumerate(columns) if EXPORT_COLUMNS[name] == "json"}
+
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        # Кожна порція — окрема row group
+        for chunk in chunks:
+            arrays = [
+                [None if row[i] is None else json.dumps(row[i], ensure_ascii=False) for row in chunk]
+                if i in json_columns else [row[i] for row in chunk]
+                for i in range(len(columns))
+            ]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(arrays, schema)],
+                schema=schema,
+            ))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_history_export(
+    engine: Engine,
+    user_id: int,
+    *,
+    fmt: str = "csv",
+    columns: Optional[Sequence[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Генератор вмісту файлу експорту. Формат і колонки перевіряє викликач."""
+    columns = list(columns or DEFAULT_EXPORT_COLUMNS)
+    chunks = iter_history_chunks(engine, user_id, columns, since=since, until=until, chunk_size=chunk_size)
+    if fmt == "parquet":
+        return _parquet_chunks(chunks, columns)
+    return _csv_chunks(chunks, columns)
@@ -0,0 +1,283 @@
+"""
+Асинхронний HTTP-клієнт для Ollama з пулом зʼєднань та обмеженням конкурентності.
+
+- OllamaClient: один httpx.AsyncClient з keep-alive пулом на весь процес
+- ConcurrencyLimiter: FIFO-черга на N одночасних генерацій
+- QueueTicket: місце в черзі з позицією та часом очікування для звітності
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+import httpx
+
+
+class LLMError(RuntimeError):
+    """Помилка звернення до мовної моделі."""
+
+
+class LLMQueueFullError(LLMError):
+    """Черга очікування на генерацію переповнена."""
+
+
+class LLMEmptyResponseError(LLMError):
+    """Мовна модель повернула порожню відповідь."""
+
+
+class QueueTicket:
+    """Зарезервоване місце в черзі до мовної моделі.
+
+    position — позиція в черзі на момент резервування (0 — слот був вільний),
+    wait_ms — фактичний час очікування слоту після wait().
+    """
+
+    def __init__(self, limiter: "ConcurrencyLimiter", future: Optional[asyncio.Future], position: int) -> None:
+        self._limiter = limiter
+        self._future = future
+        self._created = time.monotonic()
+        self._holding = future is None
+        self._released = False
+        self.position = position
+        self.wait_ms = 0
+
+    async def wait(self) -> "QueueTicket":
+        """Очікує на вільний слот (одразу повертається, якщо слот уже отримано)."""
+        if self._future is not None and not self._holding:
+            try:
+                await self._future
+            except asyncio.CancelledError:
+                self._limiter._abandon(self._future)
+                self._released = True
+                raise
+            self._holding = True
+        self.wait_ms = int((time.monotonic() - self._created) * 1000)
+        self._limiter._record_wait(self.wait_ms)
+        return self
+
+    def release(self) -> None:
+        """Звільняє слот або місце в черзі. Повторний виклик нічого не робить."""
+        if self._released:
+            return
+        self._released = True
+        if self._holding:
+            self._limiter._release()
+        elif self._future is not None:
+            self._limiter._abandon(self._future)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"position": self.position, "wait_ms": self.wait_ms}
+
+    async def __aenter__(self) -> "QueueTicket":
+        return await self.wait()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.release()
+
+
+class ConcurrencyLimiter:
+    """Обмежує кількість одночасних генерацій і веде FIFO-чергу очікування."""
+
+    def __init__(self, max_concurrency: int, max_queue: int) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.total = 0
+        self.queued_total = 0
+        self.rejected = 0
+        self.total_wait_ms = 0
+        self.max_wait_ms = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def is_full(self) -> bool:
+        """Чи буде новий запит відхилено через переповнену чергу."""
+        return self.active >= self.max_concurrency and self.waiting >= self.max_queue
+
+    def reserve(self) -> QueueTicket:
+        """Резервує слот або місце в черзі без очікування.
+
+        Raises:
+            LLMQueueFullError: якщо всі слоти зайняті і черга заповнена
+        """
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            self.total += 1
+            return QueueTicket(self, None, 0)
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise LLMQueueFullError("Черга запитів до мовної моделі переповнена. Спробуйте пізніше.")
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self.total += 1
+        self.queued_total += 1
+        return QueueTicket(self, future, len(self._waiters))
+
+    def _release(self) -> None:
+        # Передаємо слот першому живому очікувачу, не зменшуючи active
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _abandon(self, future: asyncio.Future) -> None:
+        if future in self._waiters:
+            self._waiters.remove(future)
+        elif future.done() and not future.cancelled():
+            # Слот уже було передано, але очікувач пішов — звільняємо його
+            self._release()
+
+    def _record_wait(self, wait_ms: int) -> None:
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "total": self.total,
+            "queued_total": self.queued_total,
+            "rejected": self.rejected,
+            "avg_wait_ms": int(self.total_wait_ms / self.total) if self.total else 0,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+
+class OllamaClient:
+    """Пуловий асинхронний клієнт Ollama /api/generate.
+
+    httpx.AsyncClient створюється ліниво і привʼязаний до поточного event loop,
+    тому клієнт безпечно переживає перезапуск циклу (наприклад, у тестах).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        model: str,
+        timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        max_concurrency: int = 2,
+        max_queue: int = 32,
+        max_keepalive: int = 8,
+        keepalive_expiry: float = 30.0,
+    ) -> None:
+        self.url = url
+        self.model = model
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max(max_keepalive, max_concurrency) + 2,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.limiter = ConcurrencyLimiter(max_concurrency, max_queue)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def tags_url(self) -> str:
+        """URL переліку моделей (/api/tags) на тому ж сервері Ollama."""
+        return str(httpx.URL(self.url).copy_with(path="/api/tags"))
+
+    def http(self) -> httpx.AsyncClient:
+        """Повертає спільний httpx.AsyncClient для поточного event loop."""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._http_loop = loop
+        return self._http
+
+    async def aclose(self) -> None:
+        """Закриває пул зʼєднань (викликається при завершенні роботи сервісу)."""
+        if self._http is not None and not self._http.is_closed:
+            try:
+                await self._http.aclose()
+            except RuntimeError:
+                # Цикл, до якого привʼязаний клієнт, уже закрито
+                pass
+        self._http = None
+        self._http_loop = None
+
+    async def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Повертає повну відповідь моделі одним рядком.
+
+        Raises:
+            LLMError: якщо Ollama недоступна або відповідь порожня
+        """
+        payload = {"model": self.model, "prompt": prompt, "stream": False}
+        try:
+            resp = await self.http().post(
+                self.url,
+                json=payload,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            raise LLMError(str(e) or e.__class__.__name__) from e
+
+        content_type = resp.headers.get("content-type", "")
+        if "application/json" in content_type:
+            try:
+                data = resp.json()
+            except ValueError as e:
+                raise LLMError("Невалідна JSON-відповідь мовної моделі") from e
+            return ((data or {}).get("response") or "").strip()
+
+        # Деякі версії можуть повертати NDJSON рядками — спробуємо зібрати фрагменти
+        aggregated = []
+        for line in resp.text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                part = json.loads(line).get("response")
+            except ValueError:
+                # Ігноруємо невалідні рядки
+                continue
+            if part:
+                aggregated.append(part)
+        return "".join(aggregated).strip()
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Передає фрагменти відповіді по мірі генерації (NDJSON stream).
+
+        Якщо споживач припиняє ітерацію, HTTP-зʼєднання з Ollama закривається,
+        і генерація на боці моделі зупиняється.
+
+        Raises:
+            LLMError: якщо Ollama недоступна або повернула помилку
+        """
+        payload = {"model": self.model, "prompt": prompt, "stream": True}
+        try:
+            async with self.http().stream("POST", self.url, json=payload) as resp:
+                if resp.status_code >= 400:
+                    raise LLMError(f"Ollama повернула HTTP {resp.status_code}")
+                async for line in resp.aiter_lines():
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                    except ValueError:
+                        continue
+                    if obj.get("error"):
+                        raise LLMError(str(obj["error"]))
+                    part = obj.get("response")
+                    if part:
+                        yield part
+                    if obj.get("done"):
+                        break
+        except httpx.HTTPError as e:
+            raise LLMError(str(e) or e.__class__.__name__) from e
+
+    def stats(self) -> Dict[str, Any]:
+        return {"url": self.url, "model": self.model, **self.limiter.stats()}
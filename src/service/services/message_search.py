@@ -0,0 +1,203 @@
+"""
+Повнотекстовий пошук по повідомленнях чатів та асистента (SQLite FTS5).
+
+- create_search_index: створює FTS5-таблиці з тригерами синхронізації (ідемпотентно, міграція №5)
+- build_match_query: перетворює введений користувачем текст на безпечний FTS5-запит
+- search_messages: BM25-ранжований пошук з підсвіченими фрагментами в межах доступу користувача;
+  BM25 рахується в межах кожної FTS-таблиці окремо (статистика термів у них різна,
+  тож оцінки не порівнювані), а видача чергує джерела за позицією в їхньому рейтингу
+
+FTS-таблиці використовують зовнішній вміст (content=...), тому текст не дублюється:
+індекс зберігає лише токени, а тригери на chatmessage/assistantmessage підтримують
+його в актуальному стані при будь-якому записі, зокрема поза репозиторіями.
+Повідомлення, перенесені в архіви (див. archive.py), з індексу видаляються
+тим самим тригером, тому пошук охоплює лише основну БД.
+"""
+from __future__ import annotations
+
+import html
+import re
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+# Маркери підсвітки в snippet(): замінюються на <mark> після HTML-екранування тексту
+_MARK_OPEN = "\x02"
+_MARK_CLOSE = "\x03"
+# Кількість токенів у фрагменті з підсвіткою
+SNIPPET_TOKENS = 12
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# (таблиця з даними, FTS-таблиця)
+_INDEXED_TABLES = (
+    ("chatmessage", "chatmessage_fts"),
+    ("assistantmessage", "assistantmessage_fts"),
+)
+
+FTS5_AVAILABLE = True
+
+
+class SearchUnavailableError(RuntimeError):
+    """SQLite зібрано без FTS5 — повнотекстовий пошук недоступний."""
+
+
+def _fts_ddl(table: str, fts: str) -> List[str]:
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"content, content='{table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, content) VALUES (new.id, new.content); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.id, old.content); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF content ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.id, old.content); "
+        f"INSERT INTO {fts}(rowid, content) VALUES (new.id, new.content); END",
+    ]
+
+
+def create_search_index(conn: Connection) -> bool:
+    """Створює FTS5-індекси та тригери, якщо їх ще немає (без коміту).
+
+    Для щойно створеного індексу виконується rebuild, щоб проіндексувати
+    вже наявні повідомлення. Повертає False, якщо SQLite не підтримує FTS5.
+    """
+    global FTS5_AVAILABLE
+    existing = {
+        row[0]
+        for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"))
+    }
+    try:
+        for table, fts in _INDEXED_TABLES:
+            if table not in existing:
+                continue
+            for statement in _fts_ddl(table, fts):
+                conn.execute(text(statement))
+            if fts not in existing:
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    except OperationalError as e:
+        if "fts5" not in str(e).lower():
+            raise
+        FTS5_AVAILABLE = False
+        return False
+    FTS5_AVAILABLE = True
+    return True
+
+
+def ensure_search_index(conn: Connection) -> bool:
+    """Як create_search_index, але з комітом (для окремих БД: тести, бенчмарк)."""
+    created = create_search_index(conn)
+    conn.commit()
+    return created
+
+
+def build_match_query(query: str) -> str:
+    """Будує FTS5-запит з тексту користувача.
+
+    Кожне слово береться в лапки (оператори та спецсимволи FTS5 не інтерпретуються),
+    слова обʼєднуються через AND, а останнє шукається за префіксом
+    (пошук під час набору). Порожній рядок — якщо слів немає.
+    """
+    tokens = _TOKEN_RE.findall(query or "")[:16]
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def highlight_snippet(raw: str) -> str:
+    """Екранує HTML у фрагменті та замінює маркери збігів на <mark>."""
+    escaped = html.escape(raw or "")
+    return escaped.replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+
+_CHAT_SQL = f"""
+    SELECT 'chat' AS source, m.id AS message_id, c.uuid AS chat_uuid, m.sender_id AS sender_id,
+           NULL AS role, m.created_at AS created_at,
+           snippet(chatmessage_fts, 0, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', {SNIPPET_TOKENS}) AS snippet,
+           bm25(chatmessage_fts) AS rank
+    FROM chatmessage_fts
+    JOIN chatmessage m ON m.id = chatmessage_fts.rowid
+    JOIN chat c ON c.id = m.chat_id
+    WHERE chatmessage_fts MATCH :match
+      AND (c.user1_id = :user_id OR c.user2_id = :user_id)
+      AND c.user1_id NOT IN (SELECT blocked_user_id FROM userblock WHERE user_id = :user_id)
+      AND c.user2_id NOT IN (SELECT blocked_user_id FROM userblock WHERE user_id = :user_id)
+"""
+
+_ASSISTANT_SQL = f"""
+    SELECT 'assistant' AS source, m.id AS message_id, NULL AS chat_uuid, NULL AS sender_id,
+           m.role AS role, m.created_at AS created_at,
+           snippet(assistantmessage_fts, 0, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', {SNIPPET_TOKENS}) AS snippet,
+           bm25(assistantmessage_fts) AS rank
+    FROM assistantmessage_fts
+    JOIN assistantmessage m ON m.id = assistantmessage_fts.rowid
+    WHERE assistantmessage_fts MATCH :match
+      AND m.user_id = :user_id
+"""
+
+SEARCH_SCOPES = ("all", "chats", "assistant")
+
+
+def search_messages(
+    session: Session,
+    user_id: int,
+    query: str,
+    scope: str = "all",
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Шукає повідомлення користувача, найрелевантніші (BM25) першими.
+
+    Кожне джерело ранжується окремо, а результати чергуються: перший з чатів,
+    перший з асистента, другий з чатів і т.д.; коли одне джерело вичерпано,
+    решта йде з іншого. Чати з користувачами, яких заблокував user_id,
+    виключаються — так само, як у списку чатів.
+
+    Returns:
+        Кортеж (results, has_more)
+
+    Raises:
+        SearchUnavailableError: якщо SQLite не підтримує FTS5
+    """
+    if not FTS5_AVAILABLE:
+        raise SearchUnavailableError("Повнотекстовий пошук недоступний: SQLite зібрано без FTS5.")
+    match = build_match_query(query)
+    if not match:
+        return [], False
+
+    parts = []
+    if scope in ("all", "chats"):
+        parts.append(_CHAT_SQL)
+    if scope in ("all", "assistant"):
+        parts.append(_ASSISTANT_SQL)
+    # Позиція в рейтингу свого джерела (source_rank), а не сира оцінка bm25, задає порядок видачі
+    sql = " UNION ALL ".join(
+        f"SELECT *, {order} AS source_order, ROW_NUMBER() OVER (ORDER BY rank, message_id) AS source_rank "
+        f"FROM ({part})"
+        for order, part in enumerate(parts)
+    ) + " ORDER BY source_rank, source_order LIMIT :limit OFFSET :offset"
+
+    try:
+        rows = session.execute(
+            text(sql),
+            {"match": match, "user_id": user_id, "limit": limit + 1, "offset": offset},
+        ).mappings().all()
+    except OperationalError as e:
+        # Індексу немає: міграцію виконано на SQLite без FTS5
+        if "no such table" not in str(e) or "_fts" not in str(e):
+            raise
+        raise SearchUnavailableError("Повнотекстовий пошук недоступний: SQLite зібрано без FTS5.") from e
+    has_more = len(rows) > limit
+    results = []
+    for row in rows[:limit]:
+        item = dict(row)
+        del item["source_order"], item["source_rank"]
+        item["snippet"] = highlight_snippet(item["snippet"])
+        results.append(item)
+    return results, has_more
@@ -0,0 +1,277 @@
+"""
+Агрегати прогнозів для популяційної аналітики.
+
+- create_rollup_triggers: тригери на predictionhistory, що інкрементально
+  оновлюють predictionrollup при вставці, зміні та видаленні (ідемпотентно)
+- add_to_rollups: додає до агрегатів (або віднімає) вибрані записи (архівація)
+- rebuild_rollups: повний перерахунок агрегатів з історії та архівів (міграція, відновлення)
+- summarize_predictions: зведення за довільний інтервал з агрегатів
+
+Агрегати зберігаються з двома розмірами інтервалу: день та година. Повні дні
+діапазону читаються з денних рядків, неповні краї — з погодинних, тому запит
+за рік торкається кількох сотень рядків незалежно від кількості прогнозів.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select
+
+from src.service.models import PredictionRollup
+
+GRANULARITIES = ("hour", "day")
+
+# Формат збігається з тим, як SQLAlchemy зберігає DateTime у SQLite,
+# інакше порівняння рядків з параметрами запиту було б некоректним.
+# Через ":00" у форматах DDL виконується exec_driver_sql, а не text() (там це параметр)
+_BUCKET_EXPR = {
+    "hour": "strftime('%Y-%m-%d %H:00:00.000000', {created_at})",
+    "day": "strftime('%Y-%m-%d 00:00:00.000000', {created_at})",
+}
+
+
+def _add_rows(row: str) -> str:
+    """SQL, що додає запис row (new) до обох агрегатів."""
+    return " ".join(
+        "INSERT INTO predictionrollup "
+        "(granularity, bucket_start, target, risk_bucket, model_name, count, probability_sum) "
+        f"VALUES ('{g}', {_BUCKET_EXPR[g].format(created_at=f'{row}.created_at')}, {row}.target, "
+        f"{row}.risk_bucket, COALESCE({row}.model_name, ''), 1, {row}.probability) "
+        "ON CONFLICT (granularity, bucket_start, target, risk_bucket, model_name) DO UPDATE SET "
+        "count = count + 1, probability_sum = probability_sum + excluded.probability_sum;"
+        for g in GRANULARITIES
+    )
+
+
+def _remove_rows(row: str) -> str:
+    """SQL, що віднімає запис row (old) від обох агрегатів і прибирає порожні рядки."""
+    parts = []
+    for g in GRANULARITIES:
+        key = (
+            f"granularity = '{g}' AND bucket_start = {_BUCKET_EXPR[g].format(created_at=f'{row}.created_at')} "
+            f"AND target = {row}.target AND risk_bucket = {row}.risk_bucket "
+            f"AND model_name = COALESCE({row}.model_name, '')"
+        )
+        parts.append(
+            f"UPDATE predictionrollup SET count = count - 1, "
+            f"probability_sum = probability_sum - {row}.probability WHERE {key};"
+        )
+        parts.append(f"DELETE FROM predictionrollup WHERE {key} AND count <= 0;")
+    return " ".join(parts)
+
+
+def create_rollup_triggers(conn: Connection) -> None:
+    """Створює тригери підтримки агрегатів, якщо їх ще немає (без коміту)."""
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS predictionrollup_ai AFTER INSERT ON predictionhistory "
+        f"BEGIN {_add_rows('new')} END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS predictionrollup_ad AFTER DELETE ON predictionhistory "
+        f"BEGIN {_remove_rows('old')} END"
+    )
+    conn.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS predictionrollup_au AFTER UPDATE OF "
+        "target, risk_bucket, model_name, probability, created_at ON predictionhistory "
+        f"BEGIN {_remove_rows('old')} {_add_rows('new')} END"
+    )
+
+
+# Агрегати вибраних записів: (granularity, bucket_start, target, risk_bucket, model_name, count, probability_sum)
+ROLLUP_SELECT = {
+    g: (
+        f"SELECT '{g}' AS granularity, {_BUCKET_EXPR[g].format(created_at='created_at')} AS bucket_start, "
+        "target, risk_bucket, COALESCE(model_name, '') AS model_name, COUNT(*) AS count, "
+        "SUM(probability) AS probability_sum FROM {source} WHERE {where} "
+        f"GROUP BY {_BUCKET_EXPR[g].format(created_at='created_at')}, target, risk_bucket, COALESCE(model_name, '')"
+    )
+    for g in GRANULARITIES
+}
+
+_UPSERT = (
+    "INSERT INTO predictionrollup "
+    "(granularity, bucket_start, target, risk_bucket, model_name, count, probability_sum) "
+    "{values} "
+    "ON CONFLICT (granularity, bucket_start, target, risk_bucket, model_name) DO UPDATE SET "
+    "count = count + excluded.count, probability_sum = probability_sum + excluded.probability_sum"
+)
+
+
+def add_to_rollups(
+    conn: Connection,
+    where: str = "1",
+    params: Sequence = (),
+    *,
+    source: str = "main.predictionhistory",
+    sign: int = 1,
+) -> None:
+    """Додає до агрегатів записи source, що відповідають умові where (без коміту).
+
+    Використовується архівацією: записи, перенесені в архів, лишаються в агрегатах.
+    sign=-1 віднімає внесок записів (видалення з архіву) і прибирає порожні рядки.
+    """
+    for g in GRANULARITIES:
+        conn.exec_driver_sql(
+            _UPSERT.format(values=(
+                "SELECT granularity, bucket_start, target, risk_bucket, model_name, "
+                f"{sign} * count, {sign} * probability_sum FROM ("
+                + ROLLUP_SELECT[g].format(source=source, where=where)
+                + ") WHERE 1"
+            )),
+            tuple(params),
+        )
+    if sign < 0:
+        conn.exec_driver_sql("DELETE FROM predictionrollup WHERE count <= 0")
+
+
+def rebuild_rollups(conn: Connection) -> None:
+    """Перераховує всі агрегати з predictionhistory та архівів (без коміту)."""
+    from src.service.archive import archived_rollup_rows
+
+    conn.exec_driver_sql("DELETE FROM predictionrollup")
+    add_to_rollups(conn)
+    rows = archived_rollup_rows(conn.engine)
+    if rows:
+        conn.exec_driver_sql(_UPSERT.format(values="VALUES (?, ?, ?, ?, ?, ?, ?)"), rows)
+
+
+def _floor_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(moment: datetime) -> datetime:
+    floored = _floor_hour(moment)
+    return floored if floored == moment else floored + timedelta(hours=1)
+
+
+def _range_filter(since: datetime, until: datetime):
+    """Умова вибору агрегатів, що покривають [since, until) без подвійного обліку."""
+    R = PredictionRollup
+    first_day = since.replace(hour=0)
+    if first_day < since:
+        first_day += timedelta(days=1)
+    last_day = until.replace(hour=0)
+    if first_day >= last_day:
+        return and_(R.granularity == "hour", R.bucket_start >= since, R.bucket_start < until)
+    return or_(
+        and_(R.granularity == "day", R.bucket_start >= first_day, R.bucket_start < last_day),
+        and_(
+            R.granularity == "hour",
+            or_(
+                and_(R.bucket_start >= since, R.bucket_start < first_day),
+                and_(R.bucket_start >= last_day, R.bucket_start < until),
+            ),
+        ),
+    )
+
+
+def _stat(count: int, probability_sum: float) -> Dict[str, Any]:
+    return {
+        "count": count,
+        "mean_probability": round(probability_sum / count, 4) if count else None,
+    }
+
+
+def _bucket_distribution(counts: Dict[str, int], total: int) -> Dict[str, Dict[str, Any]]:
+    return {
+        bucket: {"count": count, "share": round(count / total, 4) if total else 0.0}
+        for bucket, count in sorted(counts.items())
+    }
+
+
+def summarize_predictions(
+    session: Session,
+    since: datetime,
+    until: datetime,
+    *,
+    target: Optional[str] = None,
+    model_name: Optional[str] = None,
+    granularity: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Зведення прогнозів за [since, until) з точністю до години.
+
+    Межі вирівнюються до годин (since — вниз, until — вгору).
+    granularity ("hour" або "day") додає часовий ряд.
+    """
+    since, until = _floor_hour(since), _ceil_hour(until)
+    R = PredictionRollup
+    conditions = [_range_filter(since, until)]
+    if target is not None:
+        conditions.append(R.target == target)
+    if model_name is not None:
+        conditions.append(R.model_name == model_name)
+
+    rows = session.exec(
+        select(R.target, R.risk_bucket, R.model_name, func.sum(R.count), func.sum(R.probability_sum))
+        .where(*conditions)
+        .group_by(R.target, R.risk_bucket, R.model_name)
+    ).all()
+
+    total, probability_total = 0, 0.0
+    buckets: Dict[str, int] = {}
+    by_target: Dict[str, Dict[str, Any]] = {}
+    by_model: Dict[str, List[float]] = {}
+    for row_target, risk_bucket, row_model, count, probability_sum in rows:
+        total += count
+        probability_total += probability_sum
+        buckets[risk_bucket] = buckets.get(risk_bucket, 0) + count
+        entry = by_target.setdefault(row_target, {"count": 0, "probability_sum": 0.0, "buckets": {}})
+        entry["count"] += count
+        entry["probability_sum"] += probability_sum
+        entry["buckets"][risk_bucket] = entry["buckets"].get(risk_bucket, 0) + count
+        model_entry = by_model.setdefault(row_model or "unknown", [0, 0.0])
+        model_entry[0] += count
+        model_entry[1] += probability_sum
+
+    summary: Dict[str, Any] = {
+        "since": since,
+        "until": until,
+        **_stat(total, probability_total),
+        "by_risk_bucket": _bucket_distribution(buckets, total),
+        "by_target": {
+            name: {
+                **_stat(entry["count"], entry["probability_sum"]),
+                "by_risk_bucket": _bucket_distribution(entry["buckets"], entry["count"]),
+            }
+            for name, entry in sorted(by_target.items())
+        },
+        "by_model": {name: _stat(*values) for name, values in sorted(by_model.items())},
+        "series": [],
+    }
+    if granularity is not None:
+        summary["series"] = _series(session, since, until, conditions[1:], granularity)
+    return summary
+
+
+def _series(
+    session: Session,
+    since: datetime,
+    until: datetime,
+    extra_conditions: list,
+    granularity: str,
+) -> List[Dict[str, Any]]:
+    R = PredictionRollup
+    if granularity == "hour":
+        range_condition = and_(R.granularity == "hour", R.bucket_start >= since, R.bucket_start < until)
+    else:
+        range_condition = _range_filter(since, until)
+    rows = session.exec(
+        select(R.bucket_start, func.sum(R.count), func.sum(R.probability_sum))
+        .where(range_condition, *extra_conditions)
+        .group_by(R.bucket_start)
+        .order_by(R.bucket_start)
+    ).all()
+
+    points: Dict[datetime, Tuple[int, float]] = {}
+    for bucket_start, count, probability_sum in rows:
+        if granularity == "day":
+            bucket_start = bucket_start.replace(hour=0)
+        prev_count, prev_sum = points.get(bucket_start, (0, 0.0))
+        points[bucket_start] = (prev_count + count, prev_sum + probability_sum)
+    return [
+        {"bucket_start": bucket_start, **_stat(count, probability_sum)}
+        for bucket_start, (count, probability_sum) in sorted(points.items())
+    ]
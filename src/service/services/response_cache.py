@@ -0,0 +1,159 @@
+"""
+Кеш відповідей асистента з обмеженням за часом життя (TTL) та розміром (LRU).
+
+- ResponseCache.make_key: ключ з нормалізованого підказу та назви моделі
+- ResponseCache.get_or_create: повертає кешовану відповідь або генерує її,
+  обʼєднуючи одночасні однакові запити в одну генерацію (coalescing)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Нормалізує підказ: обрізає краї та схлопує пробіли й переноси рядків."""
+    return _WHITESPACE_RE.sub(" ", prompt or "").strip()
+
+
+class ResponseCache:
+    """LRU-кеш відповідей мовної моделі з TTL та обʼєднанням одночасних запитів.
+
+    Args:
+        ttl: Час життя запису, секунди
+        max_entries: Максимальна кількість записів (найстаріші витісняються)
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 256) -> None:
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(prompt: str, model: str) -> str:
+        """Будує ключ кешу з назви моделі та нормалізованого підказу."""
+        raw = f"{model}\0{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Повертає відповідь з кешу або None (прострочені записи видаляються)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Зберігає відповідь, витісняючи найдавніше використані записи."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Як get, але враховує звернення в метриках hits/misses."""
+        value = self.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def peek(self, key: str) -> bool:
+        """Чи можна відповісти без нової генерації (є запис або генерація вже триває)."""
+        return self.get(key) is not None or key in self._inflight
+
+    def record_bypass(self) -> None:
+        """Враховує запит, який свідомо оминув кеш."""
+        self.bypassed += 1
+
+    def clear(self) -> None:
+        """Очищає кеш (лічильники метрик зберігаються)."""
+        self._entries.clear()
+
+    async def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[str]],
+        store: bool = True,
+    ) -> Tuple[str, str]:
+        """Повертає (відповідь, статус), де статус — "hit", "miss" або "coalesced".
+
+        Якщо така сама генерація вже виконується, запит чекає на її результат
+        замість нового звернення до моделі. Помилки factory не кешуються
+        і передаються всім очікувачам; якщо генерацію скасовано, очікувачі
+        повторюють спробу самостійно. З store=False результат factory не
+        зберігається і не передається іншим запитам (він залежить від даних
+        поза ключем), але готова відповідь з кешу використовується.
+        """
+        while True:
+            value = self.get(key)
+            if value is not None:
+                self.hits += 1
+                return value, "hit"
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            # shield: скасування очікувача не скасовує спільну генерацію
+            value = await asyncio.shield(inflight)
+            if value is not None:
+                self.coalesced += 1
+                return value, "coalesced"
+
+        self.misses += 1
+        if not store:
+            return await factory(), "miss"
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Позначаємо виняток як оброблений, якщо очікувачів немає
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self.set(key, value)
+        future.set_result(value)
+        return value, "miss"
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
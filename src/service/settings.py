@@ -0,0 +1,85 @@
+"""
+Налаштування сервісу, що зчитуються зі змінних середовища.
+
+Усі значення мають безпечні типові значення для локального запуску,
+тому змінні середовища потрібні лише для перевизначення.
+"""
+
+import os
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """Зчитує булеве значення (1/true/yes/on) зі змінної середовища."""
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def env_int(name: str, default: int) -> int:
+    """Зчитує ціле значення зі змінної середовища."""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Зчитує дробове значення зі змінної середовища."""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+# Режим розробки: перезавантаження index.html при зміні файлів без рестарту
+DEV_MODE = env_bool("HEALTHRISK_DEV", False)
+WEB_SHELL_AUTO_RELOAD = env_bool("HEALTHRISK_WEB_RELOAD", DEV_MODE)
+
+# Мовна модель (Ollama) для асистента
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+# Таймаути HTTP-клієнта, секунди
+OLLAMA_TIMEOUT = env_float("OLLAMA_TIMEOUT", 60.0)
+OLLAMA_CONNECT_TIMEOUT = env_float("OLLAMA_CONNECT_TIMEOUT", 5.0)
+# Скільки генерацій одночасно надсилається до Ollama та скільки може чекати в черзі
+OLLAMA_MAX_CONCURRENCY = env_int("OLLAMA_MAX_CONCURRENCY", 2)
+OLLAMA_MAX_QUEUE = env_int("OLLAMA_MAX_QUEUE", 32)
+# Кількість keep-alive зʼєднань у пулі та час їх життя без активності
+OLLAMA_MAX_KEEPALIVE = env_int("OLLAMA_MAX_KEEPALIVE", 8)
+OLLAMA_KEEPALIVE_EXPIRY = env_float("OLLAMA_KEEPALIVE_EXPIRY", 30.0)
+
+# Кеш відповідей асистента: час життя запису (секунди) та максимальна кількість записів
+ASSISTANT_CACHE_ENABLED = env_bool("ASSISTANT_CACHE_ENABLED", True)
+ASSISTANT_CACHE_TTL = env_float("ASSISTANT_CACHE_TTL", 600.0)
+ASSISTANT_CACHE_MAX_ENTRIES = env_int("ASSISTANT_CACHE_MAX_ENTRIES", 256)
+
+# Памʼять розмови асистента: загальний бюджет промпту (оцінка в токенах),
+# максимум дослівних повідомлень історії та розмір підсумку давніх повідомлень
+ASSISTANT_PROMPT_BUDGET_TOKENS = env_int("ASSISTANT_PROMPT_BUDGET_TOKENS", 1536)
+ASSISTANT_HISTORY_MAX_MESSAGES = env_int("ASSISTANT_HISTORY_MAX_MESSAGES", 12)
+ASSISTANT_SUMMARY_MAX_TOKENS = env_int("ASSISTANT_SUMMARY_MAX_TOKENS", 256)
+
+# WebSocket чатів: інтервал heartbeat, таймаут неактивного клієнта (секунди)
+# та розмір черги подій одного зʼєднання (повільні клієнти відключаються)
+CHAT_WS_HEARTBEAT_INTERVAL = env_float("CHAT_WS_HEARTBEAT_INTERVAL", 25.0)
+CHAT_WS_IDLE_TIMEOUT = env_float("CHAT_WS_IDLE_TIMEOUT", 75.0)
+CHAT_WS_QUEUE_SIZE = env_int("CHAT_WS_QUEUE_SIZE", 100)
+
+# Завантаження чемпіонських моделей під час старту замість першого запиту /predict
+MODEL_WARMUP_ON_STARTUP = env_bool("MODEL_WARMUP_ON_STARTUP", False)
+
+# Архівація: записи, старші за ARCHIVE_AFTER_DAYS, переносяться в помісячні файли;
+# одна транзакція переносить не більше ARCHIVE_BATCH_SIZE рядків
+ARCHIVE_AFTER_DAYS = env_int("ARCHIVE_AFTER_DAYS", 365)
+ARCHIVE_BATCH_SIZE = env_int("ARCHIVE_BATCH_SIZE", 500)
+
+# Планове обслуговування БД у фоні (PRAGMA optimize, обмежений incremental_vacuum),
+# інтервал у секундах; 0 — вимкнено
+DB_MAINTENANCE_INTERVAL = env_float("DB_MAINTENANCE_INTERVAL", 86400.0)
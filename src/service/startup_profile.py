@@ -0,0 +1,83 @@
+"""
+Профіль часу запуску сервісу за фазами.
+
+- StartupProfile.phase: вимірює тривалість фази (import, db_init, migrations, model_warmup)
+- measure_cold_start: запускає сервіс у новому процесі та повертає звіт холодного старту
+"""
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Фази в порядку виконання під час старту
+PHASES = ("import", "db_init", "migrations", "model_warmup")
+
+# Важкі залежності, які не мають завантажуватися під час імпорту API
+HEAVY_MODULES = ("pandas", "sklearn", "scipy", "joblib", "xgboost", "PIL", "jose", "pyarrow")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class StartupProfile:
+    """Накопичує тривалість фаз запуску процесу (мілісекунди)."""
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+
+    def record(self, name: str, started: float) -> None:
+        """Записує фазу, що почалася в момент started (time.perf_counter)."""
+        self.phases[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    def report(self) -> Dict[str, Any]:
+        # Фаза, що не виконувалась (напр. прогрів моделей вимкнено), позначається як None
+        phases: Dict[str, Optional[float]] = {name: self.phases.get(name) for name in PHASES}
+        phases.update({k: v for k, v in self.phases.items() if k not in phases})
+        loaded: List[str] = [m for m in HEAVY_MODULES if m in sys.modules]
+        return {
+            "phases_ms": phases,
+            "total_ms": round(sum(v for v in phases.values() if v is not None), 2),
+            "heavy_modules_loaded": loaded,
+        }
+
+
+# Профіль поточного процесу
+startup_profile = StartupProfile()
+
+
+_COLD_START_SCRIPT = """
+import json
+from src.service.api import run_startup
+from src.service.startup_profile import startup_profile
+run_startup(warmup={warmup!r})
+print(json.dumps(startup_profile.report()))
+"""
+
+
+def measure_cold_start(warmup: Optional[bool] = None, timeout: float = 300.0) -> Dict[str, Any]:
+    """Запускає імпорт і старт сервісу в чистому інтерпретаторі та повертає звіт.
+
+    Окремий процес потрібен, бо в поточному модулі вже можуть бути імпортовані.
+    warmup=None — як у налаштуваннях (MODEL_WARMUP_ON_STARTUP).
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _COLD_START_SCRIPT.format(warmup=warmup)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
@@ -2256,6 +2256,7 @@ function persistToken(token) {
 
 function clearAuthState() {
   persistToken(null);
+  disconnectChatsSocket();
   authState.user = null;
   authState.history = [];
   pendingRouteAfterAuth = null;
@@ -2298,6 +2299,7 @@ async function handleAuthSuccess(payload, options = {}) {
   // Завантажуємо дані для чатів (тільки якщо користувач автентифікований)
   if (authState.user && typeof loadUnreadCount === "function") {
     loadUnreadCount();
+    connectChatsSocket();
     
     // Завантажуємо список чатів для перевірки непрочитаних повідомлень
     if (typeof loadChatsList === "function") {
@@ -3075,6 +3077,7 @@ async function initializeAuth() {
           return; // Не показуємо помилку, не логуємо
         }
       });
+      connectChatsSocket();
     }, 100);
   }
   
@@ -9552,6 +9555,101 @@ async function loadUnreadCount() {
   }
 }
 
+// ========== Події чатів у реальному часі (WebSocket) ==========
+// Замінює повторні запити до /api/chats та /api/chats/unread-count:
+// сервер сам надсилає нові повідомлення, квитанції прочитання та зміни лічильника
+let chatsSocket = null;
+let chatsSocketRetry = 0;
+let chatsSocketTimer = null;
+
+function isChatsPageActive() {
+  const page = document.getElementById("page-chats");
+  return Boolean(page && page.classList.contains("page--active"));
+}
+
+function connectChatsSocket() {
+  if (!authState.token || !("WebSocket" in window)) return;
+  if (chatsSocket && chatsSocket.readyState <= WebSocket.OPEN) return;
+  clearTimeout(chatsSocketTimer);
+
+  const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+  const url = `${protocol}//${window.location.host}/api/chats/ws?token=${encodeURIComponent(authState.token)}`;
+  const socket = new WebSocket(url);
+  chatsSocket = socket;
+
+  socket.onmessage = (event) => {
+    let data;
+    try {
+      data = JSON.parse(event.data);
+    } catch (e) {
+      return;
+    }
+    handleChatsSocketEvent(data);
+  };
+
+  socket.onclose = (event) => {
+    if (chatsSocket === socket) {
+      chatsSocket = null;
+    }
+    // 4401 — токен недійсний; без токена (вихід з акаунта) не перепідключаємось
+    if (event.code === 4401 || !authState.token) return;
+    // Експоненційна затримка перепідключення: 1, 2, 4 ... 30 с
+    const delay = Math.min(30000, 1000 * 2 ** chatsSocketRetry);
+    chatsSocketRetry += 1;
+    chatsSocketTimer = setTimeout(connectChatsSocket, delay);
+  };
+}
+
+function disconnectChatsSocket() {
+  clearTimeout(chatsSocketTimer);
+  chatsSocketRetry = 0;
+  if (chatsSocket) {
+    const socket = chatsSocket;
+    chatsSocket = null;
+    socket.close(1000);
+  }
+}
+
+function handleChatsSocketEvent(data) {
+  switch (data.type) {
+    case "hello":
+      chatsSocketRetry = 0;
+      // Після (пере)підключення синхронізуємо стан, який міг змінитися без нас
+      unreadCount = data.unread_count || 0;
+      updateChatsBadge();
+      if (isChatsPageActive()) {
+        loadChatsList({ skipAuthCheck: true });
+      }
+      break;
+    case "ping":
+      if (chatsSocket && chatsSocket.readyState === WebSocket.OPEN) {
+        chatsSocket.send(JSON.stringify({ type: "pong" }));
+      }
+      break;
+    case "unread.delta":
+      unreadCount = Math.max(0, unreadCount + (data.delta || 0));
+      updateChatsBadge();
+      break;
+    case "message.created":
+      if (isChatsPageActive() && currentChatUuid === data.chat_uuid) {
+        // Відкритий чат: дозавантажуємо нові повідомлення і позначаємо їх прочитаними
+        loadNewChatMessages(data.chat_uuid);
+      } else if (isChatsPageActive()) {
+        loadChatsList({ skipAuthCheck: true });
+      }
+      break;
+    case "messages.read":
+    case "chat.pinned":
+    case "chats.reordered":
+      if (isChatsPageActive() && !isEditMode) {
+        loadChatsList({ skipAuthCheck: true });
+      }
+      break;
+    default:
+      break;
+  }
+}
+
 function updateChatsBadge() {
   const badge = document.getElementById("nav-chats-badge");
   if (!badge) {
@@ -10039,6 +10137,114 @@ async function loadChat(uuid) {
   }
 }
 
+// ========== Курсорна пагінація повідомлень чату ==========
+// Відкриття чату повертає лише останню сторінку; старіші повідомлення
+// підвантажуються при прокрутці вгору (before_id), нові — за after_id
+const chatPage = {
+  uuid: null,
+  oldestId: null,
+  newestId: null,
+  hasMore: false,
+  loading: false,
+  refreshing: false,
+  refreshPending: false,
+};
+
+function renderChatMessageHtml(msg) {
+  const isOwn = msg.sender_id === authState.user.id;
+  return `
+      <div class="chats-message ${isOwn ? "chats-message--own" : ""}">
+        <div class="chats-message__content">${escapeHtml(msg.content)}</div>
+        <div class="chats-message__time">${formatDateTime(new Date(msg.created_at))}</div>
+      </div>
+    `;
+}
+
+function resetChatPage(chat) {
+  const list = chat.messages || [];
+  chatPage.uuid = chat.uuid;
+  chatPage.oldestId = list.length ? list[0].id : null;
+  chatPage.newestId = list.length ? list[list.length - 1].id : 0;
+  chatPage.hasMore = Boolean(chat.has_more);
+  chatPage.loading = false;
+  chatPage.refreshPending = false;
+}
+
+function bindChatScrollPagination(container) {
+  if (container.dataset.paginationBound) return;
+  container.dataset.paginationBound = "1";
+  container.addEventListener("scroll", () => {
+    if (container.scrollTop < 80) {
+      loadOlderChatMessages();
+    }
+  });
+}
+
+async function loadOlderChatMessages() {
+  const container = document.getElementById("chats-main-messages");
+  if (!container || chatPage.loading || !chatPage.hasMore || !chatPage.oldestId) return;
+  const uuid = chatPage.uuid;
+  chatPage.loading = true;
+  try {
+    const page = await apiFetch(`/api/chats/${uuid}/messages?before_id=${chatPage.oldestId}`);
+    if (chatPage.uuid !== uuid || !page || !Array.isArray(page.messages)) return;
+    if (page.messages.length) {
+      // Зберігаємо позицію прокрутки після вставки старіших повідомлень
+      const previousHeight = container.scrollHeight;
+      container.insertAdjacentHTML("afterbegin", page.messages.map(renderChatMessageHtml).join(""));
+      container.scrollTop += container.scrollHeight - previousHeight;
+      chatPage.oldestId = page.messages[0].id;
+    }
+    chatPage.hasMore = Boolean(page.has_more);
+  } catch (e) {
+    // Помилку підвантаження ігноруємо: спробуємо при наступній прокрутці
+  } finally {
+    chatPage.loading = false;
+  }
+}
+
+async function loadNewChatMessages(uuid) {
+  // Дешеве оновлення відкритого чату: лише повідомлення після останнього показаного
+  const container = document.getElementById("chats-main-messages");
+  if (!container || chatPage.uuid !== uuid || chatPage.newestId === null) {
+    return loadChat(uuid);
+  }
+  // Відправка власного повідомлення і подія WebSocket можуть прийти одночасно —
+  // не дублюємо запити, а повторюємо оновлення після поточного
+  if (chatPage.refreshing) {
+    chatPage.refreshPending = true;
+    return;
+  }
+  chatPage.refreshing = true;
+  try {
+    let hasMore = true;
+    let received = 0;
+    while (hasMore && chatPage.uuid === uuid) {
+      const page = await apiFetch(`/api/chats/${uuid}/messages?after_id=${chatPage.newestId}`);
+      if (!page || !Array.isArray(page.messages) || chatPage.uuid !== uuid) return;
+      if (page.messages.length) {
+        container.insertAdjacentHTML("beforeend", page.messages.map(renderChatMessageHtml).join(""));
+        chatPage.newestId = page.messages[page.messages.length - 1].id;
+        received += page.messages.filter(msg => msg.sender_id !== authState.user.id).length;
+      }
+      hasMore = Boolean(page.has_more);
+    }
+    container.scrollTop = container.scrollHeight;
+    if (received > 0) {
+      await apiFetch(`/api/chats/${uuid}/read`, { method: "POST" });
+    }
+  } catch (e) {
+    if (e.isAuthError || e.silent) return;
+    loadChat(uuid);
+  } finally {
+    chatPage.refreshing = false;
+    if (chatPage.refreshPending) {
+      chatPage.refreshPending = false;
+      loadNewChatMessages(uuid);
+    }
+  }
+}
+
 function renderChat(chat) {
   // Показуємо layout з чатом та sidebar
   showChatLayout();
@@ -10093,15 +10299,9 @@ function renderChat(chat) {
     refreshIcons();
   }
   
-  messages.innerHTML = chat.messages.map(msg => {
-    const isOwn = msg.sender_id === authState.user.id;
-    return `
-      <div class="chats-message ${isOwn ? "chats-message--own" : ""}">
-        <div class="chats-message__content">${escapeHtml(msg.content)}</div>
-        <div class="chats-message__time">${formatDateTime(new Date(msg.created_at))}</div>
-      </div>
-    `;
-  }).join("");
+  messages.innerHTML = chat.messages.map(renderChatMessageHtml).join("");
+  resetChatPage(chat);
+  bindChatScrollPagination(messages);
   
   messages.scrollTop = messages.scrollHeight;
   
@@ -10770,8 +10970,8 @@ function initializeChats() {
           body: JSON.stringify({ content: text }),
         });
         input.value = "";
-        // Оновлюємо поточний чат
-        loadChat(currentChatUuid);
+        // Дозавантажуємо лише нові повідомлення поточного чату
+        loadNewChatMessages(currentChatUuid);
         // Оновлюємо список чатів, щоб новий чат з'явився в списку
         loadChatsList();
       } catch (e) {
@@ -0,0 +1,252 @@
+"""
+Кеш HTML-оболонки SPA (index.html) у памʼяті.
+
+Оболонка зчитується з диска один раз, проходить через ланцюжок трансформацій
+(за замовчуванням — додавання відбитків до локальних ресурсів /app/static/*),
+після чого зберігається у вигляді готових байтів для identity, gzip та brotli.
+Кожне кодування має власний сильний ETag (суфікс -gz/-br до хешу вмісту),
+відповіді підтримують умовні запити (304 Not Modified).
+
+У режимі розробки кеш перевіряє час модифікації файлів і перезавантажує
+оболонку, якщо index.html або будь-який із підключених ресурсів змінився.
+"""
+
+import gzip
+import hashlib
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.responses import Response  # type: ignore
+from starlette.types import Receive, Scope, Send  # type: ignore
+
+# Опціональний імпорт brotli
+try:
+    import brotli  # type: ignore
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Трансформація HTML оболонки: (html, web_dir) -> html
+ShellTransform = Callable[[str, Path], str]
+
+STATIC_PREFIX = "/app/static/"
+
+# Посилання на локальні ресурси у атрибутах src/href (без query та fragment)
+ASSET_REF_PATTERN = re.compile(
+    r'(?P<attr>src|href)="(?P<url>' + re.escape(STATIC_PREFIX) + r'(?P<rel>[^"?#]+))"'
+)
+
+
+def file_digest(path: Path, length: int = 12) -> str:
+    """Повертає скорочений sha256 вмісту файлу."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:length]
+
+
+def find_asset_paths(html: str, web_dir: Path) -> List[Path]:
+    """Повертає існуючі локальні ресурси, на які посилається HTML."""
+    paths = []
+    for match in ASSET_REF_PATTERN.finditer(html):
+        asset_path = web_dir / match.group("rel")
+        if asset_path.is_file() and asset_path not in paths:
+            paths.append(asset_path)
+    return paths
+
+
+def fingerprint_assets(html: str, web_dir: Path) -> str:
+    """Додає ?v=<hash> до посилань на локальні ресурси.
+
+    Браузер отримує новий URL при кожній зміні app.js/app.css, тож ресурси
+    можна кешувати агресивно, а оболонка лишається єдиним джерелом посилань.
+    """
+    digests: Dict[Path, str] = {}
+
+    def _replace(match: "re.Match[str]") -> str:
+        asset_path = web_dir / match.group("rel")
+        if not asset_path.is_file():
+            return match.group(0)
+        if asset_path not in digests:
+            digests[asset_path] = file_digest(asset_path)
+        return f'{match.group("attr")}="{match.group("url")}?v={digests[asset_path]}"'
+
+    return ASSET_REF_PATTERN.sub(_replace, html)
+
+
+def choose_encoding(accept_encoding: str, available: Tuple[str, ...]) -> str:
+    """Обирає кодування відповіді з урахуванням Accept-Encoding та q-значень."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    # Порядок переваги: brotli стискає HTML найкраще
+    for encoding in ("br", "gzip"):
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return "identity"
+
+
+# Суфікс ETag для стиснутих тіл: різні байти — різні сильні валідатори
+ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+class ShellVariant:
+    """Готовий до відправки знімок оболонки в усіх кодуваннях."""
+
+    def __init__(self, html: str) -> None:
+        self.identity = html.encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.identity).hexdigest()[:32] + '"'
+        self.bodies: Dict[str, bytes] = {
+            "identity": self.identity,
+            "gzip": gzip.compress(self.identity, compresslevel=9, mtime=0),
+        }
+        if BROTLI_AVAILABLE:
+            self.bodies["br"] = brotli.compress(self.identity, quality=11)
+        self.etags: Dict[str, str] = {
+            encoding: self.etag[:-1] + ETAG_SUFFIXES[encoding] + '"' for encoding in self.bodies
+        }
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        return tuple(self.bodies.keys())
+
+
+class SpaShell:
+    """Кеш index.html із попередньо закодованими варіантами.
+
+    Args:
+        web_dir: Директорія з index.html та статичними ресурсами
+        transforms: Ланцюжок трансформацій HTML (за замовчуванням — fingerprint_assets)
+        auto_reload: Чи перевіряти зміни файлів (режим розробки)
+        reload_interval: Мінімальний інтервал між перевірками, секунди
+    """
+
+    def __init__(
+        self,
+        web_dir: Path,
+        transforms: Optional[List[ShellTransform]] = None,
+        auto_reload: bool = False,
+        reload_interval: float = 1.0,
+    ) -> None:
+        self.web_dir = web_dir
+        self.index_path = web_dir / "index.html"
+        self.transforms: List[ShellTransform] = (
+            list(transforms) if transforms is not None else [fingerprint_assets]
+        )
+        self.auto_reload = auto_reload
+        self.reload_interval = reload_interval
+        self._variant: Optional[ShellVariant] = None
+        self._watched: Dict[Path, float] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def add_transform(self, transform: ShellTransform) -> None:
+        """Реєструє додаткову трансформацію (наприклад, підстановку бандлів)."""
+        with self._lock:
+            self.transforms.append(transform)
+            self._variant = None
+
+    def invalidate(self) -> None:
+        """Скидає кеш; наступний запит перечитає оболонку з диска."""
+        with self._lock:
+            self._variant = None
+
+    def _load(self) -> ShellVariant:
+        raw_html = self.index_path.read_text(encoding="utf-8")
+        html = raw_html
+        for transform in self.transforms:
+            html = transform(html, self.web_dir)
+
+        watched = [self.index_path] + find_asset_paths(raw_html, self.web_dir)
+        self._watched = {path: path.stat().st_mtime for path in watched}
+        self._last_check = time.monotonic()
+        return ShellVariant(html)
+
+    def _is_stale(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return False
+        self._last_check = now
+        for path, mtime in self._watched.items():
+            try:
+                if path.stat().st_mtime != mtime:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+    def get(self) -> ShellVariant:
+        """Повертає актуальний знімок оболонки, завантажуючи його за потреби."""
+        variant = self._variant
+        if variant is not None and not (self.auto_reload and self._is_stale()):
+            return variant
+        with self._lock:
+            if self._variant is None or self._variant is variant:
+                self._variant = self._load()
+            return self._variant
+
+    def response(self) -> "ShellResponse":
+        """Створює відповідь, яка узгоджує кодування під час відправки."""
+        return ShellResponse(self.get())
+
+
+class ShellResponse(Response):
+    """HTML-відповідь з оболонкою SPA.
+
+    Кодування та 304 визначаються з заголовків запиту безпосередньо в ASGI scope,
+    тому HTML-роутам не потрібно приймати Request лише заради заголовків.
+    """
+
+    media_type = "text/html; charset=utf-8"
+
+    def __init__(self, variant: ShellVariant) -> None:
+        self.variant = variant
+        super().__init__(content=b"", status_code=200, media_type=self.media_type)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = {
+            key.decode("latin-1").lower(): value.decode("latin-1")
+            for key, value in scope.get("headers", [])
+        }
+        variant = self.variant
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""), variant.encodings)
+        etag = variant.etags[encoding]
+        extra_headers = {
+            "etag": etag,
+            "cache-control": "no-cache",
+            "vary": "Accept-Encoding",
+        }
+
+        if_none_match = request_headers.get("if-none-match", "")
+        # If-None-Match порівнюється слабко (RFC 9110): W/"..." від проксі збігається з "..."
+        listed = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in listed or if_none_match.strip() == "*":
+            self.status_code = 304
+            self.body = b""
+            self.raw_headers = [
+                (key.encode("latin-1"), value.encode("latin-1")) for key, value in extra_headers.items()
+            ]
+            await super().__call__(scope, receive, send)
+            return
+
+        self.body = variant.bodies[encoding]
+        headers = dict(extra_headers)
+        if encoding != "identity":
+            headers["content-encoding"] = encoding
+        self.init_headers(headers)
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,35 @@
+"""
+Спільні фікстури інтеграційних тестів чатів: два користувачі та чат між ними.
+"""
+
+import pytest
+
+
+def register(client, sample_user_data: dict, email: str) -> dict:
+    """Реєструє користувача та повертає {"id", "token", "headers"}."""
+    client.post("/auth/register", json={**sample_user_data, "email": email})
+    data = client.post(
+        "/auth/login", json={"email": email, "password": sample_user_data["password"]}
+    ).json()
+    token = data["access_token"]
+    return {"id": data["user"]["id"], "token": token, "headers": {"Authorization": f"Bearer {token}"}}
+
+
+@pytest.fixture
+def alice(client, sample_user_data):
+    """Перший учасник чату."""
+    return register(client, sample_user_data, "alice@example.com")
+
+
+@pytest.fixture
+def bob(client, sample_user_data):
+    """Другий учасник чату."""
+    return register(client, sample_user_data, "bob@example.com")
+
+
+@pytest.fixture
+def chat_uuid(client, alice, bob) -> str:
+    """Чат між alice та bob."""
+    response = client.post("/api/chats", json={"user_id": bob["id"]}, headers=alice["headers"])
+    assert response.status_code == 201
+    return response.json()["uuid"]
@@ -0,0 +1,209 @@
+"""
+Інтеграційні тести для чату з асистентом: потокова відповідь (SSE) та кеш відповідей.
+"""
+
+import json
+
+import pytest
+
+from src.service.services import assistant_llm
+from src.service.services.llm_client import OllamaClient
+from tests.utils.fake_ollama import FakeOllama
+
+
+def parse_sse(body: str) -> list:
+    """Розбирає тіло SSE-відповіді на список (event, data)."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = None, None
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        if event:
+            events.append((event, data))
+    return events
+
+
+@pytest.fixture
+def other_auth_headers(client, sample_user_data: dict) -> dict:
+    """Заголовки автентифікації другого користувача (без історії та прогнозів)."""
+    user = {**sample_user_data, "email": "second@example.com"}
+    assert client.post("/auth/register", json=user).status_code in [200, 201]
+    token = client.post("/auth/login", json={"email": user["email"], "password": user["password"]}).json()
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+@pytest.fixture
+def fake_ollama():
+    """Запускає фейковий Ollama та спрямовує на нього сервіс асистента."""
+    with FakeOllama() as server:
+        assistant_llm.configure_llm_client(url=server.url)
+        assistant_llm.get_response_cache().clear()
+        yield server
+    assistant_llm.configure_llm_client()
+    assistant_llm.get_response_cache().clear()
+
+
+class TestAssistantStream:
+    """Тести для /assistant/chat/stream."""
+
+    def test_stream_tokens_and_persist(self, client, auth_headers, fake_ollama):
+        """Тест: токени передаються по одному, відповідь зберігається в історії."""
+        response = client.post(
+            "/assistant/chat/stream",
+            json={"message": "Що означає мій ризик?", "language": "uk"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = parse_sse(response.text)
+        tokens = [data["delta"] for event, data in events if event == "token"]
+        assert tokens == fake_ollama.tokens
+        assert events[-1][0] == "done"
+        assert events[-1][1]["answer"] == "".join(fake_ollama.tokens)
+
+        assert fake_ollama.requests[0]["stream"] is True
+
+        history = client.get("/assistant/history", headers=auth_headers).json()
+        assert [m["role"] for m in history] == ["user", "assistant"]
+        assert history[-1]["content"] == "".join(fake_ollama.tokens)
+
+    def test_stream_upstream_error(self, client, auth_headers, fake_ollama):
+        """Тест: помилка Ollama повертає подію error і не зберігає відповідь."""
+        fake_ollama.status_code = 500
+        response = client.post(
+            "/assistant/chat/stream",
+            json={"message": "Привіт"},
+            headers=auth_headers,
+        )
+
+        events = parse_sse(response.text)
+        assert [event for event, _ in events] == ["error"]
+
+        history = client.get("/assistant/history", headers=auth_headers).json()
+        assert [m["role"] for m in history] == ["user"]
+
+    def test_stream_served_from_cache(self, client, auth_headers, fake_ollama):
+        """Тест: повторний однаковий запит віддається з кешу одним токеном."""
+        body = {"message": "Що означає мій ризик?", "language": "uk"}
+        client.post("/assistant/chat/stream", json=body, headers=auth_headers)
+        events = parse_sse(client.post("/assistant/chat/stream", json=body, headers=auth_headers).text)
+
+        assert [event for event, _ in events] == ["token", "done"]
+        assert events[-1][1]["cache"] == "hit"
+        assert events[-1][1]["answer"] == "".join(fake_ollama.tokens)
+        assert len(fake_ollama.requests) == 1
+
+    def test_stream_requires_auth(self, client):
+        """Тест: потоковий чат недоступний без автентифікації."""
+        response = client.post("/assistant/chat/stream", json={"message": "Привіт"})
+        assert response.status_code == 401
+
+    def test_stream_empty_message(self, client, auth_headers):
+        """Тест: порожнє повідомлення відхиляється до початку потоку."""
+        response = client.post("/assistant/chat/stream", json={"message": "  "}, headers=auth_headers)
+        assert response.status_code == 400
+
+
+class TestAssistantChatCache:
+    """Тести для кешу відповідей /assistant/chat."""
+
+    def test_repeated_question_hits_cache(self, client, auth_headers, fake_ollama):
+        """Тест: однаковий запит з однаковим контекстом не викликає модель вдруге."""
+        body = {"message": "Що  означає мій ризик?"}
+        first = client.post("/assistant/chat", json=body, headers=auth_headers).json()
+        second = client.post(
+            "/assistant/chat", json={"message": "Що означає мій ризик? "}, headers=auth_headers
+        ).json()
+
+        assert first["cache"] == "miss"
+        assert second["cache"] == "hit"
+        assert second["answer"] == first["answer"]
+        assert len(fake_ollama.requests) == 1
+
+        history = client.get("/assistant/history", headers=auth_headers).json()
+        assert [m["role"] for m in history] == ["user", "assistant", "user", "assistant"]
+
+    def test_opt_out(self, client, auth_headers, fake_ollama):
+        """Тест: use_cache=false завжди звертається до моделі."""
+        body = {"message": "Привіт", "use_cache": False}
+        client.post("/assistant/chat", json=body, headers=auth_headers)
+        response = client.post("/assistant/chat", json=body, headers=auth_headers).json()
+
+        assert response["cache"] == "bypass"
+        assert len(fake_ollama.requests) == 2
+
+    def test_errors_not_cached(self, client, auth_headers, fake_ollama):
+        """Тест: помилка моделі не потрапляє в кеш."""
+        fake_ollama.status_code = 500
+        client.post("/assistant/chat", json={"message": "Привіт"}, headers=auth_headers)
+        fake_ollama.status_code = 200
+        response = client.post("/assistant/chat", json={"message": "Привіт"}, headers=auth_headers).json()
+
+        assert response["cache"] == "miss"
+        assert response["answer"] == "".join(fake_ollama.tokens)
+
+    def test_health_reports_cache_metrics(self, client, auth_headers, fake_ollama):
+        """Тест: /assistant/health містить метрики кешу."""
+        client.post("/assistant/chat", json={"message": "Привіт"}, headers=auth_headers)
+        client.post("/assistant/chat", json={"message": "Привіт"}, headers=auth_headers)
+        data = client.get("/assistant/health").json()
+
+        assert data["status"] == "online"
+        assert data["cache"]["hits"] >= 1
+        assert data["cache"]["size"] >= 1
+        assert "hit_rate" in data["cache"]
+
+    def test_answer_with_history_not_shared(self, client, auth_headers, other_auth_headers, fake_ollama):
+        """Тест: відповідь, згенерована з історією розмови, не кешується для інших користувачів."""
+        client.post("/assistant/chat", json={"message": "Мене звати Олена"}, headers=auth_headers)
+        with_history = client.post("/assistant/chat", json={"message": "Як мене звати?"}, headers=auth_headers).json()
+        other = client.post("/assistant/chat", json={"message": "Як мене звати?"}, headers=other_auth_headers).json()
+
+        assert with_history["cache"] == "miss"
+        assert other["cache"] == "miss"
+        assert len(fake_ollama.requests) == 3
+        assert "Олена" not in fake_ollama.requests[-1]["prompt"]
+
+    def test_health_does_not_generate(self, client, fake_ollama):
+        """Тест: перевірка стану читає перелік моделей і не запускає генерацію."""
+        data = client.get("/assistant/health").json()
+
+        assert data["status"] == "online"
+        assert data["model_available"] is True
+        assert fake_ollama.requests == []
+        assert data["concurrency"]["total"] == 0
+
+
+class TestAssistantMemory:
+    """Тести для памʼяті розмови в /assistant/chat."""
+
+    def test_previous_turns_in_prompt(self, client, auth_headers, fake_ollama):
+        """Тест: наступний запит містить попередні повідомлення розмови."""
+        client.post("/assistant/chat", json={"message": "Мене звати Олена"}, headers=auth_headers)
+        response = client.post("/assistant/chat", json={"message": "Як мене звати?"}, headers=auth_headers).json()
+
+        prompt = fake_ollama.requests[-1]["prompt"]
+        assert "Користувач: Мене звати Олена" in prompt
+        assert response["context"]["history_messages"] == 2
+        assert response["context"]["prompt_tokens"] > 0
+
+
+class TestStreamOllama:
+    """Тести для stream_ollama."""
+
+    async def test_closing_stream_cancels_upstream(self):
+        """Тест: закриття генератора розриває зʼєднання з Ollama."""
+        with FakeOllama(tokens=["t"] * 500, delay=0.01) as server:
+            client = OllamaClient(url=server.url, model="llama3")
+            stream = client.stream("prompt")
+            first = await stream.__anext__()
+            await stream.aclose()
+            await client.aclose()
+
+            assert first == "t"
+            assert server.disconnected.wait(timeout=5)
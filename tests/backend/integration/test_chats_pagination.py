@@ -0,0 +1,99 @@
+"""
+Інтеграційні тести для курсорної пагінації повідомлень чату.
+"""
+
+from sqlalchemy import text
+from sqlmodel import select
+
+from src.service.models import Chat
+from src.service.repositories import add_chat_message, get_chat_messages_page
+from tests.backend.integration.conftest import register
+
+
+def send_messages(client, chat_uuid: str, headers: dict, count: int) -> None:
+    for i in range(count):
+        response = client.post(f"/api/chats/{chat_uuid}/messages", json={"content": f"m{i}"}, headers=headers)
+        assert response.status_code == 201
+
+
+class TestChatPagination:
+    """Тести для before_id/after_id пагінації."""
+
+    def test_open_chat_returns_latest_page(self, client, alice, chat_uuid):
+        """Тест: відкриття чату повертає останні повідомлення та has_more."""
+        send_messages(client, chat_uuid, alice["headers"], 7)
+        data = client.get(f"/api/chats/{chat_uuid}?limit=3", headers=alice["headers"]).json()
+
+        assert [m["content"] for m in data["messages"]] == ["m4", "m5", "m6"]
+        assert data["has_more"] is True
+
+    def test_scroll_back_with_before_id(self, client, alice, chat_uuid):
+        """Тест: before_id повертає старіші сторінки до початку розмови."""
+        send_messages(client, chat_uuid, alice["headers"], 7)
+        latest = client.get(f"/api/chats/{chat_uuid}?limit=3", headers=alice["headers"]).json()
+
+        seen = [m["content"] for m in latest["messages"]]
+        before_id = latest["messages"][0]["id"]
+        has_more = latest["has_more"]
+        while has_more:
+            page = client.get(
+                f"/api/chats/{chat_uuid}/messages?before_id={before_id}&limit=3", headers=alice["headers"]
+            ).json()
+            seen = [m["content"] for m in page["messages"]] + seen
+            before_id = page["messages"][0]["id"]
+            has_more = page["has_more"]
+
+        assert seen == [f"m{i}" for i in range(7)]
+
+    def test_incremental_refresh_with_after_id(self, client, alice, bob, chat_uuid):
+        """Тест: after_id повертає лише нові повідомлення."""
+        send_messages(client, chat_uuid, alice["headers"], 2)
+        last_id = client.get(f"/api/chats/{chat_uuid}", headers=bob["headers"]).json()["messages"][-1]["id"]
+
+        assert client.get(
+            f"/api/chats/{chat_uuid}/messages?after_id={last_id}", headers=bob["headers"]
+        ).json() == {"messages": [], "has_more": False}
+
+        send_messages(client, chat_uuid, alice["headers"], 2)
+        page = client.get(f"/api/chats/{chat_uuid}/messages?after_id={last_id}", headers=bob["headers"]).json()
+        assert [m["content"] for m in page["messages"]] == ["m0", "m1"]
+        assert page["messages"][0]["id"] > last_id
+
+    def test_both_cursors_rejected(self, client, alice, chat_uuid):
+        """Тест: одночасно before_id та after_id не допускаються."""
+        response = client.get(
+            f"/api/chats/{chat_uuid}/messages?before_id=5&after_id=1", headers=alice["headers"]
+        )
+        assert response.status_code == 400
+
+    def test_foreign_chat_not_found(self, client, chat_uuid, sample_user_data):
+        """Тест: сторонній користувач не бачить повідомлення чату."""
+        carol = register(client, sample_user_data, "carol@example.com")
+        response = client.get(f"/api/chats/{chat_uuid}/messages", headers=carol["headers"])
+        assert response.status_code == 404
+
+
+class TestChatPaginationQueryPlan:
+    """Тести для плану запиту курсорної пагінації."""
+
+    def test_cursor_query_uses_index(self, test_db, client, alice, chat_uuid):
+        """Тест: запит сторінки використовує індекс (chat_id, id) без окремого сортування."""
+        chat = test_db.exec(select(Chat).where(Chat.uuid == chat_uuid)).first()
+        for i in range(5):
+            add_chat_message(test_db, chat.id, alice["id"], f"m{i}")
+
+        plan = test_db.exec(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM chatmessage "
+                "WHERE chat_id = :chat_id AND id < :before ORDER BY id DESC LIMIT 51"
+            ),
+            params={"chat_id": chat.id, "before": 10**9},
+        ).all()
+        details = " ".join(str(row[-1]) for row in plan)
+
+        assert "USING INDEX ix_chatmessage_chat_id_id" in details
+        assert "TEMP B-TREE" not in details
+
+        messages, has_more = get_chat_messages_page(test_db, chat.id, limit=2, before_id=10**9)
+        assert [m.content for m in messages] == ["m3", "m4"]
+        assert has_more is True
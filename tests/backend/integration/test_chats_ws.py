@@ -0,0 +1,87 @@
+"""
+Інтеграційні тести для доставки подій чатів через WebSocket.
+"""
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from src.service import settings
+
+
+def receive_until(ws, event_type: str) -> dict:
+    """Читає події, доки не зустрінеться подія потрібного типу (пропускаючи heartbeat)."""
+    for _ in range(20):
+        event = ws.receive_json()
+        if event["type"] == event_type:
+            return event
+    raise AssertionError(f"Подію {event_type} не отримано")
+
+
+class TestChatsWebSocket:
+    """Тести для /api/chats/ws."""
+
+    def test_rejects_missing_token(self, client):
+        """Тест: підключення без токена закривається з кодом 4401."""
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect("/api/chats/ws") as ws:
+                ws.receive_json()
+        assert exc.value.code == 4401
+
+    def test_rejects_invalid_token(self, client):
+        """Тест: недійсний токен відхиляється."""
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect("/api/chats/ws?token=invalid") as ws:
+                ws.receive_json()
+        assert exc.value.code == 4401
+
+    def test_hello_and_ping(self, client, alice):
+        """Тест: після підключення приходить hello, на ping сервер відповідає pong."""
+        with client.websocket_connect(f"/api/chats/ws?token={alice['token']}") as ws:
+            hello = ws.receive_json()
+            assert hello["type"] == "hello"
+            assert hello["user_id"] == alice["id"]
+            assert hello["unread_count"] == 0
+
+            ws.send_json({"type": "ping"})
+            assert receive_until(ws, "pong") == {"type": "pong"}
+
+    def test_new_message_delivered(self, client, alice, bob, chat_uuid):
+        """Тест: отримувач бачить нове повідомлення та зміну лічильника непрочитаних."""
+        with client.websocket_connect("/api/chats/ws", headers=bob["headers"]) as ws:
+            ws.receive_json()
+            client.post(f"/api/chats/{chat_uuid}/messages", json={"content": "Привіт!"}, headers=alice["headers"])
+
+            created = receive_until(ws, "message.created")
+            assert created["chat_uuid"] == chat_uuid
+            assert created["message"]["content"] == "Привіт!"
+            assert created["message"]["sender_id"] == alice["id"]
+
+            delta = receive_until(ws, "unread.delta")
+            assert delta == {"type": "unread.delta", "chat_uuid": chat_uuid, "delta": 1}
+
+    def test_read_receipt(self, client, alice, bob, chat_uuid):
+        """Тест: відправник отримує квитанцію про прочитання."""
+        client.post(f"/api/chats/{chat_uuid}/messages", json={"content": "Привіт!"}, headers=alice["headers"])
+        with client.websocket_connect(f"/api/chats/ws?token={alice['token']}") as ws:
+            ws.receive_json()
+            client.post(f"/api/chats/{chat_uuid}/read", headers=bob["headers"])
+
+            receipt = receive_until(ws, "messages.read")
+            assert receipt["reader_id"] == bob["id"]
+            assert receipt["count"] == 1
+
+    def test_pin_event(self, client, alice, bob, chat_uuid):
+        """Тест: закріплення чату транслюється учасникам."""
+        with client.websocket_connect(f"/api/chats/ws?token={bob['token']}") as ws:
+            ws.receive_json()
+            client.patch(f"/api/chats/{chat_uuid}/pin", headers=alice["headers"])
+
+            event = receive_until(ws, "chat.pinned")
+            assert event["is_pinned"] is True
+
+    def test_heartbeat(self, client, alice, monkeypatch):
+        """Тест: за відсутності подій сервер надсилає ping."""
+        monkeypatch.setattr(settings, "CHAT_WS_HEARTBEAT_INTERVAL", 0.05)
+        with client.websocket_connect(f"/api/chats/ws?token={alice['token']}") as ws:
+            ws.receive_json()
+            assert ws.receive_json()["type"] == "ping"
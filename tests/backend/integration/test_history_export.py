@@ -0,0 +1,128 @@
+"""
+Інтеграційні тести для потокового експорту історії прогнозів.
+"""
+
+import csv
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from src.service.models import PredictionHistory, User
+from src.service.services import history_export
+from src.service.services.history_export import iter_history_chunks, stream_history_export
+
+BASE = datetime(2025, 1, 1, 12, 0)
+EXPORT_URL = "/users/me/history/export"
+
+
+def _add_history(session, user_id: int, count: int) -> None:
+    for i in range(count):
+        session.add(PredictionHistory(
+            user_id=user_id,
+            target="diabetes_present",
+            model_name="XGBoost",
+            probability=0.5,
+            risk_bucket="medium",
+            inputs={"BMXBMI": 20 + i, "top_factors": []},
+            BMXBMI=20.0 + i,
+            created_at=BASE + timedelta(days=i),
+        ))
+    session.commit()
+
+
+def _read_csv(content: bytes) -> list:
+    return list(csv.DictReader(io.StringIO(content.decode("utf-8-sig"))))
+
+
+@pytest.fixture
+def owner(test_db, auth_headers, sample_user_data) -> User:
+    """Користувач із 25 прогнозами (по одному на день) та чужий прогноз."""
+    user = test_db.exec(select(User).where(User.email == sample_user_data["email"])).one()
+    other = User(email="other@example.com", hashed_password="x", display_name="Other")
+    test_db.add(other)
+    test_db.commit()
+    _add_history(test_db, user.id, 25)
+    _add_history(test_db, other.id, 1)
+    return user
+
+
+class TestIterHistoryChunks:
+    """Тести для читання історії порціями."""
+
+    def test_fixed_size_chunks(self, test_db, owner):
+        """Тест: усі записи користувача повертаються порціями не більше chunk_size."""
+        chunks = list(iter_history_chunks(test_db.get_bind(), owner.id, ["id", "BMXBMI"], chunk_size=10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert [row[1] for chunk in chunks for row in chunk] == [20.0 + i for i in range(25)]
+
+    def test_csv_streamed_per_chunk(self, test_db, owner):
+        """Тест: CSV віддається частинами, заголовок — один раз."""
+        parts = list(stream_history_export(test_db.get_bind(), owner.id, columns=["id"], chunk_size=10))
+
+        assert len(parts) == 3
+        assert len(_read_csv(b"".join(parts))) == 25
+
+
+class TestHistoryExportEndpoint:
+    """Тести для GET /users/me/history/export."""
+
+    def test_requires_auth(self, client):
+        """Тест: без токена — 401."""
+        assert client.get(EXPORT_URL).status_code == 401
+
+    def test_csv_export(self, client, auth_headers, owner):
+        """Тест: CSV містить лише власні записи та колонки за замовчуванням."""
+        response = client.get(EXPORT_URL, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        rows = _read_csv(response.content)
+        assert len(rows) == 25
+        assert list(rows[0]) == list(history_export.DEFAULT_EXPORT_COLUMNS)
+        assert rows[0]["BMXBMI"] == "20.0" and rows[0]["LBXGLU"] == ""
+
+    def test_columns_and_range(self, client, auth_headers, owner):
+        """Тест: вибір колонок і фільтр [since, until)."""
+        response = client.get(
+            EXPORT_URL,
+            params={"columns": "created_at,BMXBMI,inputs", "since": "2025-01-03T12:00:00", "until": "2025-01-06T12:00:00Z"},
+            headers=auth_headers,
+        )
+
+        rows = _read_csv(response.content)
+        assert list(rows[0]) == ["created_at", "BMXBMI", "inputs"]
+        assert [row["BMXBMI"] for row in rows] == ["22.0", "23.0", "24.0"]
+        assert rows[0]["inputs"].startswith("{")
+
+    @pytest.mark.parametrize("params", [
+        {"format": "xlsx"},
+        {"columns": "id,hashed_password"},
+        {"since": "2025-02-01T00:00:00", "until": "2025-01-01T00:00:00"},
+    ])
+    def test_bad_request(self, client, auth_headers, params):
+        """Тест: невідомий формат, колонка або порожній інтервал — 400."""
+        assert client.get(EXPORT_URL, params=params, headers=auth_headers).status_code == 400
+
+    def test_parquet_unavailable(self, client, auth_headers, monkeypatch):
+        """Тест: без pyarrow експорт у Parquet — 503."""
+        monkeypatch.setattr("src.service.routes_auth.PARQUET_AVAILABLE", False)
+
+        response = client.get(EXPORT_URL, params={"format": "parquet"}, headers=auth_headers)
+
+        assert response.status_code == 503
+
+    def test_parquet_export(self, client, auth_headers, owner):
+        """Тест: Parquet читається pyarrow з обраними колонками."""
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        response = client.get(
+            EXPORT_URL, params={"format": "parquet", "columns": "id,created_at,BMXBMI"}, headers=auth_headers
+        )
+
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.column_names == ["id", "created_at", "BMXBMI"]
+        assert table.num_rows == 25
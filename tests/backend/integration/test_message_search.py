@@ -0,0 +1,149 @@
+"""
+Інтеграційні тести для повнотекстового пошуку повідомлень (/api/search).
+"""
+
+from sqlmodel import Session
+
+from src.service.models import ChatMessage
+from src.service.repositories import add_message
+from src.service.services.message_search import build_match_query
+from tests.backend.integration.conftest import register
+
+
+def _send(client, user, chat_uuid: str, content: str) -> int:
+    response = client.post(
+        f"/api/chats/{chat_uuid}/messages", json={"content": content}, headers=user["headers"]
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _search(client, user, q: str, **params) -> dict:
+    response = client.get("/api/search", params={"q": q, **params}, headers=user["headers"])
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestBuildMatchQuery:
+    """Тести для побудови FTS5-запиту з тексту користувача."""
+
+    def test_tokens_quoted_and_last_is_prefix(self):
+        """Тест: слова беруться в лапки, останнє — префіксний пошук."""
+        assert build_match_query("рівень глюк") == '"рівень" "глюк"*'
+
+    def test_operators_neutralized(self):
+        """Тест: оператори та спецсимволи FTS5 не потрапляють у запит."""
+        assert build_match_query('tea OR "coffee" NEAR(x) -y*') == '"tea" "OR" "coffee" "NEAR" "x" "y"*'
+
+    def test_no_words(self):
+        """Тест: запит без слів дає порожній рядок."""
+        assert build_match_query(" ***  ") == ""
+
+
+class TestMessageSearch:
+    """Тести для GET /api/search."""
+
+    def test_ranking_and_highlight(self, client, alice, bob, chat_uuid):
+        """Тест: релевантніше повідомлення першим, збіги підсвічені."""
+        _send(client, alice, chat_uuid, "Обговорюємо рівень глюкози сьогодні")
+        best = _send(client, bob, chat_uuid, "глюкоза глюкоза глюкоза")
+        _send(client, bob, chat_uuid, "Про погоду")
+
+        data = _search(client, alice, "глюкоз")
+
+        assert [r["message_id"] for r in data["results"]][0] == best
+        assert len(data["results"]) == 2
+        assert all(r["source"] == "chat" and r["chat_uuid"] == chat_uuid for r in data["results"])
+        assert "<mark>глюкоза</mark>" in data["results"][0]["snippet"]
+
+    def test_snippet_is_html_escaped(self, client, alice, bob, chat_uuid):
+        """Тест: HTML у повідомленні екранується, підсвітка лишається."""
+        _send(client, alice, chat_uuid, "<script>alert(1)</script> холестерин")
+
+        snippet = _search(client, bob, "холестерин")["results"][0]["snippet"]
+
+        assert "<script>" not in snippet
+        assert "&lt;script&gt;" in snippet
+        assert "<mark>холестерин</mark>" in snippet
+
+    def test_other_users_chats_not_visible(self, client, sample_user_data, alice, bob, chat_uuid):
+        """Тест: користувач не бачить повідомлень чужих чатів."""
+        _send(client, alice, chat_uuid, "секретний тиск")
+        carol = register(client, sample_user_data, "carol@example.com")
+
+        assert _search(client, carol, "тиск")["results"] == []
+
+    def test_blocked_user_chats_excluded(self, client, alice, bob, chat_uuid):
+        """Тест: чати із заблокованими користувачами не потрапляють у результати."""
+        _send(client, bob, chat_uuid, "пульс у нормі")
+        assert len(_search(client, alice, "пульс")["results"]) == 1
+
+        response = client.patch(f"/users/{bob['id']}/block", headers=alice["headers"])
+        assert response.status_code == 200
+
+        assert _search(client, alice, "пульс")["results"] == []
+        # Блокування одностороннє: bob і далі бачить власне повідомлення
+        assert len(_search(client, bob, "пульс")["results"]) == 1
+
+    def test_assistant_scope(self, client, test_db: Session, alice, bob, chat_uuid):
+        """Тест: scope обмежує джерела, повідомлення асистента видно лише власнику."""
+        _send(client, alice, chat_uuid, "дієта та сон")
+        add_message(test_db, user_id=alice["id"], role="assistant", content="Рекомендована дієта")
+        add_message(test_db, user_id=bob["id"], role="user", content="моя дієта")
+
+        assert {r["source"] for r in _search(client, alice, "дієта")["results"]} == {"chat", "assistant"}
+        assistant = _search(client, alice, "дієта", scope="assistant")["results"]
+        assert [(r["source"], r["role"]) for r in assistant] == [("assistant", "assistant")]
+        assert [r["source"] for r in _search(client, alice, "дієта", scope="chats")["results"]] == ["chat"]
+
+    def test_sources_ranked_separately(self, client, test_db: Session, alice, bob, chat_uuid):
+        """Тест: джерела ранжуються окремо і чергуються; вичерпане джерело доповнюється іншим."""
+        best_chat = _send(client, alice, chat_uuid, "вітамін вітамін вітамін")
+        _send(client, bob, chat_uuid, "купив вітамін у аптеці сьогодні")
+        _send(client, bob, chat_uuid, "вітамін")
+        assistant = add_message(
+            test_db, user_id=alice["id"], role="assistant",
+            content="Вітамін D бажано приймати разом з їжею, а дозу узгодити з лікарем",
+        )
+
+        results = _search(client, alice, "вітамін")["results"]
+        second_page = _search(client, alice, "вітамін", limit=1, offset=1)["results"]
+
+        assert [r["source"] for r in results] == ["chat", "assistant", "chat", "chat"]
+        assert results[0]["message_id"] == best_chat and results[1]["message_id"] == assistant.id
+        assert [r["message_id"] for r in second_page] == [assistant.id]
+
+    def test_index_follows_deletes(self, client, test_db: Session, alice, bob, chat_uuid):
+        """Тест: тригери прибирають з індексу видалені повідомлення."""
+        message_id = _send(client, alice, chat_uuid, "тимчасове повідомлення")
+        assert len(_search(client, alice, "тимчасове")["results"]) == 1
+
+        test_db.delete(test_db.get(ChatMessage, message_id))
+        test_db.commit()
+
+        assert _search(client, alice, "тимчасове")["results"] == []
+
+    def test_pagination(self, client, alice, bob, chat_uuid):
+        """Тест: limit/offset з ознакою has_more."""
+        ids = {_send(client, alice, chat_uuid, f"аналіз номер {i}") for i in range(5)}
+
+        first = _search(client, alice, "аналіз", limit=3)
+        second = _search(client, alice, "аналіз", limit=3, offset=3)
+
+        assert first["has_more"] is True and len(first["results"]) == 3
+        assert second["has_more"] is False and len(second["results"]) == 2
+        assert {r["message_id"] for r in first["results"] + second["results"]} == ids
+
+    def test_fts_syntax_is_safe(self, client, alice, bob, chat_uuid):
+        """Тест: оператори FTS5 у запиті не спричиняють помилку."""
+        _send(client, alice, chat_uuid, "NEAR AND OR")
+
+        data = _search(client, alice, 'near" OR (and*')
+
+        assert len(data["results"]) == 1
+
+    def test_invalid_requests(self, client, alice):
+        """Тест: невідома область, запит без слів та анонімний доступ."""
+        assert client.get("/api/search", params={"q": "x", "scope": "all-users"}, headers=alice["headers"]).status_code == 400
+        assert client.get("/api/search", params={"q": "***"}, headers=alice["headers"]).status_code == 400
+        assert client.get("/api/search", params={"q": "x"}).status_code == 401
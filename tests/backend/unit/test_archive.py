@@ -0,0 +1,253 @@
+"""
+Unit-тести для архівації давніх записів у помісячні файли.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, create_engine
+
+from src.service.archive import (
+    ArchiveConflictError,
+    archive_engines,
+    archive_files,
+    archive_old_rows,
+    plan_archive,
+)
+from src.service.migrations import migrate
+from src.service.models import AssistantMessage, Chat, ChatMessage, PredictionHistory, User
+from src.service.repositories import (
+    delete_chat,
+    delete_prediction,
+    delete_user_messages,
+    get_chat_messages_page,
+    list_prediction_history,
+)
+from src.service.services.history_export import iter_history_chunks
+from src.service.services.prediction_rollups import rebuild_rollups, summarize_predictions
+
+START = datetime(2024, 1, 1)
+CUTOFF = datetime(2024, 4, 1)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    migrate(engine, tmp_path / ".migrate.lock")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def populated(engine):
+    """Два користувачі з чатом; по 20 прогнозів, повідомлень чату й асистента раз на 10 днів з 2024-01-01."""
+    with Session(engine) as session:
+        alice = User(email="a@example.com", hashed_password="x", display_name="A")
+        bob = User(email="b@example.com", hashed_password="x", display_name="B")
+        session.add_all([alice, bob])
+        session.commit()
+        chat = Chat(uuid="chat-uuid", user1_id=alice.id, user2_id=bob.id)
+        session.add(chat)
+        session.commit()
+        for i in range(20):
+            moment = START + timedelta(days=10 * i)
+            session.add(PredictionHistory(
+                user_id=alice.id, target="diabetes_present", model_name="XGBoost",
+                probability=0.5, risk_bucket="low", inputs={}, created_at=moment,
+            ))
+            session.add(ChatMessage(chat_id=chat.id, sender_id=alice.id, content=f"msg {i}", created_at=moment))
+            session.add(AssistantMessage(user_id=alice.id, role="user", content=f"q {i}", created_at=moment))
+        session.commit()
+        return {"user_id": alice.id, "chat_id": chat.id}
+
+
+def _count(engine, table: str) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def _archived_count(engine, table: str) -> int:
+    total = 0
+    for reader in archive_engines(engine):
+        with reader.connect() as conn:
+            total += conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+    return total
+
+
+def _add_prediction(engine, user_id: int, created_at: datetime) -> int:
+    with Session(engine) as session:
+        row = PredictionHistory(
+            user_id=user_id, target="diabetes_present", model_name="XGBoost",
+            probability=0.9, risk_bucket="high", inputs={}, created_at=created_at,
+        )
+        session.add(row)
+        session.commit()
+        return row.id
+
+
+class TestArchiveOldRows:
+    """Тести для archive_old_rows та plan_archive."""
+
+    def test_plan_is_read_only(self, engine, populated):
+        """Тест: план рахує записи по місяцях і нічого не переносить."""
+        plan = plan_archive(engine, CUTOFF)
+
+        assert plan["predictionhistory"] == {"2024-01": 4, "2024-02": 2, "2024-03": 4}
+        assert archive_files(engine) == []
+        assert _count(engine, "predictionhistory") == 20
+
+    def test_rows_moved_to_month_files(self, engine, populated):
+        """Тест: давні записи всіх таблиць переносяться у файли за місяцем created_at."""
+        moved = archive_old_rows(engine, CUTOFF, batch_size=3)
+
+        assert moved == {"predictionhistory": 10, "assistantmessage": 10, "chatmessage": 10}
+        assert [path.name for path in archive_files(engine)] == ["2024-01.db", "2024-02.db", "2024-03.db"]
+        assert _count(engine, "predictionhistory") == 10
+        january = sqlite3.connect(archive_files(engine)[0])
+        try:
+            assert january.execute("SELECT COUNT(*) FROM chatmessage").fetchone() == (4,)
+        finally:
+            january.close()
+
+    def test_rerun_is_noop(self, engine, populated):
+        """Тест: повторний запуск нічого не переносить і не дублює."""
+        archive_old_rows(engine, CUTOFF)
+
+        assert archive_old_rows(engine, CUTOFF) == {"predictionhistory": 0, "assistantmessage": 0, "chatmessage": 0}
+
+    def test_rollups_preserved(self, engine, populated):
+        """Тест: агрегати аналітики після архівації не змінюються."""
+        with Session(engine) as session:
+            before = summarize_predictions(session, START, datetime(2025, 1, 1))
+
+        archive_old_rows(engine, CUTOFF)
+
+        with Session(engine) as session:
+            assert summarize_predictions(session, START, datetime(2025, 1, 1)) == before
+
+
+class TestArchiveIds:
+    """Тести захисту від повторного використання id та конфліктів в архівах."""
+
+    def test_archive_insert_archive_again(self, engine, populated):
+        """Тест: після архівації всіх записів новий запис отримує новий id і теж архівується без втрат."""
+        everything = datetime(2030, 1, 1)
+        archive_old_rows(engine, everything)
+        new_id = _add_prediction(engine, populated["user_id"], START)
+
+        moved = archive_old_rows(engine, everything)
+
+        assert new_id == 21
+        assert moved["predictionhistory"] == 1
+        assert _count(engine, "predictionhistory") == 0
+        assert _archived_count(engine, "predictionhistory") == 21
+
+    def test_conflicting_archive_row_keeps_main_row(self, engine, populated):
+        """Тест: інший рядок з тим самим id в архіві зупиняє архівацію, запис лишається в основній БД."""
+        archive_old_rows(engine, datetime(2024, 1, 15))
+        january = sqlite3.connect(archive_files(engine)[0])
+        try:
+            january.execute(
+                "INSERT INTO predictionhistory (id, user_id, target, probability, risk_bucket, inputs, created_at) "
+                "SELECT 4, user_id, target, 0.01, risk_bucket, inputs, created_at FROM predictionhistory LIMIT 1"
+            )
+            january.commit()
+        finally:
+            january.close()
+
+        with pytest.raises(ArchiveConflictError, match="predictionhistory"):
+            archive_old_rows(engine, datetime(2024, 2, 15), batch_size=10)
+
+        assert _count(engine, "predictionhistory") == 18
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT probability FROM predictionhistory WHERE id = 4")).scalar() == 0.5
+
+
+class TestArchiveDeletes:
+    """Тести видалення архівних записів через репозиторії та перерахунку агрегатів."""
+
+    def test_delete_archived_prediction(self, engine, populated):
+        """Тест: архівний прогноз, видимий у списку історії, видаляється разом з його внеском в агрегати."""
+        archive_old_rows(engine, CUTOFF)
+
+        with Session(engine) as session:
+            deleted = delete_prediction(session, populated["user_id"], 1)
+            missing = delete_prediction(session, populated["user_id"], 1)
+            summary = summarize_predictions(session, START, datetime(2025, 1, 1))
+
+        assert deleted and not missing
+        assert _archived_count(engine, "predictionhistory") == 9
+        assert summary["count"] == 19
+
+    def test_delete_messages_and_chat(self, engine, populated):
+        """Тест: очищення історії асистента та видалення чату прибирають і архівні повідомлення."""
+        archive_old_rows(engine, CUTOFF)
+
+        with Session(engine) as session:
+            cleared = delete_user_messages(session, populated["user_id"])
+            assert delete_chat(session, "chat-uuid", populated["user_id"])
+
+        assert cleared == 20
+        assert _archived_count(engine, "assistantmessage") == 0
+        assert _archived_count(engine, "chatmessage") == 0
+
+    def test_rebuild_rollups_counts_archives(self, engine, populated):
+        """Тест: повний перерахунок агрегатів враховує архівні прогнози."""
+        with Session(engine) as session:
+            before = summarize_predictions(session, START, datetime(2025, 1, 1))
+        archive_old_rows(engine, CUTOFF)
+
+        with engine.begin() as conn:
+            rebuild_rollups(conn)
+
+        with Session(engine) as session:
+            assert summarize_predictions(session, START, datetime(2025, 1, 1)) == before
+
+
+class TestArchiveReads:
+    """Тести прозорого читання з архівів."""
+
+    def test_prediction_history_spans_archives(self, engine, populated):
+        """Тест: історія прогнозів доповнюється з архівів від новіших до старіших."""
+        archive_old_rows(engine, CUTOFF)
+
+        with Session(engine) as session:
+            rows = list_prediction_history(session, populated["user_id"], limit=15)
+
+        dates = [row.created_at for row in rows]
+        assert len(rows) == 15
+        assert dates == sorted(dates, reverse=True)
+
+    def test_chat_pages_continue_into_archives(self, engine, populated):
+        """Тест: підвантаження старших повідомлень чату продовжується в архівах."""
+        archive_old_rows(engine, CUTOFF)
+        contents = []
+        before_id = None
+
+        with Session(engine) as session:
+            while True:
+                page, has_more = get_chat_messages_page(session, populated["chat_id"], limit=7, before_id=before_id)
+                contents = [m.content for m in page] + contents
+                if not has_more:
+                    break
+                before_id = page[0].id
+
+        assert contents == [f"msg {i}" for i in range(20)]
+
+    def test_export_includes_archives(self, engine, populated):
+        """Тест: експорт історії читає архіви першими, за зростанням id."""
+        archive_old_rows(engine, CUTOFF)
+
+        ids = [row[0] for chunk in iter_history_chunks(engine, populated["user_id"], ["id"], chunk_size=4) for row in chunk]
+
+        assert ids == sorted(ids) and len(ids) == 20
+
+    def test_archives_are_read_only(self, engine, populated):
+        """Тест: архіви відкриваються лише на читання."""
+        archive_old_rows(engine, CUTOFF)
+
+        with pytest.raises(Exception, match="readonly"):
+            with archive_engines(engine)[0].begin() as conn:
+                conn.execute(text("DELETE FROM predictionhistory"))
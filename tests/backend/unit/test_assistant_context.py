@@ -0,0 +1,111 @@
+"""
+Unit-тести для памʼяті розмови асистента та бюджету токенів.
+"""
+
+import pytest
+
+from src.service.models import User
+from src.service.repositories import add_message, delete_user_messages, get_assistant_summary
+from src.service.services.assistant_context import (
+    build_conversation_history,
+    estimate_tokens,
+    summarize_turn,
+)
+from src.service.services.assistant_llm import build_assistant_prompt
+
+
+@pytest.fixture
+def user(test_db):
+    """Користувач для історії повідомлень."""
+    user = User(email="memory@example.com", hashed_password="x", display_name="Memory")
+    test_db.add(user)
+    test_db.commit()
+    test_db.refresh(user)
+    return user
+
+
+def add_turns(session, user_id: int, count: int, size: int = 200) -> None:
+    """Додає count пар запитання/відповідь з текстом довжиною size символів."""
+    for i in range(count):
+        add_message(session, user_id=user_id, role="user", content=f"Питання {i}. " + "а" * size)
+        add_message(session, user_id=user_id, role="assistant", content=f"Відповідь {i}. " + "б" * size)
+
+
+class TestEstimateTokens:
+    """Тести для estimate_tokens."""
+
+    def test_empty_and_monotonic(self):
+        """Тест: порожній текст — 0 токенів, довший текст — більше токенів."""
+        assert estimate_tokens("") == 0
+        assert 0 < estimate_tokens("привіт") < estimate_tokens("привіт " * 10)
+
+
+class TestConversationHistory:
+    """Тести для build_conversation_history."""
+
+    def test_short_history_verbatim(self, test_db, user):
+        """Тест: коротка історія потрапляє в промпт дослівно, без підсумку."""
+        add_turns(test_db, user.id, 1, size=10)
+        history = build_conversation_history(test_db, user.id, budget_tokens=500)
+
+        assert history.messages == 2
+        assert history.summary == ""
+        assert "Користувач: Питання 0." in history.turns
+        assert get_assistant_summary(test_db, user.id) is None
+
+    def test_budget_is_respected(self, test_db, user):
+        """Тест: довга історія не перевищує бюджет, давні повідомлення стиснуто."""
+        add_turns(test_db, user.id, 20)
+        history = build_conversation_history(test_db, user.id, budget_tokens=400, summary_max_tokens=120)
+
+        assert history.tokens <= 400
+        assert estimate_tokens(history.summary + history.turns) <= 400
+        assert 0 < history.messages < 40
+        assert "Відповідь 19." in history.turns
+        assert history.summary
+
+    def test_summary_cached_and_extended(self, test_db, user):
+        """Тест: підсумок зберігається в БД і доповнюється лише новими повідомленнями."""
+        add_turns(test_db, user.id, 10)
+        build_conversation_history(test_db, user.id, budget_tokens=300)
+        first = get_assistant_summary(test_db, user.id)
+        upto = first.upto_message_id
+
+        # Повторний виклик без нових повідомлень не змінює підсумок
+        build_conversation_history(test_db, user.id, budget_tokens=300)
+        assert get_assistant_summary(test_db, user.id).upto_message_id == upto
+
+        add_turns(test_db, user.id, 5)
+        build_conversation_history(test_db, user.id, budget_tokens=300)
+        assert get_assistant_summary(test_db, user.id).upto_message_id > upto
+
+    def test_max_messages(self, test_db, user):
+        """Тест: дослівно додається не більше max_messages повідомлень."""
+        add_turns(test_db, user.id, 5, size=5)
+        history = build_conversation_history(test_db, user.id, budget_tokens=5000, max_messages=4)
+
+        assert history.messages == 4
+        assert "Питання 0." in history.summary
+
+    def test_delete_history_removes_summary(self, test_db, user):
+        """Тест: очищення історії видаляє і підсумок."""
+        add_turns(test_db, user.id, 10)
+        build_conversation_history(test_db, user.id, budget_tokens=300)
+        delete_user_messages(test_db, user.id)
+
+        assert get_assistant_summary(test_db, user.id) is None
+
+    def test_summarize_turn_first_sentence(self, test_db, user):
+        """Тест: у підсумок потрапляє лише перше речення повідомлення."""
+        msg = add_message(test_db, user_id=user.id, role="assistant", content="Перше речення. Друге речення.")
+
+        assert summarize_turn(msg) == "- Асистент: Перше речення."
+
+    def test_prompt_contains_history_blocks(self):
+        """Тест: підказ містить блоки підсумку та останніх повідомлень."""
+        prompt = build_assistant_prompt(
+            "", "Що далі?", history_summary="- Користувач: Привіт.", history_turns="Асистент: Вітаю"
+        )
+
+        assert "Підсумок попередньої розмови:" in prompt
+        assert prompt.index("Асистент: Вітаю") < prompt.index("Запит користувача: Що далі?")
@@ -0,0 +1,60 @@
+"""
+Unit-тести для in-process pub/sub чатів.
+"""
+
+import asyncio
+import threading
+
+from src.service.services.chat_hub import OVERFLOW, ChatHub
+
+
+class TestChatHub:
+    """Тести для ChatHub."""
+
+    async def test_publish_to_all_connections_of_user(self):
+        """Тест: подія доходить до всіх зʼєднань адресата і не доходить до інших."""
+        hub = ChatHub(max_queue=10)
+        first = hub.subscribe(1)
+        second = hub.subscribe(1)
+        other = hub.subscribe(2)
+
+        assert hub.publish([1], {"type": "x"}) == 2
+        assert first.queue.get_nowait() == {"type": "x"}
+        assert second.queue.get_nowait() == {"type": "x"}
+        assert other.queue.empty()
+
+    async def test_unsubscribe(self):
+        """Тест: після відписки користувач офлайн."""
+        hub = ChatHub()
+        sub = hub.subscribe(1)
+        assert hub.is_online(1)
+        hub.unsubscribe(sub)
+
+        assert not hub.is_online(1)
+        assert hub.publish([1], {"type": "x"}) == 0
+
+    async def test_slow_consumer_overflow(self):
+        """Тест: переповнена черга отримує маркер OVERFLOW, нові події відкидаються."""
+        hub = ChatHub(max_queue=3)
+        sub = hub.subscribe(1)
+        for i in range(10):
+            hub.publish([1], {"type": "x", "i": i})
+
+        events = [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+        assert events[:3] == [{"type": "x", "i": i} for i in range(3)]
+        assert events[-1] is OVERFLOW
+        assert len(events) == 4
+
+        hub.unsubscribe(sub)
+        assert hub.stats()["overflows"] == 1
+
+    async def test_publish_from_other_thread(self):
+        """Тест: публікація з іншого потоку доставляється в цикл підписника."""
+        hub = ChatHub()
+        sub = hub.subscribe(1)
+
+        thread = threading.Thread(target=hub.publish, args=([1], {"type": "x"}))
+        thread.start()
+        thread.join()
+
+        assert await asyncio.wait_for(sub.queue.get(), timeout=1) == {"type": "x"}
@@ -0,0 +1,140 @@
+"""
+Unit-тести для пулового клієнта Ollama та обмежувача конкурентності.
+"""
+
+import asyncio
+
+import pytest
+
+from src.service.services.llm_client import (
+    ConcurrencyLimiter,
+    LLMError,
+    LLMQueueFullError,
+    OllamaClient,
+)
+from tests.utils.fake_ollama import FakeOllama
+
+
+class TestConcurrencyLimiter:
+    """Тести для FIFO-черги генерацій."""
+
+    async def test_free_slot_has_zero_position(self):
+        """Тест: за наявності вільного слоту позиція в черзі 0."""
+        limiter = ConcurrencyLimiter(max_concurrency=2, max_queue=2)
+        ticket = limiter.reserve()
+        await ticket.wait()
+
+        assert ticket.position == 0
+        assert limiter.active == 1
+        ticket.release()
+        assert limiter.active == 0
+
+    async def test_queue_positions_and_fifo(self):
+        """Тест: очікувачі отримують позиції 1, 2 і слоти у порядку FIFO."""
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=5)
+        holder = limiter.reserve()
+        first = limiter.reserve()
+        second = limiter.reserve()
+        assert (first.position, second.position) == (1, 2)
+
+        order = []
+
+        async def run(ticket, name):
+            async with ticket:
+                order.append(name)
+
+        tasks = [asyncio.create_task(run(second, "second")), asyncio.create_task(run(first, "first"))]
+        await asyncio.sleep(0.01)
+        assert order == []
+
+        holder.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["first", "second"]
+        assert limiter.active == 0
+        assert first.wait_ms >= 10
+
+    async def test_queue_full(self):
+        """Тест: переповнена черга відхиляє запит."""
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1)
+        limiter.reserve()
+        limiter.reserve()
+
+        assert limiter.is_full()
+        with pytest.raises(LLMQueueFullError):
+            limiter.reserve()
+        assert limiter.stats()["rejected"] == 1
+
+    async def test_cancelled_waiter_frees_place(self):
+        """Тест: скасований очікувач не блокує чергу."""
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1)
+        holder = limiter.reserve()
+        waiter = limiter.reserve()
+
+        task = asyncio.create_task(waiter.wait())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert limiter.waiting == 0
+        holder.release()
+        assert limiter.active == 0
+
+    async def test_release_is_idempotent(self):
+        """Тест: повторне звільнення не зменшує лічильник нижче нуля."""
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1)
+        ticket = limiter.reserve()
+        ticket.release()
+        ticket.release()
+
+        assert limiter.active == 0
+
+
+class TestOllamaClient:
+    """Тести для OllamaClient на фейковому сервері."""
+
+    async def test_generate(self):
+        """Тест: generate повертає повну відповідь без стрімінгу."""
+        with FakeOllama(tokens=["a", "b"]) as server:
+            client = OllamaClient(url=server.url, model="test-model")
+            text = await client.generate("prompt")
+            await client.aclose()
+
+        assert text == "ab"
+        assert server.requests[0] == {"model": "test-model", "prompt": "prompt", "stream": False}
+
+    async def test_generate_error(self):
+        """Тест: HTTP-помилка перетворюється на LLMError."""
+        with FakeOllama(status_code=500) as server:
+            client = OllamaClient(url=server.url, model="m")
+            with pytest.raises(LLMError):
+                await client.generate("prompt")
+            await client.aclose()
+
+    async def test_connection_reused(self):
+        """Тест: послідовні запити використовують спільний пул."""
+        with FakeOllama() as server:
+            client = OllamaClient(url=server.url, model="m")
+            http = client.http()
+            await client.generate("one")
+            await client.generate("two")
+
+            assert client.http() is http
+            await client.aclose()
+
+    async def test_concurrency_cap(self):
+        """Тест: до Ollama одночасно надходить не більше max_concurrency запитів."""
+        with FakeOllama(tokens=["x"] * 5, delay=0.02) as server:
+            client = OllamaClient(url=server.url, model="m", max_concurrency=2, max_queue=10)
+
+            async def one():
+                async with client.limiter.reserve():
+                    return await client.generate("p")
+
+            results = await asyncio.gather(*[one() for _ in range(6)])
+            await client.aclose()
+
+        assert results == ["xxxxx"] * 6
+        assert server.max_active <= 2
+        assert client.limiter.stats()["queued_total"] == 4
@@ -0,0 +1,198 @@
+"""
+Unit-тести для онлайн-копіювання, перевірки цілісності та ущільнення БД.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.service import maintenance
+from src.service.maintenance import (
+    backup_database,
+    check_integrity,
+    compact_database,
+    database_stats,
+    prune_backups,
+)
+
+ROWS = 4000
+
+
+def _create_db(path, auto_vacuum: str = "NONE"):
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA auto_vacuum = {auto_vacuum}")
+    conn.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO item (payload) VALUES (?)", [("x" * 400,) for _ in range(ROWS)])
+    conn.commit()
+    conn.close()
+
+
+def _count(path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM item").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "app.db"
+    _create_db(path)
+    return path
+
+
+class TestBackupDatabase:
+    """Тести для backup_database."""
+
+    def test_backup_copies_all_pages(self, database, tmp_path):
+        """Тест: копія повна, цілісна, кроки не більше pages_per_step сторінок."""
+        destination = tmp_path / "backups" / "app-1.db"
+
+        report = backup_database(database, destination, pages_per_step=50, pause=0)
+
+        assert _count(destination) == ROWS
+        assert report["integrity"]["ok"] is True
+        assert report["pages_copied"] == report["total_pages"] == database_stats(database)["page_count"]
+        assert report["steps"] >= report["total_pages"] // 50
+        assert not destination.with_name("app-1.db.partial").exists()
+
+    def test_writers_not_blocked(self, database, tmp_path):
+        """Тест: записи під час копіювання проходять, копія лишається цілісною."""
+        done = threading.Event()
+        writes = []
+
+        def writer():
+            conn = sqlite3.connect(database, timeout=5)
+            while not done.is_set():
+                conn.execute("INSERT INTO item (payload) VALUES ('w')")
+                conn.commit()
+                writes.append(1)
+                time.sleep(0.001)
+            conn.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            report = backup_database(database, tmp_path / "copy.db", pages_per_step=100, pause=0.002)
+        finally:
+            done.set()
+            thread.join()
+
+        assert writes
+        assert report["integrity"]["ok"] is True
+        assert _count(tmp_path / "copy.db") >= ROWS
+
+    def test_prune_backups(self, tmp_path):
+        """Тест: лишаються keep найновіших копій."""
+        for stamp in ("20250101-000000", "20250102-000000", "20250103-000000"):
+            (tmp_path / f"app-{stamp}.db").write_bytes(b"")
+
+        removed = prune_backups(tmp_path, "app", keep=2)
+
+        assert [path.name for path in removed] == ["app-20250101-000000.db"]
+        assert len(list(tmp_path.glob("app-*.db"))) == 2
+
+
+class TestCheckIntegrity:
+    """Тести для check_integrity."""
+
+    def test_healthy_database(self, database):
+        """Тест: цілісна БД — ok."""
+        assert check_integrity(database)["ok"] is True
+
+    def test_corrupted_database(self, database):
+        """Тест: пошкоджені сторінки даних виявляються."""
+        data = bytearray(database.read_bytes())
+        page_size = database_stats(database)["page_size"]
+        # Затираємо кілька сторінок таблиці (перша сторінка — заголовок і схема)
+        data[page_size * 3:page_size * 6] = b"\xff" * (page_size * 3)
+        database.write_bytes(bytes(data))
+
+        report = check_integrity(database)
+
+        assert report["ok"] is False
+        assert report["errors"]
+
+
+class TestCompactDatabase:
+    """Тести для compact_database."""
+
+    def _delete_half(self, path):
+        conn = sqlite3.connect(path)
+        conn.execute("DELETE FROM item WHERE id <= ?", (ROWS // 2,))
+        conn.commit()
+        conn.close()
+
+    def test_incremental_vacuum_in_steps(self, tmp_path):
+        """Тест: вільні сторінки звільняються порціями до max_pages."""
+        path = tmp_path / "app.db"
+        _create_db(path, auto_vacuum="INCREMENTAL")
+        self._delete_half(path)
+        free = database_stats(path)["freelist_count"]
+
+        partial = compact_database(path, pages_per_step=10, pause=0, max_pages=30)
+        full = compact_database(path, pages_per_step=100, pause=0)
+
+        assert free > 30
+        assert partial["pages_freed"] == 30 and partial["steps"] == 3
+        assert partial["after"]["freelist_count"] == free - 30
+        assert full["after"]["freelist_count"] == 0
+        assert full["after"]["page_count"] < partial["before"]["page_count"]
+        assert _count(path) == ROWS // 2
+
+    def test_enable_incremental(self, database):
+        """Тест: без incremental режиму сторінки не звільняються, доки його не ввімкнено."""
+        self._delete_half(database)
+
+        unchanged = compact_database(database)
+        switched = compact_database(database, enable_incremental=True)
+
+        assert unchanged["pages_freed"] == 0 and unchanged["after"]["freelist_count"] > 0
+        assert switched["full_vacuum"] is True
+        assert switched["after"]["auto_vacuum"] == "incremental"
+        assert switched["after"]["freelist_count"] == 0
+
+
+class TestMaintenanceLoop:
+    """Тести для фонового обслуговування."""
+
+    async def test_loop_runs_periodically(self, database, monkeypatch):
+        """Тест: обслуговування виконується кожен інтервал до скасування задачі."""
+        calls = []
+        monkeypatch.setattr(maintenance, "run_maintenance", lambda path: calls.append(path) or {
+            "pages_freed": 0, "duration_ms": 0.0, "lock_wait_ms": 0.0,
+        })
+
+        task = asyncio.create_task(maintenance.maintenance_loop(database, 0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        assert len(calls) >= 2
+        assert calls[0] == database
+
+    async def test_single_worker_holds_lock(self, database, tmp_path, monkeypatch):
+        """Тест: з однаковим lock_path обслуговує лише один цикл; після його зупинки роботу бере інший."""
+        calls = []
+        monkeypatch.setattr(maintenance, "run_maintenance", lambda path: calls.append(path) or {
+            "pages_freed": 0, "duration_ms": 0.0, "lock_wait_ms": 0.0,
+        })
+        lock_path = tmp_path / ".maintenance.lock"
+
+        owner = asyncio.create_task(maintenance.maintenance_loop(database, 0.01, lock_path))
+        await asyncio.sleep(0.015)
+        other = asyncio.create_task(maintenance.maintenance_loop(tmp_path / "other.db", 0.01, lock_path))
+        await asyncio.sleep(0.05)
+        owner.cancel()
+        await asyncio.gather(owner, return_exceptions=True)
+        await asyncio.sleep(0.05)
+        other.cancel()
+        await asyncio.gather(other, return_exceptions=True)
+
+        first_other = calls.index(tmp_path / "other.db")
+        assert first_other >= 2
+        assert set(calls[:first_other]) == {database}
+        assert set(calls[first_other:]) == {tmp_path / "other.db"}
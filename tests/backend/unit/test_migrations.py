@@ -0,0 +1,181 @@
+"""
+Unit-тести для версійованих міграцій схеми БД.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import event, text
+from sqlmodel import create_engine
+
+from src.service import migrations
+from src.service.migrations import LATEST_VERSION, Migration, get_schema_version, migrate
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    return tmp_path / ".migrate.lock"
+
+
+def _columns(engine, table: str) -> set:
+    with engine.connect() as conn:
+        return {row[1] for row in conn.execute(text(f'PRAGMA table_info("{table}")'))}
+
+
+def _tables(engine) -> set:
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+
+
+class TestMigrate:
+    """Тести для migrate та get_schema_version."""
+
+    def test_fresh_database(self, engine, lock_path):
+        """Тест: порожня БД доводиться до останньої версії."""
+        assert get_schema_version(engine) == 0
+
+        applied = migrate(engine, lock_path)
+
+        assert applied == [m.version for m in migrations.MIGRATIONS]
+        assert get_schema_version(engine) == LATEST_VERSION
+        assert {"user", "chat", "chatmessage", "userblock", "chatmessage_fts"} <= _tables(engine)
+
+    def test_second_run_is_noop(self, engine, lock_path):
+        """Тест: повторний запуск нічого не застосовує, перевірка версії — один запит."""
+        migrate(engine, lock_path)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        assert get_schema_version(engine) == LATEST_VERSION
+        assert len(statements) == 1
+        assert migrate(engine, lock_path) == []
+
+    def test_legacy_database_upgraded(self, engine, lock_path):
+        """Тест: БД без schema_version та з давньою схемою отримує відсутні колонки й індекси."""
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE user (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL, "
+                "hashed_password VARCHAR NOT NULL, display_name VARCHAR NOT NULL)"
+            ))
+            conn.execute(text("INSERT INTO user (email, hashed_password, display_name) VALUES ('a@b.c', 'x', 'A')"))
+            conn.execute(text(
+                "CREATE TABLE chat (id INTEGER PRIMARY KEY, uuid VARCHAR NOT NULL, "
+                "user1_id INTEGER NOT NULL, user2_id INTEGER NOT NULL)"
+            ))
+
+        migrate(engine, lock_path)
+
+        assert {"avatar_type", "first_name", "last_name", "date_of_birth", "gender"} <= _columns(engine, "user")
+        assert {"is_pinned", "order"} <= _columns(engine, "chat")
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT avatar_type FROM user")).scalar() == "generated"
+        assert get_schema_version(engine) == LATEST_VERSION
+
+    def test_prediction_features_backfilled(self, engine, lock_path):
+        """Тест: ознаки з JSON inputs переносяться в типізовані колонки."""
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE predictionhistory (id INTEGER PRIMARY KEY, user_id INTEGER, target VARCHAR, "
+                "model_name VARCHAR, probability FLOAT, risk_bucket VARCHAR, inputs JSON, created_at DATETIME)"
+            ))
+            conn.execute(text(
+                "INSERT INTO predictionhistory (user_id, target, probability, risk_bucket, inputs, created_at) "
+                "VALUES (1, 'diabetes_present', 0.7, 'high', :inputs, '2025-01-01')"
+            ), {"inputs": '{"RIDAGEYR": 54, "RIAGENDR": 2, "BMXBMI": 31.5, "LBXGLU": "n/a", "top_factors": []}'})
+
+        migrate(engine, lock_path)
+
+        with engine.connect() as conn:
+            row = conn.execute(text(
+                "SELECT RIDAGEYR, RIAGENDR, BMXBMI, BPXSY1, LBXGLU FROM predictionhistory"
+            )).one()
+        assert tuple(row) == (54.0, 2, 31.5, None, None)
+
+    def test_archived_tables_rebuilt_with_autoincrement(self, engine, lock_path):
+        """Тест: давня chatmessage перебудовується з AUTOINCREMENT, індекси й FTS-тригери зберігаються."""
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE chatmessage (id INTEGER PRIMARY KEY, chat_id INTEGER NOT NULL, "
+                "sender_id INTEGER NOT NULL, content TEXT NOT NULL, created_at DATETIME NOT NULL, read_at DATETIME)"
+            ))
+            conn.execute(text(
+                "INSERT INTO chatmessage (chat_id, sender_id, content, created_at) "
+                "VALUES (1, 1, 'перше', '2024-01-01'), (1, 1, 'друге', '2024-01-02')"
+            ))
+
+        migrate(engine, lock_path)
+
+        with engine.begin() as conn:
+            ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'chatmessage'")).scalar()
+            dependents = {row[0] for row in conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE tbl_name = 'chatmessage' AND type IN ('index', 'trigger')"
+            ))}
+            conn.execute(text("DELETE FROM chatmessage WHERE id = 2"))
+            conn.execute(text(
+                "INSERT INTO chatmessage (chat_id, sender_id, content, created_at) VALUES (1, 1, 'третє', '2024-01-03')"
+            ))
+            new_id = conn.execute(text("SELECT MAX(id) FROM chatmessage")).scalar()
+            found = conn.execute(text(
+                "SELECT rowid FROM chatmessage_fts WHERE chatmessage_fts MATCH 'перше OR третє' ORDER BY rowid"
+            )).scalars().all()
+
+        assert "AUTOINCREMENT" in ddl
+        assert {"ix_chatmessage_chat_id_id", "chatmessage_fts_ai", "chatmessage_fts_ad"} <= dependents
+        assert new_id == 3
+        assert found == [1, 3]
+
+    def test_failure_rolls_back_everything(self, engine, lock_path, monkeypatch):
+        """Тест: помилка в міграції відкочує всі зміни цього запуску."""
+        def broken(conn):
+            conn.execute(text("CREATE TABLE half_done (id INTEGER)"))
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [Migration(99, "broken", broken)])
+
+        with pytest.raises(RuntimeError):
+            migrate(engine, lock_path)
+
+        assert "half_done" not in _tables(engine)
+        assert "user" not in _tables(engine)
+        assert get_schema_version(engine) == 0
+
+    def test_pending_migrations_only(self, engine, lock_path, monkeypatch):
+        """Тест: застосовуються лише міграції з номером, більшим за поточну версію."""
+        migrate(engine, lock_path)
+        calls = []
+        extra = Migration(LATEST_VERSION + 1, "extra", lambda conn: calls.append(conn))
+        monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [extra])
+
+        assert migrate(engine, lock_path) == [LATEST_VERSION + 1]
+        assert migrate(engine, lock_path) == []
+        assert len(calls) == 1
+
+    def test_parallel_workers(self, tmp_path, lock_path):
+        """Тест: паралельні «воркери» не виконують міграції двічі."""
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+        results, errors = [], []
+
+        def worker():
+            engine = create_engine(url, connect_args={"check_same_thread": False})
+            try:
+                results.append(migrate(engine, lock_path))
+            except Exception as e:  # pragma: no cover — помилка тесту
+                errors.append(e)
+            finally:
+                engine.dispose()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert sorted(len(r) for r in results) == [0, 0, 0, LATEST_VERSION]
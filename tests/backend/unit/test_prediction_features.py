@@ -0,0 +1,123 @@
+"""
+Unit-тести для типізованих колонок ознак у PredictionHistory та /analytics/features.
+"""
+
+from datetime import datetime, timedelta
+
+from src.service.models import PredictionHistory, User
+from src.service.repositories import (
+    add_prediction_history,
+    get_prediction_feature_stats,
+    prediction_feature_values,
+)
+
+
+def _user(session) -> User:
+    user = User(email="stats@example.com", hashed_password="x", display_name="Stats")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _add(session, user, target="diabetes_present", risk="high", **features):
+    return add_prediction_history(
+        session,
+        user_id=user.id,
+        target=target,
+        model_name="M",
+        probability=0.5,
+        risk_bucket=risk,
+        inputs={**features, "target": target, "model": "auto", "top_factors": []},
+    )
+
+
+class TestPredictionFeatureValues:
+    """Тести для prediction_feature_values."""
+
+    def test_numeric_values_kept(self):
+        """Тест: числові ознаки переносяться, стать — ціле число."""
+        values = prediction_feature_values({"RIDAGEYR": 40, "RIAGENDR": 2.0, "BMXBMI": 27.5})
+
+        assert values["RIDAGEYR"] == 40
+        assert values["RIAGENDR"] == 2 and isinstance(values["RIAGENDR"], int)
+        assert values["BMXBMI"] == 27.5
+        assert values["LBXTC"] is None
+
+    def test_non_numeric_values_dropped(self):
+        """Тест: рядки, булеві значення та не-словник дають None."""
+        assert prediction_feature_values({"BMXBMI": "30", "RIAGENDR": True})["BMXBMI"] is None
+        assert prediction_feature_values({"RIAGENDR": True})["RIAGENDR"] is None
+        assert set(prediction_feature_values(None).values()) == {None}
+
+
+class TestPredictionFeatureColumns:
+    """Тести запису та агрегації типізованих ознак."""
+
+    def test_columns_populated_on_write(self, test_db):
+        """Тест: add_prediction_history заповнює колонки, inputs не змінюється."""
+        user = _user(test_db)
+        history = _add(test_db, user, RIDAGEYR=50, BMXBMI=32.0)
+
+        stored = test_db.get(PredictionHistory, history.id)
+        assert stored.RIDAGEYR == 50
+        assert stored.BMXBMI == 32.0
+        assert stored.LBXGLU is None
+        assert stored.inputs["BMXBMI"] == 32.0
+        assert stored.inputs["top_factors"] == []
+
+    def test_feature_stats(self, test_db):
+        """Тест: агрегати по ознаках з фільтрами за ціллю, ризиком та часом."""
+        user = _user(test_db)
+        _add(test_db, user, BMXBMI=30.0, RIDAGEYR=60)
+        _add(test_db, user, BMXBMI=34.0)
+        _add(test_db, user, risk="low", BMXBMI=22.0)
+        _add(test_db, user, target="obesity_present", BMXBMI=40.0)
+
+        stats = get_prediction_feature_stats(test_db, target="diabetes_present", risk_bucket="high")
+
+        assert stats["count"] == 2
+        assert stats["features"]["BMXBMI"] == {"count": 2, "mean": 32.0, "min": 30.0, "max": 34.0}
+        assert stats["features"]["RIDAGEYR"]["count"] == 1
+        assert stats["features"]["LBXTC"] == {"count": 0, "mean": None, "min": None, "max": None}
+
+        assert get_prediction_feature_stats(test_db)["count"] == 4
+        future = datetime.utcnow() + timedelta(days=1)
+        assert get_prediction_feature_stats(test_db, since=future)["count"] == 0
+
+
+class TestAnalyticsFeaturesEndpoint:
+    """Тести для GET /analytics/features."""
+
+    def test_requires_auth(self, client):
+        """Тест: без токена — 401."""
+        assert client.get("/analytics/features").status_code == 401
+
+    def test_feature_stats(self, client, auth_headers, test_db):
+        """Тест: ендпоінт віддає агрегати ознак з фільтрами за ціллю та ризиком."""
+        user = _user(test_db)
+        _add(test_db, user, BMXBMI=30.0)
+        _add(test_db, user, BMXBMI=34.0)
+        _add(test_db, user, risk="low", BMXBMI=22.0)
+
+        response = client.get(
+            "/analytics/features",
+            params={"target": "diabetes_present", "risk_bucket": "high"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 2
+        assert data["features"]["BMXBMI"] == {"count": 2, "mean": 32.0, "min": 30.0, "max": 34.0}
+
+    def test_bad_request(self, client, auth_headers):
+        """Тест: невідома категорія ризику або порожній інтервал — 400."""
+        assert client.get(
+            "/analytics/features", params={"risk_bucket": "extreme"}, headers=auth_headers
+        ).status_code == 400
+        assert client.get(
+            "/analytics/features",
+            params={"since": "2025-03-05T00:00:00", "until": "2025-03-01T00:00:00"},
+            headers=auth_headers,
+        ).status_code == 400
@@ -0,0 +1,161 @@
+"""
+Unit-тести для агрегатів прогнозів та /analytics/summary.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from src.service.models import PredictionHistory, PredictionRollup, User
+from src.service.services.prediction_rollups import rebuild_rollups, summarize_predictions
+
+BASE = datetime(2025, 3, 1, 10, 30)
+TARGETS = ("diabetes_present", "obesity_present")
+RISKS = ("low", "medium", "high")
+
+
+def _user(session) -> User:
+    user = User(email="rollups@example.com", hashed_password="x", display_name="Rollups")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def history(test_db):
+    """60 прогнозів з кроком 7 годин (≈17.5 днів), різні цілі, моделі та ризики."""
+    user = _user(test_db)
+    for i in range(60):
+        test_db.add(PredictionHistory(
+            user_id=user.id,
+            target=TARGETS[i % 2],
+            model_name=None if i % 5 == 0 else "XGBoost",
+            probability=round(i / 60, 4),
+            risk_bucket=RISKS[i % 3],
+            inputs={},
+            created_at=BASE + timedelta(hours=7 * i),
+        ))
+    test_db.commit()
+    return test_db.exec(select(PredictionHistory)).all()
+
+
+def _scan(rows, since, until, target=None):
+    """Еталон: пряме сканування історії."""
+    return [
+        r for r in rows
+        if since <= r.created_at < until and (target is None or r.target == target)
+    ]
+
+
+def _rollups(session):
+    return sorted(
+        (r.granularity, r.bucket_start, r.target, r.risk_bucket, r.model_name, r.count, round(r.probability_sum, 6))
+        for r in session.exec(select(PredictionRollup)).all()
+    )
+
+
+class TestSummarizePredictions:
+    """Тести для summarize_predictions."""
+
+    @pytest.mark.parametrize("since, until", [
+        (datetime(2025, 3, 1), datetime(2025, 4, 1)),
+        (datetime(2025, 3, 2, 5), datetime(2025, 3, 9, 17)),
+        (datetime(2025, 3, 4, 3), datetime(2025, 3, 4, 20)),
+    ])
+    def test_matches_direct_scan(self, test_db, history, since, until):
+        """Тест: повні дні та неповні краї дають ті самі підсумки, що й скан історії."""
+        expected = _scan(history, since, until)
+
+        summary = summarize_predictions(test_db, since, until)
+
+        assert summary["count"] == len(expected)
+        assert summary["mean_probability"] == round(sum(r.probability for r in expected) / len(expected), 4)
+        for risk in RISKS:
+            count = sum(1 for r in expected if r.risk_bucket == risk)
+            assert summary["by_risk_bucket"].get(risk, {"count": 0})["count"] == count
+        assert summary["by_model"]["unknown"]["count"] == sum(1 for r in expected if r.model_name is None)
+
+    def test_filters_and_by_target(self, test_db, history):
+        """Тест: фільтр за ціллю та розбивка by_target узгоджені."""
+        since, until = datetime(2025, 3, 1), datetime(2025, 4, 1)
+
+        full = summarize_predictions(test_db, since, until)
+        diabetes = summarize_predictions(test_db, since, until, target="diabetes_present")
+
+        assert diabetes["count"] == len(_scan(history, since, until, "diabetes_present"))
+        assert full["by_target"]["diabetes_present"]["count"] == diabetes["count"]
+        assert set(diabetes["by_target"]) == {"diabetes_present"}
+        assert summarize_predictions(test_db, since, until, model_name="XGBoost")["by_model"].keys() == {"XGBoost"}
+
+    @pytest.mark.parametrize("granularity", ["hour", "day"])
+    def test_series(self, test_db, history, granularity):
+        """Тест: часовий ряд покриває всі прогнози інтервалу без подвійного обліку."""
+        since, until = datetime(2025, 3, 2, 5), datetime(2025, 3, 9, 17)
+
+        series = summarize_predictions(test_db, since, until, granularity=granularity)["series"]
+
+        assert sum(point["count"] for point in series) == len(_scan(history, since, until))
+        starts = [point["bucket_start"] for point in series]
+        assert starts == sorted(set(starts))
+        if granularity == "day":
+            assert all(start.hour == 0 for start in starts)
+
+
+class TestRollupTriggers:
+    """Тести інкрементальної підтримки агрегатів."""
+
+    def test_delete_and_update(self, test_db, history):
+        """Тест: видалення та зміна запису оновлюють агрегати, порожні рядки зникають."""
+        first = history[0]
+        test_db.delete(first)
+        moved = history[1]
+        moved.created_at = datetime(2024, 12, 31, 23, 59)
+        moved.risk_bucket = "high"
+        test_db.add(moved)
+        test_db.commit()
+
+        assert summarize_predictions(test_db, BASE - timedelta(days=1), BASE + timedelta(days=30))["count"] == 58
+        old = summarize_predictions(test_db, datetime(2024, 12, 31), datetime(2025, 1, 1))
+        assert old["count"] == 1 and old["by_risk_bucket"]["high"]["count"] == 1
+        assert all(r.count > 0 for r in test_db.exec(select(PredictionRollup)).all())
+
+    def test_rebuild_matches_triggers(self, test_db, history):
+        """Тест: повний перерахунок дає ті самі агрегати, що й тригери."""
+        incremental = _rollups(test_db)
+
+        rebuild_rollups(test_db.connection())
+        test_db.commit()
+
+        assert _rollups(test_db) == incremental
+
+
+class TestAnalyticsSummaryEndpoint:
+    """Тести для GET /analytics/summary."""
+
+    def test_requires_auth(self, client):
+        """Тест: без токена — 401."""
+        assert client.get("/analytics/summary").status_code == 401
+
+    def test_summary(self, client, auth_headers, history):
+        """Тест: ендпоінт повертає зведення та ряд за інтервал."""
+        response = client.get(
+            "/analytics/summary",
+            params={"since": "2025-03-01T00:00:00", "until": "2025-03-05T00:00:00Z", "granularity": "day"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == len(_scan(history, datetime(2025, 3, 1), datetime(2025, 3, 5)))
+        assert len(data["series"]) == 4
+
+    @pytest.mark.parametrize("params", [
+        {"granularity": "week"},
+        {"since": "2025-03-05T00:00:00", "until": "2025-03-01T00:00:00"},
+        {"since": "2020-01-01T00:00:00", "until": "2025-01-01T00:00:00", "granularity": "hour"},
+    ])
+    def test_bad_request(self, client, auth_headers, params):
+        """Тест: невідома гранулярність, порожній або завеликий інтервал — 400."""
+        assert client.get("/analytics/summary", params=params, headers=auth_headers).status_code == 400
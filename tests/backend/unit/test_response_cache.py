@@ -0,0 +1,127 @@
+"""
+Unit-тести для кешу відповідей асистента.
+"""
+
+import asyncio
+
+import pytest
+
+from src.service.services.llm_client import LLMError
+from src.service.services.response_cache import ResponseCache, normalize_prompt
+
+
+class TestResponseCache:
+    """Тести для ResponseCache."""
+
+    def test_key_normalizes_prompt(self):
+        """Тест: пробіли не впливають на ключ, модель — впливає."""
+        key = ResponseCache.make_key("Питання:\n  що  це?", "llama3")
+
+        assert key == ResponseCache.make_key("Питання: що це? ", "llama3")
+        assert key != ResponseCache.make_key("Питання: що це?", "mistral")
+        assert normalize_prompt(" a \n\t b ") == "a b"
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Тест: прострочений запис не повертається."""
+        now = [1000.0]
+        monkeypatch.setattr("src.service.services.response_cache.time.monotonic", lambda: now[0])
+        cache = ResponseCache(ttl=10, max_entries=5)
+        cache.set("k", "v")
+
+        assert cache.get("k") == "v"
+        now[0] += 11
+        assert cache.get("k") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_lru_eviction(self):
+        """Тест: при переповненні витісняється найдавніше використаний запис."""
+        cache = ResponseCache(ttl=60, max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.stats()["evictions"] == 1
+
+    async def test_get_or_create_hit_and_miss(self):
+        """Тест: перший виклик генерує відповідь, другий — бере з кешу."""
+        cache = ResponseCache()
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            return "answer"
+
+        assert await cache.get_or_create("k", factory) == ("answer", "miss")
+        assert await cache.get_or_create("k", factory) == ("answer", "hit")
+        assert len(calls) == 1
+
+    async def test_get_or_create_without_store(self):
+        """Тест: з store=False відповідь не кешується, але наявний запис використовується."""
+        cache = ResponseCache()
+
+        async def factory():
+            return "personal"
+
+        assert await cache.get_or_create("k", factory, store=False) == ("personal", "miss")
+        assert cache.get("k") is None
+        cache.set("k", "shared")
+        assert await cache.get_or_create("k", factory, store=False) == ("shared", "hit")
+
+    async def test_coalescing(self):
+        """Тест: одночасні однакові запити виконують одну генерацію."""
+        cache = ResponseCache()
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "answer"
+
+        results = await asyncio.gather(*[cache.get_or_create("k", factory) for _ in range(5)])
+
+        assert len(calls) == 1
+        assert sorted(status for _, status in results) == ["coalesced"] * 4 + ["miss"]
+        assert cache.stats()["coalesced"] == 4
+
+    async def test_errors_shared_and_not_cached(self):
+        """Тест: помилка передається очікувачам і не кешується."""
+        cache = ResponseCache()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise LLMError("down")
+
+        results = await asyncio.gather(
+            cache.get_or_create("k", failing),
+            cache.get_or_create("k", failing),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, LLMError) for r in results)
+        assert cache.get("k") is None
+
+    async def test_cancelled_leader_lets_waiter_retry(self):
+        """Тест: скасування першого запиту не скасовує очікувачів."""
+        cache = ResponseCache()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        leader = asyncio.create_task(cache.get_or_create("k", slow))
+        await started.wait()
+        follower = asyncio.create_task(cache.get_or_create("k", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert await follower == ("fast", "miss")
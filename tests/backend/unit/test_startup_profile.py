@@ -0,0 +1,79 @@
+"""
+Unit-тести для профілю запуску та бюджету часу імпорту API.
+"""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.service.startup_profile import HEAVY_MODULES, PROJECT_ROOT, StartupProfile
+
+# Бюджет кумулятивного часу `import src.service.api`, мс (з запасом для повільних CI-машин;
+# без лінивих імпортів pandas/sklearn він перевищувався приблизно вдвічі)
+IMPORT_BUDGET_MS = 1500
+
+
+def _importtime(module: str) -> dict:
+    """Повертає {модуль: кумулятивний час імпорту, мкс} з `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative_us.isdigit():
+            timings[name] = int(cumulative_us)
+    return timings
+
+
+@pytest.fixture(scope="module")
+def api_import_timings() -> dict:
+    """Профіль холодного імпорту API (один підпроцес на модуль тестів)."""
+    return _importtime("src.service.api")
+
+
+class TestStartupProfile:
+    """Тести для StartupProfile."""
+
+    def test_phases_recorded_in_order(self):
+        """Тест: фази записуються в мс, невиконані позначаються None."""
+        profile = StartupProfile()
+        with profile.phase("db_init"):
+            time.sleep(0.01)
+        profile.record("import", time.perf_counter() - 0.005)
+
+        report = profile.report()
+
+        assert list(report["phases_ms"]) == ["import", "db_init", "migrations", "model_warmup"]
+        assert report["phases_ms"]["db_init"] >= 10
+        assert report["phases_ms"]["migrations"] is None
+        assert report["total_ms"] == round(report["phases_ms"]["import"] + report["phases_ms"]["db_init"], 2)
+
+    def test_startup_endpoint(self, client):
+        """Тест: /system/startup повертає фази старту поточного процесу."""
+        data = client.get("/system/startup").json()
+
+        assert data["phases_ms"]["import"] > 0
+        assert data["phases_ms"]["db_init"] is not None
+        assert data["phases_ms"]["migrations"] is not None
+
+
+class TestImportBudget:
+    """Тести бюджету холодного імпорту API."""
+
+    def test_api_import_skips_heavy_dependencies(self, api_import_timings):
+        """Тест: імпорт API не завантажує ML-стек, PIL та jose."""
+        loaded = sorted(m for m in HEAVY_MODULES if m in api_import_timings)
+        assert loaded == []
+
+    def test_api_import_within_budget(self, api_import_timings):
+        """Тест: кумулятивний час імпорту API в межах бюджету."""
+        assert api_import_timings["src.service.api"] / 1000 < IMPORT_BUDGET_MS
@@ -0,0 +1,186 @@
+"""
+Unit-тести для кешу HTML-оболонки SPA (web_shell).
+"""
+
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.service.web_shell import (
+    SpaShell,
+    choose_encoding,
+    fingerprint_assets,
+)
+
+
+INDEX_HTML = (
+    "<html><head>"
+    '<link rel="stylesheet" href="/app/static/app.css" />'
+    '<script src="https://cdn.example.com/lib.js"></script>'
+    "</head><body>"
+    '<script src="/app/static/app.js" defer></script>'
+    '<script src="/app/static/missing.js" defer></script>'
+    "</body></html>"
+)
+
+
+@pytest.fixture
+def web_dir(tmp_path):
+    """Створює мінімальну веб-директорію з index.html та ресурсами."""
+    (tmp_path / "index.html").write_text(INDEX_HTML, encoding="utf-8")
+    (tmp_path / "app.css").write_text("body { color: red; }", encoding="utf-8")
+    (tmp_path / "app.js").write_text("console.log('v1');", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def shell_client(web_dir):
+    """Тестовий клієнт з одним HTML-роутом, що віддає оболонку."""
+    shell = SpaShell(web_dir)
+    app = FastAPI()
+
+    @app.get("/page")
+    async def page():
+        return shell.response()
+
+    return TestClient(app), shell
+
+
+class TestFingerprint:
+    """Тести для підстановки відбитків ресурсів."""
+
+    def test_local_assets_get_version(self, web_dir):
+        """Тест: локальні ресурси отримують ?v=<hash>, зовнішні — без змін."""
+        html = fingerprint_assets(INDEX_HTML, web_dir)
+
+        assert 'href="/app/static/app.css?v=' in html
+        assert 'src="/app/static/app.js?v=' in html
+        assert 'src="https://cdn.example.com/lib.js"' in html
+        # Відсутній файл залишається без відбитка
+        assert 'src="/app/static/missing.js"' in html
+
+    def test_version_changes_with_content(self, web_dir):
+        """Тест: зміна вмісту ресурсу змінює відбиток."""
+        before = fingerprint_assets(INDEX_HTML, web_dir)
+        (web_dir / "app.js").write_text("console.log('v2');", encoding="utf-8")
+        after = fingerprint_assets(INDEX_HTML, web_dir)
+
+        assert before != after
+
+
+class TestChooseEncoding:
+    """Тести для узгодження кодування."""
+
+    def test_prefers_brotli(self):
+        assert choose_encoding("gzip, deflate, br", ("identity", "gzip", "br")) == "br"
+
+    def test_falls_back_to_gzip(self):
+        assert choose_encoding("gzip, br", ("identity", "gzip")) == "gzip"
+
+    def test_respects_zero_quality(self):
+        assert choose_encoding("gzip;q=0, br;q=0", ("identity", "gzip", "br")) == "identity"
+
+    def test_empty_header(self):
+        assert choose_encoding("", ("identity", "gzip")) == "identity"
+
+
+class TestSpaShell:
+    """Тести для кешу оболонки."""
+
+    def test_loads_once(self, web_dir):
+        """Тест: без auto_reload зміни на диску не підхоплюються."""
+        shell = SpaShell(web_dir)
+        first = shell.get()
+        (web_dir / "index.html").write_text("<html>changed</html>", encoding="utf-8")
+
+        assert shell.get() is first
+
+    def test_gzip_variant_roundtrip(self, web_dir):
+        """Тест: gzip-варіант розпаковується в identity-варіант."""
+        variant = SpaShell(web_dir).get()
+
+        assert gzip.decompress(variant.bodies["gzip"]) == variant.identity
+
+    def test_auto_reload_on_asset_change(self, web_dir):
+        """Тест: у режимі розробки зміна ресурсу перезавантажує оболонку."""
+        shell = SpaShell(web_dir, auto_reload=True, reload_interval=0.0)
+        first = shell.get()
+
+        asset = web_dir / "app.js"
+        asset.write_text("console.log('v2');", encoding="utf-8")
+        stat = asset.stat()
+        os.utime(asset, (stat.st_atime, stat.st_mtime + 10))
+
+        second = shell.get()
+        assert second is not first
+        assert second.etag != first.etag
+
+    def test_add_transform(self, web_dir):
+        """Тест: зареєстрована трансформація застосовується до оболонки."""
+        shell = SpaShell(web_dir)
+        shell.get()
+        shell.add_transform(lambda html, _: html.replace("<body>", '<body data-build="42">'))
+
+        assert b'data-build="42"' in shell.get().identity
+
+    def test_missing_index_raises(self, tmp_path):
+        """Тест: відсутній index.html дає FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            SpaShell(tmp_path).get()
+
+
+class TestShellResponse:
+    """Тести для HTTP-відповіді з оболонкою."""
+
+    def test_etag_and_gzip(self, shell_client):
+        """Тест: відповідь має ETag та стискається gzip."""
+        client, shell = shell_client
+        response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == shell.get().etags["gzip"]
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == shell.get().identity
+
+    def test_identity_without_accept_encoding(self, shell_client):
+        """Тест: без Accept-Encoding тіло не стискається."""
+        client, shell = shell_client
+        response = client.get("/page", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert int(response.headers["content-length"]) == len(shell.get().identity)
+
+    def test_not_modified(self, shell_client):
+        """Тест: If-None-Match з актуальним ETag повертає 304 без тіла."""
+        client, shell = shell_client
+        etag = client.get("/page").headers["etag"]
+        response = client.get("/page", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_etag_per_encoding(self, shell_client):
+        """Тест: gzip та identity мають різні ETag; валідатор іншого кодування не дає 304."""
+        client, shell = shell_client
+        gzip_etag = client.get("/page", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+        identity_etag = client.get("/page", headers={"Accept-Encoding": "identity"}).headers["etag"]
+
+        response = client.get("/page", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+
+        assert gzip_etag == identity_etag[:-1] + '-gz"'
+        assert identity_etag == shell.get().etag
+        assert response.status_code == 200
+        assert response.content == shell.get().identity
+
+    def test_not_modified_with_weak_etag(self, shell_client):
+        """Тест: ETag, ослаблений проксі до W/"...", теж дає 304 (слабке порівняння)."""
+        client, shell = shell_client
+        etag = client.get("/page", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+        response = client.get("/page", headers={"Accept-Encoding": "gzip", "If-None-Match": f'"other", W/{etag}'})
+
+        assert response.status_code == 304
@@ -9,7 +9,7 @@ from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, create_engine
 
 # Додаємо корінь проєкту до PYTHONPATH
 import sys
@@ -36,19 +36,10 @@ def test_db() -> Generator[Session, None, None]:
         connect_args={"check_same_thread": False},
     )
     
-    # Імпортуємо моделі для створення таблиць
-    from src.service.models import (
-        User,
-        PredictionHistory,
-        PasswordResetToken,
-        AssistantMessage,
-        Chat,
-        ChatMessage,
-        UserBlock,
-    )
-    
-    # Створюємо таблиці
-    SQLModel.metadata.create_all(engine)
+    # Створюємо схему тими ж міграціями, що й під час старту сервісу
+    from src.service.migrations import migrate
+
+    migrate(engine, Path(db_file.name + ".lock"))
     
     # Створюємо сесію
     with Session(engine) as session:
@@ -56,6 +47,7 @@ def test_db() -> Generator[Session, None, None]:
     
     # Очищаємо після тесту
     os.unlink(db_file.name)
+    os.unlink(db_file.name + ".lock")
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,96 @@
+"""
+Unit-тести для колонкової копії датасету та спільного завантажувача.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.dataset_store import columnar_path, downcast_column, read_dataset, write_columnar
+from src.models import train_many
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Невеликий датасет у форматі health_dataset.csv: CSV разом з колонковою копією."""
+    df = pd.DataFrame({
+        "SEQN": np.arange(73557, 73657),
+        "RIDAGEYR": np.tile([25.0, 60.0], 50),
+        "RIAGENDR": np.tile([1, 2], 50),
+        "BMXBMI": np.linspace(18.3, 41.7, 100),
+        "BPXSY1": np.where(np.arange(100) % 10 == 0, np.nan, 120.0),
+        "diabetes_present": np.tile([0, 1, 0, 0], 25),
+    })
+    csv_path = tmp_path / "health_dataset.csv"
+    df.to_csv(csv_path, index=False, encoding="utf-8")
+    write_columnar(df, csv_path)
+    return csv_path
+
+
+class TestDowncast:
+    """Тести для downcast_column."""
+
+    @pytest.mark.parametrize("values, expected", [
+        ([1.0, 2.0, 3.0], np.int8),
+        ([73557, 83731], np.int32),
+        ([120.0, np.nan, 72.5], np.float32),
+        ([26.7, 28.6], np.float64),
+        ([1.0, np.inf, 3.0], np.float32),
+        ([-np.inf, 2.0], np.float32),
+        ([1e20, 2.0], np.float64),
+        ([2.0 ** 63, 2.0], np.float32),
+        ([2.0 ** 53 + 2, 1.0], np.float64),
+        ([2 ** 62 + 1, 1], np.int64),
+    ])
+    def test_lossless_types(self, values, expected):
+        """Тест: тип зменшується лише тоді, коли значення зберігаються точно (inf і великі числа — не в int)."""
+        series = pd.Series(values)
+
+        result = downcast_column(series)
+
+        assert result.dtype == expected
+        np.testing.assert_array_equal(result.to_numpy(dtype=np.float64), series.to_numpy(dtype=np.float64))
+
+
+class TestReadDataset:
+    """Тести для read_dataset."""
+
+    def test_columnar_matches_csv(self, dataset, tmp_path):
+        """Тест: колонкова копія та CSV дають однакові дані й типи."""
+        csv_only = tmp_path / "csv_only.csv"
+        csv_only.write_bytes(dataset.read_bytes())
+
+        pd.testing.assert_frame_equal(read_dataset(dataset), read_dataset(csv_only))
+
+    def test_projection(self, dataset):
+        """Тест: читаються лише запитані колонки у порядку датасету; відсутні пропускаються."""
+        df = read_dataset(dataset, ["diabetes_present", "BMXBMI", "LBXGLU"])
+
+        assert list(df.columns) == ["BMXBMI", "diabetes_present"]
+
+    def test_stale_copy_falls_back_to_csv(self, dataset):
+        """Тест: після зміни CSV використовується CSV, а не застаріла копія."""
+        df = pd.read_csv(dataset)
+        df.loc[0, "BMXBMI"] = 55.5
+        df.to_csv(dataset, index=False, encoding="utf-8")
+        os.utime(dataset, ns=(1, 1))
+
+        assert read_dataset(dataset, ["BMXBMI"])["BMXBMI"].iloc[0] == 55.5
+
+    def test_copy_without_csv(self, dataset):
+        """Тест: без CSV читається колонкова копія."""
+        expected = read_dataset(dataset)
+        dataset.unlink()
+
+        pd.testing.assert_frame_equal(read_dataset(dataset), expected)
+        assert columnar_path(dataset).is_dir()
+
+    def test_training_loader(self, dataset):
+        """Тест: train_many отримує ознаки у float64 незалежно від типів сховища."""
+        X, y, features = train_many.load_and_prepare_data(dataset, "diabetes_present", train_many.BASE_FEATURES)
+
+        assert features == ["RIDAGEYR", "RIAGENDR", "BMXBMI", "BPXSY1"]
+        assert (X.dtypes == np.float64).all()
+        assert len(X) == len(y) == 90
@@ -0,0 +1,176 @@
+"""
+Unit-тести для інкрементального ETL за циклами NHANES (маніфест джерел і розділів).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.data import nhanes_etl as legacy_etl
+from src.data.etl_manifest import load_manifest, partitions_path
+from src.health_risk_ai.data import nhanes_etl
+
+
+def _write_cycle(directory, first_seqn, seed):
+    """Сирі таблиці одного циклу: demographic та medications (кілька рядків на SEQN)."""
+    rng = np.random.default_rng(seed)
+    seqn = np.arange(first_seqn, first_seqn + 200)
+    directory.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        "SEQN": seqn,
+        "RIAGENDR": rng.integers(1, 3, len(seqn)),
+        "RIDAGEYR": rng.integers(18, 80, len(seqn)),
+        "BMXBMI": np.round(rng.normal(28, 6, len(seqn)), 1),
+    }).to_csv(directory / "demographic.csv", index=False)
+    pd.DataFrame({
+        "SEQN": np.repeat(seqn[::2], 2),
+        "RXDDRUG": "METFORMIN",
+        "DIQ010": np.repeat(rng.integers(1, 3, len(seqn[::2])), 2).astype(float),
+    }).to_csv(directory / "medications.csv", index=False)
+    return {"demographics": str(directory / "demographic.csv"), "medications": str(directory / "medications.csv")}
+
+
+@pytest.fixture
+def etl(tmp_path, monkeypatch):
+    """Конфігураційний ETL з двома циклами у tmp_path; повертає (config, шлях конфігурації, вихідний CSV)."""
+    output_path = tmp_path / "processed" / "health_dataset.csv"
+    monkeypatch.setattr(nhanes_etl, "OUTPUT_PATH", output_path)
+    config = {
+        "dataset_name": "nhanes",
+        "join_key": "SEQN",
+        "cycles": {
+            "2013-2014": _write_cycle(tmp_path / "raw" / "2013-2014", 73557, 0),
+            "2015-2016": _write_cycle(tmp_path / "raw" / "2015-2016", 83732, 1),
+        },
+        "features": {"keep": ["RIDAGEYR", "RIAGENDR", "BMXBMI", "DIQ010"]},
+        "targets": {
+            "obesity_present": {"type": "derived", "formula": "BMXBMI >= 30"},
+            "diabetes_present": {"type": "from_column", "column": "DIQ010"},
+        },
+    }
+    config_path = tmp_path / "nhanes.yaml"
+    config_path.write_text(yaml.safe_dump(config, sort_keys=False), encoding="utf-8")
+    return config, config_path, output_path
+
+
+def _rewrite(config, config_path):
+    config_path.write_text(yaml.safe_dump(config, sort_keys=False), encoding="utf-8")
+
+
+def _expected(config):
+    """Результат без розділів: кожен цикл обробляється окремо, цикли йдуть підряд."""
+    frames = [
+        nhanes_etl.transform_tables(nhanes_etl.read_nhanes_tables(config, paths), config)
+        for paths in nhanes_etl.cycle_paths(config).values()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestIncrementalEtl:
+    """Тести для run_etl з маніфестом циклів."""
+
+    def test_second_run_skips_everything(self, etl, monkeypatch):
+        """Тест: без змін у джерелах повторний запуск не обробляє циклів і не перезаписує датасет."""
+        config, config_path, output_path = etl
+        expected = _expected(config)
+        first = nhanes_etl.run_etl(config_path)
+        written = output_path.stat().st_mtime_ns
+        monkeypatch.setattr(nhanes_etl, "transform_tables", lambda *args: pytest.fail("цикл оброблено повторно"))
+
+        second = nhanes_etl.run_etl(config_path)
+
+        assert set(first["rebuilt"]) == {"2013-2014", "2015-2016"}
+        assert second["rebuilt"] == {} and second["skipped"] == ["2013-2014", "2015-2016"]
+        assert not second["assembled"] and output_path.stat().st_mtime_ns == written
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), expected)
+
+    def test_changed_source_rebuilds_only_its_cycle(self, etl):
+        """Тест: зміна вмісту файлу перебудовує лише його цикл; зміна лише часу — нічого."""
+        config, config_path, output_path = etl
+        nhanes_etl.run_etl(config_path)
+        medications = config["cycles"]["2015-2016"]["medications"]
+        os.utime(medications, ns=(1, 1))
+
+        touched = nhanes_etl.run_etl(config_path)
+        df = pd.read_csv(medications)
+        df.loc[0, "DIQ010"] = 3.0
+        df.to_csv(medications, index=False)
+        changed = nhanes_etl.run_etl(config_path)
+
+        assert touched["rebuilt"] == {}
+        assert changed["rebuilt"] == {"2015-2016": "змінено: medications"}
+        assert changed["skipped"] == ["2013-2014"] and changed["assembled"]
+        result = pd.read_csv(output_path)
+        assert (result["diabetes_present"] == 3.0).sum() == 1
+        pd.testing.assert_frame_equal(result, _expected(config))
+
+    def test_added_and_removed_cycles(self, etl, tmp_path):
+        """Тест: новий цикл додається без обробки старих; розділ прибраного циклу видаляється."""
+        config, config_path, output_path = etl
+        nhanes_etl.run_etl(config_path)
+        config["cycles"]["2017-2018"] = _write_cycle(tmp_path / "raw" / "2017-2018", 93703, 2)
+        _rewrite(config, config_path)
+
+        added = nhanes_etl.run_etl(config_path)
+        removed_file = partitions_path(output_path) / load_manifest(output_path)["partitions"]["2013-2014"]["file"]
+        del config["cycles"]["2013-2014"]
+        _rewrite(config, config_path)
+        removed = nhanes_etl.run_etl(config_path)
+
+        assert added["rebuilt"] == {"2017-2018": "новий цикл"}
+        assert removed["rebuilt"] == {} and removed["removed"] == ["2013-2014"]
+        assert not removed_file.exists()
+        result = pd.read_csv(output_path)
+        assert result["SEQN"].min() == 83732 and removed["rows"] == len(result) == 400
+        pd.testing.assert_frame_equal(result, _expected(config))
+
+    def test_settings_change_rebuilds_all(self, etl):
+        """Тест: зміна ознак чи цілей у конфігурації перебудовує всі цикли."""
+        config, config_path, output_path = etl
+        nhanes_etl.run_etl(config_path)
+        config["targets"]["obesity_present"]["formula"] = "BMXBMI >= 25"
+        _rewrite(config, config_path)
+
+        report = nhanes_etl.run_etl(config_path)
+
+        assert set(report["rebuilt"]) == {"2013-2014", "2015-2016"}
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), _expected(config))
+
+    def test_missing_output_is_reassembled(self, etl):
+        """Тест: видалений фінальний CSV збирається з розділів без обробки циклів."""
+        config, config_path, output_path = etl
+        nhanes_etl.run_etl(config_path)
+        output_path.unlink()
+
+        report = nhanes_etl.run_etl(config_path)
+
+        assert report["rebuilt"] == {} and report["assembled"]
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), _expected(config))
+
+
+class TestLegacyEtl:
+    """Тести для run_etl з src/data/nhanes_etl.py (команда cli data)."""
+
+    def test_cycles_processed_once(self, tmp_path, monkeypatch):
+        """Тест: обидва цикли обробляються при першому запуску і пропускаються при другому."""
+        cycles = {
+            cycle: {name: tmp_path / "raw" / cycle / os.path.basename(path) for name, path in paths.items()}
+            for cycle, paths in {
+                "2013-2014": _write_cycle(tmp_path / "raw" / "2013-2014", 73557, 0),
+                "2015-2016": _write_cycle(tmp_path / "raw" / "2015-2016", 83732, 1),
+            }.items()
+        }
+        output_path = tmp_path / "health_dataset.csv"
+        monkeypatch.setattr(legacy_etl, "RAW_DATA_CYCLES", cycles)
+        monkeypatch.setattr(legacy_etl, "OUTPUT_PATH", output_path)
+
+        first = legacy_etl.run_etl()
+        second = legacy_etl.run_etl()
+
+        assert list(first["rebuilt"]) == ["2013-2014", "2015-2016"]
+        assert second["rebuilt"] == {} and not second["assembled"]
+        expected = pd.concat([legacy_etl.process_cycle(paths) for paths in cycles.values()], ignore_index=True)
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), expected)
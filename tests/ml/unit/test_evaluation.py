@@ -0,0 +1,122 @@
+"""
+Unit-тести для спільного рушія крос-валідації та калібрування чемпіонів.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.models import calibrate_champions, train_many
+from src.models.evaluation import (
+    _transform_fold,
+    calibration_scores,
+    fold_memory,
+    make_folds,
+    prepare_folds,
+    summarize_folds,
+)
+from tests.utils.training_data import make_dataset as _dataset, small_models as _models
+
+
+@pytest.fixture(autouse=True)
+def _no_plots(monkeypatch):
+    monkeypatch.setattr(train_many, "render_plots", lambda *args, **kwargs: 0)
+    monkeypatch.setattr(calibrate_champions, "plot_calibration_curve", lambda *args, **kwargs: None)
+
+
+class TestFolds:
+    """Тести для make_folds та prepare_folds."""
+
+    def test_stratified_and_deterministic(self):
+        """Тест: фолди покривають вибірку, зберігають частку класів і не залежать від запуску."""
+        _, y, _ = _dataset(1)
+
+        folds = make_folds(y)
+
+        assert len(folds) == 5
+        assert sorted(np.concatenate([valid for _, valid in folds]).tolist()) == list(range(len(y)))
+        for _, valid in folds:
+            assert abs(y.iloc[valid].mean() - y.mean()) < 0.05
+        assert all((a[1] == b[1]).all() for a, b in zip(folds, make_folds(y)))
+
+    def test_preprocessing_cached_per_fold(self, tmp_path):
+        """Тест: трансформовані фолди кешуються на диску і повторно не обчислюються."""
+        X, y, features = _dataset(1)
+        preprocessor = train_many.create_preprocessing_pipeline(features[:1] + features[2:], ["RIAGENDR"])
+        memory = fold_memory(tmp_path)
+
+        first = prepare_folds(X, y, preprocessor, memory=memory)
+        cached = memory.cache(_transform_fold)
+
+        assert all(cached.check_call_in_cache(preprocessor, X, fold["train_idx"], fold["valid_idx"]) for fold in first)
+        second = prepare_folds(X, y, preprocessor, memory=memory)
+        assert all(np.array_equal(a["X_valid"], b["X_valid"]) for a, b in zip(first, second))
+
+
+class TestSummaries:
+    """Тести для summarize_folds та calibration_scores."""
+
+    def test_confidence_interval(self):
+        """Тест: t-інтервал навколо середнього по фолдах."""
+        folds = [{"roc_auc": v, "avg_precision": v, "brier": 0.1} for v in (0.80, 0.82, 0.84, 0.86, 0.88)]
+
+        summary = summarize_folds(folds)
+
+        margin = stats.t.ppf(0.975, 4) * np.std([0.80, 0.82, 0.84, 0.86, 0.88], ddof=1) / np.sqrt(5)
+        assert summary["cv_roc_auc_mean"] == pytest.approx(0.84)
+        assert summary["cv_roc_auc_ci_high"] - summary["cv_roc_auc_mean"] == pytest.approx(margin)
+        assert summary["cv_brier_ci_low"] == pytest.approx(0.1)
+
+    def test_calibration_scores(self):
+        """Тест: методи калібрування оцінюються за out-of-fold ймовірностями."""
+        rng = np.random.default_rng(0)
+        y = pd.Series(rng.integers(0, 2, 500))
+        # Переупевнена модель: ймовірності стиснуті до 0 і 1
+        oof = np.clip(y * 0.6 + rng.uniform(0, 0.4, 500), 0, 1) ** 3
+
+        scores = calibration_scores(oof, y, make_folds(y))
+
+        assert set(scores) == {"isotonic", "sigmoid"}
+        assert all(0 <= score < 0.25 for score in scores.values())
+
+
+class TestTrainingAndCalibration:
+    """Тести для крос-валідації в train_many та її повторного використання в калібруванні."""
+
+    @pytest.fixture
+    def trained(self, tmp_path, monkeypatch):
+        datasets = {"diabetes_present": _dataset(1)}
+        models_dir = tmp_path / "models"
+        train_many.run_training(datasets, _models(), n_jobs=1, models_dir=models_dir)
+        return models_dir / "diabetes_present"
+
+    def test_leaderboard_has_cv_columns(self, trained):
+        """Тест: лідерборд відсортований за CV ROC-AUC і містить інтервали; метрики фолдів — окремо."""
+        leaderboard = pd.read_csv(trained / "leaderboard.csv")
+        folds = pd.read_csv(trained / "leaderboard_folds.csv")
+
+        assert list(leaderboard["cv_roc_auc_mean"]) == sorted(leaderboard["cv_roc_auc_mean"], reverse=True)
+        assert (leaderboard["cv_roc_auc_ci_low"] <= leaderboard["cv_roc_auc_mean"]).all()
+        assert len(folds) == 3 * 5
+        champion = json.loads((trained / "champion.json").read_text(encoding="utf-8"))
+        assert champion["model_name"] == leaderboard["model"].iloc[0]
+
+    def test_calibration_reuses_cv(self, trained, monkeypatch):
+        """Тест: калібрування бере out-of-fold ймовірності навчання і не перенавчає фолди."""
+        X, y, _ = _dataset(1)
+        frame = X.assign(diabetes_present=y)
+        data_path = trained.parent.parent / "health.csv"
+        frame.to_csv(data_path, index=False)
+        monkeypatch.setattr(calibrate_champions, "DATA_PATH", data_path)
+        monkeypatch.setattr(calibrate_champions, "MODELS_DIR", trained.parent)
+        monkeypatch.setattr(calibrate_champions, "BASE_FEATURES", list(X.columns))
+        monkeypatch.setattr(calibrate_champions, "evaluate_fold", lambda *args: pytest.fail("фолди перенавчено"))
+
+        calibrate_champions.calibrate_champion_for_target("diabetes_present")
+
+        report = json.loads((trained / "metrics_before_after.json").read_text(encoding="utf-8"))
+        assert report["calibration_method"] == min(report["calibration_cv_brier"], key=report["calibration_cv_brier"].get)
+        assert (trained / "champion_calibrated.joblib").exists()
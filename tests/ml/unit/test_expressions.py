@@ -0,0 +1,159 @@
+"""
+Unit-тести для безпечних виразів похідних ознак і цільових змінних ETL.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.expressions import ExpressionError, compile_expression, derive_columns
+from src.health_risk_ai.data.nhanes_etl import derive_targets, required_columns, transform_tables
+
+
+@pytest.fixture
+def frame():
+    """Кілька учасників NHANES з пропусками."""
+    return pd.DataFrame({
+        "SEQN": [73557, 73558, 73559, 73560],
+        "RIDAGEYR": [20, 70, 45, 64],
+        "BMXBMI": [31.0, np.nan, 22.0, 30.0],
+        "DIQ010": [1.0, 2.0, 3.0, np.nan],
+        "LBXTC": [200.0, 180.0, 150.0, 160.0],
+        "LBXHDD": [50.0, 0.0, np.nan, 40.0],
+    })
+
+
+class TestCompileExpression:
+    """Тести для compile_expression."""
+
+    @pytest.mark.parametrize("source, expected", [
+        ("BMXBMI >= 30", [1, 0, 0, 1]),
+        ("18 <= RIDAGEYR < 65 and BMXBMI >= 30", [1, 0, 0, 1]),
+        ("DIQ010 in (1, 3)", [1, 0, 1, 0]),
+        ("notna(DIQ010) and not DIQ010 == 1", [0, 1, 1, 0]),
+        ("isna(BMXBMI) or between(RIDAGEYR, 45, 64)", [0, 1, 1, 1]),
+        ("fillna(BMXBMI, 35) >= 30", [1, 1, 0, 1]),
+    ])
+    def test_boolean_expressions(self, frame, source, expected):
+        """Тест: логічні вирази, діапазони та правила пропусків дають 0/1 (int64)."""
+        result = compile_expression(source).evaluate(frame)
+
+        assert result.dtype == np.int64
+        assert result.tolist() == expected
+
+    def test_ratio_and_missing_values(self, frame):
+        """Тест: співвідношення — float64; ділення на нуль і пропуски дають nan."""
+        result = compile_expression("LBXTC / LBXHDD").evaluate(frame)
+
+        np.testing.assert_array_equal(result, [4.0, np.nan, np.nan, 4.0])
+
+    def test_where_keeps_missing(self, frame):
+        """Тест: where з nan зберігає пропуск замість 0."""
+        result = compile_expression("where(isna(BMXBMI), nan, BMXBMI >= 30)").evaluate(frame)
+
+        np.testing.assert_array_equal(result, [1.0, np.nan, 0.0, 1.0])
+
+    def test_columns_and_cache(self):
+        """Тест: перелік колонок без функцій і констант; повторна компіляція береться з кешу."""
+        expression = compile_expression("fillna(LBXTC, nan) / maximum(LBXHDD, 1) > RIDAGEYR")
+
+        assert expression.columns == ("LBXTC", "LBXHDD", "RIDAGEYR")
+        assert compile_expression("fillna(LBXTC, nan) / maximum(LBXHDD, 1) > RIDAGEYR") is expression
+
+    @pytest.mark.parametrize("source", [
+        "__import__('os').system('true')",
+        "BMXBMI.mean()",
+        "LBXTC[0]",
+        "lambda: 1",
+        "BMXBMI == 'high'",
+        "BMXBMI and RIDAGEYR > 18",
+        "isna(BMXBMI, 1)",
+        "BMXBMI >=",
+    ])
+    def test_rejects_unsafe_or_invalid(self, source):
+        """Тест: атрибути, виклики невідомих функцій, індексація та помилки типів відхиляються під час компіляції."""
+        with pytest.raises(ExpressionError):
+            compile_expression(source)
+
+
+class TestDeriveColumns:
+    """Тести для derive_columns."""
+
+    def test_chained_definitions_without_copy(self, frame):
+        """Тест: вираз бачить попередні похідні колонки; наявні колонки не копіюються, вхід не змінюється."""
+        result = derive_columns(frame, {"tc_hdl_ratio": "LBXTC / LBXHDD", "high_ratio": "tc_hdl_ratio > 3.5"})
+
+        assert result["high_ratio"].tolist() == [1, 0, 0, 1]
+        assert "tc_hdl_ratio" not in frame.columns
+        assert np.shares_memory(result["LBXTC"].to_numpy(), frame["LBXTC"].to_numpy())
+
+    def test_missing_column_gives_na(self, frame):
+        """Тест: відсутня колонка-джерело дає pd.NA, і так само для залежних від неї виразів."""
+        result = derive_columns(frame, {"glucose_high": "LBXGLU >= 126", "flag": "glucose_high == 1"})
+
+        assert result["glucose_high"].isna().all() and result["flag"].isna().all()
+
+
+class TestConfigExpressions:
+    """Тести для виразів у конфігурації NHANES (features.derived і targets)."""
+
+    def _config(self):
+        return {
+            "join_key": "SEQN",
+            "features": {
+                "keep": ["RIDAGEYR", "BMXBMI", "LBXTC", "LBXHDD"],
+                "derived": {"tc_hdl_ratio": "LBXTC / LBXHDD"},
+            },
+            "targets": {
+                "obesity_present": {"type": "derived", "formula": "BMXBMI >= 30"},
+                "dyslipidemia": {"type": "derived", "formula": "tc_hdl_ratio > 3.5 or LBXTC >= 240"},
+                "diabetes_present": {"type": "from_column", "column": "DIQ010"},
+            },
+        }
+
+    def test_required_columns(self):
+        """Тест: читаються джерела виразів, але не похідні ознаки чи цілі."""
+        columns = required_columns(self._config())
+
+        assert columns == ["SEQN", "RIDAGEYR", "BMXBMI", "LBXTC", "LBXHDD", "DIQ010"]
+
+    def test_new_target_without_code_changes(self, frame):
+        """Тест: нова ціль з похідною ознакою задається лише конфігурацією."""
+        result = transform_tables({"all": frame}, self._config())
+
+        assert result["dyslipidemia"].tolist() == [1, 0, 0, 1]
+        assert result["tc_hdl_ratio"].iloc[0] == 4.0
+
+    def test_expression_inputs_outside_keep(self, frame):
+        """Тест: джерела виразів поза features.keep доступні для обчислення і не потрапляють у результат."""
+        config = self._config()
+        config["features"]["keep"] = ["RIDAGEYR", "BMXBMI"]
+
+        result = transform_tables({"all": frame}, config)
+
+        assert result["tc_hdl_ratio"].tolist()[:1] == [4.0]
+        assert result["dyslipidemia"].tolist() == [1, 0, 0, 1]
+        assert result["diabetes_present"].tolist()[:3] == [1.0, 2.0, 3.0]
+        assert list(result.columns) == [
+            "SEQN", "RIDAGEYR", "BMXBMI", "tc_hdl_ratio", "obesity_present", "dyslipidemia", "diabetes_present",
+        ]
+
+    def test_targets_attached_without_copy(self, frame):
+        """Тест: усі цілі додаються одним кроком, вхідні колонки не копіюються; from_column бачить попередню ціль."""
+        config = self._config()
+        config["targets"]["obesity_copy"] = {"type": "from_column", "column": "obesity_present"}
+        config["targets"]["obesity_again"] = {"type": "derived", "formula": "obesity_copy == 1"}
+
+        result = derive_targets(frame, config)
+
+        assert result["obesity_again"].tolist() == result["obesity_present"].tolist() == [1, 0, 0, 1]
+        assert result["dyslipidemia"].isna().all()
+        assert np.shares_memory(result["LBXTC"].to_numpy(), frame["LBXTC"].to_numpy())
+        assert list(frame.columns) == ["SEQN", "RIDAGEYR", "BMXBMI", "DIQ010", "LBXTC", "LBXHDD"]
+
+    def test_invalid_formula_names_target(self, frame):
+        """Тест: помилка у виразі вказує ціль."""
+        config = {"targets": {"obesity_present": {"type": "derived", "formula": "BMXBMI >>> 30"}}}
+
+        with pytest.raises(ValueError, match="obesity_present"):
+            derive_targets(frame, config)
@@ -0,0 +1,176 @@
+"""
+Unit-тести для порційного читання сирих таблиць NHANES та потокового ETL.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.health_risk_ai.data import nhanes_etl
+from src.health_risk_ai.data.nhanes_etl import (
+    _FallbackTextStream,
+    detect_encoding,
+    iter_table_chunks,
+    read_nhanes_tables,
+    run_etl_streaming,
+    transform_tables,
+)
+
+
+@pytest.fixture
+def raw_tables(tmp_path):
+    """Дві сирі таблиці: demographic (по рядку на SEQN) та medications (багато рядків на SEQN)."""
+    rng = np.random.default_rng(0)
+    seqn = np.arange(1000, 1400)
+    demographic = pd.DataFrame({
+        "SEQN": seqn,
+        "SDDSRVYR": 8,
+        "RIAGENDR": rng.integers(1, 3, len(seqn)),
+        "RIDAGEYR": rng.integers(18, 80, len(seqn)),
+        "BMXBMI": np.round(rng.normal(28, 6, len(seqn)), 1),
+        "WTINT2YR": rng.uniform(5000, 90000, len(seqn)),
+    })
+    medications = pd.DataFrame({
+        "SEQN": np.repeat(seqn[::2], 3),
+        "RXDUSE": 1,
+        "RXDDRUG": "METFORMIN",
+        "DIQ010": np.repeat(rng.integers(1, 3, len(seqn[::2])), 3).astype(float),
+    })
+    paths = {"demographics": tmp_path / "demographic.csv", "medications": tmp_path / "medications.csv"}
+    demographic.to_csv(paths["demographics"], index=False)
+    medications.to_csv(paths["medications"], index=False)
+    return paths
+
+
+def _config(paths, **reading):
+    return {
+        "join_key": "SEQN",
+        "local_paths": {name: str(path) for name, path in paths.items()},
+        "features": {"keep": ["RIDAGEYR", "RIAGENDR", "BMXBMI"]},
+        "targets": {
+            "obesity_present": {"type": "derived", "formula": "BMXBMI >= 30"},
+            "diabetes_present": {"type": "from_column", "column": "DIQ010"},
+        },
+        "reading": reading,
+    }
+
+
+class TestDetectEncoding:
+    """Тести для detect_encoding."""
+
+    @pytest.mark.parametrize("content, expected", [
+        ("SEQN,NAME\n1,Київ\n".encode("utf-8"), "utf-8"),
+        (b"\xef\xbb\xbfSEQN\n1\n", "utf-8-sig"),
+        ("SEQN,NAME\n1,Café\n".encode("latin-1"), "latin-1"),
+    ])
+    def test_encodings(self, tmp_path, content, expected):
+        """Тест: кодування визначається за вибіркою з початку файлу."""
+        path = tmp_path / "table.csv"
+        path.write_bytes(content)
+
+        assert detect_encoding(path) == expected
+
+    def test_truncated_multibyte_in_sample(self, tmp_path):
+        """Тест: обрізаний межею вибірки UTF-8 символ не вважається latin-1."""
+        path = tmp_path / "table.csv"
+        path.write_bytes("SEQN,NAME\n1,Ж\n".encode("utf-8"))
+
+        assert detect_encoding(path, sample_bytes=13) == "utf-8"
+
+
+class TestReading:
+    """Тести для iter_table_chunks та read_nhanes_tables."""
+
+    def test_projection_and_dtypes(self, raw_tables):
+        """Тест: читаються лише ключ, ознаки та джерела цілей з явними типами, без дублікатів."""
+        tables = read_nhanes_tables(_config(raw_tables, chunk_rows=64))
+
+        assert list(tables["demographics"].columns) == ["SEQN", "RIAGENDR", "RIDAGEYR", "BMXBMI"]
+        assert list(tables["medications"].columns) == ["SEQN", "DIQ010"]
+        assert tables["demographics"]["SEQN"].dtype == np.int64
+        assert (tables["demographics"].drop(columns="SEQN").dtypes == np.float64).all()
+        assert len(tables["medications"]) == 200
+
+    def test_latin1_after_sample(self, tmp_path):
+        """Тест: latin-1 після вибірки — читання продовжується без повторів і втрат рядків."""
+        path = tmp_path / "table.csv"
+        rows = [f"{i},{'Café' if i == 150 else 'Cafe'}" for i in range(200)]
+        path.write_bytes(("SEQN,NAME\n" + "\n".join(rows) + "\n").encode("latin-1"))
+
+        chunks = list(iter_table_chunks([path], ["SEQN", "NAME"], {"SEQN": "int64", "NAME": "object"}, 16, 64))
+
+        frame = pd.concat(chunks, ignore_index=True)
+        assert frame["SEQN"].tolist() == list(range(200))
+        assert frame.loc[150, "NAME"] == "Café"
+
+    def test_latin1_after_blank_lines_and_quoted_newlines(self, tmp_path):
+        """Тест: порожні рядки та переноси в лапках до некоректних байтів не зсувають місце продовження."""
+        path = tmp_path / "table.csv"
+        rows = [f'{i},"Multi\nline"' if i % 7 == 0 else f"{i},Cafe" for i in range(120)]
+        rows[30:30] = ["", ""]
+        rows.append('120,"Café"')
+        rows += [f"{i},Zoë" for i in range(121, 130)]
+        path.write_bytes(("SEQN,NAME\n" + "\n".join(rows) + "\n").encode("latin-1"))
+
+        chunks = list(iter_table_chunks([path], ["SEQN", "NAME"], {"SEQN": "int64", "NAME": "object"}, 16, 64))
+
+        frame = pd.concat(chunks, ignore_index=True)
+        assert frame["SEQN"].tolist() == list(range(130))
+        assert frame.loc[14, "NAME"] == "Multi\nline"
+        assert frame.loc[120, "NAME"] == "Café" and frame.loc[129, "NAME"] == "Zoë"
+
+    def test_fallback_stream_across_reads(self, tmp_path):
+        """Тест: UTF-8 символ на межі блоків лишається UTF-8, а з некоректного байта — latin-1."""
+        path = tmp_path / "table.csv"
+        path.write_bytes("Київ,".encode("utf-8") + "Café\n".encode("latin-1"))
+
+        with _FallbackTextStream(path, "utf-8") as stream:
+            text = "".join(iter(lambda: stream.read(3), ""))
+
+        assert text == "Київ,Café\n"
+
+    def test_several_cycles(self, raw_tables, tmp_path):
+        """Тест: кілька файлів (циклів NHANES) однієї таблиці читаються як одна таблиця."""
+        second = tmp_path / "demographic_2015.csv"
+        demographic = pd.read_csv(raw_tables["demographics"])
+        demographic.assign(SEQN=demographic["SEQN"] + 10000).to_csv(second, index=False)
+        config = _config(raw_tables)
+        config["local_paths"]["demographics"] = [str(raw_tables["demographics"]), str(second)]
+
+        tables = read_nhanes_tables(config)
+
+        assert len(tables["demographics"]) == 800
+
+
+class TestStreaming:
+    """Тести для run_etl_streaming."""
+
+    def test_matches_in_memory(self, raw_tables, tmp_path):
+        """Тест: потоковий режим з багатьма розділами дає ті самі рядки, що й звичайний."""
+        config = _config(raw_tables, chunk_rows=50, partition_mb=0.005)
+        output_path = tmp_path / "processed" / "health_dataset.csv"
+
+        rows = run_etl_streaming(config, output_path)
+
+        expected_path = tmp_path / "expected.csv"
+        transform_tables(read_nhanes_tables(config), config).to_csv(expected_path, index=False)
+        streamed, expected = (
+            pd.read_csv(path).sort_values("SEQN").reset_index(drop=True) for path in (output_path, expected_path)
+        )
+        assert rows == len(expected) == 400
+        pd.testing.assert_frame_equal(streamed, expected)
+
+    def test_partitions_bounded(self, raw_tables, tmp_path, monkeypatch):
+        """Тест: розділ у пам'яті містить лише частку ключів."""
+        config = _config(raw_tables, chunk_rows=50, partition_mb=0.005)
+        largest = []
+        original = nhanes_etl.transform_tables
+        monkeypatch.setattr(
+            nhanes_etl,
+            "transform_tables",
+            lambda tables, config: largest.append(max(len(t) for t in tables.values())) or original(tables, config),
+        )
+
+        run_etl_streaming(config, tmp_path / "health_dataset.csv")
+
+        assert len(largest) > 1 and max(largest) < 400
@@ -0,0 +1,188 @@
+"""
+Unit-тести для паралельного та інкрементального навчання множини моделей і графіків.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.models import train_many
+from src.models.train_many import CURVES_FILE, plan_cpu_budget, plan_retraining, render_plots, run_training
+from tests.utils.training_data import make_dataset as _dataset, small_models as _models
+
+
+@pytest.fixture(autouse=True)
+def _no_plots(monkeypatch):
+    """Графіки перевіряються окремо (TestRenderPlots), а займають більшу частину часу навчання."""
+    monkeypatch.setattr(train_many, "render_plots", lambda *args, **kwargs: 0)
+
+
+class TestPlanCpuBudget:
+    """Тести для plan_cpu_budget."""
+
+    @pytest.mark.parametrize("n_tasks, n_jobs, expected", [
+        (14, 8, (8, 1)),
+        (2, 8, (2, 4)),
+        (3, 8, (3, 2)),
+        (5, 1, (1, 1)),
+    ])
+    def test_budget(self, n_tasks, n_jobs, expected):
+        """Тест: процесів не більше, ніж навчань, і процеси × потоки не перевищують бюджет."""
+        assert plan_cpu_budget(n_tasks, n_jobs) == expected
+
+    def test_all_cores_by_default(self, monkeypatch):
+        """Тест: без бюджету (або -1) використовуються всі ядра."""
+        monkeypatch.setattr(train_many.os, "cpu_count", lambda: 4)
+
+        assert plan_cpu_budget(10) == plan_cpu_budget(10, -1) == (4, 1)
+
+
+class TestRunTraining:
+    """Тести для run_training."""
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Тест: лідерборди та чемпіони пулу процесів збігаються з послідовним запуском."""
+        datasets = {"diabetes_present": _dataset(1), "obesity_present": _dataset(2)}
+
+        serial = run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path / "serial")
+        parallel = run_training(datasets, _models(), n_jobs=2, models_dir=tmp_path / "parallel")
+
+        for target in datasets:
+            assert list(parallel[target]) == list(serial[target]) == list(_models())
+            pd.testing.assert_frame_equal(
+                pd.read_csv(tmp_path / "parallel" / target / "leaderboard.csv"),
+                pd.read_csv(tmp_path / "serial" / target / "leaderboard.csv"),
+            )
+            champions = [
+                json.loads((tmp_path / run / target / "champion.json").read_text(encoding="utf-8"))
+                for run in ("serial", "parallel")
+            ]
+            assert champions[0]["model_name"] == champions[1]["model_name"]
+            assert champions[0]["metrics"] == champions[1]["metrics"]
+
+    def test_saved_model_keeps_n_jobs(self, tmp_path):
+        """Тест: обмеження потоків на час навчання не потрапляє у збережену модель."""
+        results = run_training({"diabetes_present": _dataset(1)}, _models(), n_jobs=1, models_dir=tmp_path)
+
+        forest = results["diabetes_present"]["RandomForest"]["pipeline"].named_steps["model"]
+        assert forest.n_jobs == -1
+
+    def test_failed_model_skipped(self, tmp_path):
+        """Тест: помилка однієї моделі не зупиняє навчання інших."""
+        models = {**_models(), "Broken": LogisticRegression(C=-1.0)}
+
+        results = run_training({"diabetes_present": _dataset(1)}, models, n_jobs=1, models_dir=tmp_path)
+
+        assert "Broken" not in results["diabetes_present"]
+        assert len(pd.read_csv(tmp_path / "diabetes_present" / "leaderboard.csv")) == 3
+
+
+class TestIncrementalTraining:
+    """Тести для пропуску актуальних моделей за відбитками."""
+
+    def test_rerun_skips_up_to_date(self, tmp_path, monkeypatch):
+        """Тест: повторний запуск без змін нічого не навчає, результати ті самі."""
+        datasets = {"diabetes_present": _dataset(1)}
+        first = run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path)
+        leaderboard = pd.read_csv(tmp_path / "diabetes_present" / "leaderboard.csv")
+        monkeypatch.setattr(train_many, "fit_and_evaluate", lambda task: pytest.fail("модель перенавчено"))
+
+        second = run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path)
+
+        assert list(second["diabetes_present"]) == list(first["diabetes_present"])
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "diabetes_present" / "leaderboard.csv"), leaderboard)
+
+    def test_only_stale_models_retrained(self, tmp_path):
+        """Тест: зміна параметрів однієї моделі перенавчає лише її, зміна даних — усі."""
+        datasets = {"diabetes_present": _dataset(1)}
+        run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path)
+        models = _models()
+        models["KNN"].set_params(n_neighbors=7)
+
+        params_plan = plan_retraining(datasets, models, models_dir=tmp_path)["diabetes_present"]
+        data_plan = plan_retraining({"diabetes_present": _dataset(3)}, _models(), models_dir=tmp_path)
+
+        assert params_plan == {"LogisticRegression": [], "RandomForest": [], "KNN": ["params"]}
+        assert all(reasons == ["data"] for reasons in data_plan["diabetes_present"].values())
+
+    def test_plan_missing_and_force(self, tmp_path):
+        """Тест: без артефактів — missing; force перенавчає актуальні; план нічого не створює."""
+        datasets = {"diabetes_present": _dataset(1)}
+
+        plan = plan_retraining(datasets, _models(), models_dir=tmp_path)["diabetes_present"]
+
+        assert all(reasons == ["missing"] for reasons in plan.values())
+        assert not (tmp_path / "diabetes_present").exists()
+
+        run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path)
+        forced = plan_retraining(datasets, _models(), force=True, models_dir=tmp_path)
+
+        assert all(reasons == ["force"] for reasons in forced["diabetes_present"].values())
+
+    def test_interrupted_fit_is_stale(self, tmp_path):
+        """Тест: модель без fingerprint.json (перерване навчання) перенавчається."""
+        datasets = {"diabetes_present": _dataset(1)}
+        run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path)
+        (tmp_path / "diabetes_present" / "KNN" / train_many.FINGERPRINT_FILE).unlink()
+
+        plan = plan_retraining(datasets, _models(), models_dir=tmp_path)["diabetes_present"]
+
+        assert plan["KNN"] == ["missing"] and plan["LogisticRegression"] == []
+
+    def test_failed_fold_leaves_no_fingerprint(self, tmp_path, monkeypatch):
+        """Тест: якщо фолд крос-валідації впав після фінального навчання, відбитка немає і модель застаріла."""
+        datasets = {"diabetes_present": _dataset(1)}
+        run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path)
+        evaluate_fold = train_many.evaluate_fold
+
+        def failing_knn(model, fold, threads):
+            if "KNeighbors" in type(model).__name__:
+                raise RuntimeError("фолд перервано")
+            return evaluate_fold(model, fold, threads)
+
+        monkeypatch.setattr(train_many, "evaluate_fold", failing_knn)
+        run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path, force=True)
+        monkeypatch.undo()
+
+        assert not (tmp_path / "diabetes_present" / "KNN" / train_many.FINGERPRINT_FILE).exists()
+        plan = plan_retraining(datasets, _models(), models_dir=tmp_path)["diabetes_present"]
+        assert plan["KNN"] == ["missing"] and plan["LogisticRegression"] == []
+
+
+class TestRenderPlots:
+    """Тести для render_plots."""
+
+    @pytest.fixture
+    def trained(self, tmp_path):
+        run_training({"diabetes_present": _dataset(1)}, _models(), n_jobs=1, models_dir=tmp_path)
+        return tmp_path / "diabetes_present"
+
+    def test_training_saves_curves_only(self, trained):
+        """Тест: навчання зберігає дані кривих, а не зображення."""
+        with np.load(trained / "KNN" / CURVES_FILE) as curves:
+            assert {"fpr", "tpr", "precision", "recall", "roc_auc"} <= set(curves.files)
+        assert not list(trained.glob("**/*.png"))
+
+    def test_renders_stale_plots_once(self, trained):
+        """Тест: малюються відсутні графіки; повторний прохід нічого не перемальовує, force — усе."""
+        assert render_plots(trained.parent, "fast", n_jobs=1) == 3 * 3 + 1
+        assert (trained / "RandomForest" / "roc.png").exists()
+        assert (trained / "champion_importance.png").exists()
+
+        assert render_plots(trained.parent, "fast", n_jobs=1) == 0
+        assert render_plots(trained.parent, "fast", n_jobs=1, force=True) == 10
+
+    def test_none_mode_and_parallel(self, trained):
+        """Тест: режим none нічого не малює; пул процесів малює ті самі файли."""
+        assert render_plots(trained.parent, "none") == 0
+
+        assert render_plots(trained.parent, "fast", n_jobs=2) == 10
+        assert len(list(trained.glob("*/*.png"))) == 9
+
+    def test_unknown_mode(self, trained):
+        """Тест: невідомий режим — ValueError."""
+        with pytest.raises(ValueError):
+            render_plots(trained.parent, "hd")
@@ -0,0 +1,85 @@
+"""
+Unit-тести для об'єднання таблиць ETL за ключем за один прохід.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.table_join import merge_fold, outer_join_on_key
+
+
+def _tables():
+    """Три таблиці NHANES у мініатюрі: дублікати SEQN (ліки), пропущені учасники, різні типи."""
+    demographic = pd.DataFrame({
+        "SEQN": [73560, 73557, 73558, 73559],
+        "RIDAGEYR": [45, 69, 54, 72],
+        "RIAGENDR": pd.Categorical(["F", "M", "M", "F"]),
+    })
+    medications = pd.DataFrame({
+        "SEQN": [73557, 73559, 73557, 73561],
+        "RXDDRUG": ["INSULIN", "METFORMIN", "LISINOPRIL", "ASPIRIN"],
+        "RXDCOUNT": pd.array([2, 1, 2, 1], dtype="Int64"),
+    })
+    laboratory = pd.DataFrame({
+        "SEQN": [73558, 73557, 73562],
+        "LBXGLU": [99.0, 154.0, 88.0],
+        "LBXTC": [180, 210, 165],
+        "SMQ020": [True, False, True],
+    })
+    return [demographic, medications, laboratory]
+
+
+class TestOuterJoinOnKey:
+    """Тести для outer_join_on_key."""
+
+    def test_matches_merge_fold(self):
+        """Тест: результат (рядки, порядок, типи) збігається з послідовним merge."""
+        tables = _tables()
+
+        expected = merge_fold(tables, "SEQN").reset_index(drop=True)
+        result = outer_join_on_key(tables, "SEQN")
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert result["SEQN"].tolist() == [73557, 73557, 73558, 73559, 73560, 73561, 73562]
+        assert result["RIAGENDR"].dtype == "category"
+
+    @pytest.mark.parametrize("sparse", [False, True])
+    def test_random_tables(self, sparse):
+        """Тест: збіг з merge для випадкових таблиць з дублікатами, щільними та розрідженими ключами."""
+        rng = np.random.default_rng(7)
+        for _ in range(50):
+            tables = []
+            for index in range(int(rng.integers(2, 5))):
+                n = int(rng.integers(0, 25))
+                keys = rng.integers(0, 30, n) * (10**9 if sparse else 1)
+                tables.append(pd.DataFrame({
+                    "SEQN": keys,
+                    f"value_{index}": rng.normal(size=n),
+                    f"code_{index}": rng.integers(0, 5, n),
+                }))
+
+            expected = merge_fold(tables, "SEQN").reset_index(drop=True)
+
+            pd.testing.assert_frame_equal(outer_join_on_key(tables, "SEQN"), expected)
+
+    def test_empty_table(self):
+        """Тест: порожня таблиця додає колонки з пропусками."""
+        tables = _tables()
+        tables[1] = tables[1].iloc[0:0]
+
+        expected = merge_fold(tables, "SEQN").reset_index(drop=True)
+        result = outer_join_on_key(tables, "SEQN")
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert result["RXDDRUG"].isna().all()
+
+    def test_overlapping_columns_fall_back_to_merge(self):
+        """Тест: спільні колонки (суфікси _x/_y) обробляються звичайним merge."""
+        tables = _tables()
+        tables[2] = tables[2].rename(columns={"LBXTC": "RIDAGEYR"})
+
+        result = outer_join_on_key(tables, "SEQN")
+
+        assert {"RIDAGEYR_x", "RIDAGEYR_y"} <= set(result.columns)
+        pd.testing.assert_frame_equal(result, merge_fold(tables, "SEQN"))
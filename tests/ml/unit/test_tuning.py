@@ -0,0 +1,164 @@
+"""
+Unit-тести для пошуку гіперпараметрів (successive halving) та застосування результатів у train_many.
+"""
+
+import json
+
+import pytest
+
+from src.models import train_many, tuning
+from src.models.train_many import TUNED_PARAMS_FILE, plan_retraining
+from src.models.tuning import TRIALS_FILE, load_search_config, resource_levels, run_search, sample_candidates
+from tests.utils.training_data import make_dataset as _dataset, small_models as _models
+
+
+def _config(**search):
+    """Малий простір пошуку: 4 кандидати, eta 2, 3 фолди."""
+    config = {
+        "search": {
+            "n_candidates": 4,
+            "eta": 2,
+            "cv_folds": 3,
+            "early_stopping_rounds": 10,
+            "time_budget": None,
+            "max_fits": None,
+        },
+        "models": {
+            "LogisticRegression": {
+                "resource": {"name": "samples", "min": 0.25, "max": 1.0},
+                "params": {"C": {"type": "float", "low": 0.01, "high": 10.0, "log": True}},
+            },
+            "RandomForest": {
+                "resource": {"name": "n_estimators", "min": 10, "max": 40},
+                "params": {"max_depth": {"choice": [None, 3, 6]}, "min_samples_leaf": {"type": "int", "low": 1, "high": 20}},
+            },
+        },
+    }
+    config["search"].update(search)
+    return config
+
+
+class TestSearchSpace:
+    """Тести для resource_levels, sample_candidates та configs/search_spaces.yaml."""
+
+    def test_resource_levels(self):
+        """Тест: ресурс росте в eta разів, останній раунд — max."""
+        assert resource_levels({"name": "n_estimators", "min": 50, "max": 450}, 3) == [50, 150, 450]
+        assert resource_levels({"name": "n_estimators", "min": 50, "max": 500}, 3) == [50, 150, 500]
+        assert resource_levels({"name": "samples", "min": 0.11, "max": 1.0}, 3) == pytest.approx([0.11, 0.33, 1.0])
+
+    def test_candidates_deterministic_with_baseline(self):
+        """Тест: перший кандидат — поточна конфігурація, решта в межах простору і не повторюються."""
+        space = _config()["models"]["RandomForest"]["params"]
+        baseline = {"max_depth": None, "min_samples_leaf": 1}
+
+        candidates = sample_candidates(space, 8, baseline)
+
+        assert candidates[0] == baseline
+        assert candidates == sample_candidates(space, 8, baseline)
+        assert len({json.dumps(c, sort_keys=True) for c in candidates}) == 8
+        assert all(1 <= c["min_samples_leaf"] <= 20 and c["max_depth"] in (None, 3, 6) for c in candidates)
+
+    def test_config_covers_models(self):
+        """Тест: кожна модель get_models() має простір пошуку, параметри існують у моделі."""
+        config = load_search_config()
+
+        for name, model in train_many.get_models().items():
+            spec = config["models"][name]
+            params = model.get_params()
+            assert spec["resource"]["name"] == "samples" or spec["resource"]["name"] in params
+            assert set(spec["params"]) <= set(params)
+
+
+class TestRunSearch:
+    """Тести для run_search."""
+
+    def test_exports_best_and_resumes(self, tmp_path, monkeypatch):
+        """Тест: найкраща конфігурація експортується; повторний запуск бере навчання з журналу."""
+        datasets = {"diabetes_present": _dataset(1)}
+        models = {name: _models()[name] for name in ("LogisticRegression", "RandomForest")}
+
+        first = run_search(datasets, models, _config(), n_jobs=1, models_dir=tmp_path)
+
+        forest_dir = tmp_path / "diabetes_present" / "RandomForest"
+        tuned = json.loads((forest_dir / TUNED_PARAMS_FILE).read_text(encoding="utf-8"))
+        assert tuned["complete"] and tuned["params"]["n_estimators"] == 40
+        # 4 + 2 + 1 кандидатів × 3 фолди
+        assert len((forest_dir / TRIALS_FILE).read_text(encoding="utf-8").splitlines()) == 7 * 3
+
+        monkeypatch.setattr(tuning, "evaluate_trial", lambda job: pytest.fail("навчання повторено"))
+        second = run_search(datasets, models, _config(), n_jobs=1, models_dir=tmp_path)
+
+        assert second == first
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Тест: пул процесів знаходить ту саму конфігурацію."""
+        datasets = {"diabetes_present": _dataset(1)}
+        models = {"RandomForest": _models()["RandomForest"]}
+
+        serial = run_search(datasets, models, _config(), n_jobs=1, models_dir=tmp_path / "serial")
+        parallel = run_search(datasets, models, _config(), n_jobs=2, models_dir=tmp_path / "parallel")
+
+        assert serial == parallel
+
+    def test_fit_budget_stops_early(self, tmp_path):
+        """Тест: після вичерпання бюджету навчань експортується кращий кандидат завершеного раунду."""
+        datasets = {"diabetes_present": _dataset(1)}
+        models = {"RandomForest": _models()["RandomForest"]}
+
+        exported = run_search(datasets, models, _config(max_fits=15), n_jobs=1, models_dir=tmp_path)
+
+        tuned = exported["diabetes_present"]["RandomForest"]
+        assert not tuned["complete"] and tuned["rung"] == 0
+        # Ресурс недонавченого раунду не експортується
+        assert "n_estimators" not in tuned["params"]
+
+    @pytest.mark.skipif(not train_many.XGBOOST_AVAILABLE, reason="XGBoost не встановлено")
+    def test_early_stopping(self, tmp_path):
+        """Тест: для бустингу експортується кількість дерев з ранньої зупинки."""
+        config = _config()
+        config["models"] = {
+            "XGBoost": {
+                "resource": {"name": "n_estimators", "min": 50, "max": 400},
+                "early_stopping": True,
+                "params": {"learning_rate": {"type": "float", "low": 0.1, "high": 0.5, "log": True}},
+            }
+        }
+        models = {"XGBoost": train_many.get_models()["XGBoost"]}
+
+        exported = run_search({"diabetes_present": _dataset(1)}, models, config, n_jobs=1, models_dir=tmp_path)
+
+        assert exported["diabetes_present"]["XGBoost"]["params"]["n_estimators"] < 400
+
+
+class TestTrainingUsesTunedParams:
+    """Тести для застосування tuned_params.json у train_many."""
+
+    def test_tuned_params_retrain_model(self, tmp_path, monkeypatch):
+        """Тест: експортовані параметри застосовуються, а модель з ними перенавчається."""
+        monkeypatch.setattr(train_many, "render_plots", lambda *args, **kwargs: 0)
+        datasets = {"diabetes_present": _dataset(1)}
+        train_many.run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path)
+        run_search(datasets, {"RandomForest": _models()["RandomForest"]}, _config(), n_jobs=1, models_dir=tmp_path)
+
+        plan = plan_retraining(datasets, _models(), models_dir=tmp_path)["diabetes_present"]
+        results = train_many.run_training(datasets, _models(), n_jobs=1, models_dir=tmp_path)
+
+        assert plan == {"LogisticRegression": [], "RandomForest": ["params"], "KNN": []}
+        forest = results["diabetes_present"]["RandomForest"]["pipeline"].named_steps["model"]
+        assert forest.n_estimators == 40
+
+    def test_incomplete_search_skipped_unless_allowed(self, tmp_path, capsys):
+        """Тест: результат незавершеного пошуку не застосовується без incomplete_tuning."""
+        model_dir = tmp_path / "RandomForest"
+        model_dir.mkdir()
+        tuned = {"params": {"min_samples_leaf": 7}, "complete": False, "rung": 0}
+        (model_dir / TUNED_PARAMS_FILE).write_text(json.dumps(tuned), encoding="utf-8")
+        forest = _models()["RandomForest"]
+
+        skipped = train_many.apply_tuned_params(forest, model_dir)
+        applied = train_many.apply_tuned_params(forest, model_dir, incomplete_tuning=True)
+
+        assert skipped is forest
+        assert applied.min_samples_leaf == 7
+        assert "пошук не завершено" in capsys.readouterr().out
@@ -0,0 +1,142 @@
+"""
+Локальний фейковий сервер Ollama для тестів асистента.
+
+Реалізує POST /api/generate у двох режимах:
+- stream=false: один JSON-обʼєкт {"response": ..., "done": true}
+- stream=true: NDJSON по одному токену на рядок (chunked transfer encoding)
+
+та GET /api/tags з однією моделю (для перевірки /assistant/health).
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+class FakeOllama:
+    """Фейковий Ollama, що працює у фоновому потоці на випадковому порту.
+
+    Args:
+        tokens: Токени, які сервер повертає у відповіді
+        delay: Затримка між токенами у потоковому режимі, секунди
+        status_code: HTTP статус відповіді (для імітації помилок)
+    """
+
+    def __init__(self, tokens: Optional[List[str]] = None, delay: float = 0.0, status_code: int = 200) -> None:
+        self.tokens = tokens if tokens is not None else ["Привіт", ", ", "це ", "асистент."]
+        self.models = ["llama3:latest"]
+        self.delay = delay
+        self.status_code = status_code
+        self.requests: List[dict] = []
+        self.active = 0
+        self.max_active = 0
+        self.disconnected = threading.Event()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/generate"
+
+    def start(self) -> "FakeOllama":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):  # noqa: A002
+                return
+
+            def do_POST(self):  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests.append(payload)
+                    fake.active += 1
+                    fake.max_active = max(fake.max_active, fake.active)
+                try:
+                    self._respond(payload)
+                finally:
+                    with fake._lock:
+                        fake.active -= 1
+
+            def do_GET(self):  # noqa: N802
+                if self.path != "/api/tags":
+                    self._send_json(404, {"error": "not found"})
+                elif fake.status_code != 200:
+                    self._send_json(fake.status_code, {"error": "fake failure"})
+                else:
+                    self._send_json(200, {"models": [{"name": name} for name in fake.models]})
+
+            def _send_json(self, status_code: int, obj: dict) -> None:
+                body = json.dumps(obj).encode("utf-8")
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _respond(self, payload: dict) -> None:
+                if fake.status_code != 200:
+                    body = json.dumps({"error": "fake failure"}).encode("utf-8")
+                    self.send_response(fake.status_code)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                if not payload.get("stream", True):
+                    if fake.delay:
+                        time.sleep(fake.delay * len(fake.tokens))
+                    body = json.dumps(
+                        {"model": payload.get("model"), "response": "".join(fake.tokens), "done": True}
+                    ).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for token in fake.tokens:
+                        self._write_chunk({"response": token, "done": False})
+                        if fake.delay:
+                            time.sleep(fake.delay)
+                    self._write_chunk({"response": "", "done": True})
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    fake.disconnected.set()
+                    self.close_connection = True
+
+            def _write_chunk(self, obj: dict) -> None:
+                line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
@@ -0,0 +1,32 @@
+"""
+Невеликі синтетичні дані та швидкі моделі для тестів навчання (src/models).
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+
+FEATURES = ["RIDAGEYR", "RIAGENDR", "BMXBMI"]
+
+
+def make_dataset(seed: int, n: int = 300):
+    """(X, y, ознаки) у форматі train_many.load_and_prepare_data; y залежить від BMXBMI."""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        "RIDAGEYR": rng.integers(18, 80, n).astype(float),
+        "RIAGENDR": rng.integers(1, 3, n).astype(float),
+        "BMXBMI": rng.normal(27, 5, n),
+    })
+    y = pd.Series(((X["BMXBMI"] + rng.normal(0, 3, n)) > 28).astype(int))
+    return X, y, list(FEATURES)
+
+
+def small_models():
+    """Три швидкі моделі замість повного набору get_models()."""
+    return {
+        "LogisticRegression": LogisticRegression(max_iter=1000, random_state=0),
+        "RandomForest": RandomForestClassifier(n_estimators=20, n_jobs=-1, random_state=0),
+        "KNN": KNeighborsClassifier(n_neighbors=5),
+    }